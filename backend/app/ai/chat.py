@@ -1,59 +1,320 @@
 # app/ai/chat.py
 
-import os
-from groq import Groq
+import asyncio
+import hashlib
+import json
+import logging
+import re
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from app.config import settings
+from app.ai.context import construir_contexto
+from app.ai.circuit_breaker import CircuitoAbierto
+from app.ai.llm_client import crear_completion, stream_completion
+from app.ai.prompt_store import prompt_store
 from app.ai.prompts import (
-    SYSTEM_PROMPT,
     detectar_tipo_pregunta,
+    get_respuesta_fallback,
     get_respuesta_predefinida
 )
 
-client = Groq(api_key=os.getenv("GROQ_API_KEY"))
+logger = logging.getLogger(__name__)
+
+# ============================================================================
+# 🗃️ CACHE DE COMPLETIONS (TTL + LRU)
+# ============================================================================
 
-def get_chatbot_response(user_message: str, history: list = None):
+class CompletionCache:
     """
-    Genera respuesta del chatbot usando Groq LLM.
+    Cache en memoria de respuestas de Groq para preguntas sin historial.
+    
+    - TTL: una entrada vencida cuenta como miss y se descarta
+    - LRU: al superar max_entries o max_bytes se expulsa la menos usada
+    - Contadores de hits/misses/expulsiones para monitoreo
+    """
+    
+    def __init__(self, max_entries: int, max_bytes: int, ttl: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entradas = OrderedDict()  # clave -> (expira_en, respuesta, bytes)
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.expulsiones = 0
+    
+    def get(self, clave: str) -> Optional[str]:
+        entrada = self._entradas.get(clave)
+        
+        if entrada is None:
+            self.misses += 1
+            return None
+        
+        expira_en, respuesta, _ = entrada
+        if expira_en < time.monotonic():
+            self._quitar(clave)
+            self.misses += 1
+            return None
+        
+        self._entradas.move_to_end(clave)
+        self.hits += 1
+        return respuesta
+    
+    def set(self, clave: str, respuesta: str) -> None:
+        if self.max_entries <= 0:
+            return
+        
+        tamano = len(clave) + len(respuesta.encode("utf-8"))
+        if tamano > self.max_bytes:
+            return
+        
+        if clave in self._entradas:
+            self._quitar(clave)
+        
+        self._entradas[clave] = (time.monotonic() + self.ttl, respuesta, tamano)
+        self._bytes += tamano
+        
+        while len(self._entradas) > self.max_entries or self._bytes > self.max_bytes:
+            clave_vieja = next(iter(self._entradas))
+            self._quitar(clave_vieja)
+            self.expulsiones += 1
+    
+    def clear(self) -> None:
+        self._entradas.clear()
+        self._bytes = 0
+    
+    def stats(self) -> dict:
+        consultas = self.hits + self.misses
+        return {
+            "entradas": len(self._entradas),
+            "bytes": self._bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "expulsiones": self.expulsiones,
+            "hit_rate": round(self.hits / consultas, 3) if consultas else 0.0
+        }
+    
+    def _quitar(self, clave: str) -> None:
+        _, _, tamano = self._entradas.pop(clave)
+        self._bytes -= tamano
+
+
+completion_cache = CompletionCache(
+    max_entries=settings.CHAT_CACHE_MAX_ENTRIES,
+    max_bytes=settings.CHAT_CACHE_MAX_BYTES,
+    ttl=settings.CHAT_CACHE_TTL
+)
+
+
+# ============================================================================
+# 🛬 SINGLE-FLIGHT: UNA SOLA COMPLETION POR PROMPT IDÉNTICO EN VUELO
+# ============================================================================
+
+class SingleFlight:
+    """
+    Agrupa llamadas concurrentes con la misma clave en una sola ejecución.
     
+    El primero que llega (líder) lanza la llamada como tarea propia; los
+    que llegan mientras sigue en vuelo esperan esa misma tarea y reciben
+    el mismo resultado (o la misma excepción). Si un cliente se desconecta,
+    la tarea compartida sigue para los demás.
+    """
+    
+    def __init__(self):
+        self._en_vuelo = {}  # clave -> asyncio.Task
+        self.lideres = 0
+        self.compartidas = 0
+    
+    async def do(self, clave: str, funcion):
+        tarea = self._en_vuelo.get(clave)
+        
+        if tarea is None:
+            tarea = asyncio.ensure_future(funcion())
+            self._en_vuelo[clave] = tarea
+            tarea.add_done_callback(lambda _: self._en_vuelo.pop(clave, None))
+            self.lideres += 1
+        else:
+            self.compartidas += 1
+        
+        return await asyncio.shield(tarea)
+    
+    def stats(self) -> dict:
+        return {
+            "en_vuelo": len(self._en_vuelo),
+            "llamadas_upstream": self.lideres,
+            "llamadas_compartidas": self.compartidas
+        }
+
+
+single_flight = SingleFlight()
+
+
+def _normalizar_mensaje(mensaje: str) -> str:
+    """Minúsculas, espacios colapsados y sin signos de apertura/cierre."""
+    mensaje = re.sub(r"\s+", " ", mensaje.lower()).strip()
+    return mensaje.strip("¿?¡!. ")
+
+
+def _huella_prompt(messages: list) -> str:
+    """
+    Huella del prompt completo (modelo + mensajes) para single-flight.
+    Cada mensaje se normaliza igual que en _clave_cache: "Hola!" y "hola"
+    comparten llamada, como comparten entrada de cache.
+    """
+    normalizados = [[m["role"], _normalizar_mensaje(m["content"])] for m in messages]
+    base = settings.GROQ_MODEL + "|" + json.dumps(normalizados, ensure_ascii=False)
+    return hashlib.sha256(base.encode("utf-8")).hexdigest()
+
+
+def _clave_cache(user_message: str) -> str:
+    """
+    Clave = mensaje normalizado + hash del system prompt vigente + modelo.
+    Al recargar un prompt distinto las entradas viejas dejan de coincidir.
+    """
+    base = f"{settings.GROQ_MODEL}|{prompt_store.actual().hash_prompt}|{_normalizar_mensaje(user_message)}"
+    return hashlib.sha256(base.encode("utf-8")).hexdigest()
+
+
+def _respuesta_degradada(user_message: str) -> str:
+    """
+    Mejor respuesta posible sin Groq (circuito abierto, timeout o error).
+    
+    La respuesta predefinida ya se intentó antes; acá se prueba la cache
+    (aunque haya historial: mejor una respuesta genérica que ninguna) y
+    después las palabras clave.
+    """
+    respuesta_cacheada = completion_cache.get(_clave_cache(user_message))
+    if respuesta_cacheada:
+        return respuesta_cacheada
+    return get_respuesta_fallback(user_message)
+
+
+async def get_chatbot_response(user_message: str, history: list = None, resumen: str = None):
+    """
+    Genera respuesta del chatbot usando Groq LLM.
+
     Ahora:
     1. Intenta respuesta predefinida (rápido, sin IA)
-    2. Si no hay coincidencia, usa Groq
-    
+    2. Si no hay historial, busca en la cache de completions
+    3. Si no hay coincidencia, usa Groq (asíncrono, no bloquea el event loop);
+       pedidos idénticos concurrentes comparten una sola completion
+    4. Si Groq está caído o falla, responde en modo degradado al instante
+
     Args:
         user_message: El mensaje del usuario
         history: Lista de mensajes previos para mantener contexto
-    
+        resumen: Resumen de los turnos que ya salieron del historial
+
     Returns:
         str: Respuesta del bot
     """
-    
+
     if history is None:
         history = []
-    
+
     # 1️⃣ INTENTAR RESPUESTA PREDEFINIDA (rápido, sin IA)
     respuesta_rapida = get_respuesta_predefinida(user_message)
     if respuesta_rapida:
         return respuesta_rapida
-    
-    # 2️⃣ USAR GROQ CON SYSTEM PROMPT
-    messages = [{"role": "system", "content": SYSTEM_PROMPT}]
-    
-    # Agregar últimos 6 mensajes para contexto
-    if history:
-        messages.extend(history[-6:])
-    
-    # Agregar mensaje actual del usuario
-    messages.append({"role": "user", "content": user_message})
+
+    # 2️⃣ CACHE (solo primer turno / sin historial)
+    clave = None
+    if not history and not resumen:
+        clave = _clave_cache(user_message)
+        respuesta_cacheada = completion_cache.get(clave)
+        if respuesta_cacheada:
+            return respuesta_cacheada
+
+    # 3️⃣ USAR GROQ CON SYSTEM PROMPT
+    messages = _construir_mensajes(user_message, history, resumen)
+
+    async def _completar():
+        completion = await crear_completion(messages)
+        respuesta = completion.choices[0].message.content
+
+        if clave and respuesta:
+            completion_cache.set(clave, respuesta)
+
+        return respuesta
 
     try:
-        completion = client.chat.completions.create(
-            model="llama-3.3-70b-versatile",
-            messages=messages,
-            temperature=0.6,
-            max_tokens=250
-        )
-        
-        return completion.choices[0].message.content
-    
+        # Mensajes idénticos en simultáneo comparten una sola llamada a Groq
+        return await single_flight.do(_huella_prompt(messages), _completar)
+
+    # 4️⃣ MODO DEGRADADO
+    except CircuitoAbierto:
+        return _respuesta_degradada(user_message)
+
+    except asyncio.TimeoutError:
+        logger.warning("⏱️ Groq superó el deadline de la llamada")
+        return _respuesta_degradada(user_message)
+
     except Exception as e:
-        print(f"❌ Error en Groq: {e}")
-        return "Lo siento, tengo problemas técnicos. ¿Puedes intentar de nuevo?"
\ No newline at end of file
+        logger.error(f"❌ Error en Groq: {e}")
+        return _respuesta_degradada(user_message)
+
+
+async def stream_chatbot_response(user_message: str, history: list = None, resumen: str = None):
+    """
+    Igual que get_chatbot_response, pero entrega la respuesta en trozos
+    a medida que Groq los genera (para /api/chat/stream).
+
+    Las respuestas predefinidas, cacheadas y degradadas se entregan en un
+    único trozo. Si Groq falla antes de entregar texto, se entrega la
+    respuesta degradada.
+    """
+
+    if history is None:
+        history = []
+
+    respuesta_rapida = get_respuesta_predefinida(user_message)
+    if respuesta_rapida:
+        yield respuesta_rapida
+        return
+
+    clave = None
+    if not history and not resumen:
+        clave = _clave_cache(user_message)
+        respuesta_cacheada = completion_cache.get(clave)
+        if respuesta_cacheada:
+            yield respuesta_cacheada
+            return
+
+    messages = _construir_mensajes(user_message, history, resumen)
+    entrego_texto = False
+    partes = []
+
+    try:
+        async for delta in stream_completion(messages):
+            entrego_texto = True
+            partes.append(delta)
+            yield delta
+
+        if clave and partes:
+            completion_cache.set(clave, "".join(partes))
+
+    except CircuitoAbierto:
+        yield _respuesta_degradada(user_message)
+
+    except asyncio.TimeoutError:
+        logger.warning("⏱️ Groq superó el deadline durante el streaming")
+        if not entrego_texto:
+            yield _respuesta_degradada(user_message)
+
+    except Exception as e:
+        logger.error(f"❌ Error en Groq (streaming): {e}")
+        if not entrego_texto:
+            yield _respuesta_degradada(user_message)
+
+
+def _construir_mensajes(user_message: str, history: list, resumen: str = None) -> list:
+    """
+    Arma la lista de mensajes (system + resumen + contexto + usuario) para
+    Groq, con el historial más reciente que entre en CHAT_INPUT_TOKEN_BUDGET.
+    """
+    return construir_contexto(prompt_store.actual().system_prompt, history, user_message, resumen=resumen)
@@ -0,0 +1,174 @@
+# app/ai/circuit_breaker.py
+"""
+CIRCUIT BREAKER - Corta las llamadas a Groq cuando el proveedor se degrada
+
+¿Para qué?
+- Que un incidente de Groq no haga esperar el deadline completo a cada mensaje
+- Responder al instante con lo mejor que haya sin IA (predefinida / cache / palabras clave)
+- Volver solo a la normalidad cuando Groq se recupera
+
+Estados:
+- cerrado: las llamadas pasan; se registran errores y latencias en una ventana móvil
+- abierto: las llamadas se rechazan sin tocar la red durante `cooldown` segundos
+- semi_abierto: pasado el cooldown se deja pasar UNA llamada de prueba;
+  si sale bien se cierra, si falla se vuelve a abrir
+
+Una llamada más lenta que `umbral_lento` cuenta como fallo aunque responda:
+si Groq tarda 7s en cada mensaje también conviene degradar.
+"""
+
+import logging
+import time
+from collections import deque
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+CERRADO = "cerrado"
+ABIERTO = "abierto"
+SEMI_ABIERTO = "semi_abierto"
+
+
+class CircuitoAbierto(Exception):
+    """La llamada se rechazó sin tocar la red porque el circuito está abierto."""
+
+
+class CircuitBreaker:
+    """
+    Breaker por conteo: mira las últimas `ventana` llamadas.
+
+    Se abre cuando hay al menos `min_llamadas` en la ventana y la proporción
+    de fallos (errores + timeouts + lentas) llega a `tasa_error`.
+    """
+
+    def __init__(
+        self,
+        nombre: str,
+        ventana: int,
+        min_llamadas: int,
+        tasa_error: float,
+        umbral_lento: float,
+        cooldown: float
+    ):
+        self.nombre = nombre
+        self.min_llamadas = min_llamadas
+        self.tasa_error = tasa_error
+        self.umbral_lento = umbral_lento
+        self.cooldown = cooldown
+
+        self.estado = CERRADO
+        self._resultados = deque(maxlen=ventana)  # True = fallo
+        self._latencias = deque(maxlen=ventana)
+        self._abierto_desde: Optional[float] = None
+        self._prueba_en_curso = False
+
+        self.rechazadas = 0
+        self.aperturas = 0
+
+    # ------------------------------------------------------------------------
+    # Antes de llamar
+    # ------------------------------------------------------------------------
+
+    def permitir(self) -> bool:
+        """
+        ¿Se puede llamar al proveedor ahora?
+
+        Si retorna True, el llamador DEBE informar el resultado con
+        registrar_exito / registrar_fallo (o liberar si se canceló).
+        """
+
+        if self.estado == CERRADO:
+            return True
+
+        if self.estado == ABIERTO and time.monotonic() - self._abierto_desde >= self.cooldown:
+            self.estado = SEMI_ABIERTO
+            logger.info(f"🟡 Circuito {self.nombre} semi-abierto: probando el proveedor")
+
+        if self.estado == SEMI_ABIERTO and not self._prueba_en_curso:
+            self._prueba_en_curso = True
+            return True
+
+        self.rechazadas += 1
+        return False
+
+    # ------------------------------------------------------------------------
+    # Después de llamar
+    # ------------------------------------------------------------------------
+
+    def registrar_exito(self, latencia: float) -> None:
+        self._latencias.append(latencia)
+
+        if latencia > self.umbral_lento:
+            self.registrar_fallo()
+            return
+
+        if self.estado == SEMI_ABIERTO:
+            self._cerrar()
+            return
+
+        self._resultados.append(False)
+
+    def registrar_fallo(self) -> None:
+        if self.estado == SEMI_ABIERTO:
+            self._abrir()
+            return
+
+        if self.estado == ABIERTO:
+            return
+
+        self._resultados.append(True)
+
+        llamadas = len(self._resultados)
+        if llamadas >= self.min_llamadas and sum(self._resultados) / llamadas >= self.tasa_error:
+            self._abrir()
+
+    def liberar(self) -> None:
+        """La llamada permitida se canceló sin resultado (ej: cliente desconectado)."""
+        if self.estado == SEMI_ABIERTO:
+            self._prueba_en_curso = False
+
+    # ------------------------------------------------------------------------
+    # Transiciones
+    # ------------------------------------------------------------------------
+
+    def _abrir(self) -> None:
+        self.estado = ABIERTO
+        self._abierto_desde = time.monotonic()
+        self._prueba_en_curso = False
+        self.aperturas += 1
+        logger.warning(f"🔴 Circuito {self.nombre} abierto por {self.cooldown}s: respuestas degradadas")
+
+    def _cerrar(self) -> None:
+        self.estado = CERRADO
+        self._abierto_desde = None
+        self._prueba_en_curso = False
+        self._resultados.clear()
+        logger.info(f"🟢 Circuito {self.nombre} cerrado: proveedor recuperado")
+
+    # ------------------------------------------------------------------------
+    # Monitoreo
+    # ------------------------------------------------------------------------
+
+    def stats(self) -> dict:
+        llamadas = len(self._resultados)
+        latencias = sorted(self._latencias)
+
+        def percentil(p: float) -> Optional[float]:
+            if not latencias:
+                return None
+            return round(latencias[min(len(latencias) - 1, int(p * len(latencias)))], 3)
+
+        return {
+            "nombre": self.nombre,
+            "estado": self.estado,
+            "llamadas_en_ventana": llamadas,
+            "tasa_error": round(sum(self._resultados) / llamadas, 3) if llamadas else 0.0,
+            "latencia_p50": percentil(0.50),
+            "latencia_p95": percentil(0.95),
+            "rechazadas": self.rechazadas,
+            "aperturas": self.aperturas,
+            "reintento_en": (
+                round(max(0.0, self.cooldown - (time.monotonic() - self._abierto_desde)), 1)
+                if self.estado == ABIERTO else None
+            )
+        }
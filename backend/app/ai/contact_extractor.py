@@ -0,0 +1,333 @@
+# app/ai/contact_extractor.py
+"""
+EXTRACTOR DE CONTACTO - Un solo motor para email, teléfono, nombre e intención
+
+¿Para qué?
+- Un único lugar con los patrones (antes había tres versiones distintas)
+- Patrones precompilados una sola vez (antes se compilaban en cada mensaje)
+- Las palabras clave se resuelven tokenizando una vez y cruzando con un
+  conjunto, en vez de buscar cada palabra por separado en el texto
+- Buscar solo los campos que faltan
+
+Usado por:
+- app/routes/chat.py (contacto incremental de la sesión)
+- app/ai/summarizer.py (datos que se conservan en el resumen)
+- app/utils/lead_detector.py y app/ai/lead_detector.py (API anterior)
+
+Campos que detecta:
+- email, telefono, nombre, tipo_cliente, servicio (texto)
+- problema (solo desde el formulario del chat)
+- intencion (quiere que lo contacten), quiere_agendar (da día/hora o confirma)
+"""
+
+import re
+from typing import Dict, Iterable, Optional
+
+CAMPOS = (
+    "nombre", "email", "telefono", "tipo_cliente", "problema",
+    "servicio", "intencion", "quiere_agendar"
+)
+
+# ============================================================================
+# 📝 PATRONES (precompilados una sola vez)
+# ============================================================================
+
+EMAIL_RE = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
+
+# Secuencia de dígitos con espacios/guiones opcionales; el largo real
+# (7 a 15 dígitos, como el detector anterior) se valida después. El "+"
+# inicial se agrega a mano.
+TELEFONO_RE = re.compile(r"\d[\d\s-]{5,18}\d")
+
+# Palabras del mensaje ya pasado a minúscula
+PALABRA_RE = re.compile(r"[a-záéíóúüñ]+")
+
+# Candidatos a nombre: Capitalizada, 3+ letras, resto en minúscula ("PCs", "IT" no)
+CAPITALIZADA_RE = re.compile(r"\b[A-ZÁÉÍÓÚÑ][a-záéíóúüñ]{2,}\b")
+
+# Palabras clave exactas (en minúscula) -> (campo, valor)
+CLAVES = {
+    "particular": ("tipo_cliente", "Particular"),
+    "autónomo": ("tipo_cliente", "Particular"),
+    "autonomo": ("tipo_cliente", "Particular"),
+    "comercio": ("tipo_cliente", "Comercio"),
+    "oficina": ("tipo_cliente", "Oficina"),
+    "empresa": ("tipo_cliente", "Empresa"),
+    "seguridad": ("servicio", "Seguridad IT"),
+    "soporte": ("servicio", "Soporte IT"),
+    "consulta": ("servicio", "Consulta General"),
+    "reunion": ("intencion", True),
+    "reunión": ("intencion", True),
+    "llamame": ("intencion", True),
+    "llámame": ("intencion", True),
+    "contactame": ("intencion", True),
+    "contáctame": ("intencion", True),
+    "whatsapp": ("intencion", True),
+    "wp": ("intencion", True),
+    "wa": ("intencion", True),
+    "cotización": ("intencion", True),
+    "cotizacion": ("intencion", True),
+    "enviame": ("intencion", True),
+    "envíame": ("intencion", True),
+    "lunes": ("quiere_agendar", True),
+    "martes": ("quiere_agendar", True),
+    "miércoles": ("quiere_agendar", True),
+    "miercoles": ("quiere_agendar", True),
+    "jueves": ("quiere_agendar", True),
+    "viernes": ("quiere_agendar", True),
+    "mañana": ("quiere_agendar", True),
+    "hs": ("quiere_agendar", True),
+    "hora": ("quiere_agendar", True),
+    "agendemos": ("quiere_agendar", True),
+    "dale": ("quiere_agendar", True),
+    "ok": ("quiere_agendar", True),
+}
+
+# Plurales de las claves ("empresas", "oficinas", "consultas")
+for _clave, _dato in list(CLAVES.items()):
+    if _dato[0] in ("tipo_cliente", "servicio"):
+        CLAVES.setdefault(_clave + "s", _dato)
+
+_CLAVES_SET = frozenset(CLAVES)
+
+# Raíces (en minúscula) -> (campo, valor): "automatizar", "automatización"...
+RAICES = {
+    "automatiz": ("servicio", "Automatización"),
+    "particular": ("tipo_cliente", "Particular"),
+    "agenda": ("intencion", True),
+    "presupuest": ("intencion", True),
+    "necesit": ("intencion", True),
+}
+RAIZ_RE = re.compile("|".join(RAICES))
+
+# Si el mensaje nombra varios, gana el primero (mismo orden que antes):
+# "tengo un comercio y una oficina" -> Comercio
+PRIORIDAD = {
+    valor: orden
+    for valores in (
+        ("Particular", "Comercio", "Oficina", "Empresa"),
+        ("Automatización", "Seguridad IT", "Soporte IT", "Consulta General"),
+    )
+    for orden, valor in enumerate(valores)
+}
+
+# Frases de más de una palabra
+FRASES = {
+    "me interesa": ("intencion", True),
+}
+
+# Campos que salen de palabras clave (si no se pide ninguno, no se tokeniza)
+CAMPOS_CLAVE = frozenset(dato[0] for dato in (*CLAVES.values(), *RAICES.values(), *FRASES.values()))
+
+# Palabras con mayúscula que no son nombres
+PALABRAS_EXCLUIR_NOMBRE = {
+    "interesado", "automatización", "seguridad", "soporte", "consulta",
+    "hola", "perfecto", "gracias", "particular", "comercio", "buenas",
+    "buenos", "buen", "saludos", "dale", "genial", "excelente"
+}
+
+FIN_DE_FRASE = frozenset(".!?¡¿\n")
+
+
+def _es_telefono(texto: str) -> bool:
+    digitos = sum(c.isdigit() for c in texto)
+    return 7 <= digitos <= 15
+
+
+def _es_clave(minuscula: str) -> bool:
+    return minuscula in _CLAVES_SET or RAIZ_RE.match(minuscula) is not None
+
+
+# ============================================================================
+# 🔍 MOTOR
+# ============================================================================
+
+class ContactExtractor:
+    """
+    Extrae datos de contacto de un mensaje.
+
+    Ejemplo:
+    extractor.extraer("Soy Ana, ana@mail.com, tel 351 555 1234")
+    # {"nombre": "Ana", "email": "ana@mail.com", "telefono": "351 555 1234"}
+    """
+
+    def extraer(self, mensaje: str, campos: Optional[Iterable[str]] = None) -> Dict:
+        """
+        Retorna solo los campos encontrados (de los pedidos en `campos`;
+        todos si es None). Si el mensaje viene del formulario del chat
+        ("nombre | email | tipo | problema | telefono | Interesado en: ..."),
+        se toma de ahí.
+
+        Cada búsqueda corre solo si su campo fue pedido: con el contacto
+        casi completo, un mensaje cuesta un par de búsquedas nomás.
+        """
+
+        buscados = set(CAMPOS if campos is None else campos)
+        if not buscados or not mensaje:
+            return {}
+
+        formulario = parsear_formulario(mensaje)
+        if formulario:
+            return {campo: valor for campo, valor in formulario.items() if campo in buscados and valor}
+
+        encontrados = {}
+
+        if "email" in buscados and "@" in mensaje:
+            match = EMAIL_RE.search(mensaje)
+            if match:
+                encontrados["email"] = match.group()[:255]
+
+        if "telefono" in buscados:
+            for match in TELEFONO_RE.finditer(mensaje):
+                telefono = match.group().strip()
+                if _es_telefono(telefono):
+                    if match.start() and mensaje[match.start() - 1] == "+":
+                        telefono = "+" + telefono
+                    encontrados["telefono"] = telefono[:20]
+                    break
+
+        if not CAMPOS_CLAVE.isdisjoint(buscados):
+            minuscula = mensaje.lower()
+            # Un solo tokenizado + intersección de conjuntos (todo en C).
+            # El conjunto no tiene orden: con varias coincidencias decide
+            # PRIORIDAD, igual para claves exactas y raíces
+            coincidencias = [CLAVES[palabra] for palabra in _CLAVES_SET.intersection(PALABRA_RE.findall(minuscula))]
+            coincidencias += [RAICES[raiz] for raiz in RAIZ_RE.findall(minuscula)]
+            for campo, valor in coincidencias:
+                if campo not in buscados:
+                    continue
+                actual = encontrados.get(campo)
+                if actual is None or PRIORIDAD.get(valor, 0) < PRIORIDAD.get(actual, 0):
+                    encontrados[campo] = valor
+            for frase, (campo, valor) in FRASES.items():
+                if campo in buscados and campo not in encontrados and frase in minuscula:
+                    encontrados[campo] = valor
+
+        if "nombre" in buscados:
+            nombre = self._nombre(mensaje)
+            if nombre:
+                encontrados["nombre"] = nombre[:100]
+
+        return encontrados
+
+    def _nombre(self, mensaje: str) -> Optional[str]:
+        """
+        1. La palabra después de "me llamo", "soy" o "mi nombre es"
+           (o antes de "es mi nombre")
+        2. Si no, la primera Capitalizada a mitad de frase: los mensajes
+           empiezan con "Tengo", "Quiero"... así que una palabra al inicio
+           de frase solo cuenta si el mensaje es cortito ("Ana López") o
+           si la sigue otra Capitalizada ("Juan Perez, necesito...")
+        """
+
+        candidato = None
+        mensaje_corto = None
+
+        for match in CAPITALIZADA_RE.finditer(mensaje):
+            palabra = match.group()
+            minuscula = palabra.lower()
+            if minuscula in PALABRAS_EXCLUIR_NOMBRE or _es_clave(minuscula):
+                continue
+
+            antes = mensaje[:match.start()]
+            previas = antes[-20:].lower().split()[-2:]
+            if previas and (
+                previas[-1] in ("llamo", "soy")
+                or previas == ["nombre", "es"]
+            ) or mensaje[match.end():match.end() + 13].lower() == " es mi nombre":
+                return palabra
+
+            if candidato is None:
+                antes = antes.rstrip()
+                if not antes or antes[-1] in FIN_DE_FRASE:
+                    if mensaje_corto is None:
+                        mensaje_corto = len(mensaje.split()) <= 3
+                    if not mensaje_corto and not self._sigue_apellido(mensaje, match.end()):
+                        continue
+                candidato = palabra
+
+        return candidato
+
+    @staticmethod
+    def _sigue_apellido(mensaje: str, fin: int) -> bool:
+        """¿Después de la palabra viene otra Capitalizada que no es clave ("Juan Perez")?"""
+
+        match = CAPITALIZADA_RE.match(mensaje, fin + 1) if mensaje[fin:fin + 1] == " " else None
+        if match is None:
+            return False
+        minuscula = match.group().lower()
+        return minuscula not in PALABRAS_EXCLUIR_NOMBRE and not _es_clave(minuscula)
+
+    def analizar(self, mensaje: str) -> Dict:
+        """
+        Señales de lead de un mensaje.
+
+        Retorna:
+            {
+                'es_lead': True/False,
+                'telefono': '+543516889414' o None,
+                'email': 'usuario@email.com' o None,
+                'tiene_intencion': True/False,
+                'quiere_agendar': True/False,
+                'razon': 'descripción de por qué es lead'
+            }
+        """
+
+        datos = self.extraer(mensaje, ("email", "telefono", "intencion", "quiere_agendar"))
+        telefono = datos.get("telefono")
+        if telefono:
+            telefono = telefono.replace(" ", "").replace("-", "")
+        email = datos.get("email")
+        tiene_intencion = bool(datos.get("intencion"))
+
+        razon_partes = []
+        if telefono:
+            razon_partes.append(f"Teléfono: {telefono}")
+        if email:
+            razon_partes.append(f"Email: {email}")
+        if tiene_intencion and not (telefono or email):
+            razon_partes.append("Palabras de intención de contacto")
+
+        return {
+            "es_lead": bool(telefono or email or tiene_intencion),
+            "telefono": telefono,
+            "email": email,
+            "tiene_intencion": tiene_intencion,
+            "quiere_agendar": bool(datos.get("quiere_agendar")),
+            "razon": " | ".join(razon_partes) if razon_partes else "Sin señales"
+        }
+
+
+def parsear_formulario(mensaje: str) -> Dict:
+    """
+    Formato del formulario del chat:
+    nombre | email | tipoCliente | problema | telefono | Interesado en: servicio
+
+    Retorna los campos, o {} si el mensaje no tiene ese formato.
+    """
+
+    if " | " not in mensaje:
+        return {}
+
+    partes = mensaje.split(" | ")
+    if len(partes) < 6:
+        return {}
+
+    # Validar y sanitizar cada campo
+    contacto = {
+        "nombre": partes[0].strip()[:100],  # Máximo 100 caracteres
+        "email": partes[1].strip()[:255],
+        "tipo_cliente": partes[2].strip()[:50],
+        "problema": partes[3].strip()[:500],
+        "telefono": partes[4].strip()[:20],
+        "servicio": ""
+    }
+
+    servicio_parte = partes[5].strip()
+    if "Interesado en:" in servicio_parte:
+        contacto["servicio"] = servicio_parte.replace("Interesado en:", "").strip()[:100]
+
+    return contacto
+
+
+extractor = ContactExtractor()
@@ -0,0 +1,88 @@
+# app/ai/context.py
+"""
+ARMADO DE CONTEXTO - Mensajes para Groq dentro de un presupuesto de tokens
+
+¿Para qué?
+- No mandar historial de más: prompts chicos = prefill más rápido y barato
+- Priorizar siempre los turnos más recientes
+- Estimar tokens localmente, sin tokenizer ni llamadas externas
+
+La estimación usa bytes UTF-8 / CHARS_POR_TOKEN. Para español con algo
+de emojis queda cerca del tokenizer de Llama y cuesta O(largo del texto).
+"""
+
+from functools import lru_cache
+from typing import List, Optional
+
+from app.config import settings
+
+# Bytes UTF-8 promedio por token (español, tokenizer tipo Llama)
+CHARS_POR_TOKEN = 3.8
+
+# Tokens extra que agrega el formato de cada mensaje (rol, separadores)
+TOKENS_POR_MENSAJE = 4
+
+
+def estimar_tokens(texto: str) -> int:
+    """Estimación rápida de tokens de un texto."""
+    if not texto:
+        return 0
+    return int(len(texto.encode("utf-8")) / CHARS_POR_TOKEN) + 1
+
+
+@lru_cache(maxsize=16)
+def _tokens_prompt(prompt: str) -> int:
+    """El system prompt casi nunca cambia: se estima una sola vez."""
+    return estimar_tokens(prompt) + TOKENS_POR_MENSAJE
+
+
+def construir_contexto(
+    system_prompt: str,
+    history: List[dict],
+    user_message: str,
+    presupuesto: int = None,
+    resumen: Optional[str] = None
+) -> List[dict]:
+    """
+    Arma [system, resumen, ...historial reciente, user] sin pasar el
+    presupuesto de tokens de entrada.
+
+    El system prompt, el resumen y el mensaje actual siempre van. Del
+    historial se toman mensajes desde el más reciente hacia atrás
+    mientras entren; nunca se deja una respuesta del bot sin la pregunta
+    que la originó.
+
+    Parámetros:
+    - system_prompt: Instrucciones del LLM
+    - history: Mensajes previos [{"role": ..., "content": ...}] en orden cronológico
+    - user_message: Mensaje actual del usuario
+    - presupuesto: Tokens máximos de entrada (default CHAT_INPUT_TOKEN_BUDGET)
+    - resumen: Resumen de turnos anteriores a la ventana (va antes del historial)
+    """
+
+    if presupuesto is None:
+        presupuesto = settings.CHAT_INPUT_TOKEN_BUDGET
+
+    usados = _tokens_prompt(system_prompt) + estimar_tokens(user_message) + TOKENS_POR_MENSAJE
+    if resumen:
+        usados += estimar_tokens(resumen) + TOKENS_POR_MENSAJE
+
+    inicio = len(history)
+    for i in range(len(history) - 1, -1, -1):
+        costo = estimar_tokens(history[i]["content"]) + TOKENS_POR_MENSAJE
+        if usados + costo > presupuesto:
+            break
+        usados += costo
+        inicio = i
+
+    seleccion = history[inicio:]
+    if seleccion and seleccion[0]["role"] == "assistant":
+        seleccion = seleccion[1:]
+
+    messages = [{"role": "system", "content": system_prompt}]
+    if resumen:
+        messages.append({"role": "system", "content": f"Resumen de la conversación anterior:\n{resumen}"})
+    messages.extend(seleccion)
+    messages.append({"role": "user", "content": user_message})
+
+    return messages
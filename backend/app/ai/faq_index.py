@@ -0,0 +1,146 @@
+# app/ai/faq_index.py
+"""
+ÍNDICE DE FAQ - Respuestas predefinidas por similitud de trigramas
+
+¿Para qué?
+- Encontrar la pregunta frecuente más parecida sin recorrer todas
+  (antes: normalizar cada pregunta en cada llamada + substring en ambos sentidos)
+- Menos falsos positivos: "cuesta" solo ya no dispara "¿Cuánto cuesta?",
+  y un mensaje largo que de casualidad contiene una pregunta corta tampoco
+- Escalar a cientos o miles de preguntas con búsquedas de microsegundos
+
+Cómo funciona:
+- Cada pregunta se normaliza (minúsculas, sin tildes ni signos) y se parte
+  en trigramas de caracteres por palabra, como pg_trgm: "  cuanto " ->
+  "  c", " cu", "cua", "uan", "ant", "nto", "to "
+- Un índice invertido trigrama -> preguntas que lo contienen (arrays de
+  NumPy: contar compartidos es un bincount, sin loop de Python por pregunta)
+- Similitud de Dice: 2 * compartidos / (trigramas_mensaje + trigramas_pregunta)
+- Gana la más parecida si supera el umbral (FAQ_SIMILARITY_THRESHOLD) y
+  el mensaje cubre al menos COBERTURA_MINIMA de los trigramas de la
+  pregunta (una sola palabra suelta no alcanza a cubrir una pregunta)
+
+El índice se arma una vez y no se modifica: para cambiar las preguntas se
+arma uno nuevo y se reemplaza la referencia.
+"""
+
+import re
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.ai.keyword_matcher import plegar
+from app.config import settings
+
+SIGNOS_RE = re.compile(r"[^\w\s]+")
+
+# Proporción de los trigramas de la pregunta que tiene que traer el mensaje
+COBERTURA_MINIMA = 0.6
+
+
+def normalizar(texto: str) -> str:
+    """Minúsculas, sin tildes, sin signos y con espacios simples."""
+    return " ".join(SIGNOS_RE.sub(" ", plegar(texto)).split())
+
+
+def trigramas(texto_normalizado: str, tope: float = float("inf")) -> set:
+    """
+    Trigramas por palabra, con dos espacios al inicio y uno al final.
+    Deja de agregar palabras apenas pasa `tope` trigramas.
+    """
+
+    resultado = set()
+    for palabra in texto_normalizado.split():
+        relleno = f"  {palabra} "
+        resultado.update([relleno[i:i + 3] for i in range(len(relleno) - 2)])
+        if len(resultado) > tope:
+            break
+    return resultado
+
+
+class FaqIndex:
+    """
+    Índice inmutable de preguntas frecuentes.
+
+    Ejemplo:
+    indice = FaqIndex({"¿Cuánto cuesta?": "Depende del alcance..."})
+    indice.buscar("cuanto cuesta??")
+    # "Depende del alcance..."
+    """
+
+    def __init__(self, preguntas: Dict[str, str], umbral: Optional[float] = None):
+        self.umbral = settings.FAQ_SIMILARITY_THRESHOLD if umbral is None else umbral
+
+        self._respuestas: List[str] = []
+        self._preguntas: List[str] = []
+        self._tamanos: List[int] = []
+        self._exactas: Dict[str, int] = {}
+        invertido: Dict[str, List[int]] = {}
+
+        for pregunta, respuesta in preguntas.items():
+            normalizada = normalizar(pregunta)
+            grams = trigramas(normalizada)
+            if not grams:
+                continue
+
+            indice = len(self._respuestas)
+            self._respuestas.append(respuesta)
+            self._preguntas.append(pregunta)
+            self._tamanos.append(len(grams))
+            self._exactas.setdefault(normalizada, indice)
+            for gram in grams:
+                invertido.setdefault(gram, []).append(indice)
+
+        self._invertido = {gram: np.array(indices, dtype=np.int32) for gram, indices in invertido.items()}
+        self._tamanos_np = np.array(self._tamanos, dtype=np.float64)
+
+        # Dice <= 2*min(a, b) / (a + b): un mensaje con más trigramas que
+        # esto no puede superar el umbral contra ninguna pregunta
+        mayor = max(self._tamanos, default=0)
+        self._max_trigramas = mayor * (2 - self.umbral) / self.umbral if self.umbral > 0 else float("inf")
+
+    def __len__(self) -> int:
+        return len(self._respuestas)
+
+    def _mejor_indice(self, mensaje: str) -> Optional[Tuple[int, float]]:
+        normalizado = normalizar(mensaje)
+        exacta = self._exactas.get(normalizado)
+        if exacta is not None:
+            return exacta, 1.0
+
+        grams = trigramas(normalizado, tope=self._max_trigramas)
+        if not grams or len(grams) > self._max_trigramas:
+            return None
+
+        invertido = self._invertido
+        listas = [invertido[gram] for gram in grams if gram in invertido]
+        if not listas:
+            return None
+
+        # Trigramas compartidos con cada pregunta, Dice y cobertura, todo vectorizado
+        compartidos = np.bincount(np.concatenate(listas), minlength=len(self._tamanos))
+        tamanos = self._tamanos_np
+        similitud = 2 * compartidos / (len(grams) + tamanos)
+        similitud[compartidos < COBERTURA_MINIMA * tamanos] = 0.0
+
+        mejor_indice = int(similitud.argmax())
+        mejor_similitud = float(similitud[mejor_indice])
+        if mejor_similitud == 0.0 or mejor_similitud < self.umbral:
+            return None
+        return mejor_indice, mejor_similitud
+
+    def mejor(self, mensaje: str) -> Optional[Tuple[str, float]]:
+        """(pregunta, similitud) de la más parecida sobre el umbral, o None."""
+
+        resultado = self._mejor_indice(mensaje)
+        if resultado is None:
+            return None
+        return self._preguntas[resultado[0]], resultado[1]
+
+    def buscar(self, mensaje: str) -> Optional[str]:
+        """Respuesta de la pregunta más parecida, o None si ninguna alcanza el umbral."""
+
+        resultado = self._mejor_indice(mensaje)
+        if resultado is None:
+            return None
+        return self._respuestas[resultado[0]]
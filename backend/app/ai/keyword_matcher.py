@@ -0,0 +1,158 @@
+# app/ai/keyword_matcher.py
+"""
+BUSCADOR DE PALABRAS CLAVE - Autómata Aho-Corasick sobre palabras
+
+¿Para qué?
+- Buscar TODAS las palabras clave de varios diccionarios en una sola pasada
+  (antes: un `palabra in mensaje` por cada entrada de cada lista)
+- Que el costo dependa del largo del mensaje, no de cuántas claves hay
+- Comparar sin tildes ni mayúsculas: "Automatización" == "automatizacion"
+- Respetar los límites de palabra: "api" ya no aparece dentro de "rápido"
+
+Cómo funciona:
+- El mensaje se pliega (minúsculas, sin tildes) y se parte en palabras
+- Las claves de varias palabras ("base de datos", "esta semana") son
+  caminos en un autómata Aho-Corasick cuyo alfabeto son las palabras
+- Una palabra que no aparece en ninguna clave vuelve el autómata a la
+  raíz sin recorrer enlaces de falla
+- Plurales simples: "facturas" y "clientes" encuentran "factura" y "cliente"
+
+Ejemplo:
+buscador = KeywordMatcher({"positivas": ["necesito", "base de datos"], "negativas": ["spam"]})
+buscador.encontrar("Necesito migrar la base de datos")
+# {"positivas": ["necesito", "base de datos"]}
+"""
+
+import re
+from collections import deque
+from typing import Dict, Iterable, List, Tuple
+
+TILDES = (
+    ("á", "a"), ("é", "e"), ("í", "i"), ("ó", "o"), ("ú", "u"), ("ü", "u"),
+    ("à", "a"), ("è", "e"), ("ì", "i"), ("ò", "o"), ("ù", "u")
+)
+
+PALABRA_RE = re.compile(r"\w+")
+
+
+def plegar(texto: str) -> str:
+    """Minúsculas y sin tildes (la ñ se conserva)."""
+
+    texto = texto.lower()
+    if texto.isascii():
+        return texto
+    # Un str.replace por tilde es bastante más rápido que str.translate
+    for con_tilde, sin_tilde in TILDES:
+        if con_tilde in texto:
+            texto = texto.replace(con_tilde, sin_tilde)
+    return texto
+
+
+def palabras(texto: str) -> List[str]:
+    """Palabras del texto ya plegado."""
+    return PALABRA_RE.findall(plegar(texto))
+
+
+class KeywordMatcher:
+    """
+    Autómata construido una sola vez a partir de diccionarios agrupados:
+    {"grupo": [clave, ...]} (también sirve un dict clave -> puntos).
+    """
+
+    def __init__(self, grupos: Dict[str, Iterable[str]]):
+        self._siguiente: List[Dict[str, int]] = [{}]   # estado -> {palabra: estado}
+        self._falla: List[int] = [0]
+        self._salidas: List[List[Tuple[str, str]]] = [[]]  # estado -> [(grupo, clave)]
+        self._vocabulario = set()
+        self.total_claves = 0
+
+        for grupo, claves in grupos.items():
+            for clave in claves:
+                self._agregar(grupo, clave)
+        self._enlazar_fallas()
+
+    # ------------------------------------------------------------------------
+    # Construcción
+    # ------------------------------------------------------------------------
+
+    def _agregar(self, grupo: str, clave: str) -> None:
+        partes = palabras(clave)
+        if not partes:
+            return
+        # Plurales simples de la última palabra: "factura" -> "facturas", "solucion" -> "soluciones"
+        for final in (partes[-1], partes[-1] + "s", partes[-1] + "es"):
+            self._agregar_camino(grupo, clave, partes[:-1] + [final])
+        self.total_claves += 1
+
+    def _agregar_camino(self, grupo: str, clave: str, camino: List[str]) -> None:
+        estado = 0
+        for palabra in camino:
+            self._vocabulario.add(palabra)
+            destino = self._siguiente[estado].get(palabra)
+            if destino is None:
+                destino = len(self._siguiente)
+                self._siguiente.append({})
+                self._falla.append(0)
+                self._salidas.append([])
+                self._siguiente[estado][palabra] = destino
+            estado = destino
+
+        if (grupo, clave) not in self._salidas[estado]:
+            self._salidas[estado].append((grupo, clave))
+
+    def _enlazar_fallas(self) -> None:
+        """Enlaces de falla por BFS; cada estado hereda las salidas de su falla."""
+
+        cola = deque(self._siguiente[0].values())
+        while cola:
+            estado = cola.popleft()
+            for palabra, destino in self._siguiente[estado].items():
+                cola.append(destino)
+                falla = self._falla[estado]
+                while falla and palabra not in self._siguiente[falla]:
+                    falla = self._falla[falla]
+                candidato = self._siguiente[falla].get(palabra, 0)
+                self._falla[destino] = candidato if candidato != destino else 0
+                self._salidas[destino].extend(self._salidas[self._falla[destino]])
+
+    # ------------------------------------------------------------------------
+    # Búsqueda
+    # ------------------------------------------------------------------------
+
+    def buscar(self, texto: str) -> List[Tuple[str, str]]:
+        """
+        Todas las coincidencias, en orden de aparición: [(grupo, clave), ...].
+        Una clave que aparece dos veces figura dos veces.
+        """
+
+        siguiente = self._siguiente
+        falla = self._falla
+        salidas = self._salidas
+        vocabulario = self._vocabulario
+
+        coincidencias = []
+        tokens = palabras(texto)
+        if vocabulario.isdisjoint(tokens):
+            return coincidencias
+
+        estado = 0
+        for palabra in tokens:
+            if palabra not in vocabulario:
+                estado = 0
+                continue
+            while estado and palabra not in siguiente[estado]:
+                estado = falla[estado]
+            estado = siguiente[estado].get(palabra, 0)
+            if salidas[estado]:
+                coincidencias.extend(salidas[estado])
+        return coincidencias
+
+    def encontrar(self, texto: str) -> Dict[str, List[str]]:
+        """Claves distintas encontradas por grupo: {"grupo": [clave, ...]}."""
+
+        encontradas: Dict[str, List[str]] = {}
+        for grupo, clave in self.buscar(texto):
+            claves = encontradas.setdefault(grupo, [])
+            if clave not in claves:
+                claves.append(clave)
+        return encontradas
@@ -1,21 +1,18 @@
-# app/utils/lead_detector.py
-import re
+# app/ai/lead_detector.py
+from app.ai.contact_extractor import extractor
+
 
 class LeadDetector:
     def analizar(self, texto: str):
-        t = texto.lower()
-        email = re.search(r'[\w\.-]+@[\w\.-]+\.\w+', t)
-        telefono = re.search(r'\+?\d{7,15}', t)
-        
-        # Detectar si el usuario está dando una fecha o confirmando
-        confirmacion = any(x in t for x in ["lunes", "martes", "miércoles", "jueves", "viernes", "mañana", "hs", "hora", "agendemos", "dale", "ok"])
+        resultado = extractor.analizar(texto)
         
         return {
-            "es_lead": bool(email or telefono),
-            "email": email.group(0) if email else None,
-            "telefono": telefono.group(0) if telefono else None,
-            "quiere_agendar": confirmacion,
+            "es_lead": bool(resultado["email"] or resultado["telefono"]),
+            "email": resultado["email"],
+            "telefono": resultado["telefono"],
+            # ¿El usuario está dando una fecha o confirmando?
+            "quiere_agendar": resultado["quiere_agendar"],
             "texto_puro": texto
         }
 
-detector = LeadDetector()
\ No newline at end of file
+detector = LeadDetector()
@@ -18,10 +18,12 @@ Factores considerados:
 """
 
 import re
-import logging
-from typing import List
+from dataclasses import asdict, dataclass, field
+from typing import List, Optional, Sequence
 
-logger = logging.getLogger(__name__)
+import numpy as np
+
+from app.ai.keyword_matcher import KeywordMatcher
 
 # ============================================================================
 # 🎯 PALABRAS CLAVE PARA SCORING
@@ -85,6 +87,29 @@ PALABRAS_NEGATIVAS = {
     "no sé": -15,
 }
 
+# Detalles técnicos y de timeline (ver _detectar_detalles_especificos)
+DETALLES_TECNICOS = [
+    "api", "python", "zapier", "n8n", "make", "automate",
+    "windows", "linux", "sql", "excel", "google sheets"
+]
+
+DETALLES_TIMELINE = [
+    "mañana", "esta semana", "este mes", "urgente",
+    "asap", "pronto", "rápido"
+]
+
+# Un solo autómata con todos los diccionarios: una pasada por mensaje
+# encuentra las palabras positivas, negativas y los detalles
+BUSCADOR = KeywordMatcher({
+    "positivas": PALABRAS_POSITIVAS,
+    "negativas": PALABRAS_NEGATIVAS,
+    "tecnicos": DETALLES_TECNICOS,
+    "timeline": DETALLES_TIMELINE
+})
+
+NUMERO_RE = re.compile(r'\d')
+VOLUMEN_RE = re.compile(r'\d\s*(?:email|factura|pedido|cliente)')
+
 # ============================================================================
 # 📊 FUNCIÓN PRINCIPAL: SCORE_LEAD
 # ============================================================================
@@ -93,8 +118,9 @@ def score_lead(
     mensaje: str,
     tiene_contacto: bool = False,
     tiene_intencion: bool = False,
-    historial_length: int = 0
-) -> int:
+    historial_length: int = 0,
+    explain: bool = False
+):
     """
     Calcula el score de un lead (0-100).
     
@@ -103,10 +129,15 @@ def score_lead(
     - tiene_contacto: ¿Dejó email/teléfono?
     - tiene_intencion: ¿Mostró intención?
     - historial_length: Cuántos mensajes previos en la conversación
+    - explain: Si es True retorna un ScoreBreakdown (ver explicar_score)
     
     Retorna:
     - int: Score 0-100
     
+    Se llama en cada turno del chat y en cada formulario: no loguea ni
+    arma strings. Para ver el detalle de un score usar explain=True o
+    GET /api/leads/{id}/score.
+    
     Ejemplo:
     score = score_lead(
         mensaje="Necesito automatizar mis facturas. WhatsApp: +54 9 351 123 4567",
@@ -117,137 +148,167 @@ def score_lead(
     # Retorna: 92
     """
     
+    if explain:
+        return explicar_score(mensaje, tiene_contacto, tiene_intencion, historial_length)
+    
     # Base score: 20 puntos (todo lead tiene un mínimo)
     score = 20
     
-    logger.info(f"🎯 Iniciando scoring del lead")
-    
-    # ========================================================================
     # FACTOR 1: ¿Tiene contacto? (email/teléfono)
-    # ========================================================================
     if tiene_contacto:
-        score += 35  # +35 puntos si dejó contacto
-        logger.info(f"  ✓ Tiene contacto: +35 (total: {score})")
-    else:
-        logger.info(f"  ✗ Sin contacto: +0")
+        score += 35
     
-    # ========================================================================
     # FACTOR 2: ¿Mostró intención?
-    # ========================================================================
     if tiene_intencion:
-        score += 15  # +15 puntos si mostró intención
-        logger.info(f"  ✓ Con intención: +15 (total: {score})")
-    
-    # ========================================================================
-    # FACTOR 3: Análisis del mensaje
-    # ========================================================================
-    mensaje_lower = mensaje.lower().strip()
-    
-    # 3a. Longitud del mensaje (más específico = mejor)
-    longitud = len(mensaje_lower)
-    if longitud >= 100:
-        score += 10
-        logger.info(f"  ✓ Mensaje largo ({longitud} chars): +10")
-    elif longitud >= 50:
-        score += 5
-        logger.info(f"  ✓ Mensaje medio ({longitud} chars): +5")
-    
-    # 3b. Palabras positivas
-    puntos_positivos = 0
-    palabras_encontradas = []
-    for palabra, puntos in PALABRAS_POSITIVAS.items():
-        if palabra in mensaje_lower:
-            puntos_positivos += puntos
-            palabras_encontradas.append(f"{palabra}(+{puntos})")
-    
-    if puntos_positivos > 0:
-        score += min(puntos_positivos, 20)  # Máximo +20 de palabras positivas
-        logger.info(f"  ✓ Palabras positivas {palabras_encontradas}: +{min(puntos_positivos, 20)}")
-    
-    # 3c. Palabras negativas
-    puntos_negativos = 0
-    for palabra, puntos in PALABRAS_NEGATIVAS.items():
-        if palabra in mensaje_lower:
-            puntos_negativos += puntos
-    
-    score += puntos_negativos  # Resta directamente
-    if puntos_negativos != 0:
-        logger.info(f"  ✗ Palabras negativas: {puntos_negativos}")
-    
-    # 3d. Presencia de números (presupuesto, timeline, etc)
-    numeros = re.findall(r'\d+', mensaje)
-    if numeros:
-        score += 5
-        logger.info(f"  ✓ Números encontrados: +5")
+        score += 15
     
-    # ========================================================================
-    # FACTOR 4: Historial de la conversación
-    # ========================================================================
-    # Si ya hubo conversación previa, es más serio
-    if historial_length > 0:
-        score += min(historial_length * 3, 10)  # Máximo +10
-        logger.info(f"  ✓ Historial de {historial_length} mensajes: +{min(historial_length * 3, 10)}")
-    
-    # ========================================================================
+    # FACTOR 3: Análisis del mensaje (longitud, palabras, números)
     # FACTOR 5: Detalles específicos
-    # ========================================================================
-    detalles_score = _detectar_detalles_especificos(mensaje)
-    score += detalles_score
-    if detalles_score > 0:
-        logger.info(f"  ✓ Detalles específicos: +{detalles_score}")
+    longitud, positivos, negativos, numeros, detalles = _extraer_features(mensaje)
+    score += longitud + min(positivos, 20) + negativos + numeros + detalles
+    
+    # FACTOR 4: Historial de la conversación (máximo +10)
+    if historial_length > 0:
+        score += min(historial_length * 3, 10)
     
-    # ========================================================================
     # Limitar a rango 0-100
-    # ========================================================================
-    score = max(0, min(100, score))
-    
-    # Clasificación final
-    if score >= 80:
-        clasificacion = "🔥 MUY CALIDO"
-    elif score >= 60:
-        clasificacion = "⭐ CALIDO"
-    elif score >= 40:
-        clasificacion = "🌡️ TIBIO"
-    else:
-        clasificacion = "❄️ FRIO"
+    return max(0, min(100, score))
+
+
+# ============================================================================
+# 🔎 FUNCIÓN: EXPLICAR UN SCORE
+# ============================================================================
+
+@dataclass
+class FactorScore:
+    """Un factor que sumó (o restó) puntos."""
+    factor: str
+    puntos: int
+    palabras: List[str] = field(default_factory=list)
+
+
+@dataclass
+class ScoreBreakdown:
+    """Detalle de un score: qué factores aportaron y con qué palabras."""
+    score: int
+    score_sin_recortar: int
+    factores: List[FactorScore]
+    categoria: dict
+    
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def explicar_score(
+    mensaje: str,
+    tiene_contacto: bool = False,
+    tiene_intencion: bool = False,
+    historial_length: int = 0
+) -> ScoreBreakdown:
+    """
+    Mismo cálculo que score_lead, pero devolviendo el detalle de cada factor.
+    Solo para el panel de admin y depuración (no se usa en el chat).
     
-    logger.info(f"🎯 SCORE FINAL: {score}/100 - {clasificacion}")
+    Ejemplo:
+    explicar_score("Necesito automatizar 50 facturas", tiene_contacto=True).to_dict()
+    # {"score": 85, "factores": [{"factor": "base", "puntos": 20, ...}, ...], ...}
+    """
     
-    return score
+    encontradas = BUSCADOR.encontrar(mensaje)
+    longitud, positivos, negativos, numeros, detalles = _extraer_features(mensaje)
+    
+    factores = [FactorScore("base", 20)]
+    if tiene_contacto:
+        factores.append(FactorScore("contacto", 35))
+    if tiene_intencion:
+        factores.append(FactorScore("intencion", 15))
+    if longitud:
+        factores.append(FactorScore("longitud_mensaje", longitud))
+    if positivos > 0:
+        factores.append(FactorScore("palabras_positivas", min(positivos, 20), encontradas.get("positivas", [])))
+    if negativos:
+        factores.append(FactorScore("palabras_negativas", negativos, encontradas.get("negativas", [])))
+    if numeros:
+        factores.append(FactorScore("numeros", numeros))
+    if historial_length > 0:
+        factores.append(FactorScore("historial", min(historial_length * 3, 10)))
+    if detalles:
+        factores.append(FactorScore(
+            "detalles_especificos",
+            detalles,
+            encontradas.get("tecnicos", []) + encontradas.get("timeline", [])
+        ))
+    
+    total = sum(f.puntos for f in factores)
+    score = max(0, min(100, total))
+    
+    return ScoreBreakdown(
+        score=score,
+        score_sin_recortar=total,
+        factores=factores,
+        categoria=get_score_category(score)
+    )
+
+
+# ============================================================================
+# 🧮 FUNCIÓN AUXILIAR: FEATURES DEL MENSAJE
+# ============================================================================
+
+def _extraer_features(mensaje: str) -> tuple:
+    """
+    Puntos que dependen solo del texto (compartido por score_lead y
+    score_leads_batch, así los dos calculan exactamente lo mismo).
+    
+    Retorna (longitud, positivos, negativos, numeros, detalles):
+    - longitud: 0, 5 o 10 según el largo del mensaje
+    - positivos: suma SIN tope de las palabras positivas
+    - negativos: suma de las palabras negativas (<= 0)
+    - numeros: 5 si el mensaje tiene algún número
+    - detalles: puntos de _detectar_detalles_especificos
+    """
+    
+    encontradas = BUSCADOR.encontrar(mensaje)
+    
+    largo = len(mensaje.lower().strip())
+    longitud = 10 if largo >= 100 else 5 if largo >= 50 else 0
+    positivos = sum(PALABRAS_POSITIVAS[p] for p in encontradas.get("positivas", ()))
+    negativos = sum(PALABRAS_NEGATIVAS[p] for p in encontradas.get("negativas", ()))
+    numeros = 5 if NUMERO_RE.search(mensaje) else 0
+    detalles = _detectar_detalles_especificos(mensaje, encontradas)
+    
+    return longitud, positivos, negativos, numeros, detalles
 
 
 # ============================================================================
 # 🔍 FUNCIÓN AUXILIAR: DETECTAR DETALLES ESPECÍFICOS
 # ============================================================================
 
-def _detectar_detalles_especificos(mensaje: str) -> int:
+def _detectar_detalles_especificos(mensaje: str, encontradas: dict = None) -> int:
     """
     Detecta si el mensaje contiene detalles específicos sobre el problema.
     Ejemplos:
     - "50 facturas por día"
     - "Microsoft 365"
     - "API REST"
+    
+    `encontradas` es el resultado de BUSCADOR.encontrar(mensaje) si ya se
+    calculó (score_lead lo reutiliza para no recorrer el mensaje dos veces).
     """
     
     puntos = 0
-    mensaje_lower = mensaje.lower()
+    if encontradas is None:
+        encontradas = BUSCADOR.encontrar(mensaje)
     
-    # Detalles de volumen
-    if re.search(r'\d+\s*(emails?|facturas?|pedidos?|clientes?)', mensaje_lower):
+    # Detalles de volumen (sin números no hay nada que buscar)
+    if NUMERO_RE.search(mensaje) and VOLUMEN_RE.search(mensaje.lower()):
         puntos += 5
     
     # Detalles técnicos
-    if any(palabra in mensaje_lower for palabra in [
-        "api", "python", "zapier", "n8n", "make", "automate",
-        "windows", "linux", "sql", "excel", "google sheets"
-    ]):
+    if "tecnicos" in encontradas:
         puntos += 5
     
     # Detalles de timeline
-    if any(palabra in mensaje_lower for palabra in [
-        "mañana", "esta semana", "este mes", "urgente",
-        "asap", "pronto", "rápido"
-    ]):
+    if "timeline" in encontradas:
         puntos += 3
     
     return puntos
@@ -327,6 +388,84 @@ def get_score_category(score: int) -> dict:
         }
 
 
+# ============================================================================
+# 📦 FUNCIÓN: SCORE EN LOTE (vectorizado)
+# ============================================================================
+
+# Cortes de get_score_category / distribución: <30, 30-49, 50-69, 70-79, 80-89, 90+
+CORTES_CATEGORIA = np.array([30, 50, 70, 80, 90])
+PROBABILIDAD_POR_TRAMO = np.array([
+    get_score_category(piso)["probabilidad_conversion"] for piso in (0, 30, 50, 70, 80, 90)
+])
+NOMBRES_TRAMO = (
+    "spam_0-29", "frios_30-49", "tibios_50-69",
+    "calidos_70-79", "muy_calidos_80-89", "muy_calidos_90+"
+)
+
+
+def _como_array(valores: Optional[Sequence], cantidad: int, tipo) -> np.ndarray:
+    if valores is None:
+        return np.zeros(cantidad, dtype=tipo)
+    return np.fromiter(valores, dtype=tipo, count=cantidad)
+
+
+def score_leads_batch(
+    mensajes: Sequence[str],
+    tiene_contacto: Optional[Sequence[bool]] = None,
+    tiene_intencion: Optional[Sequence[bool]] = None,
+    historial_length: Optional[Sequence[int]] = None
+) -> np.ndarray:
+    """
+    score_lead para muchos leads a la vez. Retorna un array de int64 con
+    exactamente los mismos valores que score_lead, lead por lead.
+    
+    - Las features de texto se calculan una vez por mensaje DISTINTO
+      (en históricos se repiten mucho: "Hola", "¿Qué servicios ofrecen?")
+    - La suma de factores, los topes y el recorte 0-100 son operaciones
+      sobre arrays, sin un loop de Python por lead
+    
+    Ejemplo:
+    scores = score_leads_batch(
+        ["Necesito automatizar facturas", "hola"],
+        tiene_contacto=[True, False]
+    )
+    # array([..., ...])
+    """
+    
+    cantidad = len(mensajes)
+    
+    # Features de texto, una fila por mensaje distinto
+    indice_por_mensaje = {}
+    filas = []
+    posicion = np.empty(cantidad, dtype=np.int64)
+    for i, mensaje in enumerate(mensajes):
+        fila = indice_por_mensaje.get(mensaje)
+        if fila is None:
+            fila = indice_por_mensaje[mensaje] = len(filas)
+            filas.append(_extraer_features(mensaje))
+        posicion[i] = fila
+    
+    features = np.array(filas, dtype=np.int64).reshape(-1, 5)[posicion]
+    longitud, positivos, negativos, numeros, detalles = features.T
+    
+    contacto = _como_array(tiene_contacto, cantidad, bool)
+    intencion = _como_array(tiene_intencion, cantidad, bool)
+    historial = _como_array(historial_length, cantidad, np.int64)
+    
+    scores = (
+        20
+        + 35 * contacto
+        + 15 * intencion
+        + longitud
+        + np.minimum(positivos, 20)
+        + negativos
+        + numeros
+        + np.where(historial > 0, np.minimum(historial * 3, 10), 0)
+        + detalles
+    )
+    return np.clip(scores, 0, 100)
+
+
 # ============================================================================
 # 📊 FUNCIÓN: ANALIZAR LISTA DE LEADS
 # ============================================================================
@@ -354,33 +493,28 @@ def analizar_calidad_leads(leads: List[dict]) -> dict:
             "distribucion": {}
         }
     
-    scores = [
-        score_lead(
-            lead.get("mensaje", ""),
-            lead.get("tiene_contacto", False),
-            lead.get("tiene_intencion", False),
-            lead.get("historial_length", 0)
-        )
-        for lead in leads
-    ]
-    
-    # Distribución
+    scores = score_leads_batch(
+        [lead.get("mensaje", "") for lead in leads],
+        [bool(lead.get("tiene_contacto", False)) for lead in leads],
+        [bool(lead.get("tiene_intencion", False)) for lead in leads],
+        [lead.get("historial_length", 0) for lead in leads]
+    )
+    
+    # Tramo de cada score (0 = spam ... 5 = 90+) y distribución en una pasada
+    tramos = np.searchsorted(CORTES_CATEGORIA, scores, side="right")
+    conteos = np.bincount(tramos, minlength=len(NOMBRES_TRAMO))
+    
     distribucion = {
-        "muy_calidos_90+": len([s for s in scores if s >= 90]),
-        "muy_calidos_80-89": len([s for s in scores if 80 <= s < 90]),
-        "calidos_70-79": len([s for s in scores if 70 <= s < 80]),
-        "tibios_50-69": len([s for s in scores if 50 <= s < 70]),
-        "frios_30-49": len([s for s in scores if 30 <= s < 50]),
-        "spam_0-29": len([s for s in scores if s < 30]),
+        nombre: int(conteos[i]) for i, nombre in reversed(list(enumerate(NOMBRES_TRAMO)))
     }
     
     return {
         "total_leads": len(leads),
-        "score_promedio": round(sum(scores) / len(scores), 1),
-        "score_min": min(scores),
-        "score_max": max(scores),
+        "score_promedio": round(int(scores.sum()) / len(scores), 1),
+        "score_min": int(scores.min()),
+        "score_max": int(scores.max()),
         "distribucion": distribucion,
-        "tasa_conversion_estimada": round(sum([get_score_category(s)["probabilidad_conversion"] for s in scores]) / len(scores), 2)
+        "tasa_conversion_estimada": round(float(PROBABILIDAD_POR_TRAMO[tramos].sum()) / len(scores), 2)
     }
 
 
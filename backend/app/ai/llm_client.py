@@ -0,0 +1,295 @@
+# app/ai/llm_client.py
+"""
+MOTOR LLM ASÍNCRONO - Router de proveedores para el chatbot
+
+¿Para qué?
+- No bloquear el event loop de uvicorn mientras el LLM responde
+- Limitar cuántas completions corren a la vez por worker y proveedor
+- Cortar cada llamada en un deadline fijo (sin esperar el timeout del SDK)
+- Reutilizar conexiones keep-alive en vez de abrir una por mensaje
+- Dejar de llamar a un proveedor mientras está caído (circuit breaker)
+- Cortar la cola de latencia con requests "cubiertos" (hedging)
+
+Proveedores, en orden de preferencia:
+1. Groq (siempre)
+2. Cualquier API compatible con OpenAI (si OPENAI_API_KEY está configurada)
+
+Hedging: si el primario no respondió dentro de su p95 reciente (acotado
+entre LLM_HEDGE_MIN_DELAY y LLM_HEDGE_MAX_DELAY), se dispara el mismo
+pedido al siguiente proveedor, se usa el primero que responde y se
+cancela el otro. Solo ~5% de los pedidos llegan a cubrirse, y
+LLM_HEDGE_MAX_RATIO pone un techo duro al costo extra.
+
+El pool se abre en el startup de la app (init_llm_client) y se cierra
+en el shutdown (close_llm_client).
+"""
+
+import asyncio
+import logging
+import time
+from contextlib import aclosing
+from typing import AsyncIterator, List, Optional
+
+import httpx
+from groq import AsyncGroq
+from openai import AsyncOpenAI
+
+from app.config import settings
+from app.ai.circuit_breaker import CircuitoAbierto
+from app.ai.providers import Proveedor
+
+logger = logging.getLogger(__name__)
+
+# ============================================================================
+# 🔌 ESTADO DEL MOTOR (uno por proceso)
+# ============================================================================
+
+_proveedores: List[Proveedor] = []
+
+_hedging = {
+    "llamadas": 0,
+    "cubiertas": 0,      # Se disparó un segundo proveedor por demora
+    "ganadas": 0,        # ...y el segundo respondió primero
+    "failovers": 0       # El primario falló y respondió otro
+}
+
+
+def _crear_http_client(max_conexiones: int) -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=max_conexiones,
+            max_keepalive_connections=max_conexiones,
+            keepalive_expiry=60.0
+        ),
+        timeout=httpx.Timeout(settings.GROQ_TIMEOUT, connect=3.0)
+    )
+
+
+def _crear_proveedores() -> List[Proveedor]:
+    """Crea los proveedores configurados, cada uno sobre su pool keep-alive."""
+
+    global _proveedores
+
+    http_groq = _crear_http_client(settings.GROQ_POOL_CONNECTIONS)
+    proveedores = [
+        Proveedor(
+            nombre="groq",
+            cliente=AsyncGroq(
+                api_key=settings.GROQ_API_KEY,
+                base_url=settings.GROQ_BASE_URL,
+                http_client=http_groq,
+                timeout=settings.GROQ_TIMEOUT,
+                max_retries=1
+            ),
+            modelo=settings.GROQ_MODEL,
+            max_concurrencia=settings.GROQ_MAX_CONCURRENCY,
+            http_client=http_groq
+        )
+    ]
+
+    if settings.OPENAI_API_KEY:
+        http_openai = _crear_http_client(settings.GROQ_POOL_CONNECTIONS)
+        proveedores.append(
+            Proveedor(
+                nombre="openai",
+                cliente=AsyncOpenAI(
+                    api_key=settings.OPENAI_API_KEY,
+                    base_url=settings.OPENAI_BASE_URL,
+                    http_client=http_openai,
+                    timeout=settings.GROQ_TIMEOUT,
+                    max_retries=1
+                ),
+                modelo=settings.OPENAI_MODEL,
+                max_concurrencia=settings.GROQ_MAX_CONCURRENCY,
+                http_client=http_openai
+            )
+        )
+
+    _proveedores = proveedores
+    return _proveedores
+
+
+# ============================================================================
+# 🔄 CICLO DE VIDA (startup / shutdown)
+# ============================================================================
+
+async def init_llm_client() -> None:
+    """Abre los pools de conexiones hacia los proveedores. Llamar en el startup."""
+
+    if not _proveedores:
+        _crear_proveedores()
+    nombres = ", ".join(p.nombre for p in _proveedores)
+    logger.info(
+        f"🤖 Motor LLM listo (proveedores={nombres}, "
+        f"concurrencia={settings.GROQ_MAX_CONCURRENCY}, deadline={settings.GROQ_TIMEOUT}s)"
+    )
+
+
+async def close_llm_client() -> None:
+    """Cierra los pools de conexiones. Llamar en el shutdown."""
+
+    global _proveedores
+
+    for proveedor in _proveedores:
+        await proveedor.cerrar()
+    _proveedores = []
+
+
+def get_proveedores() -> List[Proveedor]:
+    """
+    Retorna los proveedores en orden de preferencia.
+    Si no se inicializaron (scripts, consola), los crea bajo demanda.
+    """
+
+    if not _proveedores:
+        return _crear_proveedores()
+    return _proveedores
+
+
+def get_llm_client():
+    """Cliente del proveedor primario (Groq)."""
+    return get_proveedores()[0].cliente
+
+
+# ============================================================================
+# 🚀 FUNCIÓN PRINCIPAL: CREAR COMPLETION
+# ============================================================================
+
+def _demora_hedge(proveedor: Proveedor) -> float:
+    """Cuánto esperar al proveedor antes de cubrirlo con el siguiente."""
+
+    p95 = proveedor.latencias.percentil(0.95)
+    if p95 is None:
+        return settings.LLM_HEDGE_MAX_DELAY
+    return min(settings.LLM_HEDGE_MAX_DELAY, max(settings.LLM_HEDGE_MIN_DELAY, p95))
+
+
+def _hedge_permitido() -> bool:
+    """Techo de costo: como mucho LLM_HEDGE_MAX_RATIO de los pedidos se cubren."""
+    return _hedging["cubiertas"] < settings.LLM_HEDGE_MAX_RATIO * _hedging["llamadas"]
+
+
+async def crear_completion(
+    messages: List[dict],
+    timeout: Optional[float] = None
+):
+    """
+    Pide una completion al primer proveedor disponible, con hedging y
+    failover hacia los siguientes.
+
+    - Si el proveedor en curso falla o tiene el circuito abierto, se pasa
+      al siguiente de inmediato
+    - Si tarda más que su p95 reciente, se dispara el siguiente en
+      paralelo y gana el primero que responde (el otro se cancela)
+
+    Lanza asyncio.TimeoutError si se vence el deadline total y
+    CircuitoAbierto si todos los proveedores están caídos.
+    """
+
+    proveedores = get_proveedores()
+    fin = time.monotonic() + (timeout or settings.GROQ_TIMEOUT)
+    _hedging["llamadas"] += 1
+
+    cola = list(proveedores)
+    en_curso = {}  # asyncio.Task -> Proveedor
+    ultimo_error: Exception = CircuitoAbierto("llm")
+    cubierto = False
+
+    def _lanzar(proveedor: Proveedor) -> None:
+        restante = max(0.0, fin - time.monotonic())
+        en_curso[asyncio.ensure_future(proveedor.completar(messages, restante))] = proveedor
+
+    try:
+        while True:
+            if not en_curso:
+                if not cola:
+                    raise ultimo_error
+                if cola[0] is not proveedores[0]:
+                    _hedging["failovers"] += 1
+                _lanzar(cola.pop(0))
+
+            restante = fin - time.monotonic()
+            if restante <= 0:
+                raise asyncio.TimeoutError()
+
+            puede_cubrir = cola and len(en_curso) == 1 and _hedge_permitido()
+            espera = restante
+            if puede_cubrir:
+                espera = min(restante, _demora_hedge(next(iter(en_curso.values()))))
+
+            hechas, _ = await asyncio.wait(en_curso, timeout=espera, return_when=asyncio.FIRST_COMPLETED)
+
+            for tarea in hechas:
+                proveedor = en_curso.pop(tarea)
+                error = tarea.exception()
+                if error is None:
+                    if cubierto and proveedor is not proveedores[0]:
+                        _hedging["ganadas"] += 1
+                    return tarea.result()
+                if not isinstance(error, CircuitoAbierto):
+                    logger.warning(f"⚠️ Proveedor {proveedor.nombre} falló: {error!r}")
+                    ultimo_error = error
+
+            if not hechas and puede_cubrir:
+                cubierto = True
+                _hedging["cubiertas"] += 1
+                _lanzar(cola.pop(0))
+
+    finally:
+        for tarea in en_curso:
+            tarea.cancel()
+
+
+# ============================================================================
+# 📡 FUNCIÓN: COMPLETION EN STREAMING
+# ============================================================================
+
+async def stream_completion(
+    messages: List[dict],
+    timeout: Optional[float] = None
+) -> AsyncIterator[str]:
+    """
+    Pide una completion en modo streaming y va entregando los deltas
+    de texto a medida que llegan.
+
+    Sin hedging (duplicaría todo el stream): se usa el primer proveedor
+    disponible y, si falla antes de entregar texto, el siguiente.
+
+    Lanza asyncio.TimeoutError si se vence algún plazo y CircuitoAbierto
+    si todos los proveedores están caídos.
+    """
+
+    limite = timeout or settings.GROQ_TIMEOUT
+    ultimo_error: Exception = CircuitoAbierto("llm")
+
+    for proveedor in get_proveedores():
+        entrego_texto = False
+        try:
+            async with aclosing(proveedor.stream(messages, limite)) as deltas:
+                async for delta in deltas:
+                    entrego_texto = True
+                    yield delta
+            return
+
+        except CircuitoAbierto:
+            continue
+
+        except Exception as e:
+            if entrego_texto:
+                raise
+            logger.warning(f"⚠️ Proveedor {proveedor.nombre} falló en streaming: {e!r}")
+            ultimo_error = e
+
+    raise ultimo_error
+
+
+# ============================================================================
+# 📊 MÉTRICAS
+# ============================================================================
+
+def llm_stats() -> dict:
+    """Estado de cada proveedor (breaker + latencias) y contadores de hedging."""
+    return {
+        "proveedores": [p.stats() for p in get_proveedores()],
+        "hedging": dict(_hedging)
+    }
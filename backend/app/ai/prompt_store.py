@@ -0,0 +1,272 @@
+# app/ai/prompt_store.py
+"""
+ALMACÉN DE PROMPTS - System prompts y respuestas predefinidas en disco, con recarga en caliente
+
+¿Para qué?
+- Cambiar una respuesta predefinida o el system prompt sin redeploy ni
+  reinicio (por ejemplo, ajustar respuestas en medio de un pico de tráfico)
+- Que cada worker tome el cambio solo, en segundos
+
+Archivo (JSON, PROMPT_STORE_PATH):
+    {
+        "version": 3,
+        "system_prompt": "...",
+        "system_prompt_formulario": "...",
+        "ejemplos_respuestas": {"¿Cuánto cuesta?": "Depende del alcance..."}
+    }
+Las claves que falten toman el valor de app/ai/prompts.py. Sin archivo,
+se usan los valores de prompts.py (versión 0).
+
+Cómo funciona:
+- Cada worker revisa el archivo cada PROMPT_STORE_POLL_SECONDS (mtime y tamaño)
+- Si cambió, lo lee y arma un snapshot nuevo EN UN THREAD: índice de FAQ
+  y hash del system prompt (clave de la cache de completions)
+- El snapshot se reemplaza con una sola asignación: un request ve el
+  snapshot viejo o el nuevo completo, nunca una mezcla
+- Si el archivo está roto se loguea y se sigue con el snapshot anterior
+
+Para editar sin que un worker lea un archivo a medio escribir, usar
+guardar() (escribe a un temporal y hace os.replace):
+    python -m app.ai.prompt_store exportar   # crea el archivo desde prompts.py
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+from typing import Dict, Optional
+
+from app.ai.faq_index import FaqIndex
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+CLAVES = ("system_prompt", "system_prompt_formulario", "ejemplos_respuestas")
+
+
+# ============================================================================
+# 📸 SNAPSHOT (inmutable)
+# ============================================================================
+
+class PromptSnapshot:
+    """Una versión completa de los prompts, con sus estructuras precalculadas."""
+
+    __slots__ = (
+        "version", "system_prompt", "system_prompt_formulario",
+        "ejemplos_respuestas", "indice_faq", "hash_prompt", "cargado_en"
+    )
+
+    def __init__(self, version: int, system_prompt: str, system_prompt_formulario: str,
+                 ejemplos_respuestas: Dict[str, str]):
+        self.version = version
+        self.system_prompt = system_prompt
+        self.system_prompt_formulario = system_prompt_formulario
+        self.ejemplos_respuestas = dict(ejemplos_respuestas)
+        self.indice_faq = FaqIndex(self.ejemplos_respuestas)
+        self.hash_prompt = hashlib.sha256(system_prompt.encode("utf-8")).hexdigest()[:16]
+        self.cargado_en = time.time()
+
+
+def _predeterminados() -> dict:
+    """Valores de app/ai/prompts.py (import diferido: prompts.py usa este módulo)."""
+
+    from app.ai import prompts
+
+    return {
+        "version": 0,
+        "system_prompt": prompts.SYSTEM_PROMPT,
+        "system_prompt_formulario": prompts.SYSTEM_PROMPT_FORMULARIO,
+        "ejemplos_respuestas": prompts.EJEMPLOS_RESPUESTAS
+    }
+
+
+def _validar(datos) -> dict:
+    """Completa con los predeterminados y valida tipos. Lanza ValueError si algo no cierra."""
+
+    if not isinstance(datos, dict):
+        raise ValueError("el archivo debe ser un objeto JSON")
+
+    completos = {**_predeterminados(), **{k: v for k, v in datos.items() if k in CLAVES + ("version",)}}
+
+    if not isinstance(completos["version"], int) or completos["version"] < 0:
+        raise ValueError("'version' debe ser un entero >= 0")
+    for clave in ("system_prompt", "system_prompt_formulario"):
+        if not isinstance(completos[clave], str) or not completos[clave].strip():
+            raise ValueError(f"'{clave}' debe ser texto no vacío")
+    ejemplos = completos["ejemplos_respuestas"]
+    if not isinstance(ejemplos, dict) or not all(
+        isinstance(p, str) and isinstance(r, str) for p, r in ejemplos.items()
+    ):
+        raise ValueError("'ejemplos_respuestas' debe ser un objeto pregunta -> respuesta")
+
+    return completos
+
+
+# ============================================================================
+# 🗄️ ALMACÉN
+# ============================================================================
+
+class PromptStore:
+    """
+    Snapshot vigente + vigilancia del archivo.
+
+    Ejemplo:
+    snapshot = prompt_store.actual()
+    snapshot.indice_faq.buscar("¿Cuánto cuesta?")
+    """
+
+    def __init__(self, ruta: str, intervalo: float):
+        self.ruta = ruta
+        self.intervalo = intervalo
+        self._snapshot: Optional[PromptSnapshot] = None
+        self._firma = None  # (mtime_ns, tamaño) del último archivo leído
+        self._tarea: Optional[asyncio.Task] = None
+        self.recargas = 0
+        self.errores = 0
+        self.ultimo_error: Optional[str] = None
+
+    def actual(self) -> PromptSnapshot:
+        """Snapshot vigente (lo carga la primera vez)."""
+
+        snapshot = self._snapshot
+        if snapshot is None:
+            self.recargar()
+            snapshot = self._snapshot
+        return snapshot
+
+    def _leer_firma(self):
+        try:
+            estado = os.stat(self.ruta)
+        except FileNotFoundError:
+            return None
+        return estado.st_mtime_ns, estado.st_size
+
+    def recargar(self) -> bool:
+        """
+        Relee el archivo si cambió desde la última lectura y reemplaza el
+        snapshot. Retorna True si hubo reemplazo. Bloqueante: desde el event
+        loop llamarlo con asyncio.to_thread.
+        """
+
+        firma = self._leer_firma()
+        if self._snapshot is not None and firma == self._firma:
+            return False
+
+        anterior = self._snapshot
+        try:
+            if firma is None:
+                datos = _predeterminados()
+            else:
+                with open(self.ruta, encoding="utf-8") as archivo:
+                    datos = _validar(json.load(archivo))
+            nuevo = PromptSnapshot(
+                datos["version"],
+                datos["system_prompt"],
+                datos["system_prompt_formulario"],
+                datos["ejemplos_respuestas"]
+            )
+        except (OSError, ValueError) as e:
+            # json.JSONDecodeError es un ValueError
+            self._firma = firma  # No reintentar el mismo archivo roto en cada vuelta
+            self.errores += 1
+            self.ultimo_error = str(e)
+            logger.error(f"❌ Prompts: no se pudo cargar {self.ruta}: {e} (sigue la versión anterior)")
+            if anterior is None:
+                self._snapshot = PromptSnapshot(**_predeterminados())
+            return False
+
+        self._firma = firma
+        self._snapshot = nuevo  # Reemplazo atómico: una sola asignación
+        if anterior is not None:
+            self.recargas += 1
+            logger.info(
+                f"🔄 Prompts recargados: v{anterior.version} → v{nuevo.version} "
+                f"({len(nuevo.ejemplos_respuestas)} respuestas predefinidas)"
+            )
+        return True
+
+    # ------------------------------------------------------------------------
+    # Vigilancia (una tarea por worker)
+    # ------------------------------------------------------------------------
+
+    async def iniciar(self) -> None:
+        """Carga el snapshot y arranca la vigilancia. Llamar en el startup."""
+
+        await asyncio.to_thread(self.recargar)
+        if self._tarea is None and self.intervalo > 0:
+            self._tarea = asyncio.create_task(self._vigilar())
+        logger.info(f"📝 Prompts v{self.actual().version} listos (vigilando {self.ruta} cada {self.intervalo}s)")
+
+    async def detener(self) -> None:
+        """Frena la vigilancia. Llamar en el shutdown."""
+
+        if self._tarea is not None:
+            self._tarea.cancel()
+            try:
+                await self._tarea
+            except asyncio.CancelledError:
+                pass
+            self._tarea = None
+
+    async def _vigilar(self) -> None:
+        while True:
+            await asyncio.sleep(self.intervalo)
+            try:
+                await asyncio.to_thread(self.recargar)
+            except Exception as e:
+                logger.error(f"❌ Prompts: error vigilando {self.ruta}: {e}")
+
+    def stats(self) -> dict:
+        snapshot = self.actual()
+        return {
+            "version": snapshot.version,
+            "hash_prompt": snapshot.hash_prompt,
+            "respuestas_predefinidas": len(snapshot.ejemplos_respuestas),
+            "cargado_hace": round(time.time() - snapshot.cargado_en, 1),
+            "recargas": self.recargas,
+            "errores": self.errores,
+            "ultimo_error": self.ultimo_error
+        }
+
+
+# ============================================================================
+# 💾 ESCRITURA ATÓMICA
+# ============================================================================
+
+def guardar(ruta: str, datos: dict) -> None:
+    """
+    Escribe el archivo de prompts de forma atómica (temporal + os.replace).
+    Valida antes de escribir: un archivo inválido nunca llega al disco.
+    """
+
+    _validar(datos)
+    directorio = os.path.dirname(os.path.abspath(ruta))
+    descriptor, temporal = tempfile.mkstemp(dir=directorio, prefix=".prompts-", suffix=".json")
+    try:
+        with os.fdopen(descriptor, "w", encoding="utf-8") as archivo:
+            json.dump(datos, archivo, ensure_ascii=False, indent=2)
+        os.replace(temporal, ruta)
+    except BaseException:
+        if os.path.exists(temporal):
+            os.unlink(temporal)
+        raise
+
+
+prompt_store = PromptStore(settings.PROMPT_STORE_PATH, settings.PROMPT_STORE_POLL_SECONDS)
+
+
+if __name__ == "__main__":
+    # python -m app.ai.prompt_store exportar  -> crea PROMPT_STORE_PATH desde prompts.py
+    if sys.argv[1:] == ["exportar"]:
+        if os.path.exists(settings.PROMPT_STORE_PATH):
+            sys.exit(f"❌ {settings.PROMPT_STORE_PATH} ya existe")
+        datos = _predeterminados()
+        datos["version"] = 1
+        guardar(settings.PROMPT_STORE_PATH, datos)
+        print(f"✅ Prompts exportados a {settings.PROMPT_STORE_PATH} (v1)")
+    else:
+        sys.exit("Uso: python -m app.ai.prompt_store exportar")
@@ -5,6 +5,11 @@ SYSTEM PROMPTS - Instrucciones para el LLM (Groq)
 Ahora soporta preguntas generales sobre el negocio + formulario
 """
 
+import re
+
+from app.ai.keyword_matcher import KeywordMatcher
+from app.ai.prompt_store import prompt_store
+
 # ============================================================================
 # 🎯 SYSTEM PROMPT PRINCIPAL - MEJORADO
 # ============================================================================
@@ -152,6 +157,41 @@ SI EL USUARIO PREGUNTA ALGO DURANTE EL FORMULARIO:
                       y en la consulta te doy presupuesto exacto."
 """
 
+# ============================================================================
+# 🔑 PALABRAS CLAVE POR TIPO DE PREGUNTA
+# ============================================================================
+
+# 🔴 PALABRAS CLAVE PARA PREGUNTAS GENERALES
+PALABRAS_GENERALES = [
+    "servicio", "cuesta", "precio", "tarifa", "costo",
+    "horario", "atienden", "disponible", "cuándo",
+    "ubicación", "dónde", "dirección",
+    "cómo funciona", "explica", "cuéntame",
+    "más info", "información", "detalles",
+    "referencias", "clientes", "experiencia",
+    "garantía", "términos", "contrato",
+    "soporte post", "mantenimiento",
+    "empresa", "about", "nosotros", "quiénes son"
+]
+
+# 🟢 PALABRAS CLAVE PARA FORMULARIO
+PALABRAS_FORMULARIO = [
+    "nombre", "email", "teléfono", "whatsapp",
+    "servicio que", "problema", "necesito",
+    "automatizar", "seguridad", "soporte",
+    "particular", "comercio", "oficina", "empresa",
+    "describe", "describe tu", "cuál es tu"
+]
+
+# Signos de intención de consulta
+PALABRAS_CONSULTA = ["necesito", "requiero", "tengo problema", "ayuda", "consulta"]
+
+BUSCADOR_TIPO = KeywordMatcher({
+    "general": PALABRAS_GENERALES,
+    "formulario": PALABRAS_FORMULARIO,
+    "consulta": PALABRAS_CONSULTA
+})
+
 # ============================================================================
 # 🔧 FUNCIÓN: DETECTAR TIPO DE PREGUNTA
 # ============================================================================
@@ -166,40 +206,12 @@ def detectar_tipo_pregunta(mensaje: str) -> str:
     - "conversacion": Charla normal
     """
     
-    mensaje_lower = mensaje.lower().strip()
+    encontradas = BUSCADOR_TIPO.encontrar(mensaje)
     
-    # 🔴 PALABRAS CLAVE PARA PREGUNTAS GENERALES
-    palabras_generales = [
-        "servicio", "cuesta", "precio", "tarifa", "costo",
-        "horario", "atienden", "disponible", "cuándo",
-        "ubicación", "dónde", "dirección",
-        "cómo funciona", "explica", "cuéntame",
-        "más info", "información", "detalles",
-        "referencias", "clientes", "experiencia",
-        "garantía", "términos", "contrato",
-        "soporte post", "mantenimiento",
-        "empresa", "about", "nosotros", "quiénes son"
-    ]
+    if "general" in encontradas:
+        return "general"
     
-    for palabra in palabras_generales:
-        if palabra in mensaje_lower:
-            return "general"
-    
-    # 🟢 PALABRAS CLAVE PARA FORMULARIO
-    palabras_formulario = [
-        "nombre", "email", "teléfono", "whatsapp",
-        "servicio que", "problema", "necesito",
-        "automatizar", "seguridad", "soporte",
-        "particular", "comercio", "oficina", "empresa",
-        "describe", "describe tu", "cuál es tu"
-    ]
-    
-    for palabra in palabras_formulario:
-        if palabra in mensaje_lower:
-            return "formulario"
-    
-    # Si tiene signos de intención de consulta
-    if any(x in mensaje_lower for x in ["necesito", "requiero", "tengo problema", "ayuda", "consulta"]):
+    if "formulario" in encontradas or "consulta" in encontradas:
         return "formulario"
     
     return "conversacion"
@@ -224,10 +236,11 @@ def get_system_prompt(tipo_pregunta: str = "general") -> str:
     # Retorna SYSTEM_PROMPT_FORMULARIO (guía el formulario)
     """
     
+    snapshot = prompt_store.actual()
     if tipo_pregunta == "formulario":
-        return SYSTEM_PROMPT_FORMULARIO
+        return snapshot.system_prompt_formulario
     else:
-        return SYSTEM_PROMPT
+        return snapshot.system_prompt
 
 
 # ============================================================================
@@ -262,24 +275,81 @@ EJEMPLOS_RESPUESTAS = {
 
 def get_respuesta_predefinida(mensaje: str) -> str:
     """
-    Si el mensaje coincide exactamente con una pregunta conocida,
+    Si el mensaje se parece lo suficiente a una pregunta conocida,
     retorna la respuesta predefinida (más rápido que Groq).
     
     Ejemplo:
     resp = get_respuesta_predefinida("¿Cuánto cuesta?")
     # Retorna: "Depende del alcance. Típicamente $300-500/mes..."
+    
+    resp = get_respuesta_predefinida("cuesta")
+    # Retorna: None (una palabra suelta no alcanza)
+    """
+    
+    # Índice de trigramas del snapshot vigente (ver app/ai/prompt_store.py)
+    return prompt_store.actual().indice_faq.buscar(mensaje)  # None = usar Groq
+
+
+# ============================================================================
+# 🛟 FUNCIÓN: RESPUESTA DE RESPALDO (Groq no disponible)
+# ============================================================================
+
+# Palabra clave -> pregunta de EJEMPLOS_RESPUESTAS cuya respuesta sirve
+PALABRAS_FALLBACK = {
+    "precio": "¿Cuánto cuesta?",
+    "cuesta": "¿Cuánto cuesta?",
+    "costo": "¿Cuánto cuesta?",
+    "tarifa": "¿Cuánto cuesta?",
+    "presupuesto": "¿Cuánto cuesta?",
+    "horario": "¿En qué horarios atienden?",
+    "atienden": "¿En qué horarios atienden?",
+    "ubicación": "¿Dónde están?",
+    "dónde": "¿Dónde están?",
+    "córdoba": "¿Dónde están?",
+    "servicio": "¿Qué servicios ofrecen?",
+    "ofrecen": "¿Qué servicios ofrecen?",
+    "experiencia": "¿Cuánta experiencia tienen?",
+    "pc": "¿Hacen soporte de PCs?",
+    "computadora": "¿Hacen soporte de PCs?",
+    "probar": "¿Puedo probar antes de contratar?",
+    "prueba": "¿Puedo probar antes de contratar?",
+    "gratis": "¿Puedo probar antes de contratar?",
+    "contrato": "¿Ofrecen contrato?",
+    "garantía": "¿Ofrecen contrato?",
+    "empezar": "¿Cómo empezamos?",
+    "empezamos": "¿Cómo empezamos?",
+    "contratar": "¿Cómo empezamos?",
+    "whatsapp": "¿Puedo contactarte por WhatsApp?",
+    "contacto": "¿Puedo contactarte por WhatsApp?",
+    "teléfono": "¿Puedo contactarte por WhatsApp?",
+}
+
+RESPUESTA_FALLBACK_GENERICA = (
+    "Gracias por tu mensaje. Ahora no puedo responderte en detalle: "
+    "escribime por WhatsApp al +54 9 351 6889414 o completá el formulario "
+    "de asesoría y te contacto en 24hs."
+)
+
+
+def get_respuesta_fallback(mensaje: str) -> str:
+    """
+    Respuesta sin IA para cuando Groq no está disponible (circuito abierto,
+    timeout, error). Busca la primera palabra clave conocida en el mensaje;
+    si no hay ninguna, deriva a WhatsApp / formulario.
+    
+    Siempre retorna texto (nunca None).
     """
     
-    mensaje_clean = mensaje.lower().strip().rstrip("?!")
+    palabras = re.findall(r"\w+", mensaje.lower())
+    ejemplos = prompt_store.actual().ejemplos_respuestas
     
-    for pregunta, respuesta in EJEMPLOS_RESPUESTAS.items():
-        pregunta_clean = pregunta.lower().strip().rstrip("?!")
-        
-        # Búsqueda flexible (no necesita ser exacta)
-        if mensaje_clean in pregunta_clean or pregunta_clean in mensaje_clean:
-            return respuesta
+    for palabra in palabras:
+        # "precios", "servicios" -> "precio", "servicio"
+        pregunta = PALABRAS_FALLBACK.get(palabra) or PALABRAS_FALLBACK.get(palabra.rstrip("s"))
+        if pregunta and pregunta in ejemplos:
+            return ejemplos[pregunta]
     
-    return None  # No hay respuesta predefinida, usar Groq
+    return RESPUESTA_FALLBACK_GENERICA
 
 
 # ============================================================================
@@ -307,6 +377,10 @@ FLUJO:
 OPTIMIZACIONES:
 - get_respuesta_predefinida() acelera respuestas comunes
 - detectar_tipo_pregunta() elige el prompt correcto
+- get_respuesta_fallback() responde por palabras clave si Groq está caído
+- Los textos de este archivo son los valores por defecto: si existe
+  PROMPT_STORE_PATH manda ese archivo, y se recarga sin reiniciar
+  (ver app/ai/prompt_store.py)
 - Respuestas siempre ≤ 3 líneas para no abrumar
 
 MEJORAS FUTURAS:
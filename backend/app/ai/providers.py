@@ -0,0 +1,256 @@
+# app/ai/providers.py
+"""
+PROVEEDORES LLM - Un backend de completions (Groq, OpenAI-compatible)
+
+¿Para qué?
+- Que el router (app/ai/llm_client.py) trate a todos los proveedores igual
+- Que cada proveedor tenga su propio semáforo, circuit breaker y latencias
+
+Groq y cualquier API compatible con OpenAI exponen la misma interfaz
+(`client.chat.completions.create`), así que un Proveedor solo guarda el
+cliente, el modelo y su estado.
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import AsyncIterator, List, Optional
+
+from app.ai.circuit_breaker import CircuitBreaker, CircuitoAbierto
+from app.config import settings
+
+# ============================================================================
+# 📊 HISTOGRAMA DE LATENCIAS
+# ============================================================================
+
+# Límites superiores de cada bucket (segundos)
+BUCKETS_LATENCIA = (0.1, 0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 16.0)
+
+# Muestras mínimas antes de confiar en el p95 reciente
+MIN_MUESTRAS_P95 = 20
+
+
+class LatencyHistogram:
+    """
+    Latencias de las completions de un proveedor: las exitosas y, como cota
+    inferior, las canceladas en vuelo (el perdedor de un hedge). Sin estas
+    últimas los pedidos lentos salen de la muestra y el p95 que decide
+    cuándo cubrir da de menos.
+
+    - Buckets acumulados desde el arranque (para monitoreo)
+    - Ventana de las últimas `ventana` muestras (para percentiles recientes,
+      que es lo que usa el router para decidir cuándo cubrir)
+    """
+
+    def __init__(self, ventana: int = 200):
+        self._buckets = [0] * (len(BUCKETS_LATENCIA) + 1)
+        self._recientes = deque(maxlen=ventana)
+        self.total = 0
+
+    def registrar(self, latencia: float) -> None:
+        indice = len(BUCKETS_LATENCIA)
+        for i, limite in enumerate(BUCKETS_LATENCIA):
+            if latencia <= limite:
+                indice = i
+                break
+        self._buckets[indice] += 1
+        self._recientes.append(latencia)
+        self.total += 1
+
+    def percentil(self, p: float) -> Optional[float]:
+        """Percentil de la ventana reciente (None si no hay muestras suficientes)."""
+        if len(self._recientes) < MIN_MUESTRAS_P95:
+            return None
+        ordenadas = sorted(self._recientes)
+        return ordenadas[min(len(ordenadas) - 1, int(p * len(ordenadas)))]
+
+    def stats(self) -> dict:
+        etiquetas = [f"<={limite}s" for limite in BUCKETS_LATENCIA] + [f">{BUCKETS_LATENCIA[-1]}s"]
+        redondear = lambda valor: round(valor, 3) if valor is not None else None
+        return {
+            "total": self.total,
+            "buckets": dict(zip(etiquetas, self._buckets)),
+            "p50": redondear(self.percentil(0.50)),
+            "p95": redondear(self.percentil(0.95)),
+            "p99": redondear(self.percentil(0.99))
+        }
+
+
+def _es_falla_del_proveedor(error: Exception) -> bool:
+    """
+    Errores que indican que el proveedor está degradado (timeouts, red, 5xx, 429).
+    Un 4xx por un request inválido no dice nada de la salud del proveedor.
+    """
+    status_code = getattr(error, "status_code", None)
+    if isinstance(status_code, int):
+        return status_code >= 500 or status_code == 429
+    return True
+
+
+# ============================================================================
+# 🔌 PROVEEDOR
+# ============================================================================
+
+class Proveedor:
+    """
+    Un backend LLM con su cliente, modelo, límite de concurrencia,
+    circuit breaker e histograma de latencias.
+    """
+
+    def __init__(self, nombre: str, cliente, modelo: str, max_concurrencia: int, http_client=None):
+        self.nombre = nombre
+        self.cliente = cliente
+        self.modelo = modelo
+        self.http_client = http_client
+        self.semaforo = asyncio.Semaphore(max_concurrencia)
+        self.breaker = CircuitBreaker(
+            nombre=nombre,
+            ventana=settings.GROQ_BREAKER_WINDOW,
+            min_llamadas=settings.GROQ_BREAKER_MIN_CALLS,
+            tasa_error=settings.GROQ_BREAKER_ERROR_RATE,
+            umbral_lento=settings.GROQ_BREAKER_SLOW_SECONDS,
+            cooldown=settings.GROQ_BREAKER_COOLDOWN
+        )
+        self.latencias = LatencyHistogram()
+
+    async def cerrar(self) -> None:
+        if self.http_client is not None:
+            await self.http_client.aclose()
+
+    # ------------------------------------------------------------------------
+    # Completion normal
+    # ------------------------------------------------------------------------
+
+    async def completar(self, messages: List[dict], timeout: float):
+        """
+        Pide una completion respetando el semáforo, el breaker y el deadline.
+
+        El deadline cuenta desde que se pide el turno en el semáforo, así
+        que una cola larga también corta a tiempo.
+
+        Lanza asyncio.TimeoutError si se vence el deadline y CircuitoAbierto
+        si el proveedor está marcado como caído (sin esperar nada).
+        """
+
+        if not self.breaker.permitir():
+            raise CircuitoAbierto(self.nombre)
+
+        en_vuelo = False  # True una vez obtenido el turno: la cola local no es culpa del proveedor
+        inicio = 0.0
+
+        async def _llamar():
+            nonlocal en_vuelo, inicio
+            async with self.semaforo:
+                en_vuelo = True
+                inicio = time.monotonic()
+                completion = await self.cliente.chat.completions.create(
+                    model=self.modelo,
+                    messages=messages,
+                    temperature=settings.GROQ_TEMPERATURE,
+                    max_tokens=settings.GROQ_MAX_TOKENS
+                )
+                latencia = time.monotonic() - inicio
+                self.latencias.registrar(latencia)
+                self.breaker.registrar_exito(latencia)
+                return completion
+
+        try:
+            return await asyncio.wait_for(_llamar(), timeout)
+
+        except asyncio.CancelledError:
+            # Cancelado por el router (perdió la carrera) o por el cliente.
+            # Lo que llevaba en vuelo es una cota inferior de su latencia:
+            # sin registrarla, los pedidos lentos no entran al p95
+            if en_vuelo:
+                self.latencias.registrar(time.monotonic() - inicio)
+            self.breaker.liberar()
+            raise
+
+        except Exception as e:
+            if en_vuelo and _es_falla_del_proveedor(e):
+                self.breaker.registrar_fallo()
+            else:
+                self.breaker.liberar()
+            raise
+
+    # ------------------------------------------------------------------------
+    # Completion en streaming
+    # ------------------------------------------------------------------------
+
+    async def stream(self, messages: List[dict], timeout: float) -> AsyncIterator[str]:
+        """
+        Entrega los deltas de texto a medida que llegan.
+
+        El turno del semáforo se mantiene mientras dure el stream. El
+        deadline aplica a la espera del turno, a la respuesta inicial y
+        al hueco entre deltas (no al total, que depende del largo). Para
+        el breaker y el histograma, la latencia es la del primer delta.
+        """
+
+        if not self.breaker.permitir():
+            raise CircuitoAbierto(self.nombre)
+
+        informado = False
+
+        try:
+            await asyncio.wait_for(self.semaforo.acquire(), timeout)
+        except BaseException:
+            self.breaker.liberar()
+            raise
+
+        try:
+            inicio = time.monotonic()
+            primer_delta = None
+
+            stream = await asyncio.wait_for(
+                self.cliente.chat.completions.create(
+                    model=self.modelo,
+                    messages=messages,
+                    temperature=settings.GROQ_TEMPERATURE,
+                    max_tokens=settings.GROQ_MAX_TOKENS,
+                    stream=True
+                ),
+                timeout
+            )
+
+            try:
+                chunks = stream.__aiter__()
+                while True:
+                    try:
+                        chunk = await asyncio.wait_for(chunks.__anext__(), timeout)
+                    except StopAsyncIteration:
+                        break
+
+                    if not chunk.choices:
+                        continue
+                    delta = chunk.choices[0].delta.content
+                    if delta:
+                        if primer_delta is None:
+                            primer_delta = time.monotonic() - inicio
+                        yield delta
+            finally:
+                await stream.response.aclose()
+
+            latencia = primer_delta if primer_delta is not None else time.monotonic() - inicio
+            self.latencias.registrar(latencia)
+            self.breaker.registrar_exito(latencia)
+            informado = True
+
+        except Exception as e:
+            if _es_falla_del_proveedor(e):
+                self.breaker.registrar_fallo()
+                informado = True
+            raise
+
+        finally:
+            if not informado:
+                self.breaker.liberar()
+            self.semaforo.release()
+
+    def stats(self) -> dict:
+        return {
+            "nombre": self.nombre,
+            "modelo": self.modelo,
+            "circuit_breaker": self.breaker.stats(),
+            "latencias": self.latencias.stats()
+        }
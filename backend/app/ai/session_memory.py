@@ -0,0 +1,195 @@
+# app/ai/session_memory.py
+"""
+MEMORIA DE SESIONES - Últimos turnos de cada chat en memoria del proceso
+
+¿Para qué?
+- Armar el contexto del LLM sin consultar ChatHistory en cada turno
+- Tener a mano los datos de contacto ya detectados en la sesión
+- Expulsar sesiones inactivas después de SESSION_TIMEOUT
+- Si la sesión no está en memoria (reinicio, otro worker), se recarga de BD
+
+Cada sesión guarda un ring buffer de CHAT_HISTORY_LIMIT turnos.
+Nota: con varios workers cada uno tiene su propia memoria; la BD sigue
+siendo la fuente de verdad. Cada entrada guarda la versión de la sesión
+(ChatSession.turnos_total) con la que se armó: si al registrar un turno
+en BD ya es otra, otro worker registró turnos y la entrada se descarta.
+"""
+
+import time
+from collections import OrderedDict, deque
+from typing import List, NamedTuple, Optional
+
+from app.config import settings
+
+
+class Turno(NamedTuple):
+    """Un intercambio usuario → bot."""
+    mensaje_usuario: str
+    respuesta_bot: str
+
+
+class _EntradaSesion:
+    __slots__ = ("turnos", "resumen", "contacto", "version", "ultimo_acceso")
+
+    def __init__(self, max_turnos: int):
+        self.turnos = deque(maxlen=max_turnos)
+        self.resumen = None
+        self.contacto = {}
+        self.version = 0
+        self.ultimo_acceso = time.monotonic()
+
+
+class SessionMemory:
+    """
+    Ring buffers por sesión, ordenados por último acceso.
+
+    Las sesiones inactivas quedan al principio del OrderedDict, así que
+    purgarlas solo recorre las que efectivamente vencieron.
+    """
+
+    def __init__(self, max_turnos: int, timeout: int, max_sesiones: int):
+        self.max_turnos = max_turnos
+        self.timeout = timeout
+        self.max_sesiones = max_sesiones
+        self._sesiones = OrderedDict()  # session_id -> _EntradaSesion
+        self.hits = 0
+        self.misses = 0
+        self.expulsiones = 0
+
+    def __contains__(self, session_id: str) -> bool:
+        return session_id in self._sesiones
+
+    def get(self, session_id: str) -> Optional[List[Turno]]:
+        """
+        Retorna los turnos recientes de la sesión (más viejo primero),
+        o None si la sesión no está en memoria.
+        """
+
+        self.purgar_inactivas()
+
+        entrada = self._sesiones.get(session_id)
+        if entrada is None:
+            self.misses += 1
+            return None
+
+        entrada.ultimo_acceso = time.monotonic()
+        self._sesiones.move_to_end(session_id)
+        self.hits += 1
+        return list(entrada.turnos)
+
+    def get_resumen(self, session_id: str) -> Optional[str]:
+        """Resumen de turnos viejos de la sesión (ver app/ai/summarizer.py)."""
+
+        entrada = self._sesiones.get(session_id)
+        return entrada.resumen if entrada is not None else None
+
+    def set_resumen(self, session_id: str, resumen: Optional[str]) -> None:
+        entrada = self._sesiones.get(session_id)
+        if entrada is not None:
+            entrada.resumen = resumen
+
+    def get_contacto(self, session_id: str) -> Optional[dict]:
+        """Campos de contacto ya detectados en la sesión (solo los completos)."""
+
+        entrada = self._sesiones.get(session_id)
+        return dict(entrada.contacto) if entrada is not None else None
+
+    def set_contacto(self, session_id: str, contacto: dict) -> None:
+        entrada = self._sesiones.get(session_id)
+        if entrada is not None:
+            entrada.contacto = dict(contacto)
+
+    def get_version(self, session_id: str) -> Optional[int]:
+        """Turnos registrados de la sesión cuando se actualizó esta copia (ChatSession.turnos_total)."""
+
+        entrada = self._sesiones.get(session_id)
+        return entrada.version if entrada is not None else None
+
+    def set_version(self, session_id: str, version: int) -> None:
+        entrada = self._sesiones.get(session_id)
+        if entrada is not None:
+            entrada.version = version
+
+    def descartar(self, session_id: str) -> None:
+        """Saca la sesión de memoria (el próximo turno la recarga de BD)."""
+
+        self._sesiones.pop(session_id, None)
+
+    def cargar(
+        self,
+        session_id: str,
+        turnos: List[Turno],
+        resumen: Optional[str] = None,
+        contacto: Optional[dict] = None,
+        version: int = 0
+    ) -> None:
+        """Registra una sesión (nueva o recargada de BD) en memoria."""
+
+        entrada = _EntradaSesion(self.max_turnos)
+        entrada.turnos.extend(turnos)
+        entrada.resumen = resumen
+        entrada.contacto = dict(contacto or {})
+        entrada.version = version
+        self._sesiones[session_id] = entrada
+        self._sesiones.move_to_end(session_id)
+
+        while len(self._sesiones) > self.max_sesiones:
+            self._sesiones.popitem(last=False)
+            self.expulsiones += 1
+
+    def agregar_turno(self, session_id: str, turno: Turno) -> Optional[Turno]:
+        """
+        Agrega un turno al buffer de la sesión.
+
+        Retorna el turno que salió del buffer por estar lleno (o None).
+        Si la sesión no está en memoria no hace nada (usar cargar).
+        """
+
+        entrada = self._sesiones.get(session_id)
+        if entrada is None:
+            return None
+
+        saliente = None
+        if len(entrada.turnos) == entrada.turnos.maxlen:
+            saliente = entrada.turnos[0]
+
+        entrada.turnos.append(turno)
+        entrada.ultimo_acceso = time.monotonic()
+        self._sesiones.move_to_end(session_id)
+        return saliente
+
+    def purgar_inactivas(self) -> int:
+        """Expulsa las sesiones sin actividad en los últimos `timeout` segundos."""
+
+        limite = time.monotonic() - self.timeout
+        expulsadas = 0
+
+        while self._sesiones:
+            session_id, entrada = next(iter(self._sesiones.items()))
+            if entrada.ultimo_acceso >= limite:
+                break
+            del self._sesiones[session_id]
+            expulsadas += 1
+
+        self.expulsiones += expulsadas
+        return expulsadas
+
+    def stats(self) -> dict:
+        consultas = self.hits + self.misses
+        return {
+            "sesiones": len(self._sesiones),
+            "max_sesiones": self.max_sesiones,
+            "max_turnos": self.max_turnos,
+            "timeout": self.timeout,
+            "hits": self.hits,
+            "misses": self.misses,
+            "expulsiones": self.expulsiones,
+            "hit_rate": round(self.hits / consultas, 3) if consultas else 0.0
+        }
+
+
+session_memory = SessionMemory(
+    max_turnos=settings.CHAT_HISTORY_LIMIT,
+    timeout=settings.SESSION_TIMEOUT,
+    max_sesiones=settings.CHAT_MEMORY_MAX_SESSIONS
+)
@@ -0,0 +1,98 @@
+# app/ai/summarizer.py
+"""
+RESUMEN DE CONVERSACIÓN - Compacta los turnos viejos de una sesión
+
+¿Para qué?
+- Que el prompt tenga tamaño constante aunque el chat sea largo
+- No perder los datos de contacto que el usuario dio al principio
+
+Cuando un turno sale de la ventana de historial (CHAT_HISTORY_LIMIT) se
+"pliega" en un resumen extractivo guardado en ChatSession.resumen:
+- datos: email, teléfono y nombre detectados (nunca se descartan)
+- temas: primera frase de cada mensaje del usuario (los más viejos se
+  descartan al superar CHAT_SUMMARY_MAX_CHARS)
+
+No llama a ningún LLM: cuesta O(largo del turno).
+"""
+
+import json
+import re
+from typing import Optional
+
+from app.config import settings
+from app.ai.contact_extractor import extractor
+
+CAMPOS_DATOS = ("email", "telefono", "nombre")
+
+FRASE_RE = re.compile(r'[.!?](?=\s|$)|\n')
+
+# Mensajes demasiado cortos ("hola", "ok", "gracias") no aportan tema
+MIN_CHARS_TEMA = 12
+MAX_CHARS_TEMA = 140
+
+
+def _cargar(resumen: Optional[str]) -> dict:
+    if not resumen:
+        return {"datos": {}, "temas": []}
+    try:
+        return json.loads(resumen)
+    except ValueError:
+        return {"datos": {}, "temas": []}
+
+
+def compactar(resumen: Optional[str], mensaje_usuario: str, respuesta_bot: str = "") -> str:
+    """
+    Pliega un turno en el resumen de la sesión.
+
+    Parámetros:
+    - resumen: Resumen actual (JSON guardado en ChatSession.resumen) o None
+    - mensaje_usuario / respuesta_bot: El turno que sale de la ventana
+
+    Retorna el nuevo resumen serializado.
+    """
+
+    data = _cargar(resumen)
+    datos = data.setdefault("datos", {})
+    temas = data.setdefault("temas", [])
+
+    # 1️⃣ Datos de contacto (el primero que se detectó se conserva)
+    faltantes = [campo for campo in CAMPOS_DATOS if campo not in datos]
+    if faltantes:
+        datos.update(extractor.extraer(mensaje_usuario, faltantes))
+
+    # 2️⃣ Tema: primera frase del mensaje del usuario
+    # (recortada antes de comparar: los temas guardados ya están recortados)
+    frase = FRASE_RE.split(mensaje_usuario.strip(), maxsplit=1)[0].strip()
+    tema = " ".join(frase.split())[:MAX_CHARS_TEMA]
+    if len(frase) >= MIN_CHARS_TEMA and tema.lower() not in {t.lower() for t in temas}:
+        temas.append(tema)
+
+    # 3️⃣ Tamaño acotado: se descartan los temas más viejos
+    while temas and len(_a_texto_data(data)) > settings.CHAT_SUMMARY_MAX_CHARS:
+        temas.pop(0)
+
+    return json.dumps(data, ensure_ascii=False)
+
+
+def a_texto(resumen: Optional[str]) -> Optional[str]:
+    """Convierte el resumen guardado en texto para el contexto del LLM."""
+
+    if not resumen:
+        return None
+    return _a_texto_data(_cargar(resumen)) or None
+
+
+def _a_texto_data(data: dict) -> str:
+    lineas = []
+
+    datos = data.get("datos") or {}
+    if datos:
+        partes = [f"{campo}: {valor}" for campo, valor in datos.items()]
+        lineas.append("Datos del cliente: " + " | ".join(partes))
+
+    temas = data.get("temas") or []
+    if temas:
+        lineas.append("Temas ya conversados:")
+        lineas.extend(f"- {tema}" for tema in temas)
+
+    return "\n".join(lineas)
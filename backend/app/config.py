@@ -39,6 +39,48 @@ class Settings:
     GROQ_TEMPERATURE: float = 0.6
     GROQ_MAX_TOKENS: int = 250
     
+    # URL base de la API (apuntar a perf/stub_llm.py para pruebas de carga)
+    GROQ_BASE_URL: str = os.getenv("GROQ_BASE_URL", "https://api.groq.com")
+    
+    # Motor asíncrono: deadline por llamada, concurrencia y pool keep-alive
+    GROQ_TIMEOUT: float = float(os.getenv("GROQ_TIMEOUT", 8.0))
+    GROQ_MAX_CONCURRENCY: int = int(os.getenv("GROQ_MAX_CONCURRENCY", 32))
+    GROQ_POOL_CONNECTIONS: int = int(os.getenv("GROQ_POOL_CONNECTIONS", 20))
+    
+    # Circuit breaker (uno por proveedor): ventana móvil de llamadas, tasa de
+    # fallos que lo abre, latencia que cuenta como fallo y segundos antes de probar
+    GROQ_BREAKER_WINDOW: int = int(os.getenv("GROQ_BREAKER_WINDOW", 20))
+    GROQ_BREAKER_MIN_CALLS: int = int(os.getenv("GROQ_BREAKER_MIN_CALLS", 5))
+    GROQ_BREAKER_ERROR_RATE: float = float(os.getenv("GROQ_BREAKER_ERROR_RATE", 0.5))
+    GROQ_BREAKER_SLOW_SECONDS: float = float(os.getenv("GROQ_BREAKER_SLOW_SECONDS", 4.0))
+    GROQ_BREAKER_COOLDOWN: float = float(os.getenv("GROQ_BREAKER_COOLDOWN", 30.0))
+    
+    # Proveedor de respaldo compatible con OpenAI (opcional: sin API key no se usa)
+    OPENAI_API_KEY: str = os.getenv("OPENAI_API_KEY", "")
+    OPENAI_BASE_URL: str = os.getenv("OPENAI_BASE_URL", "https://api.openai.com/v1")
+    OPENAI_MODEL: str = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+    
+    # Hedging: demora antes de cubrir al primario (p95 acotado) y techo de
+    # proporción de pedidos cubiertos
+    LLM_HEDGE_MIN_DELAY: float = float(os.getenv("LLM_HEDGE_MIN_DELAY", 0.3))
+    LLM_HEDGE_MAX_DELAY: float = float(os.getenv("LLM_HEDGE_MAX_DELAY", 2.5))
+    LLM_HEDGE_MAX_RATIO: float = float(os.getenv("LLM_HEDGE_MAX_RATIO", 0.1))
+    
+    # Cache de completions (solo preguntas sin historial)
+    CHAT_CACHE_TTL: int = int(os.getenv("CHAT_CACHE_TTL", 3600))
+    CHAT_CACHE_MAX_ENTRIES: int = int(os.getenv("CHAT_CACHE_MAX_ENTRIES", 1000))
+    CHAT_CACHE_MAX_BYTES: int = int(os.getenv("CHAT_CACHE_MAX_BYTES", 2_000_000))
+    
+    # Prompts y respuestas predefinidas en disco (se recargan sin reiniciar)
+    PROMPT_STORE_PATH: str = os.getenv("PROMPT_STORE_PATH", "./prompts.json")
+    PROMPT_STORE_POLL_SECONDS: float = float(os.getenv("PROMPT_STORE_POLL_SECONDS", 5.0))
+    
+    # Respuestas predefinidas: similitud mínima (Dice de trigramas, 0-1)
+    FAQ_SIMILARITY_THRESHOLD: float = float(os.getenv("FAQ_SIMILARITY_THRESHOLD", 0.6))
+    
+    # Presupuesto de tokens de entrada (system prompt + historial + mensaje)
+    CHAT_INPUT_TOKEN_BUDGET: int = int(os.getenv("CHAT_INPUT_TOKEN_BUDGET", 2500))
+    
     # Validación crítica
     if not GROQ_API_KEY:
         raise ValueError("❌ GROQ_API_KEY no está configurada en .env - REQUERIDA")
@@ -61,6 +103,10 @@ class Settings:
     # ========================================================================
     SENDGRID_API_KEY: str = os.getenv("SENDGRID_API_KEY", "")
     SENDGRID_FROM_EMAIL: str = os.getenv("SENDGRID_FROM_EMAIL", "")
+    SENDGRID_TIMEOUT: float = float(os.getenv("SENDGRID_TIMEOUT", 10.0))
+    # Envío masivo: destinatarios por request (máximo de SendGrid: 1000)
+    SENDGRID_BULK_MAX_RECIPIENTS: int = int(os.getenv("SENDGRID_BULK_MAX_RECIPIENTS", 500))
+    SENDGRID_BULK_MAX_WAIT: float = float(os.getenv("SENDGRID_BULK_MAX_WAIT", 0.5))
     
     # Email alternativo: Gmail SMTP
     MAIL_USERNAME: str = os.getenv("MAIL_USERNAME", "")
@@ -84,6 +130,13 @@ class Settings:
     # ========================================================================
     TELEGRAM_TOKEN: str = os.getenv("TELEGRAM_TOKEN", "")
     TELEGRAM_CHAT_ID: str = os.getenv("TELEGRAM_CHAT_ID", "")
+    TELEGRAM_TIMEOUT: float = float(os.getenv("TELEGRAM_TIMEOUT", 5.0))
+    # Ritmo del despachador (límite del Bot API: ~20 mensajes/minuto por grupo)
+    TELEGRAM_MESSAGES_PER_MINUTE: int = int(os.getenv("TELEGRAM_MESSAGES_PER_MINUTE", 20))
+    TELEGRAM_BURST: int = int(os.getenv("TELEGRAM_BURST", 3))
+    TELEGRAM_DIGEST_SCORE: int = int(os.getenv("TELEGRAM_DIGEST_SCORE", 60))
+    TELEGRAM_DIGEST_MAX: int = int(os.getenv("TELEGRAM_DIGEST_MAX", 20))
+    TELEGRAM_MAX_RETRIES: int = int(os.getenv("TELEGRAM_MAX_RETRIES", 3))
     
     if not TELEGRAM_TOKEN or not TELEGRAM_CHAT_ID:
         raise ValueError("❌ TELEGRAM_TOKEN y TELEGRAM_CHAT_ID son REQUERIDAS")
@@ -95,6 +148,16 @@ class Settings:
     AIRTABLE_BASE_ID: str = os.getenv("AIRTABLE_BASE_ID", "")
     AIRTABLE_TABLE_LEADS: str = "Leads"
     AIRTABLE_TABLE_SESSIONS: str = "Sessions"
+    AIRTABLE_TIMEOUT: float = float(os.getenv("AIRTABLE_TIMEOUT", 10.0))
+    AIRTABLE_RATE_LIMIT_PER_SECOND: float = float(os.getenv("AIRTABLE_RATE_LIMIT_PER_SECOND", 5.0))
+    AIRTABLE_BATCH_SIZE: int = int(os.getenv("AIRTABLE_BATCH_SIZE", 10))
+    AIRTABLE_BATCH_MAX_WAIT: float = float(os.getenv("AIRTABLE_BATCH_MAX_WAIT", 0.25))
+    AIRTABLE_READ_MAX_RETRIES: int = int(os.getenv("AIRTABLE_READ_MAX_RETRIES", 3))
+    # Sincronización incremental leads <-> Airtable (0 = desactivada)
+    AIRTABLE_SYNC_INTERVAL_SECONDS: float = float(os.getenv("AIRTABLE_SYNC_INTERVAL_SECONDS", 60.0))
+    AIRTABLE_SYNC_BATCH: int = int(os.getenv("AIRTABLE_SYNC_BATCH", 100))
+    AIRTABLE_SYNC_LAG_SECONDS: float = float(os.getenv("AIRTABLE_SYNC_LAG_SECONDS", 5.0))
+    AIRTABLE_SYNC_LEASE_SECONDS: float = float(os.getenv("AIRTABLE_SYNC_LEASE_SECONDS", 300.0))
     
     # ========================================================================
     # 🗓️ GOOGLE CALENDAR
@@ -112,7 +175,26 @@ class Settings:
         "N8N_WEBHOOK_URL",
         "http://localhost:5678/webhook/lead-manager"
     )
-    N8N_TIMEOUT: float = 2.0
+    N8N_TIMEOUT: float = float(os.getenv("N8N_TIMEOUT", 2.0))
+    
+    # ========================================================================
+    # 🔌 CLIENTES HTTP DE INTEGRACIONES (un pool keep-alive por servicio)
+    # ========================================================================
+    HTTP_CLIENT_MAX_CONNECTIONS: int = int(os.getenv("HTTP_CLIENT_MAX_CONNECTIONS", 10))
+    HTTP_CLIENT_KEEPALIVE_SECONDS: float = float(os.getenv("HTTP_CLIENT_KEEPALIVE_SECONDS", 60.0))
+    HTTP_CLIENT_CONNECT_TIMEOUT: float = float(os.getenv("HTTP_CLIENT_CONNECT_TIMEOUT", 3.0))
+    HTTP_CLIENT_HTTP2: bool = os.getenv("HTTP_CLIENT_HTTP2", "False").lower() == "true"
+    
+    # ========================================================================
+    # 📤 OUTBOX (emails, Telegram, Airtable y n8n después del formulario)
+    # ========================================================================
+    OUTBOX_WORKERS: int = int(os.getenv("OUTBOX_WORKERS", 10))
+    OUTBOX_POLL_SECONDS: float = float(os.getenv("OUTBOX_POLL_SECONDS", 2.0))
+    OUTBOX_BATCH_SIZE: int = int(os.getenv("OUTBOX_BATCH_SIZE", 20))
+    OUTBOX_LEASE_SECONDS: float = float(os.getenv("OUTBOX_LEASE_SECONDS", 60.0))
+    OUTBOX_MAX_ATTEMPTS: int = int(os.getenv("OUTBOX_MAX_ATTEMPTS", 6))
+    OUTBOX_BACKOFF_BASE_SECONDS: float = float(os.getenv("OUTBOX_BACKOFF_BASE_SECONDS", 5.0))
+    OUTBOX_BACKOFF_MAX_SECONDS: float = float(os.getenv("OUTBOX_BACKOFF_MAX_SECONDS", 600.0))
     
     # ========================================================================
     # 🔐 SEGURIDAD - CRÍTICO PARA PRODUCCIÓN
@@ -151,6 +233,8 @@ class Settings:
     # ========================================================================
     CHAT_HISTORY_LIMIT: int = 6
     SESSION_TIMEOUT: int = 3600
+    CHAT_MEMORY_MAX_SESSIONS: int = int(os.getenv("CHAT_MEMORY_MAX_SESSIONS", 5000))
+    CHAT_SUMMARY_MAX_CHARS: int = int(os.getenv("CHAT_SUMMARY_MAX_CHARS", 800))
     FOLLOW_UP_DELAY_HOURS: int = 24
     
     # ========================================================================
@@ -148,6 +148,40 @@ def init_db():
         }
 
 
+# ============================================================================
+# 🗂️ COLUMNAS E ÍNDICES EN TABLAS EXISTENTES
+# ============================================================================
+
+def sincronizar_esquema(metadata) -> None:
+    """
+    Agrega a las tablas existentes las columnas e índices declarados en
+    los modelos que todavía no existan.
+    
+    create_all() solo crea tablas nuevas; las BDs creadas antes de
+    agregar una columna (nullable) o un índice los reciben acá.
+    """
+    
+    inspector = inspect(engine)
+    
+    with engine.begin() as connection:
+        for tabla in metadata.sorted_tables:
+            if not inspector.has_table(tabla.name):
+                continue
+            
+            existentes = {col["name"] for col in inspector.get_columns(tabla.name)}
+            for columna in tabla.columns:
+                if columna.name in existentes:
+                    continue
+                
+                tipo = columna.type.compile(dialect=engine.dialect)
+                connection.execute(text(f"ALTER TABLE {tabla.name} ADD COLUMN {columna.name} {tipo}"))
+                logger.info(f"🗂️ Columna agregada: {tabla.name}.{columna.name}")
+    
+    for tabla in metadata.sorted_tables:
+        for indice in tabla.indexes:
+            indice.create(bind=engine, checkfirst=True)
+
+
 # ============================================================================
 # 🔄 EVENT LISTENERS
 # ============================================================================
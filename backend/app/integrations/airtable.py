@@ -22,10 +22,14 @@ Setup:
 
 import httpx
 import logging
-from typing import Optional, Dict
+from typing import Optional, Dict, List
 from datetime import datetime
 
 from app.config import settings
+from app.integrations.http_clients import cliente_http
+from app.integrations.airtable_writer import AirtableError, airtable_writer, limite_airtable
+from app.integrations.airtable_reader import iterar_registros
+from app.integrations.airtable_sync import estado_airtable
 
 logger = logging.getLogger(__name__)
 
@@ -41,11 +45,15 @@ async def save_lead_to_airtable(
     lead_score: int,
     origen: str = "chat",
     fecha: str = None,
-    notas: Optional[str] = None
+    notas: Optional[str] = None,
+    lead_id: Optional[int] = None
 ) -> Dict:
     """
     Guarda un lead en Airtable.
     
+    No hace un request por lead: el registro entra al próximo lote de
+    airtable_writer (hasta 10 por request, respetando el rate limit).
+    
     Parámetros:
     - nombre: Nombre del contacto
     - email: Email
@@ -55,6 +63,7 @@ async def save_lead_to_airtable(
     - origen: Dónde vino (formulario_landing, chat, etc)
     - fecha: Timestamp (auto-generado si no viene)
     - notas: Notas adicionales
+    - lead_id: ID del Lead local; si viene, se le guarda el record ID de Airtable
     
     Retorna:
     {
@@ -85,62 +94,34 @@ async def save_lead_to_airtable(
     if not fecha:
         fecha = datetime.utcnow().isoformat()
     
-    # URL del API de Airtable
-    url = f"https://api.airtable.com/v0/{settings.AIRTABLE_BASE_ID}/{settings.AIRTABLE_TABLE_LEADS}"
-    
-    # Headers
-    headers = {
-        "Authorization": f"Bearer {settings.AIRTABLE_TOKEN}",
-        "Content-Type": "application/json"
-    }
-    
-    # Mapeo de estados según score
-    if lead_score >= 80:
-        estado = "Calido"
-    elif lead_score >= 50:
-        estado = "Tibio"
-    else:
-        estado = "Frio"
-    
-    # Payload - Las columnas deben coincidir con tu tabla en Airtable
-    payload = {
-        "records": [
-            {
-                "fields": {
-                    "Nombre": nombre,
-                    "Email": email,
-                    "Teléfono": telefono,
-                    "Mensaje": mensaje,
-                    "Lead Score": lead_score,
-                    "Estado": estado,  # Calido, Tibio, Frio
-                    "Origen": origen,
-                    "Fecha": fecha,
-                    "Notas": notas or ""
-                }
-            }
-        ]
+    # Campos - Las columnas deben coincidir con tu tabla en Airtable
+    campos = {
+        "Nombre": nombre,
+        "Email": email,
+        "Teléfono": telefono,
+        "Mensaje": mensaje,
+        "Lead Score": lead_score,
+        "Estado": estado_airtable("nuevo", lead_score),  # Calido, Tibio, Frio (el mismo que pone la sincronización)
+        "Origen": origen,
+        "Fecha": fecha,
+        "Notas": notas or ""
     }
     
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.post(url, json=payload, headers=headers)
-            
-            if response.status_code == 200:
-                data = response.json()
-                record_id = data["records"][0]["id"]
-                logger.info(f"✅ Lead guardado en Airtable: {record_id}")
-                return {
-                    "exito": True,
-                    "record_id": record_id,
-                    "mensaje": f"Lead '{nombre}' guardado en Airtable"
-                }
-            else:
-                logger.error(f"❌ Error Airtable: {response.status_code} - {response.text}")
-                return {
-                    "exito": False,
-                    "mensaje": f"Error: {response.status_code}"
-                }
+        record_id = await airtable_writer.crear("leads", campos, lead_id=lead_id)
+        logger.info(f"✅ Lead guardado en Airtable: {record_id}")
+        return {
+            "exito": True,
+            "record_id": record_id,
+            "mensaje": f"Lead '{nombre}' guardado en Airtable"
+        }
     
+    except AirtableError as e:
+        logger.error(f"❌ Error Airtable: {e}")
+        return {
+            "exito": False,
+            "mensaje": f"Error: {e.status}"
+        }
     except httpx.TimeoutException:
         logger.error("❌ Timeout conectando a Airtable")
         return {
@@ -213,18 +194,19 @@ async def update_lead_state_airtable(
         payload["fields"]["Notas"] = notas
     
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.patch(url, json=payload, headers=headers)
-            
-            if response.status_code == 200:
-                logger.info(f"✅ Lead actualizado en Airtable: {nuevo_estado}")
-                return {
-                    "exito": True,
-                    "mensaje": f"Estado actualizado a: {nuevo_estado}"
-                }
-            else:
-                logger.error(f"❌ Error: {response.text}")
-                return {"exito": False}
+        await limite_airtable.adquirir()
+        client = cliente_http("airtable")
+        response = await client.patch(url, json=payload, headers=headers)
+        
+        if response.status_code == 200:
+            logger.info(f"✅ Lead actualizado en Airtable: {nuevo_estado}")
+            return {
+                "exito": True,
+                "mensaje": f"Estado actualizado a: {nuevo_estado}"
+            }
+        else:
+            logger.error(f"❌ Error: {response.text}")
+            return {"exito": False}
     
     except Exception as e:
         logger.error(f"❌ Error actualizando: {str(e)}")
@@ -237,14 +219,19 @@ async def update_lead_state_airtable(
 
 async def get_all_leads_airtable(
     filtro: Optional[str] = None,
-    max_records: int = 100
+    max_records: Optional[int] = 100,
+    campos: Optional[List[str]] = None
 ) -> Dict:
     """
-    Obtiene todos los leads de Airtable.
+    Obtiene los leads de Airtable (recorre todas las páginas hasta max_records).
+    
+    Arma la lista completa en memoria: para recorrer todo el CRM sin
+    cargarlo entero, usar airtable_reader.iterar_registros().
     
     Parámetros:
     - filtro: Fórmula de Airtable (ej: "{Estado} = 'Nuevo'")
-    - max_records: Máximo de registros a traer
+    - max_records: Máximo de registros a traer (None = todos)
+    - campos: Solo estas columnas (None = todas)
     
     Ejemplo sin filtro:
     leads = await get_all_leads_airtable()
@@ -264,47 +251,22 @@ async def get_all_leads_airtable(
         logger.error("❌ Airtable no configurado")
         return {"exito": False, "leads": []}
     
-    url = f"https://api.airtable.com/v0/{settings.AIRTABLE_BASE_ID}/{settings.AIRTABLE_TABLE_LEADS}"
-    
-    headers = {
-        "Authorization": f"Bearer {settings.AIRTABLE_TOKEN}"
-    }
-    
-    params = {
-        "maxRecords": max_records,
-        "pageSize": 100  # Airtable limita a 100 por página
-    }
-    
-    # Agregar filtro si viene
-    if filtro:
-        params["filterByFormula"] = filtro
-    
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(url, headers=headers, params=params)
-            
-            if response.status_code == 200:
-                data = response.json()
-                records = data.get("records", [])
-                
-                # Formatear respuesta
-                leads = [
-                    {
-                        "id": record["id"],
-                        **record["fields"]
-                    }
-                    for record in records
-                ]
-                
-                logger.info(f"✅ {len(leads)} leads obtenidos de Airtable")
-                return {
-                    "exito": True,
-                    "total": len(leads),
-                    "leads": leads
-                }
-            else:
-                logger.error(f"❌ Error: {response.text}")
-                return {"exito": False, "leads": []}
+        # Formatear respuesta
+        leads = [
+            {
+                "id": record["id"],
+                **record["fields"]
+            }
+            async for record in iterar_registros("leads", filtro=filtro, campos=campos, max_records=max_records)
+        ]
+        
+        logger.info(f"✅ {len(leads)} leads obtenidos de Airtable")
+        return {
+            "exito": True,
+            "total": len(leads),
+            "leads": leads
+        }
     
     except Exception as e:
         logger.error(f"❌ Error obteniendo leads: {str(e)}")
@@ -341,55 +303,55 @@ async def test_conexion_airtable() -> Dict:
     }
     
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            # Test 1: GET para verificar acceso
-            response = await client.get(url, headers=headers, params={"maxRecords": 1})
-            
-            if response.status_code == 200:
-                # Test 2: POST para verificar escritura
-                test_record = {
-                    "records": [
-                        {
-                            "fields": {
-                                "Nombre": "🧪 Test",
-                                "Email": "test@test.com",
-                                "Teléfono": "0000000000",
-                                "Mensaje": "Mensaje de prueba",
-                                "Lead Score": 0,
-                                "Estado": "Test",
-                                "Origen": "test"
-                            }
+        client = cliente_http("airtable")
+        # Test 1: GET para verificar acceso
+        response = await client.get(url, headers=headers, params={"maxRecords": 1})
+        
+        if response.status_code == 200:
+            # Test 2: POST para verificar escritura
+            test_record = {
+                "records": [
+                    {
+                        "fields": {
+                            "Nombre": "🧪 Test",
+                            "Email": "test@test.com",
+                            "Teléfono": "0000000000",
+                            "Mensaje": "Mensaje de prueba",
+                            "Lead Score": 0,
+                            "Estado": "Test",
+                            "Origen": "test"
                         }
-                    ]
-                }
-                
-                response_test = await client.post(url, json=test_record, headers=headers)
-                
-                if response_test.status_code == 200:
-                    # Eliminarlo después
-                    data = response_test.json()
-                    test_id = data["records"][0]["id"]
-                    await client.delete(
-                        f"{url}/{test_id}",
-                        headers=headers
-                    )
-                    
-                    return {
-                        "conectado": True,
-                        "tabla": settings.AIRTABLE_TABLE_LEADS,
-                        "base": settings.AIRTABLE_BASE_ID,
-                        "mensaje": "✅ Conexión exitosa (lectura y escritura)"
-                    }
-                else:
-                    return {
-                        "conectado": False,
-                        "mensaje": f"❌ Error escribiendo: {response_test.status_code}"
                     }
+                ]
+            }
+            
+            response_test = await client.post(url, json=test_record, headers=headers)
+            
+            if response_test.status_code == 200:
+                # Eliminarlo después
+                data = response_test.json()
+                test_id = data["records"][0]["id"]
+                await client.delete(
+                    f"{url}/{test_id}",
+                    headers=headers
+                )
+                
+                return {
+                    "conectado": True,
+                    "tabla": settings.AIRTABLE_TABLE_LEADS,
+                    "base": settings.AIRTABLE_BASE_ID,
+                    "mensaje": "✅ Conexión exitosa (lectura y escritura)"
+                }
             else:
                 return {
                     "conectado": False,
-                    "mensaje": f"❌ Error leyendo: {response.status_code}"
+                    "mensaje": f"❌ Error escribiendo: {response_test.status_code}"
                 }
+        else:
+            return {
+                "conectado": False,
+                "mensaje": f"❌ Error leyendo: {response.status_code}"
+            }
     
     except Exception as e:
         return {
@@ -417,36 +379,18 @@ async def save_chat_session_airtable(
     if not settings.AIRTABLE_TOKEN or not settings.AIRTABLE_BASE_ID:
         return {"exito": False}
     
-    url = f"https://api.airtable.com/v0/{settings.AIRTABLE_BASE_ID}/{settings.AIRTABLE_TABLE_SESSIONS}"
-    
-    headers = {
-        "Authorization": f"Bearer {settings.AIRTABLE_TOKEN}",
-        "Content-Type": "application/json"
-    }
-    
-    payload = {
-        "records": [
-            {
-                "fields": {
-                    "Session ID": session_id,
-                    "Email": email or "No identificado",
-                    "Mensaje Inicial": mensaje_inicial[:100],
-                    "Lead Score": lead_score,
-                    "Fecha": datetime.utcnow().isoformat()
-                }
-            }
-        ]
+    campos = {
+        "Session ID": session_id,
+        "Email": email or "No identificado",
+        "Mensaje Inicial": mensaje_inicial[:100],
+        "Lead Score": lead_score,
+        "Fecha": datetime.utcnow().isoformat()
     }
     
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.post(url, json=payload, headers=headers)
-            
-            if response.status_code == 200:
-                logger.info(f"✅ Sesión chat guardada en Airtable")
-                return {"exito": True}
-            else:
-                return {"exito": False}
+        record_id = await airtable_writer.crear("sesiones", campos)
+        logger.info(f"✅ Sesión chat guardada en Airtable")
+        return {"exito": True, "record_id": record_id}
     
     except Exception as e:
         logger.error(f"❌ Error: {str(e)}")
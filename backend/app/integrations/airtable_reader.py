@@ -0,0 +1,125 @@
+# app/integrations/airtable_reader.py
+"""
+LECTURA PAGINADA DE AIRTABLE - Todos los registros, de a una página, sin cargar todo
+
+¿Para qué?
+- Airtable devuelve como mucho 100 registros por GET y un token `offset`
+  para pedir la siguiente página; antes se hacía un solo GET y el resto
+  se perdía sin aviso
+- Recorrer el CRM completo sin armar una lista gigante en memoria
+- Que la red y el procesamiento se solapen: mientras quien llama procesa
+  la página N, la N+1 ya se está pidiendo
+
+Cómo funciona:
+- iterar_registros(...) es un generador async: entrega registro por registro
+- Apenas llega una página (y con ella el offset de la siguiente) se lanza
+  el GET de la próxima en segundo plano; en memoria hay como mucho dos páginas
+- campos=[...] se manda como fields[]: Airtable devuelve solo esas columnas
+- Cada GET pasa por limite_airtable (el mismo balde que las escrituras)
+- 429, 5xx o timeout: se espera (backoff) y se reintenta la misma página;
+  leer es idempotente. Tras AIRTABLE_READ_MAX_RETRIES se lanza AirtableError
+- Si quien llama corta el loop antes, al cerrarse el generador se cancela
+  el GET pendiente (con `async with aclosing(...)` se cierra en el acto)
+
+Uso:
+    async for registro in iterar_registros("leads", campos=["Email", "Estado"]):
+        ...   # {"id": "rec...", "createdTime": "...", "fields": {...}}
+"""
+
+import asyncio
+import logging
+from typing import AsyncIterator, List, Optional, Tuple
+
+import httpx
+
+from app.config import settings
+from app.integrations.airtable_writer import ESPERA_429, AirtableError, airtable_writer, limite_airtable
+from app.integrations.http_clients import cliente_http
+
+logger = logging.getLogger(__name__)
+
+# Máximo de Airtable por página
+TAMANO_PAGINA = 100
+
+
+async def _pedir_pagina(url: str, params: List[Tuple[str, str]]) -> dict:
+    """Un GET con rate limit y reintentos. Retorna el JSON de la página."""
+
+    headers = {"Authorization": f"Bearer {settings.AIRTABLE_TOKEN}"}
+    intentos = settings.AIRTABLE_READ_MAX_RETRIES + 1
+
+    for intento in range(1, intentos + 1):
+        await limite_airtable.adquirir()
+        try:
+            response = await cliente_http("airtable").get(url, headers=headers, params=params)
+        except httpx.TransportError as e:
+            error = AirtableError(0, f"{type(e).__name__}: {e}")
+            espera = min(2 ** intento, 30)
+        else:
+            if response.status_code == 200:
+                return response.json()
+            error = AirtableError(response.status_code, response.text)
+            if response.status_code == 429:
+                limite_airtable.penalizar(ESPERA_429)
+                espera = 0  # El balde ya espera el castigo
+            elif response.status_code >= 500:
+                espera = min(2 ** intento, 30)
+            else:
+                raise error  # 4xx: reintentar no lo arregla
+
+        if intento == intentos:
+            raise error
+        logger.warning(f"🔁 Airtable: reintentando página ({intento}/{intentos - 1}): {error}")
+        await asyncio.sleep(espera)
+
+
+async def iterar_registros(
+    tabla: str = "leads",
+    filtro: Optional[str] = None,
+    campos: Optional[List[str]] = None,
+    max_records: Optional[int] = None,
+    orden: Optional[List[Tuple[str, str]]] = None
+) -> AsyncIterator[dict]:
+    """
+    Recorre todos los registros de `tabla` ("leads" o "sesiones"), página por página.
+
+    Parámetros:
+    - filtro: Fórmula de Airtable (ej: "{Estado} = 'Calido'")
+    - campos: Solo estas columnas (fields[]); None = todas
+    - max_records: Tope total de registros; None = sin tope
+    - orden: [(campo, "asc"|"desc"), ...]
+    """
+
+    url = f"https://api.airtable.com/v0/{settings.AIRTABLE_BASE_ID}/{airtable_writer.tablas[tabla]}"
+
+    base: List[Tuple[str, str]] = [("pageSize", str(TAMANO_PAGINA))]
+    if filtro:
+        base.append(("filterByFormula", filtro))
+    if max_records:
+        base.append(("maxRecords", str(max_records)))
+    for campo in campos or []:
+        base.append(("fields[]", campo))
+    for i, (campo, direccion) in enumerate(orden or []):
+        base += [(f"sort[{i}][field]", campo), (f"sort[{i}][direction]", direccion)]
+
+    siguiente = asyncio.create_task(_pedir_pagina(url, base))
+    paginas = 0
+    try:
+        while siguiente is not None:
+            pagina = await siguiente
+            paginas += 1
+
+            # Pedir la próxima ANTES de entregar esta (se solapa con el procesamiento)
+            offset = pagina.get("offset")
+            siguiente = asyncio.create_task(_pedir_pagina(url, base + [("offset", offset)])) if offset else None
+
+            for registro in pagina.get("records", []):
+                yield registro
+    finally:
+        if siguiente is not None and not siguiente.done():
+            siguiente.cancel()
+            try:
+                await siguiente
+            except (asyncio.CancelledError, Exception):
+                pass
+        logger.debug(f"📄 Airtable {tabla}: {paginas} páginas leídas")
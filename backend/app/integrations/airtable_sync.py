@@ -0,0 +1,596 @@
+# app/integrations/airtable_sync.py
+"""
+SINCRONIZACIÓN INCREMENTAL LEADS <-> AIRTABLE
+
+¿Para qué?
+- Que los cambios hechos en el panel (PUT /api/leads/{id}: estado, notas)
+  lleguen a Airtable, y que lo que se edita en Airtable vuelva a la BD
+- Que cada corrida cueste según lo que CAMBIÓ, no según el tamaño de la tabla
+
+Cómo funciona (una fila de SyncState por sincronización):
+
+1. Subida (local -> Airtable)
+   - watermark_local = (fecha_ultima_actividad, id) del último lead enviado
+   - Se leen de a AIRTABLE_SYNC_BATCH los leads con (fecha, id) mayor al
+     watermark, en orden (índice sobre fecha_ultima_actividad)
+   - Con airtable_record_id: PATCH de a 10. Sin él: primero se busca en
+     Airtable un registro con el mismo email (ej: los que creó el alta del
+     formulario antes de que existiera esta sincronización) y se asocia;
+     solo los que no aparecen se crean por airtable_writer (lotes de 10) y
+     el ID queda guardado en el lead
+   - El watermark avanza después de cada grupo de 10 confirmado: si algo
+     falla, la próxima corrida sigue desde ahí
+   - Un registro que Airtable rechaza (422, ej: una opción de select que no
+     existe) no frena la subida: se saltea, queda anotado en
+     SyncState.rechazados y el watermark avanza igual. Vuelve a subir
+     cuando el lead se edita
+   - "Estado": mientras el lead sigue "nuevo" se manda la etiqueta por
+     score (Calido/Tibio/Frio), la misma que pone el alta del formulario
+   - Solo se miran cambios con más de AIRTABLE_SYNC_LAG_SECONDS: una
+     transacción que todavía no hizo commit no puede quedar atrás del watermark
+   - Los leads con el alta pendiente en el outbox no se crean acá (los
+     crea el outbox; así no se duplican). Quedan anotados en
+     SyncState.pendientes_outbox y se revisan en cada corrida: si el evento
+     terminó "muerto", el lead se sube acá
+
+2. Bajada (Airtable -> local)
+   - Solo registros con LAST_MODIFIED_TIME() posterior a watermark_remoto
+     (menos AIRTABLE_SYNC_LAG_SECONDS de solapamiento por relojes)
+   - Se buscan por airtable_record_id (o por email si todavía no estaban
+     asociados); los que no existen localmente se importan (origen "importado")
+   - Se aplican Estado y Notas. Si el lead tiene cambios locales todavía no
+     subidos, gana el local (se sube en la próxima corrida)
+   - Lo que se aplica NO actualiza fecha_ultima_actividad: si no, cada
+     bajada se volvería a subir
+
+Con varios workers de uvicorn corre uno solo a la vez: el que toma el
+lease de la fila de SyncState (UPDATE condicional, como el outbox).
+"""
+
+import asyncio
+import json
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, or_, update
+
+from app.config import settings
+from app.database import SessionLocal
+from app.integrations.airtable_reader import iterar_registros
+from app.integrations.airtable_writer import (
+    MAX_REGISTROS_POR_REQUEST, AirtableError, _guardar_record_ids, airtable_writer
+)
+from app.models.lead import Lead, OutboxEvent, SyncState
+
+logger = logging.getLogger(__name__)
+
+NOMBRE = "airtable_leads"
+
+# Estado local (EstadoLead) <-> columna "Estado" de Airtable
+ESTADOS_A_AIRTABLE = {
+    "nuevo": "Nuevo",
+    "contactado": "Contactado",
+    "en_negociacion": "Negociando",
+    "negociando": "Negociando",
+    "agendado": "Agendado",
+    "convertido": "Convertido",
+    "perdido": "Perdido",
+    "spam": "Spam"
+}
+ESTADOS_DESDE_AIRTABLE = {
+    "Nuevo": "nuevo",
+    "Contactado": "contactado",
+    "Negociando": "en_negociacion",
+    "Agendado": "agendado",
+    "Convertido": "convertido",
+    "Perdido": "perdido",
+    "Spam": "spam"
+}
+
+CAMPOS_BAJADA = ["Nombre", "Email", "Teléfono", "Mensaje", "Lead Score", "Estado", "Notas"]
+
+
+def estado_airtable(estado: Optional[str], lead_score: Optional[int]) -> str:
+    """
+    Columna "Estado" de Airtable. Un lead "nuevo" lleva la etiqueta por
+    score (Calido/Tibio/Frio) con la que lo crea el alta; los demás, su estado.
+    """
+
+    if estado and estado != "nuevo":
+        return ESTADOS_A_AIRTABLE.get(estado, "Nuevo")
+
+    lead_score = lead_score or 0
+    if lead_score >= 80:
+        return "Calido"
+    if lead_score >= 50:
+        return "Tibio"
+    return "Frio"
+
+
+def campos_airtable(lead: Lead) -> dict:
+    """Columnas de Airtable para un lead local."""
+
+    campos = {
+        "Nombre": lead.nombre,
+        "Email": lead.email,
+        "Teléfono": lead.telefono,
+        "Mensaje": lead.mensaje or "",
+        "Lead Score": lead.lead_score or 0,
+        "Estado": estado_airtable(lead.estado, lead.lead_score),
+        "Origen": lead.origen or "",
+        "Fecha": lead.fecha_creacion.isoformat() if lead.fecha_creacion else None,
+        "Notas": lead.notas or ""
+    }
+    if lead.fecha_contacto:
+        campos["Fecha Contacto"] = lead.fecha_contacto.isoformat()
+    return campos
+
+
+# ============================================================================
+# 🗄️ ACCESO A BD (bloqueante: se llama con asyncio.to_thread)
+# ============================================================================
+
+def _tomar_lease(segundos: float) -> Optional[dict]:
+    """Toma el lock de la sincronización. Retorna los watermarks, o None si la tiene otro."""
+
+    ahora = datetime.utcnow()
+    with SessionLocal() as db:
+        if db.get(SyncState, NOMBRE) is None:
+            db.add(SyncState(nombre=NOMBRE))
+            try:
+                db.commit()
+            except Exception:
+                db.rollback()  # Otro proceso la creó al mismo tiempo
+
+        resultado = db.execute(
+            update(SyncState)
+            .where(
+                SyncState.nombre == NOMBRE,
+                or_(SyncState.bloqueado_hasta.is_(None), SyncState.bloqueado_hasta < ahora)
+            )
+            .values(bloqueado_hasta=ahora + timedelta(seconds=segundos))
+        )
+        db.commit()
+        if resultado.rowcount != 1:
+            return None
+
+        estado = db.get(SyncState, NOMBRE)
+        return {
+            "local": (estado.watermark_local, estado.watermark_local_id),
+            "remoto": estado.watermark_remoto,
+            "pendientes_outbox": json.loads(estado.pendientes_outbox) if estado.pendientes_outbox else [],
+            "rechazados": json.loads(estado.rechazados) if estado.rechazados else []
+        }
+
+
+def _guardar_estado(**valores) -> None:
+    with SessionLocal() as db:
+        db.execute(update(SyncState).where(SyncState.nombre == NOMBRE).values(**valores))
+        db.commit()
+
+
+def _para_subir(db, leads: List[Lead]) -> List[dict]:
+    """Datos de cada lead para la subida (marcando los que tienen el alta en el outbox)."""
+
+    if not leads:
+        return []
+
+    # Altas de Airtable que todavía tiene el outbox: no crearlas dos veces
+    en_outbox = set()
+    sin_id = {lead.id for lead in leads if not lead.airtable_record_id}
+    if sin_id:
+        for (payload,) in db.query(OutboxEvent.payload).filter(
+            OutboxEvent.tipo == "airtable_nuevo_lead",
+            OutboxEvent.estado == "pendiente"
+        ):
+            en_outbox.add(json.loads(payload).get("lead_id"))
+
+    return [
+        {
+            "id": lead.id,
+            "fecha": lead.fecha_ultima_actividad,
+            "record_id": lead.airtable_record_id,
+            "en_outbox": lead.id in en_outbox,
+            "campos": campos_airtable(lead)
+        }
+        for lead in leads
+    ]
+
+
+def _leads_cambiados(desde: Tuple[Optional[datetime], Optional[int]], hasta: datetime, limite: int) -> List[dict]:
+    """Leads con (fecha_ultima_actividad, id) > `desde` y fecha <= `hasta`, en orden."""
+
+    fecha, lead_id = desde
+    with SessionLocal() as db:
+        query = db.query(Lead).filter(Lead.fecha_ultima_actividad <= hasta)
+        if fecha is not None:
+            query = query.filter(or_(
+                Lead.fecha_ultima_actividad > fecha,
+                and_(Lead.fecha_ultima_actividad == fecha, Lead.id > (lead_id or 0))
+            ))
+        return _para_subir(db, query.order_by(Lead.fecha_ultima_actividad, Lead.id).limit(limite).all())
+
+
+def _leads_por_id(ids: List[int]) -> List[dict]:
+    """Los leads salteados en corridas anteriores que todavía no tienen record ID."""
+
+    with SessionLocal() as db:
+        leads = db.query(Lead).filter(Lead.id.in_(ids), Lead.airtable_record_id.is_(None)).order_by(Lead.id).all()
+        return _para_subir(db, leads)
+
+
+def _aplicar_remotos(registros: List[dict], pendientes_desde: Tuple[Optional[datetime], Optional[int]]) -> Dict[str, int]:
+    """Aplica una página de registros de Airtable a la BD local."""
+
+    resultado = {"actualizados": 0, "importados": 0, "asociados": 0, "sin_cambios": 0, "gana_local": 0}
+    fecha_w, id_w = pendientes_desde
+
+    def _tiene_cambios_sin_subir(lead: Lead) -> bool:
+        if fecha_w is None:
+            return True
+        return (lead.fecha_ultima_actividad, lead.id) > (fecha_w, id_w or 0)
+
+    with SessionLocal() as db:
+        ids = [registro["id"] for registro in registros]
+        por_record = {lead.airtable_record_id: lead for lead in db.query(Lead).filter(Lead.airtable_record_id.in_(ids))}
+
+        # Registros que todavía no están asociados: buscar el lead por email
+        emails = {
+            registro["fields"].get("Email"): registro["id"]
+            for registro in registros
+            if registro["id"] not in por_record and registro["fields"].get("Email")
+        }
+        if emails:
+            for lead in db.query(Lead).filter(Lead.email.in_(emails), Lead.airtable_record_id.is_(None)):
+                record_id = emails.pop(lead.email, None)
+                if record_id is None:
+                    continue
+                db.execute(
+                    update(Lead).where(Lead.id == lead.id)
+                    .values(airtable_record_id=record_id, fecha_ultima_actividad=Lead.fecha_ultima_actividad)
+                )
+                lead.airtable_record_id = record_id
+                por_record[record_id] = lead
+                resultado["asociados"] += 1
+
+        for registro in registros:
+            campos = registro["fields"]
+            lead = por_record.get(registro["id"])
+
+            if lead is None:
+                if not campos.get("Email"):
+                    continue
+                db.add(Lead(
+                    nombre=(campos.get("Nombre") or "Sin nombre")[:100],
+                    email=campos["Email"][:100],
+                    telefono=(campos.get("Teléfono") or "")[:20],
+                    mensaje=campos.get("Mensaje"),
+                    lead_score=int(campos.get("Lead Score") or 0),
+                    estado=ESTADOS_DESDE_AIRTABLE.get(campos.get("Estado"), "nuevo"),
+                    notas=campos.get("Notas"),
+                    origen="importado",
+                    airtable_record_id=registro["id"]
+                ))
+                resultado["importados"] += 1
+                continue
+
+            cambios = {}
+            estado = ESTADOS_DESDE_AIRTABLE.get(campos.get("Estado"))  # "Calido"/"Tibio"/"Frio" no son estados
+            if estado and ESTADOS_A_AIRTABLE.get(lead.estado) != campos.get("Estado"):
+                cambios["estado"] = estado
+            if (campos.get("Notas") or "") != (lead.notas or ""):
+                cambios["notas"] = campos.get("Notas") or None
+
+            if not cambios:
+                resultado["sin_cambios"] += 1
+                continue
+            if _tiene_cambios_sin_subir(lead):
+                resultado["gana_local"] += 1
+                continue
+
+            db.execute(
+                update(Lead).where(Lead.id == lead.id)
+                .values(**cambios, fecha_ultima_actividad=Lead.fecha_ultima_actividad)
+            )
+            resultado["actualizados"] += 1
+
+        db.commit()
+    return resultado
+
+
+# ============================================================================
+# 🔄 MOTOR DE SINCRONIZACIÓN
+# ============================================================================
+
+class AirtableSync:
+    """
+    Ejemplo:
+    resultado = await airtable_sync.sincronizar()
+    # {"subidos": 3, "creados": 1, "bajada": {"actualizados": 2, ...}}
+    """
+
+    def __init__(self, intervalo: float, lote: int, desfase: float, lease: float):
+        self.intervalo = intervalo
+        self.lote = lote
+        self.desfase = desfase
+        self.lease = lease
+        self._tarea: Optional[asyncio.Task] = None
+        self._despierto: Optional[asyncio.Event] = None
+        self._corriendo = asyncio.Lock()
+        self.corridas = 0
+        self.ultimo_resultado: Optional[dict] = None
+
+    async def sincronizar(self) -> dict:
+        """Una corrida completa: subida y después bajada."""
+
+        async with self._corriendo:
+            watermarks = await asyncio.to_thread(_tomar_lease, self.lease)
+            if watermarks is None:
+                return {"omitida": "otra sincronización en curso"}
+
+            inicio = datetime.utcnow()
+            resultado = {"inicio": inicio.isoformat()}
+            try:
+                subida, hasta_local = await self._subir(
+                    watermarks["local"], watermarks["pendientes_outbox"], watermarks["rechazados"], inicio
+                )
+                resultado.update(subida)
+                resultado["bajada"] = await self._bajar(watermarks["remoto"], hasta_local, inicio)
+            except Exception as e:
+                resultado["error"] = f"{type(e).__name__}: {e}"
+                logger.error(f"❌ Sincronización Airtable: {resultado['error']}")
+            finally:
+                resultado["segundos"] = round((datetime.utcnow() - inicio).total_seconds(), 2)
+                self.corridas += 1
+                self.ultimo_resultado = resultado
+                await asyncio.to_thread(
+                    _guardar_estado,
+                    bloqueado_hasta=None,
+                    ultima_ejecucion=inicio,
+                    ultimo_resultado=json.dumps(resultado, ensure_ascii=False, default=str)
+                )
+
+            if "error" not in resultado:
+                logger.info(
+                    f"🔄 Airtable sync: {resultado['subidos']} subidos ({resultado['creados']} nuevos, "
+                    f"{resultado['asociados']} asociados por email, {resultado['rechazados']} rechazados), "
+                    f"bajada {resultado['bajada']}"
+                )
+            return resultado
+
+    async def _subir(
+        self,
+        desde: Tuple[Optional[datetime], Optional[int]],
+        pendientes: List[int],
+        rechazados_antes: List[int],
+        inicio: datetime
+    ) -> Tuple[dict, tuple]:
+        hasta = inicio - timedelta(seconds=self.desfase)
+        totales = {"subidos": 0, "creados": 0, "asociados": 0, "en_outbox": 0, "rechazados": 0}
+        rechazados = set(rechazados_antes)
+
+        def _anotar(grupo: List[dict], rechazados_grupo: List[int]) -> None:
+            # Los que subieron bien salen de la lista; los rechazados entran
+            rechazados.difference_update(lead["id"] for lead in grupo)
+            rechazados.update(rechazados_grupo)
+
+        def _como_json(ids) -> Optional[str]:
+            return json.dumps(sorted(set(ids))) if ids else None
+
+        # Salteados en corridas anteriores: los que el outbox ya creó tienen
+        # record ID (no vuelven en la consulta); los demás se reintentan acá
+        salteados: List[int] = []
+        if pendientes:
+            revisar = await asyncio.to_thread(_leads_por_id, pendientes)
+            for i in range(0, len(revisar), MAX_REGISTROS_POR_REQUEST):
+                grupo = revisar[i:i + MAX_REGISTROS_POR_REQUEST]
+                salteados_grupo, rechazados_grupo = await self._subir_grupo(grupo, totales)
+                salteados += salteados_grupo
+                _anotar(grupo, rechazados_grupo)
+            await asyncio.to_thread(
+                _guardar_estado,
+                pendientes_outbox=_como_json(salteados),
+                rechazados=_como_json(rechazados)
+            )
+
+        while True:
+            leads = await asyncio.to_thread(_leads_cambiados, desde, hasta, self.lote)
+            if not leads:
+                break
+
+            for i in range(0, len(leads), MAX_REGISTROS_POR_REQUEST):
+                grupo = leads[i:i + MAX_REGISTROS_POR_REQUEST]
+                salteados_grupo, rechazados_grupo = await self._subir_grupo(grupo, totales)
+                salteados += salteados_grupo
+                _anotar(grupo, rechazados_grupo)
+
+                desde = (grupo[-1]["fecha"], grupo[-1]["id"])
+                await asyncio.to_thread(
+                    _guardar_estado,
+                    watermark_local=desde[0],
+                    watermark_local_id=desde[1],
+                    pendientes_outbox=_como_json(salteados),
+                    rechazados=_como_json(rechazados)
+                )
+
+            if len(leads) < self.lote:
+                break
+
+        return totales, desde
+
+    async def _subir_grupo(self, grupo: List[dict], totales: dict) -> Tuple[List[int], List[int]]:
+        """
+        Sube hasta 10 leads. Retorna (IDs salteados por tener el alta en el
+        outbox, IDs que Airtable rechazó con 422).
+        """
+
+        existentes = [(lead["id"], lead["record_id"], lead["campos"]) for lead in grupo if lead["record_id"]]
+        nuevos = [lead for lead in grupo if not lead["record_id"] and not lead["en_outbox"]]
+        salteados = [lead["id"] for lead in grupo if not lead["record_id"] and lead["en_outbox"]]
+        rechazados: List[int] = []
+
+        # Antes de crear: ¿ya existe en Airtable un registro con ese email?
+        if nuevos:
+            por_email = await self._record_ids_por_email([lead["campos"]["Email"] for lead in nuevos])
+            asociados = []
+            for lead in list(nuevos):
+                record_id = por_email.pop((lead["campos"]["Email"] or "").lower(), None)
+                if record_id:
+                    asociados.append((lead["id"], record_id))
+                    existentes.append((lead["id"], record_id, lead["campos"]))
+                    nuevos.remove(lead)
+            if asociados:
+                await asyncio.to_thread(_guardar_record_ids, asociados)
+                totales["asociados"] += len(asociados)
+
+        if existentes:
+            rechazados_patch = set(await airtable_writer.actualizar(
+                "leads", [(record_id, campos) for _, record_id, campos in existentes]
+            ))
+            rechazados += [lead_id for lead_id, record_id, _ in existentes if record_id in rechazados_patch]
+
+        creados = 0
+        if nuevos:
+            # El writer los junta en un POST y guarda cada record ID en su lead.
+            # Un 422 falla solo ese registro; cualquier otro error corta la
+            # corrida (el watermark no avanza y se reintenta)
+            resultados = await asyncio.gather(*[
+                airtable_writer.crear("leads", lead["campos"], lead_id=lead["id"]) for lead in nuevos
+            ], return_exceptions=True)
+            for lead, resultado in zip(nuevos, resultados):
+                if isinstance(resultado, AirtableError) and resultado.status == 422:
+                    rechazados.append(lead["id"])
+                elif isinstance(resultado, BaseException):
+                    raise resultado
+                else:
+                    creados += 1
+
+        totales["subidos"] += len(existentes) + len(nuevos) - len(rechazados)
+        totales["creados"] += creados
+        totales["en_outbox"] += len(salteados)
+        totales["rechazados"] += len(rechazados)
+        return salteados, rechazados
+
+    @staticmethod
+    async def _record_ids_por_email(emails: List[Optional[str]]) -> Dict[str, str]:
+        """{email en minúscula: record ID} de los registros de Airtable con esos emails."""
+
+        emails = sorted({email.lower() for email in emails if email})
+        if not emails:
+            return {}
+
+        condiciones = ", ".join(
+            "LOWER({Email}) = '" + email.replace("\\", "\\\\").replace("'", "\\'") + "'" for email in emails
+        )
+        encontrados: Dict[str, str] = {}
+        async for registro in iterar_registros("leads", filtro=f"OR({condiciones})", campos=["Email"]):
+            email = (registro["fields"].get("Email") or "").lower()
+            encontrados.setdefault(email, registro["id"])
+        return encontrados
+
+    async def _bajar(
+        self,
+        desde: Optional[datetime],
+        pendientes_desde: Tuple[Optional[datetime], Optional[int]],
+        inicio: datetime
+    ) -> Dict[str, int]:
+        filtro = None
+        if desde is not None:
+            # Solapamiento de AIRTABLE_SYNC_LAG_SECONDS: aplicar dos veces es inocuo
+            corte = (desde - timedelta(seconds=self.desfase)).strftime("%Y-%m-%dT%H:%M:%S.000Z")
+            filtro = f"IS_AFTER(LAST_MODIFIED_TIME(), DATETIME_PARSE('{corte}'))"
+
+        # Lo recién subido ya está al día: un lead tiene cambios sin subir si
+        # quedó después del watermark que dejó la subida de esta corrida
+        totales = {"actualizados": 0, "importados": 0, "asociados": 0, "sin_cambios": 0, "gana_local": 0}
+
+        pagina = []
+        async for registro in iterar_registros("leads", filtro=filtro, campos=CAMPOS_BAJADA):
+            pagina.append(registro)
+            if len(pagina) == self.lote:
+                parcial = await asyncio.to_thread(_aplicar_remotos, pagina, pendientes_desde)
+                totales = {k: totales[k] + parcial[k] for k in totales}
+                pagina = []
+        if pagina:
+            parcial = await asyncio.to_thread(_aplicar_remotos, pagina, pendientes_desde)
+            totales = {k: totales[k] + parcial[k] for k in totales}
+
+        await asyncio.to_thread(_guardar_estado, watermark_remoto=inicio)
+        return totales
+
+    # ------------------------------------------------------------------------
+    # Ciclo periódico
+    # ------------------------------------------------------------------------
+
+    async def iniciar(self) -> None:
+        """Arranca la sincronización periódica. Llamar en el startup."""
+
+        if self._tarea is not None or self.intervalo <= 0:
+            return
+        if not settings.AIRTABLE_TOKEN or not settings.AIRTABLE_BASE_ID:
+            logger.warning("⚠️ Airtable no configurado: sincronización desactivada")
+            return
+
+        self._despierto = asyncio.Event()
+        self._tarea = asyncio.create_task(self._ciclo())
+        logger.info(f"🔄 Sincronización Airtable iniciada: cada {self.intervalo}s")
+
+    async def detener(self) -> None:
+        """Frena el ciclo (una corrida a mitad retoma desde su watermark la próxima vez)."""
+
+        if self._tarea is None:
+            return
+        self._tarea.cancel()
+        await asyncio.gather(self._tarea, return_exceptions=True)
+        self._tarea = None
+
+    def despertar(self) -> None:
+        """Hubo un cambio local: sincronizar sin esperar al próximo intervalo."""
+
+        if self._despierto is not None:
+            self._despierto.set()
+
+    async def _ciclo(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._despierto.wait(), timeout=self.intervalo)
+                # Despertado por un cambio: esperar el desfase para que entre en esta corrida
+                await asyncio.sleep(self.desfase)
+            except asyncio.TimeoutError:
+                pass
+            self._despierto.clear()
+
+            try:
+                await self.sincronizar()
+            except Exception as e:
+                logger.error(f"❌ Sincronización Airtable: {e}")
+
+    def stats(self) -> dict:
+        """Watermarks guardados + última corrida. Bloqueante."""
+
+        with SessionLocal() as db:
+            estado = db.get(SyncState, NOMBRE)
+            guardado = {
+                "watermark_local": estado.watermark_local.isoformat() if estado and estado.watermark_local else None,
+                "watermark_remoto": estado.watermark_remoto.isoformat() if estado and estado.watermark_remoto else None,
+                "ultima_ejecucion": estado.ultima_ejecucion.isoformat() if estado and estado.ultima_ejecucion else None,
+                "rechazados": json.loads(estado.rechazados) if estado and estado.rechazados else [],
+                "ultimo_resultado": json.loads(estado.ultimo_resultado) if estado and estado.ultimo_resultado else None
+            }
+        return {
+            **guardado,
+            "proceso": {
+                "activo": self._tarea is not None,
+                "intervalo_seg": self.intervalo,
+                "corridas": self.corridas
+            }
+        }
+
+
+airtable_sync = AirtableSync(
+    intervalo=settings.AIRTABLE_SYNC_INTERVAL_SECONDS,
+    lote=settings.AIRTABLE_SYNC_BATCH,
+    desfase=settings.AIRTABLE_SYNC_LAG_SECONDS,
+    lease=settings.AIRTABLE_SYNC_LEASE_SECONDS
+)
@@ -0,0 +1,216 @@
+# app/integrations/airtable_writer.py
+"""
+ESCRITURA EN LOTES A AIRTABLE - Hasta 10 registros por request, a 5 req/seg
+
+¿Para qué?
+- La API de Airtable acepta hasta 10 registros por POST, pero antes se
+  mandaba uno por llamada: en un pico, 10 leads eran 10 requests
+- Airtable limita a 5 requests/seg por base y responde 429 (con 30 seg
+  de castigo) si uno se pasa: el TokenBucket frena antes de llegar
+- Guardar en la BD local el ID que Airtable le dio a cada lead
+  (Lead.airtable_record_id), para actualizarlo o sincronizarlo después
+
+Cómo funciona:
+- save_lead_to_airtable / save_chat_session_airtable (airtable.py) llaman a
+  airtable_writer.crear(...), que espera el resultado de su registro
+- Un MicroBatcher por tabla junta los registros que llegan juntos y los
+  despacha al completar AIRTABLE_BATCH_SIZE o pasados AIRTABLE_BATCH_MAX_WAIT
+- Cada POST pasa antes por `limite_airtable` (compartido con las demás
+  llamadas a Airtable de este proceso)
+- Los record IDs vuelven en el mismo orden que se mandaron: se asignan a
+  cada registro y, si vino lead_id, se guardan en la BD en un solo UPDATE
+- Si Airtable rechaza el lote con 422 (un registro inválido rechaza los
+  10), se parte en mitades y se reintenta: solo falla el registro con
+  problema, los demás se crean (o se actualizan, en actualizar())
+
+El tamaño real de cada lote depende de cuántos registros lleguen a la vez:
+desde el outbox, como mucho OUTBOX_WORKERS.
+"""
+
+import asyncio
+import logging
+from functools import partial
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import bindparam, update
+
+from app.config import settings
+from app.database import SessionLocal
+from app.integrations.http_clients import cliente_http
+from app.models.lead import Lead
+from app.utils.batching import MicroBatcher
+from app.utils.rate_limit import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+# Límite de la API de Airtable
+MAX_REGISTROS_POR_REQUEST = 10
+ESPERA_429 = 30.0
+
+# Un balde por base: todas las llamadas a Airtable de este proceso lo comparten
+limite_airtable = TokenBucket(
+    tasa=settings.AIRTABLE_RATE_LIMIT_PER_SECOND,
+    capacidad=settings.AIRTABLE_RATE_LIMIT_PER_SECOND
+)
+
+
+class AirtableError(Exception):
+    """Airtable rechazó el request (status distinto de 200)."""
+
+    def __init__(self, status: int, detalle: str):
+        super().__init__(f"Airtable {status}: {detalle[:200]}")
+        self.status = status
+
+
+def _guardar_record_ids(pares: List[Tuple[int, str]]) -> None:
+    """
+    Lead.id -> airtable_record_id, en un solo UPDATE por lote. Bloqueante.
+    No toca fecha_ultima_actividad: asociar el ID no es un cambio del lead
+    (si no, la sincronización lo volvería a mandar).
+    """
+
+    tabla = Lead.__table__
+    with SessionLocal() as db:
+        db.execute(
+            update(tabla)
+            .where(tabla.c.id == bindparam("b_id"))
+            .values(
+                airtable_record_id=bindparam("b_record_id"),
+                fecha_ultima_actividad=tabla.c.fecha_ultima_actividad
+            ),
+            [{"b_id": lead_id, "b_record_id": record_id} for lead_id, record_id in pares]
+        )
+        db.commit()
+
+
+class AirtableWriter:
+    """
+    Ejemplo:
+    record_id = await airtable_writer.crear("leads", {"Nombre": "Juan", ...}, lead_id=42)
+    """
+
+    def __init__(self, max_lote: int, max_espera: float):
+        max_lote = max(1, min(max_lote, MAX_REGISTROS_POR_REQUEST))
+        self.tablas = {
+            "leads": settings.AIRTABLE_TABLE_LEADS,
+            "sesiones": settings.AIRTABLE_TABLE_SESSIONS
+        }
+        self._lotes: Dict[str, MicroBatcher] = {
+            clave: MicroBatcher(f"airtable_{clave}", partial(self._crear_registros, clave), max_lote, max_espera)
+            for clave in self.tablas
+        }
+        self.requests = 0
+        self.rechazados = 0
+
+    async def crear(self, tabla: str, campos: dict, lead_id: Optional[int] = None) -> str:
+        """Crea un registro (en el próximo lote de su tabla) y retorna su record ID."""
+
+        return await self._lotes[tabla].enviar((campos, lead_id))
+
+    async def _crear_registros(self, tabla: str, items: List[Tuple[dict, Optional[int]]]) -> List:
+        """Un record ID por item; un AirtableError en el lugar de cada registro rechazado."""
+
+        url = f"https://api.airtable.com/v0/{settings.AIRTABLE_BASE_ID}/{self.tablas[tabla]}"
+        headers = {
+            "Authorization": f"Bearer {settings.AIRTABLE_TOKEN}",
+            "Content-Type": "application/json"
+        }
+        payload = {"records": [{"fields": campos} for campos, _ in items]}
+
+        await limite_airtable.adquirir()
+        self.requests += 1
+        response = await cliente_http("airtable").post(url, json=payload, headers=headers)
+
+        if response.status_code == 422:
+            # Un registro inválido rechaza el lote entero. Partir y reintentar
+            if len(items) == 1:
+                self.rechazados += 1
+                logger.error(f"❌ Airtable rechazó un registro de {self.tablas[tabla]}: {response.text[:200]}")
+                return [AirtableError(response.status_code, response.text)]
+            mitad = len(items) // 2
+            return (
+                await self._crear_registros(tabla, items[:mitad])
+                + await self._crear_registros(tabla, items[mitad:])
+            )
+
+        if response.status_code == 429:
+            limite_airtable.penalizar(ESPERA_429)
+            logger.warning(f"⏳ Airtable 429: pausa de {ESPERA_429:.0f}s")
+        if response.status_code != 200:
+            raise AirtableError(response.status_code, response.text)
+
+        record_ids = [registro["id"] for registro in response.json()["records"]]
+        logger.info(f"✅ Airtable: {len(record_ids)} registros creados en {self.tablas[tabla]}")
+
+        # El registro ya existe en Airtable: si falla la BD local no hay que
+        # reintentar el POST (se duplicaría), solo avisar
+        pares = [(lead_id, record_id) for (_, lead_id), record_id in zip(items, record_ids) if lead_id is not None]
+        if pares:
+            try:
+                await asyncio.to_thread(_guardar_record_ids, pares)
+            except Exception as e:
+                logger.error(f"❌ No se pudieron guardar los record IDs de Airtable: {e}")
+
+        return record_ids
+
+    async def actualizar(self, tabla: str, registros: List[Tuple[str, dict]]) -> List[str]:
+        """
+        PATCH de hasta 10 registros ya existentes: [(record_id, campos), ...].
+        Sin micro-batching: quien llama ya arma el lote (ej: la sincronización).
+
+        Retorna los record IDs que Airtable rechazó (422); los demás quedan
+        actualizados.
+        """
+
+        if len(registros) > MAX_REGISTROS_POR_REQUEST:
+            raise ValueError(f"Airtable acepta hasta {MAX_REGISTROS_POR_REQUEST} registros por request")
+
+        url = f"https://api.airtable.com/v0/{settings.AIRTABLE_BASE_ID}/{self.tablas[tabla]}"
+        headers = {
+            "Authorization": f"Bearer {settings.AIRTABLE_TOKEN}",
+            "Content-Type": "application/json"
+        }
+        payload = {"records": [{"id": record_id, "fields": campos} for record_id, campos in registros]}
+
+        await limite_airtable.adquirir()
+        self.requests += 1
+        response = await cliente_http("airtable").patch(url, json=payload, headers=headers)
+
+        if response.status_code == 422:
+            # Igual que al crear: partir hasta aislar el registro inválido
+            if len(registros) == 1:
+                self.rechazados += 1
+                logger.error(f"❌ Airtable rechazó la actualización de {registros[0][0]}: {response.text[:200]}")
+                return [registros[0][0]]
+            mitad = len(registros) // 2
+            return (
+                await self.actualizar(tabla, registros[:mitad])
+                + await self.actualizar(tabla, registros[mitad:])
+            )
+
+        if response.status_code == 429:
+            limite_airtable.penalizar(ESPERA_429)
+            logger.warning(f"⏳ Airtable 429: pausa de {ESPERA_429:.0f}s")
+        if response.status_code != 200:
+            raise AirtableError(response.status_code, response.text)
+        return []
+
+    async def cerrar(self) -> None:
+        """Despacha los lotes pendientes. Llamar en el shutdown (antes de cerrar los clientes HTTP)."""
+
+        for lote in self._lotes.values():
+            await lote.cerrar()
+
+    def stats(self) -> dict:
+        return {
+            "requests": self.requests,
+            "rechazados": self.rechazados,
+            "lotes": {clave: lote.stats() for clave, lote in self._lotes.items()},
+            "rate_limit": limite_airtable.stats()
+        }
+
+
+airtable_writer = AirtableWriter(
+    max_lote=settings.AIRTABLE_BATCH_SIZE,
+    max_espera=settings.AIRTABLE_BATCH_MAX_WAIT
+)
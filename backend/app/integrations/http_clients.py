@@ -0,0 +1,151 @@
+# app/integrations/http_clients.py
+"""
+CLIENTES HTTP COMPARTIDOS - Un pool keep-alive por integración
+
+¿Para qué?
+- Antes cada llamada a Telegram, SendGrid, Airtable o n8n abría su propio
+  httpx.AsyncClient: DNS + TCP + TLS en CADA notificación (~300ms)
+- Con un cliente por integración, abierto en el startup, las conexiones
+  quedan vivas (keep-alive) y la siguiente llamada es solo el round-trip
+- Timeouts por integración (Telegram no tiene por qué esperar lo que Airtable)
+- Métricas de reuso: cuántos requests fueron por una conexión ya abierta
+
+Uso:
+    client = cliente_http("telegram")
+    response = await client.post(url, json=payload)
+
+Los pools se abren en el startup (init_http_clients) y se cierran en el
+shutdown (close_http_clients). Si se pide un cliente antes (por ejemplo
+desde un script), se crea en el momento.
+
+HTTP/2 (HTTP_CLIENT_HTTP2=true) necesita el paquete h2; si no está
+instalado se sigue con HTTP/1.1 y se avisa en el log.
+"""
+
+import logging
+from typing import Dict
+
+import httpx
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+# ============================================================================
+# ⚙️ CONFIGURACIÓN POR INTEGRACIÓN
+# ============================================================================
+
+def _integraciones() -> Dict[str, float]:
+    """Integración -> timeout total (segundos) de cada request."""
+
+    return {
+        "telegram": settings.TELEGRAM_TIMEOUT,
+        "sendgrid": settings.SENDGRID_TIMEOUT,
+        "airtable": settings.AIRTABLE_TIMEOUT,
+        "n8n": settings.N8N_TIMEOUT
+    }
+
+
+def _http2_disponible() -> bool:
+    if not settings.HTTP_CLIENT_HTTP2:
+        return False
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        logger.warning("⚠️ HTTP_CLIENT_HTTP2=true pero el paquete 'h2' no está instalado: se usa HTTP/1.1")
+        return False
+    return True
+
+
+# ============================================================================
+# 📊 CLIENTE CON MÉTRICAS DE REUSO
+# ============================================================================
+
+class _ClienteIntegracion:
+    """httpx.AsyncClient de una integración + contadores de conexiones."""
+
+    def __init__(self, nombre: str, timeout: float, http2: bool):
+        self.nombre = nombre
+        self.requests = 0
+        self.conexiones_nuevas = 0
+        self.handshakes_tls = 0
+        self.errores = 0
+
+        self.client = httpx.AsyncClient(
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=settings.HTTP_CLIENT_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.HTTP_CLIENT_MAX_CONNECTIONS,
+                keepalive_expiry=settings.HTTP_CLIENT_KEEPALIVE_SECONDS
+            ),
+            timeout=httpx.Timeout(timeout, connect=min(timeout, settings.HTTP_CLIENT_CONNECT_TIMEOUT)),
+            event_hooks={"request": [self._al_enviar], "response": [self._al_recibir]}
+        )
+
+    async def _al_enviar(self, request: httpx.Request) -> None:
+        self.requests += 1
+        # httpcore avisa cada paso de la conexión: si hay connect_tcp, no se reusó
+        request.extensions["trace"] = self._trace
+
+    async def _al_recibir(self, response: httpx.Response) -> None:
+        if response.status_code >= 500:
+            self.errores += 1
+
+    async def _trace(self, evento: str, info: dict) -> None:
+        if evento == "connection.connect_tcp.complete":
+            self.conexiones_nuevas += 1
+        elif evento == "connection.start_tls.complete":
+            self.handshakes_tls += 1
+
+    def stats(self) -> dict:
+        reusados = max(self.requests - self.conexiones_nuevas, 0)
+        return {
+            "requests": self.requests,
+            "conexiones_nuevas": self.conexiones_nuevas,
+            "handshakes_tls": self.handshakes_tls,
+            "reuso": round(reusados / self.requests, 3) if self.requests else None,
+            "errores_5xx": self.errores
+        }
+
+
+# ============================================================================
+# 🗂️ REGISTRO (uno por proceso)
+# ============================================================================
+
+_clientes: Dict[str, _ClienteIntegracion] = {}
+
+
+def cliente_http(nombre: str) -> httpx.AsyncClient:
+    """Cliente compartido de la integración `nombre` (telegram, sendgrid, airtable, n8n)."""
+
+    registro = _clientes.get(nombre)
+    if registro is None:
+        timeouts = _integraciones()
+        if nombre not in timeouts:
+            raise KeyError(f"Integración HTTP desconocida: '{nombre}'")
+        registro = _ClienteIntegracion(nombre, timeouts[nombre], _http2_disponible())
+        _clientes[nombre] = registro
+    return registro.client
+
+
+async def init_http_clients() -> None:
+    """Abre un pool por integración. Llamar en el startup."""
+
+    for nombre in _integraciones():
+        cliente_http(nombre)
+    logger.info(f"🔌 Clientes HTTP listos: {', '.join(_clientes)}")
+
+
+async def close_http_clients() -> None:
+    """Cierra los pools. Llamar en el shutdown."""
+
+    for registro in _clientes.values():
+        await registro.client.aclose()
+    _clientes.clear()
+
+
+def http_clients_stats() -> dict:
+    """Requests, conexiones nuevas y proporción de reuso por integración."""
+
+    return {nombre: registro.stats() for nombre, registro in _clientes.items()}
@@ -0,0 +1,331 @@
+# app/integrations/plantillas_email.py
+"""
+PLANTILLAS DE EMAIL - Compiladas una vez, personalizadas por destinatario
+
+¿Para qué?
+- Antes cada email armaba su HTML con un f-string grande en cada llamada
+- El envío masivo (sendgrid_bulk.py) manda UN cuerpo por request y varios
+  destinatarios (personalizations): cada uno solo lleva sus valores
+
+Cómo funciona:
+- Cada plantilla se escribe con la sintaxis de app/utils/plantillas.py
+  ({campo}, {telefono|wa}, {?enlace_meet}...{/enlace_meet}) y se compila al
+  importar el módulo: HTML, texto plano y versión con etiquetas de SendGrid
+- Por destinatario solo se arma el dict de sustituciones (valores ya
+  escapados por la función generada) y el asunto (texto plano)
+- Si ningún valor del destinatario cambia al escaparlo (lo común), el texto
+  plano usa las mismas etiquetas que el HTML: un mensaje largo viaja una
+  vez y no dos. Esos destinatarios van con `contenido_compartido`
+- `preparar(datos)` calcula campos que son lógica y no formato (color del
+  score, fecha legible, ...)
+
+Uso:
+    plantilla = PLANTILLAS["seguimiento"]
+    personalizacion, compartida = plantilla.personalizacion("juan@empresa.com", {"nombre": "Juan", ...})
+    asunto, html, texto = plantilla.render({"nombre": "Juan", ...})   # envío individual
+"""
+
+from datetime import datetime
+from typing import Callable, Dict, Optional, Tuple
+
+from app.utils.plantillas import Plantilla
+
+
+class PlantillaEmail:
+    """
+    Ejemplo:
+    plantilla = PlantillaEmail("hola", asunto="Hola {nombre}", html="<p>Hola {nombre}</p>")
+    plantilla.html          # "<p>Hola -nombre-</p>"  (con etiquetas de SendGrid)
+    plantilla.personalizacion("juan@x.com", {"nombre": "Juan & Cía"})
+    # ({"to": [...], "subject": "Hola Juan & Cía", "substitutions": {"-nombre-": "Juan &amp; Cía", ...}}, False)
+    """
+
+    def __init__(
+        self,
+        nombre: str,
+        asunto: str,
+        html: str,
+        preparar: Optional[Callable[[dict], dict]] = None
+    ):
+        self.nombre = nombre
+        self.preparar = preparar
+
+        self.asunto = Plantilla(asunto, html=False, nombre=f"{nombre}_asunto")
+        self.cuerpo = Plantilla(html, texto=True, nombre=nombre)
+        self.html, self.texto, self._sustituciones = self.cuerpo.con_etiquetas()
+        _, texto_compartido, self._sustituciones_compartidas = self.cuerpo.con_etiquetas(compartir_valores=True)
+
+        # Etiquetas de valores del texto -> la del mismo valor en el HTML
+        etiquetas = self._sustituciones({})
+        self._pares_texto = [
+            (etiqueta, "-" + etiqueta[3:])
+            for etiqueta in etiquetas
+            if etiqueta.startswith("-t:") and etiqueta[3] not in "?!" and "-" + etiqueta[3:] in etiquetas
+        ]
+
+        # SendGrid pide text/plain antes que text/html
+        self.contenido = [
+            {"type": "text/plain", "value": self.texto},
+            {"type": "text/html", "value": self.html}
+        ]
+        self.contenido_compartido = [
+            {"type": "text/plain", "value": texto_compartido},
+            {"type": "text/html", "value": self.html}
+        ]
+
+    def personalizacion(self, email: str, datos: dict) -> Tuple[dict, bool]:
+        """
+        Entrada de `personalizations` para un destinatario, y si va con
+        `contenido_compartido` (True) o con `contenido` (False).
+        """
+
+        if self.preparar:
+            datos = self.preparar(datos)
+        sustituciones = self._sustituciones(datos)
+        compartida = all(sustituciones[texto] == sustituciones[html] for texto, html in self._pares_texto)
+        if compartida:
+            sustituciones = self._sustituciones_compartidas(datos)
+        return {
+            "to": [{"email": email}],
+            "subject": self.asunto.render(datos),
+            "substitutions": sustituciones
+        }, compartida
+
+    def render(self, datos: dict) -> Tuple[str, str, str]:
+        """(asunto, html, texto) completos, para un envío individual."""
+
+        if self.preparar:
+            datos = self.preparar(datos)
+        return self.asunto.render(datos), self.cuerpo.render(datos), self.cuerpo.render_texto(datos)
+
+
+# ============================================================================
+# 🔧 CAMPOS DERIVADOS
+# ============================================================================
+
+def _preparar_admin(datos: dict) -> dict:
+    score = datos.get("lead_score")
+    if score is None:
+        color, emoji, score_txt = "#64748b", "•", "sin score"
+    elif score >= 80:
+        color, emoji, score_txt = "#22c55e", "🔥", f"{score}/100"  # Verde
+    elif score >= 60:
+        color, emoji, score_txt = "#f59e0b", "⭐", f"{score}/100"  # Naranja
+    else:
+        color, emoji, score_txt = "#ef4444", "⚡", f"{score}/100"  # Rojo
+
+    fecha = datos.get("fecha")
+    return {
+        **datos,
+        "origen": datos.get("origen") or "formulario_landing",
+        "color_score": color,
+        "emoji_score": emoji,
+        "score_txt": score_txt,
+        "fecha_txt": datetime.fromisoformat(fecha).strftime("%Y-%m-%d %H:%M:%S") if fecha else "-"
+    }
+
+
+# ============================================================================
+# 📄 PLANTILLAS
+# ============================================================================
+
+_CABECERA = """
+        <div style="background: linear-gradient(135deg, #0f172a 0%, #1e293b 100%); color: #22c55e; padding: 30px; text-align: center; border-radius: 10px 10px 0 0;">
+            <h1 style="margin: 0; font-size: 24px;">{titulo}</h1>
+        </div>
+"""
+
+_FIRMA = """
+            <hr style="border: none; border-top: 1px solid #ddd; margin: 20px 0;">
+
+            <p style="font-size: 12px; color: #999; margin: 20px 0 0 0;">
+                Saludos,<br>
+                <strong>Luciano Valinoti</strong><br>
+                <em>Especialista en Automatización IT</em><br>
+                📍 Córdoba, Argentina
+            </p>
+"""
+
+
+CONFIRMACION_USUARIO = PlantillaEmail(
+    "confirmacion_usuario",
+    asunto="Recibí tu consulta - {nombre}",
+    html="""
+    <div style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto; color: #333;">
+        """ + _CABECERA.replace("{titulo}", "¡Hola {nombre}!") + """
+        <div style="background: #f9f9f9; padding: 30px; border-radius: 0 0 10px 10px;">
+
+            <p style="font-size: 16px; line-height: 1.6;">
+                Gracias por contactarme. He recibido tu mensaje correctamente.
+            </p>
+
+            <div style="background: white; padding: 20px; border-left: 5px solid #22c55e; margin: 20px 0; border-radius: 5px;">
+                <p style="margin: 0; color: #666;"><strong>Tu mensaje:</strong></p>
+                <p style="margin: 10px 0 0 0; color: #333; font-style: italic;">"{mensaje}"</p>
+            </div>
+
+            <p style="font-size: 14px; color: #666;"><strong>Tus datos de contacto:</strong></p>
+            <ul style="margin: 10px 0 20px 0; padding-left: 20px;">
+                <li style="margin: 5px 0;">📧 Email: <strong>{email}</strong></li>
+                <li style="margin: 5px 0;">📱 WhatsApp: <strong>{telefono}</strong></li>
+            </ul>
+
+            <p style="font-size: 14px; color: #666; line-height: 1.6;">
+                Me pondré en contacto contigo a la brevedad para analizar cómo podemos automatizar tus procesos
+                y mejorar la eficiencia de tu empresa.
+            </p>
+
+            <div style="text-align: center; margin: 20px 0;">
+                <a href="https://wa.me/{telefono|wa}"
+                   style="display: inline-block; background: #25D366; color: white; padding: 12px 30px; text-decoration: none; border-radius: 5px; font-weight: bold; margin-right: 10px; margin-bottom: 10px;">
+                    📱 Contactar por WhatsApp
+                </a>
+                <a href="mailto:lucianovalinoti@gmail.com?subject=Re:%20tu%20consulta"
+                   style="display: inline-block; background: #0066cc; color: white; padding: 12px 30px; text-decoration: none; border-radius: 5px; font-weight: bold;">
+                    📧 Escribir Email
+                </a>
+            </div>
+            """ + _FIRMA + """
+        </div>
+    </div>
+    """
+)
+
+
+NUEVO_LEAD_ADMIN = PlantillaEmail(
+    "nuevo_lead_admin",
+    asunto="🚀 NUEVO LEAD: {nombre}",
+    preparar=_preparar_admin,
+    html="""
+    <div style="font-family: Arial, sans-serif; max-width: 700px; margin: 0 auto;">
+
+        <div style="background: linear-gradient(135deg, #0f172a 0%, #1e293b 100%); color: #22c55e; padding: 30px; text-align: center; border-radius: 10px 10px 0 0;">
+            <h1 style="margin: 0; font-size: 28px;">🚀 NUEVO LEAD DETECTADO</h1>
+            <p style="margin: 10px 0 0 0; font-size: 14px;">Formulario de {origen|titulo}</p>
+        </div>
+
+        <div style="background: white; padding: 30px; border-radius: 0 0 10px 10px; border: 1px solid #eee;">
+
+            <table style="width: 100%; margin: 20px 0;">
+                <tr>
+                    <td style="padding: 10px; background: #f9f9f9; font-weight: bold; width: 120px;">👤 Nombre:</td>
+                    <td style="padding: 10px;">{nombre}</td>
+                </tr>
+                <tr>
+                    <td style="padding: 10px; background: #f9f9f9; font-weight: bold;">📧 Email:</td>
+                    <td style="padding: 10px;"><a href="mailto:{email}" style="color: #0066cc;">{email}</a></td>
+                </tr>
+                <tr>
+                    <td style="padding: 10px; background: #f9f9f9; font-weight: bold;">📱 Teléfono:</td>
+                    <td style="padding: 10px;">
+                        <a href="https://wa.me/{telefono|wa}" style="color: #25D366;">{telefono} (WhatsApp)</a>
+                    </td>
+                </tr>
+                <tr>
+                    <td style="padding: 10px; background: #f9f9f9; font-weight: bold;">💬 Mensaje:</td>
+                    <td style="padding: 10px;"><em>{mensaje}</em></td>
+                </tr>
+                <tr>
+                    <td style="padding: 10px; background: #f9f9f9; font-weight: bold;">⭐ Score:</td>
+                    <td style="padding: 10px;">
+                        <span style="background: {color_score}; color: white; padding: 5px 10px; border-radius: 5px; font-weight: bold;">
+                            {emoji_score} {score_txt}
+                        </span>
+                    </td>
+                </tr>
+            </table>
+
+            <div style="margin-top: 20px; padding: 15px; background: #f0f9ff; border-left: 4px solid #22c55e;">
+                <p style="margin: 0;"><strong>⏰ Timestamp:</strong> {fecha_txt} UTC</p>
+            </div>
+
+            <div style="text-align: center; margin: 30px 0; padding: 20px; background: #f0f9ff; border-radius: 10px;">
+                <p style="margin: 0 0 15px 0; font-size: 14px; color: #666;"><strong>Acciones rápidas:</strong></p>
+                <a href="https://wa.me/{telefono|wa}?text=Hola%20{nombre|url},%20vi%20tu%20consulta"
+                   style="display: inline-block; background: #25D366; color: white; padding: 12px 25px; text-decoration: none; border-radius: 5px; font-weight: bold; margin-right: 10px; margin-bottom: 10px;">
+                    📲 RESPONDER POR WHATSAPP
+                </a>
+                <a href="mailto:{email}?subject=Re:%20tu%20consulta%20sobre%20automatizaci%C3%B3n"
+                   style="display: inline-block; background: #0066cc; color: white; padding: 12px 25px; text-decoration: none; border-radius: 5px; font-weight: bold;">
+                    📧 RESPONDER POR EMAIL
+                </a>
+            </div>
+
+            <hr style="border: none; border-top: 1px solid #ddd; margin: 20px 0;">
+
+            <p style="font-size: 12px; color: #999; margin: 10px 0;">
+                <strong>💡 Tip:</strong> Responde en las próximas 2 horas para maximizar las chances de conversión.
+            </p>
+        </div>
+    </div>
+    """
+)
+
+
+RECORDATORIO_CITA = PlantillaEmail(
+    "recordatorio_cita",
+    asunto="⏰ Recordatorio: Cita el {fecha_cita} a las {hora_cita}",
+    html="""
+    <div style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
+        """ + _CABECERA.replace("{titulo}", "📅 RECORDATORIO DE CITA") + """
+        <div style="background: #f9f9f9; padding: 30px; border-radius: 0 0 10px 10px;">
+
+            <p>¡Hola {nombre}!</p>
+
+            <p>Te recordamos que tenemos una cita agendada:</p>
+
+            <div style="background: white; padding: 20px; border-left: 5px solid #22c55e; margin: 20px 0; border-radius: 5px;">
+                <p style="margin: 5px 0;"><strong>📅 Fecha:</strong> {fecha_cita}</p>
+                <p style="margin: 5px 0;"><strong>⏰ Hora:</strong> {hora_cita} (Hora Argentina)</p>
+            </div>
+
+            {?enlace_meet}
+            <p style="text-align: center; margin: 20px 0;">
+                <a href="{enlace_meet}"
+                   style="display: inline-block; background: #4285F4; color: white; padding: 12px 30px; text-decoration: none; border-radius: 5px; font-weight: bold;">
+                    🎥 UNIRSE A LA LLAMADA (Google Meet)
+                </a>
+            </p>
+            {/enlace_meet}
+
+            <p style="color: #666;">
+                Si necesitas reagendar o cancelar, simplemente responde este email.
+            </p>
+            """ + _FIRMA + """
+        </div>
+    </div>
+    """
+)
+
+
+SEGUIMIENTO = PlantillaEmail(
+    "seguimiento",
+    asunto="¿Seguimos con tu consulta, {nombre}?",
+    html="""
+    <div style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto; color: #333;">
+        """ + _CABECERA.replace("{titulo}", "¡Hola {nombre}!") + """
+        <div style="background: #f9f9f9; padding: 30px; border-radius: 0 0 10px 10px;">
+
+            <p style="font-size: 16px; line-height: 1.6;">
+                Hace unos días me escribiste por esta consulta:
+            </p>
+
+            <div style="background: white; padding: 20px; border-left: 5px solid #22c55e; margin: 20px 0; border-radius: 5px;">
+                <p style="margin: 0; color: #333; font-style: italic;">"{mensaje|200}"</p>
+            </div>
+
+            <p style="font-size: 14px; color: #666; line-height: 1.6;">
+                ¿Pudiste avanzar? Si todavía te interesa automatizarlo, respondé este email
+                y coordinamos una llamada corta para ver tu caso.
+            </p>
+            """ + _FIRMA + """
+        </div>
+    </div>
+    """
+)
+
+
+PLANTILLAS: Dict[str, PlantillaEmail] = {
+    plantilla.nombre: plantilla
+    for plantilla in (CONFIRMACION_USUARIO, NUEVO_LEAD_ADMIN, RECORDATORIO_CITA, SEGUIMIENTO)
+}
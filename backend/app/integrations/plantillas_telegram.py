@@ -0,0 +1,89 @@
+# app/integrations/plantillas_telegram.py
+"""
+PLANTILLAS DE TELEGRAM - Avisos al admin (parse_mode HTML)
+
+Compiladas al importar con app/utils/plantillas.py: cada valor sale escapado
+(un nombre con "<" ya no rompe el mensaje ni lo hace rechazar por Telegram)
+y el link de WhatsApp se arma siempre igual ({telefono|wa}).
+
+Uso:
+    texto = NUEVO_LEAD_FORMULARIO.render({"nombre": "Juan", "email": ..., ...})
+"""
+
+from app.utils.plantillas import Plantilla
+
+# tiene_score: un bloque {?lead_score} ocultaría un score 0
+NUEVO_LEAD_FORMULARIO = Plantilla("""
+🚀 <b>NUEVO LEAD - FORMULARIO</b>
+
+👤 <b>Nombre:</b> {nombre}
+📧 <b>Email:</b> {email}
+📱 <b>WhatsApp:</b> {telefono}
+💬 <b>Mensaje:</b> {mensaje}
+{?tiene_score}⭐ <b>Lead Score:</b> {lead_score}/100
+{/tiene_score}
+<a href="https://wa.me/{telefono|wa}">📲 WHATSAPP</a> | <a href="mailto:{email}">📧 EMAIL</a>
+""", nombre="telegram_nuevo_lead_formulario")
+
+
+NUEVO_LEAD_CHAT = Plantilla("""
+<b>🚀 NUEVO LEAD - CHATBOT</b>
+
+<b>👤 Nombre:</b> <code>{nombre}</code>
+<b>📧 Email:</b> <code>{email}</code>
+<b>📱 WhatsApp:</b> <a href="https://wa.me/{telefono|wa}">{telefono}</a>
+
+<b>{emoji_tipo} Tipo:</b> {?tipo_cliente}{tipo_cliente}{/tipo_cliente}{!tipo_cliente}No especificado{/tipo_cliente}
+<b>🎯 Servicio:</b> {mensaje|100}
+
+<b>📝 Problema/Necesidad:</b>
+<code>{?problema}{problema|150}{/problema}{!problema}No especificado{/problema}</code>
+
+<b>{emoji_score} Score:</b> <code>{lead_score}/100</code>
+<b>📍 Origen:</b> {origen}
+
+━━━━━━━━━━━━━━━━━━━━━━
+<a href="https://wa.me/{telefono|wa}?text=Hola%20{nombre|url}%2C%20soy%20Luciano.%20Recib%C3%AD%20tu%20consulta.">📲 RESPONDER WHATSAPP</a> | <a href="mailto:{email}">📧 EMAIL</a>
+""", nombre="telegram_nuevo_lead_chat")
+
+
+# Línea de un lead dentro del resumen que arma el despachador en una ráfaga
+RESUMEN_LEAD = Plantilla(
+    "{emoji_score} <b>{nombre}</b> · {lead_score}/100 · {email} · {origen}",
+    nombre="telegram_resumen_lead"
+)
+
+
+ALERTA = Plantilla("""
+<b>{emoji} ALERTA</b>
+
+<b>Título:</b> {titulo}
+<b>Descripción:</b> {descripcion}
+<b>Gravedad:</b> {gravedad}
+
+<i>⏰ {hora}</i>
+""", nombre="telegram_alerta")
+
+
+REPORTE_DIARIO = Plantilla("""
+<b>📊 REPORTE DIARIO</b>
+
+<b>📈 Métricas de hoy:</b>
+  • Nuevos leads: <code>{total_leads}</code>
+  • Conversiones: <code>{conversiones}</code>
+  • Score promedio: <code>{score_promedio}/100</code>
+
+<b>Tasa de conversión:</b> <code>{tasa_conversion}%</code>
+
+<i>⏰ {hora}</i>
+""", nombre="telegram_reporte_diario")
+
+
+def emoji_score(lead_score: int) -> str:
+    """🔥 caliente, ⭐ tibio, ⚡ frío (mismos cortes en todos los avisos)."""
+
+    if lead_score >= 80:
+        return "🔥"
+    if lead_score >= 60:
+        return "⭐"
+    return "⚡"
@@ -11,6 +11,9 @@ Envía emails transaccionales (confirmaciones, recordatorios, etc).
 
 Plan gratuito: 100 emails/día
 
+Los emails con plantilla (confirmación, aviso al admin, recordatorios)
+salen por sendgrid_bulk: los que llegan juntos comparten un request.
+
 Setup:
 1. Registrate en https://sendgrid.com (gratuito)
 2. Verifica email
@@ -18,10 +21,13 @@ Setup:
 """
 
 import logging
+from datetime import datetime
 from typing import List, Optional
 import httpx
 
 from app.config import settings
+from app.integrations.http_clients import cliente_http
+from app.integrations.sendgrid_bulk import sendgrid_bulk
 
 logger = logging.getLogger(__name__)
 
@@ -119,15 +125,15 @@ async def send_email_sendgrid(
         payload["personalizations"][0]["bcc"] = [{"email": email} for email in bcc]
     
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.post(url, json=payload, headers=headers)
-            
-            if response.status_code in [200, 201, 202]:
-                logger.info(f"✅ Email enviado a {to_email}")
-                return True
-            else:
-                logger.error(f"❌ Error SendGrid: {response.status_code} - {response.text}")
-                return False
+        client = cliente_http("sendgrid")
+        response = await client.post(url, json=payload, headers=headers)
+        
+        if response.status_code in [200, 201, 202]:
+            logger.info(f"✅ Email enviado a {to_email}")
+            return True
+        else:
+            logger.error(f"❌ Error SendGrid: {response.status_code} - {response.text}")
+            return False
     
     except httpx.TimeoutException:
         logger.error("❌ Timeout conectando a SendGrid")
@@ -154,78 +160,14 @@ async def send_email_confirmacion_usuario(
     - Confirmación de que recibiste su mensaje
     - Sus datos
     - Links rápidos para contactar (WhatsApp, email)
-    """
-    
-    # Sanitizar datos
-    nombre = nombre.replace("<", "&lt;").replace(">", "&gt;")
-    email = email.replace("<", "&lt;").replace(">", "&gt;")
-    mensaje = mensaje.replace("<", "&lt;").replace(">", "&gt;")
     
-    html_content = f"""
-    <div style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto; color: #333;">
-        
-        <!-- Header -->
-        <div style="background: linear-gradient(135deg, #0f172a 0%, #1e293b 100%); color: #22c55e; padding: 30px; text-align: center; border-radius: 10px 10px 0 0;">
-            <h1 style="margin: 0; font-size: 24px;">¡Hola {nombre}!</h1>
-        </div>
-        
-        <!-- Body -->
-        <div style="background: #f9f9f9; padding: 30px; border-radius: 0 0 10px 10px;">
-            
-            <p style="font-size: 16px; line-height: 1.6;">
-                Gracias por contactarme. He recibido tu mensaje correctamente.
-            </p>
-            
-            <div style="background: white; padding: 20px; border-left: 5px solid #22c55e; margin: 20px 0; border-radius: 5px;">
-                <p style="margin: 0; color: #666;"><strong>Tu mensaje:</strong></p>
-                <p style="margin: 10px 0 0 0; color: #333; font-style: italic;">"{mensaje}"</p>
-            </div>
-            
-            <p style="font-size: 14px; color: #666;"><strong>Tus datos de contacto:</strong></p>
-            <ul style="margin: 10px 0 20px 0; padding-left: 20px;">
-                <li style="margin: 5px 0;">📧 Email: <strong>{email}</strong></li>
-                <li style="margin: 5px 0;">📱 WhatsApp: <strong>{telefono}</strong></li>
-            </ul>
-            
-            <p style="font-size: 14px; color: #666; line-height: 1.6;">
-                Me pondré en contacto contigo a la brevedad para analizar cómo podemos automatizar tus procesos 
-                y mejorar la eficiencia de tu empresa.
-            </p>
-            
-            <hr style="border: none; border-top: 1px solid #ddd; margin: 20px 0;">
-            
-            <p style="font-size: 14px; color: #666; margin: 15px 0;">
-                <strong>¿Necesitas contactarme de inmediato?</strong>
-            </p>
-            
-            <div style="text-align: center; margin: 20px 0;">
-                <a href="https://wa.me/{telefono.replace('+', '').replace(' ', '')}" 
-                   style="display: inline-block; background: #25D366; color: white; padding: 12px 30px; text-decoration: none; border-radius: 5px; font-weight: bold; margin-right: 10px; margin-bottom: 10px;">
-                    📱 Contactar por WhatsApp
-                </a>
-                <a href="mailto:lucianovalinoti@gmail.com?subject=Re:%20tu%20consulta" 
-                   style="display: inline-block; background: #0066cc; color: white; padding: 12px 30px; text-decoration: none; border-radius: 5px; font-weight: bold;">
-                    📧 Escribir Email
-                </a>
-            </div>
-            
-            <hr style="border: none; border-top: 1px solid #ddd; margin: 20px 0;">
-            
-            <p style="font-size: 12px; color: #999; margin: 20px 0 0 0;">
-                Saludos,<br>
-                <strong>Luciano Valinoti</strong><br>
-                <em>Especialista en Automatización IT</em><br>
-                📍 Córdoba, Argentina
-            </p>
-        </div>
-        
-    </div>
+    Plantilla "confirmacion_usuario" (plantillas_email.py): escapa sola.
     """
     
-    return await send_email_sendgrid(
-        to_email=email,
-        subject=f"Recibí tu consulta - {nombre}",
-        html_content=html_content
+    return await sendgrid_bulk.enviar(
+        "confirmacion_usuario",
+        email,
+        {"nombre": nombre, "email": email, "telefono": telefono, "mensaje": mensaje}
     )
 
 
@@ -238,8 +180,9 @@ async def send_email_nuevo_lead_admin(
     email: str,
     telefono: str,
     mensaje: str,
-    lead_score: int,
-    origen: str = "formulario_landing"
+    lead_score: Optional[int] = None,
+    origen: str = "formulario_landing",
+    fecha: Optional[str] = None
 ) -> bool:
     """
     Notifica al admin (Luciano) cuando llega un nuevo lead.
@@ -248,97 +191,22 @@ async def send_email_nuevo_lead_admin(
     - Detalles completos del lead
     - Botones rápidos para responder (WhatsApp, email)
     - Score del lead
-    """
-    
-    # Sanitizar
-    nombre = nombre.replace("<", "&lt;").replace(">", "&gt;")
-    email = email.replace("<", "&lt;").replace(">", "&gt;")
-    mensaje = mensaje.replace("<", "&lt;").replace(">", "&gt;")
-    
-    # Color según score
-    if lead_score >= 80:
-        color_score = "#22c55e"  # Verde
-        emoji_score = "🔥"
-    elif lead_score >= 60:
-        color_score = "#f59e0b"  # Naranja
-        emoji_score = "⭐"
-    else:
-        color_score = "#ef4444"  # Rojo
-        emoji_score = "⚡"
     
-    html_content = f"""
-    <div style="font-family: Arial, sans-serif; max-width: 700px; margin: 0 auto;">
-        
-        <!-- Header -->
-        <div style="background: linear-gradient(135deg, #0f172a 0%, #1e293b 100%); color: #22c55e; padding: 30px; text-align: center; border-radius: 10px 10px 0 0;">
-            <h1 style="margin: 0; font-size: 28px;">🚀 NUEVO LEAD DETECTADO</h1>
-            <p style="margin: 10px 0 0 0; font-size: 14px;">Formulario de {origen.replace('_', ' ').title()}</p>
-        </div>
-        
-        <!-- Body -->
-        <div style="background: white; padding: 30px; border-radius: 0 0 10px 10px; border: 1px solid #eee;">
-            
-            <!-- Información del lead -->
-            <table style="width: 100%; margin: 20px 0;">
-                <tr>
-                    <td style="padding: 10px; background: #f9f9f9; font-weight: bold; width: 120px;">👤 Nombre:</td>
-                    <td style="padding: 10px;">{nombre}</td>
-                </tr>
-                <tr>
-                    <td style="padding: 10px; background: #f9f9f9; font-weight: bold;">📧 Email:</td>
-                    <td style="padding: 10px;"><a href="mailto:{email}" style="color: #0066cc;">{email}</a></td>
-                </tr>
-                <tr>
-                    <td style="padding: 10px; background: #f9f9f9; font-weight: bold;">📱 Teléfono:</td>
-                    <td style="padding: 10px;">
-                        <a href="https://wa.me/{telefono.replace('+', '').replace(' ', '')}" style="color: #25D366;">
-                            {telefono} (WhatsApp)
-                        </a>
-                    </td>
-                </tr>
-                <tr>
-                    <td style="padding: 10px; background: #f9f9f9; font-weight: bold;">💬 Mensaje:</td>
-                    <td style="padding: 10px;"><em>{mensaje[:150]}...</em></td>
-                </tr>
-                <tr>
-                    <td style="padding: 10px; background: #f9f9f9; font-weight: bold;">⭐ Score:</td>
-                    <td style="padding: 10px;">
-                        <span style="background: {color_score}; color: white; padding: 5px 10px; border-radius: 5px; font-weight: bold;">
-                            {emoji_score} {lead_score}/100
-                        </span>
-                    </td>
-                </tr>
-            </table>
-            
-            <!-- Botones de acción -->
-            <div style="text-align: center; margin: 30px 0; padding: 20px; background: #f0f9ff; border-radius: 10px;">
-                <p style="margin: 0 0 15px 0; font-size: 14px; color: #666;"><strong>Acciones rápidas:</strong></p>
-                <a href="https://wa.me/{telefono.replace('+', '').replace(' ', '')}?text=Hola%20{nombre.replace(' ', '%20')},%20vi%20tu%20consulta" 
-                   style="display: inline-block; background: #25D366; color: white; padding: 12px 25px; text-decoration: none; border-radius: 5px; font-weight: bold; margin-right: 10px; margin-bottom: 10px;">
-                    📲 RESPONDER POR WHATSAPP
-                </a>
-                <a href="mailto:{email}?subject=Re:%20tu%20consulta%20sobre%20automatizaci%C3%B3n" 
-                   style="display: inline-block; background: #0066cc; color: white; padding: 12px 25px; text-decoration: none; border-radius: 5px; font-weight: bold;">
-                    📧 RESPONDER POR EMAIL
-                </a>
-            </div>
-            
-            <!-- Footer -->
-            <hr style="border: none; border-top: 1px solid #ddd; margin: 20px 0;">
-            
-            <p style="font-size: 12px; color: #999; margin: 10px 0;">
-                <strong>💡 Tip:</strong> Responde en las próximas 2 horas para maximizar las chances de conversión.
-            </p>
-            
-        </div>
-        
-    </div>
+    Plantilla "nuevo_lead_admin": varios leads juntos salen en un solo request.
     """
     
-    return await send_email_sendgrid(
-        to_email=settings.SENDGRID_FROM_EMAIL,  # A ti mismo
-        subject=f"🚀 NUEVO LEAD: {nombre}",
-        html_content=html_content
+    return await sendgrid_bulk.enviar(
+        "nuevo_lead_admin",
+        settings.SENDGRID_FROM_EMAIL,  # A ti mismo
+        {
+            "nombre": nombre,
+            "email": email,
+            "telefono": telefono,
+            "mensaje": mensaje,
+            "lead_score": lead_score,
+            "origen": origen,
+            "fecha": fecha or datetime.utcnow().isoformat()
+        }
     )
 
 
@@ -362,60 +230,27 @@ async def send_email_recordatorio_cita(
     - fecha_cita: Fecha (ej: "05 de Febrero 2025")
     - hora_cita: Hora (ej: "15:00 hs")
     - enlace_meet: URL de Google Meet (opcional)
-    """
     
-    nombre = nombre.replace("<", "&lt;").replace(">", "&gt;")
+    Para muchas citas a la vez: enviar_recordatorios_citas (un solo request).
+    """
     
-    enlace_html = ""
-    if enlace_meet:
-        enlace_html = f"""
-        <p style="text-align: center; margin: 20px 0;">
-            <a href="{enlace_meet}" 
-               style="display: inline-block; background: #4285F4; color: white; padding: 12px 30px; text-decoration: none; border-radius: 5px; font-weight: bold;">
-                🎥 UNIRSE A LA LLAMADA (Google Meet)
-            </a>
-        </p>
-        """
+    return await sendgrid_bulk.enviar(
+        "recordatorio_cita",
+        email,
+        {"nombre": nombre, "fecha_cita": fecha_cita, "hora_cita": hora_cita, "enlace_meet": enlace_meet}
+    )
+
+
+async def enviar_recordatorios_citas(citas: List[dict]) -> dict:
+    """
+    Recordatorios de muchas citas (ej: todas las de mañana) en un puñado de requests.
     
-    html_content = f"""
-    <div style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
-        
-        <div style="background: linear-gradient(135deg, #0f172a 0%, #1e293b 100%); color: #22c55e; padding: 30px; text-align: center; border-radius: 10px 10px 0 0;">
-            <h1 style="margin: 0; font-size: 24px;">📅 RECORDATORIO DE CITA</h1>
-        </div>
-        
-        <div style="background: #f9f9f9; padding: 30px; border-radius: 0 0 10px 10px;">
-            
-            <p>¡Hola {nombre}!</p>
-            
-            <p>Te recordamos que tenemos una cita agendada:</p>
-            
-            <div style="background: white; padding: 20px; border-left: 5px solid #22c55e; margin: 20px 0; border-radius: 5px;">
-                <p style="margin: 5px 0;"><strong>📅 Fecha:</strong> {fecha_cita}</p>
-                <p style="margin: 5px 0;"><strong>⏰ Hora:</strong> {hora_cita} (Hora Argentina)</p>
-            </div>
-            
-            {enlace_html}
-            
-            <p style="color: #666;">
-                Si necesitas reagendar o cancelar, simplemente responde este email.
-            </p>
-            
-            <hr style="border: none; border-top: 1px solid #ddd; margin: 20px 0;">
-            
-            <p style="font-size: 12px; color: #999;">
-                Luciano Valinoti<br>
-                Especialista en Automatización IT
-            </p>
-        </div>
-        
-    </div>
+    Cada cita: {"nombre", "email", "fecha_cita", "hora_cita", "enlace_meet" (opcional)}
     """
     
-    return await send_email_sendgrid(
-        to_email=email,
-        subject=f"⏰ Recordatorio: Cita el {fecha_cita} a las {hora_cita}",
-        html_content=html_content
+    return await sendgrid_bulk.campana(
+        "recordatorio_cita",
+        [(cita["email"], cita) for cita in citas]
     )
 
 
@@ -496,7 +331,14 @@ await send_email_recordatorio_cita(
     enlace_meet="https://meet.google.com/abc-def-ghi"
 )
 
-EJEMPLO 4: Email personalizado
+EJEMPLO 4: Recordatorios de todas las citas de mañana (un solo request)
+----
+await enviar_recordatorios_citas([
+    {"nombre": "Juan", "email": "juan@empresa.com", "fecha_cita": "05/02", "hora_cita": "15:00 hs"},
+    {"nombre": "Ana", "email": "ana@empresa.com", "fecha_cita": "05/02", "hora_cita": "17:00 hs"}
+])
+
+EJEMPLO 5: Email personalizado
 ----
 await send_email_sendgrid(
     to_email="juan@empresa.com",
@@ -504,7 +346,7 @@ await send_email_sendgrid(
     html_content="<h1>Hola Juan</h1><p>Aquí está tu propuesta...</p>"
 )
 
-EJEMPLO 5: Test de conexión
+EJEMPLO 6: Test de conexión
 ----
 resultado = await test_conexion_sendgrid()
 print(resultado)
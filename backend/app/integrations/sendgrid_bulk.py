@@ -0,0 +1,238 @@
+# app/integrations/sendgrid_bulk.py
+"""
+ENVÍO MASIVO POR SENDGRID - Un request por plantilla, muchos destinatarios
+
+¿Para qué?
+- send_email_sendgrid hace un POST por destinatario: una campaña de
+  seguimiento a 300 leads eran 300 requests (y 300 HTML armados)
+- /v3/mail/send acepta hasta 1000 `personalizations` por request: mismo
+  cuerpo, y cada destinatario con su asunto y sus sustituciones
+
+Cómo funciona:
+- Las plantillas vienen compiladas de plantillas_email.py (HTML + texto plano)
+- enviar(plantilla, email, datos) agrega el destinatario al lote abierto de
+  esa plantilla (MicroBatcher) y espera el resultado: True/False
+- El lote sale al completar SENDGRID_BULK_MAX_RECIPIENTS o pasados
+  SENDGRID_BULK_MAX_WAIT segundos. Emails sueltos (ej: desde el outbox) salen
+  casi igual que antes; los que llegan juntos comparten request
+- campana(plantilla, destinatarios) encola a todos a la vez: cientos de
+  leads = un puñado de requests
+- Si SendGrid rechaza el lote con 400 por un destinatario (errors[].field
+  = "personalizations..."; ej: un email inválido), se parte en mitades y se
+  reintenta: solo fallan los destinatarios con problema
+- Un 400 por el request en sí (from, contenido, tamaño) falla el lote de
+  una: partirlo no lo arregla. Si pasa a mitad de una partición, no se
+  sigue con la otra mitad
+- 429 / 5xx / error de red: falla el lote (el outbox reintenta sus eventos)
+- SendGrid no acepta más de 10.000 bytes de sustituciones por destinatario:
+  uno que se pase (ej: un mensaje de 2000 caracteres con emojis) sale solo,
+  con el HTML y el texto ya armados (render), como antes del envío masivo
+- Cada plantilla tiene dos lotes: el de destinatarios que comparten
+  valores entre el HTML y el texto (contenido_compartido) y el del resto
+
+Cada destinatario va en su propia personalization: nadie ve a los demás.
+"""
+
+import asyncio
+import logging
+from functools import partial
+from typing import Dict, List, Tuple
+
+import httpx
+
+from app.config import settings
+from app.integrations.http_clients import cliente_http
+from app.integrations.plantillas_email import PLANTILLAS, PlantillaEmail
+from app.utils.batching import MicroBatcher
+
+logger = logging.getLogger(__name__)
+
+# Límite de la API de SendGrid
+MAX_PERSONALIZACIONES = 1000
+MAX_BYTES_SUSTITUCIONES = 10000
+URL_SENDGRID = "https://api.sendgrid.com/v3/mail/send"
+
+
+class SendGridError(Exception):
+    """SendGrid rechazó el request (status distinto de 2xx)."""
+
+    def __init__(self, status: int, detalle: str):
+        super().__init__(f"SendGrid {status}: {detalle[:200]}")
+        self.status = status
+
+
+def _rechazo_por_destinatario(response: httpx.Response) -> bool:
+    """¿El 400 apunta solo a personalizations (un destinatario) y no al request entero?"""
+
+    try:
+        errores = response.json().get("errors") or []
+    except ValueError:
+        return False
+    return bool(errores) and all(
+        (error.get("field") or "").startswith("personalizations") for error in errores
+    )
+
+
+def _bytes_sustituciones(personalizacion: dict) -> int:
+    return sum(
+        len(etiqueta.encode()) + len(valor.encode())
+        for etiqueta, valor in personalizacion["substitutions"].items()
+    )
+
+
+class SendGridBulk:
+    """
+    Ejemplo:
+    ok = await sendgrid_bulk.enviar("confirmacion_usuario", "juan@x.com", {"nombre": "Juan", ...})
+    resultado = await sendgrid_bulk.campana("seguimiento", [("juan@x.com", {...}), ...])
+    # {"destinatarios": 300, "enviados": 300, "fallidos": 0, "requests": 1}
+    """
+
+    def __init__(self, max_lote: int, max_espera: float):
+        max_lote = max(1, min(max_lote, MAX_PERSONALIZACIONES))
+        # (plantilla, compartida) -> lote: cada uno lleva su propio contenido
+        self._lotes: Dict[Tuple[str, bool], MicroBatcher] = {
+            (nombre, compartida): MicroBatcher(
+                f"sendgrid_{nombre}" + ("" if compartida else "_texto_propio"),
+                partial(
+                    self._enviar_lote,
+                    plantilla,
+                    plantilla.contenido_compartido if compartida else plantilla.contenido
+                ),
+                max_lote,
+                max_espera
+            )
+            for nombre, plantilla in PLANTILLAS.items()
+            for compartida in (True, False)
+        }
+        self.requests = 0
+        self.rechazados = 0
+        self.individuales = 0
+
+    async def enviar(self, plantilla: str, email: str, datos: dict) -> bool:
+        """Envía la plantilla a un destinatario (en el próximo lote). False si SendGrid lo rechazó."""
+
+        if not settings.SENDGRID_API_KEY or not settings.SENDGRID_FROM_EMAIL:
+            logger.error("❌ SENDGRID_API_KEY o SENDGRID_FROM_EMAIL no configuradas")
+            return False
+
+        personalizacion, compartida = PLANTILLAS[plantilla].personalizacion(email, datos)
+        try:
+            if _bytes_sustituciones(personalizacion) > MAX_BYTES_SUSTITUCIONES:
+                return await self._enviar_individual(PLANTILLAS[plantilla], email, datos)
+            return await self._lotes[(plantilla, compartida)].enviar(personalizacion)
+        except (SendGridError, httpx.HTTPError) as e:
+            logger.error(f"❌ Error SendGrid ({plantilla}): {e}")
+            return False
+
+    async def campana(self, plantilla: str, destinatarios: List[Tuple[str, dict]]) -> dict:
+        """Envía la plantilla a todos los destinatarios: [(email, datos), ...]."""
+
+        requests_antes = self.requests
+        resultados = await asyncio.gather(*[
+            self.enviar(plantilla, email, datos) for email, datos in destinatarios
+        ])
+        enviados = sum(1 for ok in resultados if ok)
+
+        resultado = {
+            "plantilla": plantilla,
+            "destinatarios": len(destinatarios),
+            "enviados": enviados,
+            "fallidos": len(destinatarios) - enviados,
+            "requests": self.requests - requests_antes
+        }
+        logger.info(
+            f"📨 Campaña '{plantilla}': {enviados}/{len(destinatarios)} enviados "
+            f"en {resultado['requests']} requests"
+        )
+        return resultado
+
+    async def _post(self, personalizaciones: List[dict], contenido: List[dict]) -> httpx.Response:
+        payload = {
+            "personalizations": personalizaciones,
+            "from": {
+                "email": settings.SENDGRID_FROM_EMAIL,
+                "name": "Luciano Valinoti - IT Specialist"
+            },
+            "content": contenido
+        }
+        headers = {
+            "Authorization": f"Bearer {settings.SENDGRID_API_KEY}",
+            "Content-Type": "application/json"
+        }
+
+        self.requests += 1
+        return await cliente_http("sendgrid").post(URL_SENDGRID, json=payload, headers=headers)
+
+    async def _enviar_individual(self, plantilla: PlantillaEmail, email: str, datos: dict) -> bool:
+        """Un destinatario con sustituciones demasiado grandes: cuerpo ya armado, sin etiquetas."""
+
+        asunto, html, texto = plantilla.render(datos)
+        self.individuales += 1
+        response = await self._post(
+            [{"to": [{"email": email}], "subject": asunto}],
+            [{"type": "text/plain", "value": texto}, {"type": "text/html", "value": html}]
+        )
+
+        if response.status_code in (200, 201, 202):
+            logger.info(f"✅ SendGrid: '{plantilla.nombre}' enviado a {email} (individual)")
+            return True
+        if response.status_code == 400 and _rechazo_por_destinatario(response):
+            self.rechazados += 1
+            logger.error(f"❌ SendGrid rechazó {email}: {response.text[:200]}")
+            return False
+        raise SendGridError(response.status_code, response.text)
+
+    async def _enviar_lote(
+        self,
+        plantilla: PlantillaEmail,
+        contenido: List[dict],
+        personalizaciones: List[dict]
+    ) -> List[bool]:
+        response = await self._post(personalizaciones, contenido)
+
+        if response.status_code in (200, 201, 202):
+            logger.info(f"✅ SendGrid: '{plantilla.nombre}' enviado a {len(personalizaciones)} destinatarios")
+            return [True] * len(personalizaciones)
+
+        if response.status_code != 400 or not _rechazo_por_destinatario(response):
+            raise SendGridError(response.status_code, response.text)
+
+        # 400 por un destinatario: invalida el lote entero. Partir y reintentar
+        if len(personalizaciones) == 1:
+            self.rechazados += 1
+            logger.error(f"❌ SendGrid rechazó {personalizaciones[0]['to'][0]['email']}: {response.text[:200]}")
+            return [False]
+
+        mitad = len(personalizaciones) // 2
+        resultados = []
+        for parte in (personalizaciones[:mitad], personalizaciones[mitad:]):
+            try:
+                resultados += await self._enviar_lote(plantilla, contenido, parte)
+            except (SendGridError, httpx.HTTPError) as e:
+                # La otra mitad ya pudo haber salido: no marcarla como fallida.
+                # Esta parte (y lo que falte) fallan; un 400 del request entero
+                # se repetiría igual en la otra mitad
+                logger.error(f"❌ Error SendGrid ({plantilla.nombre}) partiendo el lote: {e}")
+                return resultados + [False] * (len(personalizaciones) - len(resultados))
+        return resultados
+
+    async def cerrar(self) -> None:
+        """Despacha los lotes pendientes. Llamar en el shutdown (antes de cerrar los clientes HTTP)."""
+
+        for lote in self._lotes.values():
+            await lote.cerrar()
+
+    def stats(self) -> dict:
+        return {
+            "requests": self.requests,
+            "rechazados": self.rechazados,
+            "individuales": self.individuales,
+            "lotes": {lote.nombre: lote.stats() for lote in self._lotes.values()}
+        }
+
+
+sendgrid_bulk = SendGridBulk(
+    max_lote=settings.SENDGRID_BULK_MAX_RECIPIENTS,
+    max_espera=settings.SENDGRID_BULK_MAX_WAIT
+)
@@ -3,13 +3,21 @@
 INTEGRACIÓN TELEGRAM - Notificaciones al admin (Luciano) por Telegram
 """
 
-import httpx
 import logging
+from datetime import datetime
 from typing import Optional
 from app.config import settings
+from app.integrations.plantillas_telegram import (
+    ALERTA, NUEVO_LEAD_CHAT, REPORTE_DIARIO, RESUMEN_LEAD, emoji_score
+)
+from app.integrations.telegram_dispatcher import telegram_dispatcher
 
 logger = logging.getLogger(__name__)
 
+
+def _hora_utc() -> str:
+    return datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S UTC')
+
 # ============================================================================
 # 🤖 FUNCIÓN PRINCIPAL: ENVIAR MENSAJE A TELEGRAM
 # ============================================================================
@@ -17,10 +25,18 @@ logger = logging.getLogger(__name__)
 async def send_telegram_message(
     message: str,
     parse_mode: str = "HTML",
-    disable_notification: bool = False
+    disable_notification: bool = False,
+    agrupable: bool = False,
+    resumen: Optional[str] = None
 ) -> bool:
     """
-    Envía un mensaje de texto a Telegram.
+    Envía un mensaje de texto a Telegram (por la cola del despachador).
+    
+    Parámetros:
+    - agrupable: En una ráfaga puede salir junto con otros en un resumen
+    - resumen: Línea que lo representa dentro del resumen (HTML ya escapado)
+    
+    Espera a que Telegram lo acepte: si está en pausa por límite, espera.
     """
     
     if not settings.TELEGRAM_TOKEN or not settings.TELEGRAM_CHAT_ID:
@@ -31,33 +47,13 @@ async def send_telegram_message(
         logger.warning("⚠️ Mensaje vacío para Telegram")
         return False
     
-    url = f"https://api.telegram.org/bot{settings.TELEGRAM_TOKEN}/sendMessage"
-    
-    payload = {
-        "chat_id": settings.TELEGRAM_CHAT_ID,
-        "text": message,
-        "parse_mode": parse_mode,
-        "disable_notification": disable_notification,
-        "disable_web_page_preview": True
-    }
-    
-    try:
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            response = await client.post(url, json=payload)
-            
-            if response.status_code == 200:
-                logger.info("✅ Mensaje Telegram enviado")
-                return True
-            else:
-                logger.error(f"❌ Error Telegram: {response.text}")
-                return False
-    
-    except httpx.TimeoutException:
-        logger.error("❌ Timeout conectando a Telegram")
-        return False
-    except Exception as e:
-        logger.error(f"❌ Error enviando Telegram: {str(e)}")
-        return False
+    return await telegram_dispatcher.enviar(
+        message,
+        parse_mode=parse_mode,
+        silencioso=disable_notification,
+        agrupable=agrupable,
+        resumen=resumen
+    )
 
 
 # ============================================================================
@@ -88,25 +84,14 @@ async def notificar_nuevo_lead(
     - problema: Descripción del problema/necesidad
     """
     
-    # Sanitizar entrada
-    nombre = nombre.replace("<", "&lt;").replace(">", "&gt;").strip()
-    email = email.replace("<", "&lt;").replace(">", "&gt;").strip()
-    tipo_cliente = tipo_cliente.replace("<", "&lt;").replace(">", "&gt;").strip()
-    problema = problema.replace("<", "&lt;").replace(">", "&gt;")[:150]
-    mensaje = mensaje.replace("<", "&lt;").replace(">", "&gt;")[:100]
+    # Las plantillas escapan cada valor: acá solo se normaliza
+    nombre = nombre.strip()
+    tipo_cliente = tipo_cliente.strip()
     
     # Validar que tenemos al menos nombre
     if not nombre or nombre.lower() == "usuario del chat":
         nombre = "Cliente Chatbot"
     
-    # Emoji según score
-    if lead_score >= 80:
-        emoji_score = "🔥"
-    elif lead_score >= 60:
-        emoji_score = "⭐"
-    else:
-        emoji_score = "⚡"
-    
     # Emoji según tipo de cliente
     emoji_tipo = {
         "Particular": "👤",
@@ -115,28 +100,25 @@ async def notificar_nuevo_lead(
         "Empresa": "🏭"
     }.get(tipo_cliente, "💼")
     
-    # Construir mensaje HTML
-    mensaje_tg = f"""
-<b>🚀 NUEVO LEAD - CHATBOT</b>
-
-<b>👤 Nombre:</b> <code>{nombre}</code>
-<b>📧 Email:</b> <code>{email}</code>
-<b>📱 WhatsApp:</b> <a href="https://wa.me/{telefono.replace('+', '').replace(' ', '')}">{telefono}</a>
-
-<b>{emoji_tipo} Tipo:</b> {tipo_cliente if tipo_cliente else 'No especificado'}
-<b>🎯 Servicio:</b> {mensaje}
-
-<b>📝 Problema/Necesidad:</b>
-<code>{problema if problema else 'No especificado'}</code>
-
-<b>{emoji_score} Score:</b> <code>{lead_score}/100</code>
-<b>📍 Origen:</b> {origen}
-
-━━━━━━━━━━━━━━━━━━━━━━
-<a href="https://wa.me/{telefono.replace('+', '').replace(' ', '')}?text=Hola%20{nombre.replace(' ', '%20')}%2C%20soy%20Luciano.%20Recib%C3%AD%20tu%20consulta.">📲 RESPONDER WHATSAPP</a> | <a href="mailto:{email}">📧 EMAIL</a>
-"""
+    datos = {
+        "nombre": nombre,
+        "email": email.strip(),
+        "telefono": telefono,
+        "mensaje": mensaje,
+        "lead_score": lead_score,
+        "origen": origen,
+        "tipo_cliente": tipo_cliente,
+        "problema": problema,
+        "emoji_tipo": emoji_tipo,
+        "emoji_score": emoji_score(lead_score)
+    }
     
-    return await send_telegram_message(mensaje_tg)
+    # Leads fríos: en una ráfaga salen agrupados; los calientes, solos y primero
+    return await send_telegram_message(
+        NUEVO_LEAD_CHAT.render(datos),
+        agrupable=lead_score < settings.TELEGRAM_DIGEST_SCORE,
+        resumen=RESUMEN_LEAD.render(datos)
+    )
 
 
 # ============================================================================
@@ -165,18 +147,13 @@ async def notificar_alerta(
     }
     emoji = emojis.get(gravedad, "⚠️")
     
-    titulo = titulo.replace("<", "&lt;").replace(">", "&gt;")
-    descripcion = descripcion.replace("<", "&lt;").replace(">", "&gt;")
-    
-    mensaje_tg = f"""
-<b>{emoji} ALERTA</b>
-
-<b>Título:</b> {titulo}
-<b>Descripción:</b> {descripcion}
-<b>Gravedad:</b> {gravedad.upper()}
-
-<i>⏰ {__import__('datetime').datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S UTC')}</i>
-"""
+    mensaje_tg = ALERTA.render({
+        "emoji": emoji,
+        "titulo": titulo,
+        "descripcion": descripcion,
+        "gravedad": gravedad.upper(),
+        "hora": _hora_utc()
+    })
     
     return await send_telegram_message(
         mensaje_tg,
@@ -197,17 +174,12 @@ async def enviar_reporte_diario(
     Reporte diario de métricas.
     """
     
-    mensaje_tg = f"""
-<b>📊 REPORTE DIARIO</b>
-
-<b>📈 Métricas de hoy:</b>
-  • Nuevos leads: <code>{total_leads_hoy}</code>
-  • Conversiones: <code>{conversiones_hoy}</code>
-  • Score promedio: <code>{score_promedio:.1f}/100</code>
-
-<b>Tasa de conversión:</b> <code>{(conversiones_hoy/max(total_leads_hoy,1)*100):.1f}%</code>
-
-<i>⏰ {__import__('datetime').datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S UTC')}</i>
-"""
+    mensaje_tg = REPORTE_DIARIO.render({
+        "total_leads": total_leads_hoy,
+        "conversiones": conversiones_hoy,
+        "score_promedio": f"{score_promedio:.1f}",
+        "tasa_conversion": f"{conversiones_hoy / max(total_leads_hoy, 1) * 100:.1f}",
+        "hora": _hora_utc()
+    })
     
     return await send_telegram_message(mensaje_tg)
\ No newline at end of file
@@ -0,0 +1,315 @@
+# app/integrations/telegram_dispatcher.py
+"""
+DESPACHADOR DE TELEGRAM - Una cola por chat, al ritmo que permite el Bot API
+
+¿Para qué?
+- Telegram deja a un bot mandar ~20 mensajes por minuto a un mismo grupo;
+  en un pico de leads contestaba 429 y el mensaje se perdía (solo se logueaba)
+- Que un lead caliente avise al instante aunque haya una ráfaga de leads fríos
+- Que una ráfaga de leads fríos no sean 30 mensajes: se juntan en un resumen
+
+Cómo funciona:
+- send_telegram_message(...) deja el mensaje en la cola y espera a que salga
+  (retorna True/False como antes: el outbox sigue reintentando si falla)
+- Un solo despachador envía, siempre pasando por un TokenBucket que nunca
+  supera TELEGRAM_MESSAGES_PER_MINUTE en ninguna ventana de 60 segundos
+- Prioridad: primero los mensajes normales (leads calientes, alertas), después
+  los "agrupables" (leads con score < TELEGRAM_DIGEST_SCORE)
+- Si al tocar el turno de los agrupables hay más de uno esperando, salen
+  todos juntos en UN mensaje de resumen (una línea por lead)
+- 429: se respeta `retry_after` (se frena el balde) y el mensaje vuelve al
+  principio de la cola; no cuenta como fallo
+- Error de red o 5xx: se reintenta con backoff hasta TELEGRAM_MAX_RETRIES
+
+Si quien espera se cancela (ej: vence el plazo del outbox):
+- Si el mensaje todavía está en la cola, se saca: el reintento no lo duplica
+- Si ya se está enviando, no se puede "des-enviar": quien espera aguarda la
+  respuesta de Telegram y retorna el resultado real (si salió, el outbox lo
+  marca enviado y no lo repite). Si Telegram contesta 429, no vuelve a la
+  cola: se informa como no enviado y lo reintenta el outbox
+"""
+
+import asyncio
+import logging
+import re
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, List, Optional
+
+import httpx
+
+from app.config import settings
+from app.integrations.http_clients import cliente_http
+from app.utils.rate_limit import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+# Límite del Bot API por mensaje (con margen para el encabezado del resumen)
+MAX_CARACTERES_RESUMEN = 3800
+ESPERA_429_DEFECTO = 5.0
+
+
+@dataclass
+class _Mensaje:
+    texto: str
+    parse_mode: str
+    silencioso: bool
+    agrupable: bool
+    resumen: Optional[str]
+    futuro: asyncio.Future
+    encolado: float = field(default_factory=time.monotonic)
+    # Quien espera se canceló con el mensaje ya en envío
+    abandonado: bool = False
+
+    def linea(self) -> str:
+        """Línea del mensaje dentro de un resumen."""
+
+        if self.resumen:
+            return self.resumen
+        # Sin resumen: primera línea con texto, sin etiquetas HTML
+        for linea in self.texto.splitlines():
+            limpia = re.sub(r"<[^>]+>", "", linea).strip()
+            if limpia:
+                return limpia[:120]
+        return "(mensaje vacío)"
+
+
+class TelegramDispatcher:
+    """
+    Ejemplo:
+    ok = await telegram_dispatcher.enviar("<b>Hola</b>")
+    ok = await telegram_dispatcher.enviar(texto, agrupable=True, resumen="⚡ Juan - 35/100")
+    """
+
+    def __init__(self, tasa: float, capacidad: float, max_resumen: int, max_reintentos: int):
+        self.limite = TokenBucket(tasa=tasa, capacidad=capacidad)
+        self.max_resumen = max(2, max_resumen)
+        self.max_reintentos = max_reintentos
+
+        self._normales: Deque[_Mensaje] = deque()
+        self._agrupables: Deque[_Mensaje] = deque()
+        self._en_envio: List[_Mensaje] = []
+        self._hay_mensajes: Optional[asyncio.Event] = None
+        self._tarea: Optional[asyncio.Task] = None
+
+        self.enviados = 0
+        self.resumenes = 0
+        self.en_resumenes = 0
+        self.respuestas_429 = 0
+        self.fallidos = 0
+        self.espera_maxima = 0.0
+
+    # ------------------------------------------------------------------------
+    # API
+    # ------------------------------------------------------------------------
+
+    async def enviar(
+        self,
+        texto: str,
+        parse_mode: str = "HTML",
+        silencioso: bool = False,
+        agrupable: bool = False,
+        resumen: Optional[str] = None
+    ) -> bool:
+        """Encola el mensaje y espera a que Telegram lo acepte. Retorna False si falló."""
+
+        if self._tarea is None:
+            self.iniciar()  # Scripts o tests que no pasan por el startup
+
+        mensaje = _Mensaje(
+            texto=texto,
+            parse_mode=parse_mode,
+            silencioso=silencioso,
+            agrupable=agrupable,
+            resumen=resumen,
+            futuro=asyncio.get_running_loop().create_future()
+        )
+        (self._agrupables if agrupable else self._normales).append(mensaje)
+        self._hay_mensajes.set()
+
+        try:
+            return await asyncio.shield(mensaje.futuro)
+        except asyncio.CancelledError:
+            en_cola = False
+            for cola in (self._normales, self._agrupables):
+                if mensaje in cola:
+                    cola.remove(mensaje)
+                    en_cola = True
+            if en_cola or mensaje.futuro.done() or self._tarea is None:
+                raise
+            # Ya está saliendo: esperar la respuesta y retornar lo que pasó de verdad
+            mensaje.abandonado = True
+            return await mensaje.futuro
+
+    def iniciar(self) -> None:
+        """Arranca el despachador. Llamar en el startup (si no, arranca con el primer mensaje)."""
+
+        if self._tarea is not None:
+            return
+        self._hay_mensajes = asyncio.Event()
+        self._tarea = asyncio.create_task(self._despachador())
+
+    async def detener(self) -> None:
+        """Frena el despachador; quien espera un mensaje sin enviar recibe CancelledError."""
+
+        if self._tarea is None:
+            return
+        self._tarea.cancel()
+        await asyncio.gather(self._tarea, return_exceptions=True)
+        self._tarea = None
+
+        for cola in (self._normales, self._agrupables):
+            while cola:
+                cola.popleft().futuro.cancel()
+        for mensaje in self._en_envio:
+            mensaje.futuro.cancel()
+        self._en_envio = []
+
+    # ------------------------------------------------------------------------
+    # Despachador
+    # ------------------------------------------------------------------------
+
+    async def _despachador(self) -> None:
+        while True:
+            if not self._normales and not self._agrupables:
+                self._hay_mensajes.clear()
+                await self._hay_mensajes.wait()
+                continue
+
+            # Mientras se espera el turno, una ráfaga sigue sumando agrupables:
+            # por eso el lote se arma DESPUÉS de tener el token
+            await self.limite.adquirir()
+            lote = self._siguiente_lote()
+            if not lote:
+                continue
+
+            self._en_envio = lote
+            try:
+                await self._enviar_lote(lote)
+            except Exception as e:
+                logger.error(f"❌ Telegram: error inesperado enviando: {e}")
+                self._resolver(lote, False)
+            self._en_envio = []
+
+    def _siguiente_lote(self) -> List[_Mensaje]:
+        for cola in (self._normales, self._agrupables):
+            while cola and cola[0].futuro.done():
+                cola.popleft()  # Quien esperaba se canceló
+
+        if self._normales:
+            return [self._normales.popleft()]
+
+        lote, caracteres = [], 0
+        while self._agrupables and len(lote) < self.max_resumen:
+            mensaje = self._agrupables[0]
+            if mensaje.futuro.done():
+                self._agrupables.popleft()
+                continue
+            caracteres += len(mensaje.linea()) + 1
+            if lote and caracteres > MAX_CARACTERES_RESUMEN:
+                break
+            lote.append(self._agrupables.popleft())
+        return lote
+
+    def _armar_texto(self, lote: List[_Mensaje]) -> str:
+        if len(lote) == 1:
+            return lote[0].texto
+
+        lineas = "\n".join(mensaje.linea() for mensaje in lote)
+        return f"<b>📦 {len(lote)} LEADS NUEVOS</b> <i>(agrupados)</i>\n\n{lineas}"
+
+    async def _enviar_lote(self, lote: List[_Mensaje]) -> None:
+        url = f"https://api.telegram.org/bot{settings.TELEGRAM_TOKEN}/sendMessage"
+        payload = {
+            "chat_id": settings.TELEGRAM_CHAT_ID,
+            "text": self._armar_texto(lote),
+            "parse_mode": lote[0].parse_mode,
+            "disable_notification": all(mensaje.silencioso for mensaje in lote),
+            "disable_web_page_preview": True
+        }
+
+        for intento in range(1, self.max_reintentos + 2):
+            if intento > 1:
+                await asyncio.sleep(min(2 ** (intento - 1), 30))
+                await self.limite.adquirir()
+
+            try:
+                response = await cliente_http("telegram").post(url, json=payload)
+            except httpx.TransportError as e:
+                logger.warning(f"🔁 Telegram: {type(e).__name__} (intento {intento})")
+                continue
+
+            if response.status_code == 200:
+                self._registrar_envio(lote)
+                return
+
+            if response.status_code == 429:
+                # El mensaje no se pierde: vuelve adelante y sale cuando termine el castigo
+                espera = self._retry_after(response)
+                self.respuestas_429 += 1
+                self.limite.penalizar(espera)
+                # Los abandonados no salieron: se informan como fallidos (el
+                # outbox los reintenta) en vez de esperar el castigo
+                self._resolver([mensaje for mensaje in lote if mensaje.abandonado], False)
+                pendientes = [mensaje for mensaje in lote if not mensaje.abandonado]
+                cola = self._agrupables if lote[0].agrupable else self._normales
+                cola.extendleft(reversed(pendientes))
+                logger.warning(f"⏳ Telegram 429: pausa de {espera:.0f}s, {len(pendientes)} mensajes vuelven a la cola")
+                return
+
+            if response.status_code < 500:
+                logger.error(f"❌ Error Telegram: {response.text}")  # 400/403: reintentar no lo arregla
+                break
+            logger.warning(f"🔁 Telegram {response.status_code} (intento {intento})")
+
+        self.fallidos += len(lote)
+        self._resolver(lote, False)
+
+    @staticmethod
+    def _retry_after(response: httpx.Response) -> float:
+        try:
+            return float(response.json()["parameters"]["retry_after"])
+        except Exception:
+            return ESPERA_429_DEFECTO
+
+    def _registrar_envio(self, lote: List[_Mensaje]) -> None:
+        ahora = time.monotonic()
+        self.enviados += 1
+        if len(lote) > 1:
+            self.resumenes += 1
+            self.en_resumenes += len(lote)
+            logger.info(f"✅ Telegram: resumen de {len(lote)} leads enviado")
+        else:
+            logger.info("✅ Mensaje Telegram enviado")
+        self.espera_maxima = max(self.espera_maxima, max(ahora - mensaje.encolado for mensaje in lote))
+        self._resolver(lote, True)
+
+    @staticmethod
+    def _resolver(lote: List[_Mensaje], resultado: bool) -> None:
+        for mensaje in lote:
+            if not mensaje.futuro.done():
+                mensaje.futuro.set_result(resultado)
+
+    def stats(self) -> dict:
+        return {
+            "en_cola": len(self._normales),
+            "agrupables_en_cola": len(self._agrupables),
+            "mensajes_enviados": self.enviados,
+            "resumenes": self.resumenes,
+            "leads_en_resumenes": self.en_resumenes,
+            "respuestas_429": self.respuestas_429,
+            "fallidos": self.fallidos,
+            "espera_maxima_seg": round(self.espera_maxima, 2),
+            "rate_limit": self.limite.stats()
+        }
+
+
+# La ráfaga se descuenta de la tasa: en cualquier ventana de 60s salen como
+# mucho TELEGRAM_MESSAGES_PER_MINUTE mensajes (capacidad + tasa * 60)
+telegram_dispatcher = TelegramDispatcher(
+    tasa=max(settings.TELEGRAM_MESSAGES_PER_MINUTE - settings.TELEGRAM_BURST, 1) / 60,
+    capacidad=settings.TELEGRAM_BURST,
+    max_resumen=settings.TELEGRAM_DIGEST_MAX,
+    max_reintentos=settings.TELEGRAM_MAX_RETRIES
+)
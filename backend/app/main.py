@@ -11,10 +11,19 @@ from slowapi.errors import RateLimitExceeded
 # IMPORTAR MODELOS (CRÍTICO)
 from app.models.lead import Base, ChatSession, ChatHistory, Lead
 from app.config import settings, validate_setup
-from app.database import engine
+from app.database import engine, sincronizar_esquema
+from app.ai.llm_client import init_llm_client, close_llm_client
+from app.ai.prompt_store import prompt_store
+from app.workers.outbox import outbox
+from app.integrations.http_clients import init_http_clients, close_http_clients, http_clients_stats
+from app.integrations.airtable_writer import airtable_writer
+from app.integrations.airtable_sync import airtable_sync
+from app.integrations.telegram_dispatcher import telegram_dispatcher
+from app.integrations.sendgrid_bulk import sendgrid_bulk
 
 # Crear todas las tablas
 Base.metadata.create_all(bind=engine)
+sincronizar_esquema(Base.metadata)
 print("✅ Tablas creadas correctamente")
 
 # ============================================================================
@@ -127,6 +136,16 @@ async def api_health(request: Request):
         "environment": settings.ENVIRONMENT,
     }
 
+@app.get("/api/health/integraciones")
+async def integraciones_health():
+    """Reuso de conexiones HTTP, lotes de Airtable y SendGrid, cola de Telegram."""
+    return {
+        "http": http_clients_stats(),
+        "airtable": airtable_writer.stats(),
+        "telegram": telegram_dispatcher.stats(),
+        "sendgrid": sendgrid_bulk.stats()
+    }
+
 # ============================================================================
 # ⚠️ ERROR HANDLERS - SIN EXPONER INFORMACIÓN
 # ============================================================================
@@ -168,6 +187,13 @@ async def global_exception_handler(request: Request, exc: Exception):
 @app.on_event("startup")
 async def startup():
     """Eventos al iniciar"""
+    await init_llm_client()
+    await init_http_clients()
+    telegram_dispatcher.iniciar()
+    await prompt_store.iniciar()
+    await outbox.iniciar()
+    await airtable_sync.iniciar()
+    
     logger.info("✅ Backend iniciado correctamente")
     logger.info(f"🌍 Entorno: {settings.ENVIRONMENT}")
     logger.info(f"📊 CORS habilitado para: {', '.join(settings.ALLOWED_ORIGINS)}")
@@ -180,6 +206,14 @@ async def startup():
 @app.on_event("shutdown")
 async def shutdown():
     """Eventos al detener"""
+    await close_llm_client()
+    await prompt_store.detener()
+    await outbox.detener()
+    await airtable_sync.detener()
+    await airtable_writer.cerrar()
+    await telegram_dispatcher.detener()
+    await sendgrid_bulk.cerrar()
+    await close_http_clients()
     logger.info("❌ Backend detenido")
 
 # ============================================================================
@@ -197,7 +231,9 @@ async def add_security_headers(request: Request, call_next):
     response.headers["X-XSS-Protection"] = "1; mode=block"  # XSS protection
     
     # No revelar versión de servidor
-    response.headers.pop("server", None)
+    # (MutableHeaders no tiene pop(): se borra solo si existe)
+    if "server" in response.headers:
+        del response.headers["server"]
     
     return response
 
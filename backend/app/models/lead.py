@@ -1,5 +1,5 @@
 # app/models/lead.py
-from sqlalchemy import Column, Integer, String, Text, DateTime, Float, Boolean
+from sqlalchemy import Column, Integer, String, Text, DateTime, Float, Boolean, Index
 from sqlalchemy.ext.declarative import declarative_base
 from datetime import datetime
 
@@ -18,6 +18,20 @@ class ChatSession(Base):
     fecha_creacion = Column(DateTime, default=datetime.utcnow, nullable=False)
     fecha_ultima_actividad = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    # Resumen de los turnos que ya salieron de la ventana de historial
+    resumen = Column(Text, nullable=True)
+    turnos_resumidos = Column(Integer, default=0)
+    # Turnos registrados: con varios workers, dice si la copia en memoria de un worker sigue al día
+    turnos_total = Column(Integer, default=0)
+    
+    # Datos de contacto detectados en la conversación (se completan de a uno)
+    nombre = Column(String(100), nullable=True)
+    email = Column(String(255), nullable=True)
+    telefono = Column(String(20), nullable=True)
+    tipo_cliente = Column(String(50), nullable=True)
+    problema = Column(Text, nullable=True)
+    servicio = Column(String(100), nullable=True)
+    
     def __repr__(self):
         return f"<ChatSession {self.session_id}>"
 
@@ -29,6 +43,10 @@ class ChatSession(Base):
 class ChatHistory(Base):
     """Modelo para historial de mensajes en chat."""
     __tablename__ = "chat_history"
+    __table_args__ = (
+        # Últimos N turnos de una sesión: WHERE session_id = ? ORDER BY fecha DESC
+        Index("ix_chat_history_session_fecha", "session_id", "fecha"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     session_id = Column(String(100), index=True, nullable=False)
@@ -61,9 +79,14 @@ class Lead(Base):
     estado = Column(String(20), default="nuevo", index=True)  # nuevo, contactado, negociando, agendado, convertido, perdido, spam
     origen = Column(String(50), default="formulario_landing")  # formulario_landing, chat, importado
     
+    # ID del registro en Airtable (lo completa airtable_writer al crearlo)
+    airtable_record_id = Column(String(20), nullable=True, index=True)
+    
     # Timestamps
     fecha_creacion = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
-    fecha_ultima_actividad = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Indexada: la sincronización con Airtable busca lo cambiado desde su watermark
+    fecha_ultima_actividad = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
+    fecha_contacto = Column(DateTime, nullable=True)
     
     # Notas internas
     notas = Column(Text, nullable=True)
@@ -91,4 +114,67 @@ class Lead(Base):
         return f"{emojis.get(self.estado, '?')} {self.estado.capitalize()}"
     
     def __repr__(self):
-        return f"<Lead {self.nombre} ({self.email})>"
\ No newline at end of file
+        return f"<Lead {self.nombre} ({self.email})>"
+
+
+# ============================================================================
+# 📤 OUTBOX (efectos secundarios pendientes)
+# ============================================================================
+
+class OutboxEvent(Base):
+    """
+    Efecto secundario a ejecutar (email, Telegram, Airtable, n8n).
+    Se escribe en la misma transacción que el Lead y lo procesa
+    app/workers/outbox.py: si el proceso se cae, el evento sigue acá.
+    """
+    __tablename__ = "outbox_events"
+    __table_args__ = (
+        # Eventos vencidos: WHERE estado = 'pendiente' AND proximo_intento <= ?
+        Index("ix_outbox_estado_proximo", "estado", "proximo_intento"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    tipo = Column(String(50), nullable=False)
+    payload = Column(Text, nullable=False)  # JSON
+    estado = Column(String(20), default="pendiente", nullable=False)  # pendiente, enviado, muerto
+    intentos = Column(Integer, default=0, nullable=False)
+    # Próximo intento; mientras un worker lo procesa es el vencimiento de su lease
+    proximo_intento = Column(DateTime, default=datetime.utcnow, nullable=False)
+    ultimo_error = Column(Text, nullable=True)
+    fecha_creacion = Column(DateTime, default=datetime.utcnow, nullable=False)
+    fecha_procesado = Column(DateTime, nullable=True)
+    
+    def __repr__(self):
+        return f"<OutboxEvent {self.id} {self.tipo} ({self.estado})>"
+
+
+
+# ============================================================================
+# 🔄 ESTADO DE SINCRONIZACIONES
+# ============================================================================
+
+class SyncState(Base):
+    """
+    Hasta dónde llegó una sincronización incremental (ej: "airtable_leads").
+    También sirve de lock entre procesos: solo corre quien tiene el lease.
+    """
+    __tablename__ = "sync_state"
+    
+    nombre = Column(String(50), primary_key=True)
+    # Último cambio local enviado: (fecha_ultima_actividad, id) del último lead
+    watermark_local = Column(DateTime, nullable=True)
+    watermark_local_id = Column(Integer, nullable=True)
+    # Leads salteados porque su alta estaba en el outbox (JSON: [ids]):
+    # se revisan en la próxima corrida aunque el watermark ya los haya pasado
+    pendientes_outbox = Column(Text, nullable=True)
+    # Leads que Airtable rechazó (422) y se saltearon (JSON: [ids]): vuelven
+    # a subir cuando se editan; salen de la lista al subir bien
+    rechazados = Column(Text, nullable=True)
+    # Desde cuándo pedir cambios remotos en la próxima corrida
+    watermark_remoto = Column(DateTime, nullable=True)
+    bloqueado_hasta = Column(DateTime, nullable=True)
+    ultima_ejecucion = Column(DateTime, nullable=True)
+    ultimo_resultado = Column(Text, nullable=True)  # JSON
+    
+    def __repr__(self):
+        return f"<SyncState {self.nombre}>"
@@ -1,18 +1,25 @@
 # app/routes/chat.py
 
 from fastapi import APIRouter, BackgroundTasks, Depends, Request
+from fastapi.responses import JSONResponse, StreamingResponse
 from slowapi.util import get_remote_address
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 import uuid
-import re
+import json
 from datetime import datetime
 import logging
 
-from app.database import get_db
+from app.database import get_db, SessionLocal
 from app.schemas import ChatQuery
 from app.models.lead import ChatSession, ChatHistory
-from app.ai.chat import get_chatbot_response
+from app.ai.contact_extractor import extractor, parsear_formulario
+from app.ai.chat import get_chatbot_response, stream_chatbot_response, completion_cache, single_flight
+from app.ai.llm_client import llm_stats
 from app.ai.lead_scorer import score_lead
+from app.ai.session_memory import session_memory, Turno
+from app.ai.prompt_store import prompt_store
+from app.ai.summarizer import compactar, a_texto as resumen_a_texto
 from app.integrations.telegram import notificar_nuevo_lead
 from app.config import settings
 
@@ -52,67 +59,20 @@ async def chat_endpoint(
         # 2️⃣ Generar o recuperar session_id
         session_id = query.session_id or str(uuid.uuid4())
         
-        # 3️⃣ Recuperar sesión existente o crear nueva
-        session = db.query(ChatSession).filter(
-            ChatSession.session_id == session_id
-        ).first()
-        
-        if not session:
-            session = ChatSession(session_id=session_id)
-            db.add(session)
-            db.flush()
+        # 3️⃣ Recuperar sesión e historial (CON LÍMITE)
+        turnos, history_with_bot, resumen, contacto, version = _cargar_contexto(db, session_id)
         
-        # 4️⃣ Recuperar historial de esta sesión (CON LÍMITE)
-        history_records = db.query(ChatHistory).filter(
-            ChatHistory.session_id == session_id
-        ).limit(settings.CHAT_HISTORY_LIMIT).all()
-        
-        # Intercalar respuestas del bot
-        history_with_bot = []
-        for h in history_records:
-            history_with_bot.append({"role": "user", "content": h.mensaje_usuario})
-            history_with_bot.append({"role": "assistant", "content": h.respuesta_bot})
-        
-        # 5️⃣ Llamar a Groq para obtener respuesta
-        response_text = get_chatbot_response(query.message, history_with_bot)
-        
-        # 6️⃣ Calcular score
-        lead_score = score_lead(query.message)
-        
-        # 7️⃣ EXTRAER DATOS DEL HISTORIAL COMPLETO
-        all_messages = " ".join([h.mensaje_usuario for h in history_records]) + " " + query.message
-        contact_info = extract_contact_info(all_messages)
-        
-        # 8️⃣ Guardar en base de datos
-        chat_history = ChatHistory(
-            session_id=session_id,
-            mensaje_usuario=query.message,
-            respuesta_bot=response_text,
-            lead_score=lead_score
+        # 4️⃣ Llamar a Groq para obtener respuesta
+        response_text = await get_chatbot_response(
+            query.message, history_with_bot, resumen_a_texto(resumen)
         )
-        db.add(chat_history)
-        
-        # 9️⃣ NOTIFICAR - Solo si tiene datos completos
-        if contact_info.get("nombre") and contact_info.get("email") and contact_info.get("telefono"):
-            servicio = contact_info.get("servicio", "No especificado")
-            
-            background_tasks.add_task(
-                notificar_nuevo_lead,
-                nombre=contact_info.get("nombre"),
-                email=contact_info.get("email"),
-                telefono=contact_info.get("telefono"),
-                mensaje=servicio,
-                lead_score=lead_score,
-                origen="chat",
-                tipo_cliente=contact_info.get("tipo_cliente", ""),
-                problema=contact_info.get("problema", "")
-            )
-            
-            logger.info(f"✅ Lead capturado: {contact_info.get('nombre')} ({contact_info.get('tipo_cliente')}) - {contact_info.get('telefono')}")
         
-        db.commit()
+        # 5️⃣ Score, extracción de contacto, guardado y notificación
+        lead_score, contact_info = _registrar_turno(
+            db, background_tasks, session_id, query.message, response_text, turnos, resumen, contacto, version
+        )
         
-        # 🔟 Responder al frontend - SIN EXPONER INFORMACIÓN SENSIBLE
+        # 6️⃣ Responder al frontend - SIN EXPONER INFORMACIÓN SENSIBLE
         return {
             "status": "success",
             "response": response_text,
@@ -141,119 +101,316 @@ async def chat_endpoint(
 
 
 # ============================================================================
-# 🔧 FUNCIÓN: EXTRAER INFORMACIÓN DE CONTACTO
+# 📡 ENDPOINT STREAMING: POST /api/chat/stream - SERVER-SENT EVENTS
 # ============================================================================
 
-def extract_contact_info(message: str) -> dict:
+@router.post("/chat/stream")
+async def chat_stream_endpoint(
+    request: Request,
+    query: ChatQuery,
+    background_tasks: BackgroundTasks
+):
     """
-    Extrae nombre, email, teléfono, tipo de cliente y problema del mensaje.
-    Formato esperado: nombre | email | tipoCliente | problema | telefono | Interesado en: servicio
+    Variante de /api/chat que entrega la respuesta token a token (SSE).
+    
+    Eventos (cada uno como "data: {json}"):
+    - {"type": "delta", "content": "..."}  → trozo de texto
+    - {"type": "done", "session_id": ..., "lead_score": ..., "is_lead": ..., "timestamp": ...}
+    - {"type": "error", "response": "..."}
+    
+    El turno completo se guarda en BD (y se calcula score/contacto)
+    recién cuando termina el stream.
     """
-    contact = {
-        "nombre": "",
-        "email": "",
-        "telefono": "",
-        "tipo_cliente": "",
-        "problema": "",
-        "servicio": ""
-    }
     
-    try:
-        # 1️⃣ INTENTAR PARSEAR FORMATO NUEVO
-        if " | " in message:
-            partes = message.split(" | ")
+    client_ip = request.client.host if request.client else "unknown"
+    
+    # Misma validación que /api/chat, antes de abrir el stream
+    if not query.message or len(query.message) > 1000:
+        logger.warning(f"⚠️ Mensaje inválido desde {client_ip}")
+        return JSONResponse(
+            status_code=400,
+            content={
+                "status": "error",
+                "response": "Mensaje debe tener entre 1 y 1000 caracteres.",
+                "session_id": query.session_id or None
+            }
+        )
+    
+    session_id = query.session_id or str(uuid.uuid4())
+    
+    async def eventos():
+        # Sesión de BD propia: el stream vive más que el handler
+        db = SessionLocal()
+        try:
+            turnos, history_with_bot, resumen, contacto, version = _cargar_contexto(db, session_id)
+            
+            partes = []
+            async for delta in stream_chatbot_response(
+                query.message, history_with_bot, resumen_a_texto(resumen)
+            ):
+                partes.append(delta)
+                yield _evento_sse({"type": "delta", "content": delta})
             
-            if len(partes) >= 6:
-                # Validar y sanitizar cada campo
-                contact["nombre"] = partes[0].strip()[:100]  # Máximo 100 caracteres
-                contact["email"] = partes[1].strip()[:255]
-                contact["tipo_cliente"] = partes[2].strip()[:50]
-                contact["problema"] = partes[3].strip()[:500]
-                contact["telefono"] = partes[4].strip()[:20]
-                
-                # Extraer servicio
-                servicio_parte = partes[5].strip()
-                if "Interesado en:" in servicio_parte:
-                    contact["servicio"] = servicio_parte.replace("Interesado en:", "").strip()[:100]
-                
-                logger.info(f"✅ Parseado formato nuevo: {contact['nombre']}")
-                return contact
+            lead_score, contact_info = _registrar_turno(
+                db, background_tasks, session_id, query.message, "".join(partes), turnos, resumen, contacto, version
+            )
+            
+            yield _evento_sse({
+                "type": "done",
+                "status": "success",
+                "session_id": session_id,
+                "lead_score": lead_score,
+                "is_lead": len(contact_info.get("telefono", "")) > 5,
+                "timestamp": datetime.utcnow().isoformat()
+            })
+        
+        except Exception as e:
+            logger.error(f"❌ Error en /api/chat/stream desde {client_ip}: {str(e)}")
+            db.rollback()
+            yield _evento_sse({
+                "type": "error",
+                "status": "error",
+                "response": "Error procesando tu mensaje. Intenta de nuevo.",
+                "session_id": session_id
+            })
+        
+        finally:
+            db.close()
     
-    except Exception as e:
-        logger.error(f"⚠️ Error parseando contacto: {str(e)}")
-    
-    # 2️⃣ FALLBACK: Extraer manualmente
-    
-    # EMAIL - Validación regex
-    email_pattern = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
-    email_match = re.search(email_pattern, message)
-    if email_match:
-        contact["email"] = email_match.group()[:255]
-    
-    # TELÉFONO - Validación múltiple
-    phone_patterns = [
-        r'\+\d{1,3}\s?\d{1,4}\s?\d{1,4}\s?\d{1,4}',
-        r'\+\d{1,3}\s?\d{7,14}',
-        r'(?:^|\s)(\d{2,4}\s?\d{3,4}\s?\d{4})',
-        r'3\d{9}',
-    ]
-    
-    for pattern in phone_patterns:
-        phone_match = re.search(pattern, message)
-        if phone_match:
-            telefono = phone_match.group().strip()
-            digitos = re.sub(r'\D', '', telefono)
-            if len(digitos) >= 8:
-                contact["telefono"] = telefono[:20]
-                break
-    
-    # NOMBRE - Validación
-    words = message.split()
-    palabras_excluir = [
-        "interesado", "en:", "automatización", "seguridad", "soporte", 
-        "consulta", "hola", "perfecto", "gracias", "particular", "comercio"
-    ]
-    
-    for word in words:
-        clean_word = word.replace(",", "").replace(".", "").replace("!", "").replace("?", "")
+    return StreamingResponse(
+        eventos(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+def _evento_sse(data: dict) -> str:
+    """Formatea un evento Server-Sent Events."""
+    return f"data: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+# ============================================================================
+# 🔧 FUNCIONES AUXILIARES DEL TURNO DE CHAT
+# ============================================================================
+
+def _cargar_contexto(db: Session, session_id: str):
+    """
+    Recupera los turnos recientes de la sesión, su resumen y los datos
+    de contacto ya detectados.
+    
+    Primero busca en la memoria de sesiones; si no está, recupera (o crea)
+    la sesión y sus últimos turnos desde la BD. La sesión entra a memoria
+    en _registrar_turno, una vez hecho el commit.
+    
+    Con varios workers la copia en memoria puede estar vieja (otro worker
+    registró turnos de la sesión). No se consulta la BD para saberlo: lo
+    detecta el UPDATE condicional de _registrar_turno, que en ese caso la
+    saca de memoria y el próximo turno la recarga.
+    
+    Retorna:
+    - turnos: lista de Turno (más viejo primero)
+    - history_with_bot: mensajes intercalados usuario/bot para el LLM
+    - resumen: resumen guardado de los turnos que ya salieron de la ventana
+    - contacto: campos de contacto ya completos de la sesión
+    - version: turnos_total de la sesión con el que se armó el contexto
+    """
+    
+    turnos = session_memory.get(session_id)
+    resumen = session_memory.get_resumen(session_id)
+    contacto = session_memory.get_contacto(session_id)
+    version = session_memory.get_version(session_id)
+    
+    if turnos is None:
+        session = db.query(ChatSession).filter(
+            ChatSession.session_id == session_id
+        ).first()
         
-        if (clean_word and 
-            clean_word[0].isupper() and 
-            len(clean_word) > 2 and 
-            clean_word.lower() not in palabras_excluir and
-            not any(char.isdigit() for char in clean_word) and
-            '@' not in clean_word):
+        if not session:
+            session = ChatSession(session_id=session_id)
+            db.add(session)
+            db.flush()
+            turnos = []
+            resumen = None
+            contacto = {}
+            version = 0
+        else:
+            # Últimos N turnos (los más recientes), en orden cronológico
+            history_records = db.query(ChatHistory).filter(
+                ChatHistory.session_id == session_id
+            ).order_by(ChatHistory.fecha.desc()).limit(settings.CHAT_HISTORY_LIMIT).all()
             
-            contact["nombre"] = clean_word[:100]
-            break
-    
-    # TIPO DE CLIENTE
-    tipo_patterns = {
-        "Particular": ["particular", "autónomo"],
-        "Comercio": ["comercio"],
-        "Oficina": ["oficina"],
-        "Empresa": ["empresa"]
-    }
+            turnos = [
+                Turno(h.mensaje_usuario, h.respuesta_bot)
+                for h in reversed(history_records)
+            ]
+            resumen = session.resumen
+            contacto = {
+                campo: getattr(session, campo)
+                for campo in CAMPOS_CONTACTO
+                if getattr(session, campo)
+            }
+            version = session.turnos_total or 0
     
-    message_lower = message.lower()
-    for tipo, palabras in tipo_patterns.items():
-        if any(p in message_lower for p in palabras):
-            contact["tipo_cliente"] = tipo
-            break
-    
-    # SERVICIO
-    servicio_patterns = {
-        "Automatización": ["automatización", "automatizar"],
-        "Seguridad IT": ["seguridad"],
-        "Soporte IT": ["soporte"],
-        "Consulta General": ["consulta"]
-    }
+    # Intercalar respuestas del bot
+    history_with_bot = []
+    for t in turnos:
+        history_with_bot.append({"role": "user", "content": t.mensaje_usuario})
+        history_with_bot.append({"role": "assistant", "content": t.respuesta_bot})
+    
+    return turnos, history_with_bot, resumen, contacto, version
+
+
+def _contacto_completo(contacto: dict) -> bool:
+    return bool(contacto.get("nombre") and contacto.get("email") and contacto.get("telefono"))
+
+
+def _registrar_turno(
+    db: Session,
+    background_tasks: BackgroundTasks,
+    session_id: str,
+    mensaje: str,
+    response_text: str,
+    turnos: list,
+    resumen: str = None,
+    contacto: dict = None,
+    version: int = 0
+):
+    """
+    Cierra un turno de chat: score, extracción de contacto, guardado
+    en BD y notificación (si el lead acaba de completar sus datos).
+    
+    El contacto se extrae solo del mensaje nuevo y solo para los campos
+    que faltan. Si la ventana de historial está llena, el turno más viejo
+    se pliega en el resumen de la sesión. Todo va en el mismo commit.
+    
+    La sesión se actualiza solo si sigue en `version` (UPDATE condicional):
+    si otro worker registró un turno en el medio, no se pisa su resumen y
+    la sesión sale de memoria para recargarse en el próximo turno.
+    
+    Retorna (lead_score, contact_info).
+    """
+    
+    contacto = contacto or {}
     
-    for servicio, palabras in servicio_patterns.items():
-        if any(p in message_lower for p in palabras):
-            contact["servicio"] = servicio
-            break
+    # Calcular score
+    lead_score = score_lead(mensaje)
     
+    # EXTRAER DATOS NUEVOS (solo los campos que la sesión todavía no tiene)
+    nuevos = actualizar_contacto(contacto, mensaje)
+    contact_info = {**contacto, **nuevos}
+    
+    # Guardar en base de datos
+    chat_history = ChatHistory(
+        session_id=session_id,
+        mensaje_usuario=mensaje,
+        respuesta_bot=response_text,
+        lead_score=lead_score
+    )
+    db.add(chat_history)
+    
+    cambios_sesion = {getattr(ChatSession, campo): valor for campo, valor in nuevos.items()}
+    
+    # Compactar: el turno más viejo sale de la ventana → al resumen
+    if len(turnos) >= settings.CHAT_HISTORY_LIMIT:
+        saliente = turnos[0]
+        resumen = compactar(resumen, saliente.mensaje_usuario, saliente.respuesta_bot)
+        cambios_sesion[ChatSession.resumen] = resumen
+        cambios_sesion[ChatSession.turnos_resumidos] = func.coalesce(ChatSession.turnos_resumidos, 0) + 1
+    
+    cambios_sesion[ChatSession.turnos_total] = version + 1
+    actualizada = db.query(ChatSession).filter(
+        ChatSession.session_id == session_id,
+        func.coalesce(ChatSession.turnos_total, 0) == version
+    ).update(cambios_sesion, synchronize_session=False)
+    
+    if not actualizada:
+        # Otro worker avanzó la sesión: guardar el contacto nuevo y contar
+        # el turno, pero no pisar el resumen que armó el otro
+        cambios_sesion.pop(ChatSession.resumen, None)
+        cambios_sesion.pop(ChatSession.turnos_resumidos, None)
+        cambios_sesion[ChatSession.turnos_total] = func.coalesce(ChatSession.turnos_total, 0) + 1
+        db.query(ChatSession).filter(
+            ChatSession.session_id == session_id
+        ).update(cambios_sesion, synchronize_session=False)
+    
+    # NOTIFICAR - Solo en el turno en que el lead completa sus datos
+    if _contacto_completo(contact_info) and not _contacto_completo(contacto):
+        servicio = contact_info.get("servicio", "No especificado")
+        
+        background_tasks.add_task(
+            notificar_nuevo_lead,
+            nombre=contact_info.get("nombre"),
+            email=contact_info.get("email"),
+            telefono=contact_info.get("telefono"),
+            mensaje=servicio,
+            lead_score=lead_score,
+            origen="chat",
+            tipo_cliente=contact_info.get("tipo_cliente", ""),
+            problema=contact_info.get("problema", "")
+        )
+        
+        logger.info(f"✅ Lead capturado: {contact_info.get('nombre')} ({contact_info.get('tipo_cliente')}) - {contact_info.get('telefono')}")
+    
+    db.commit()
+    
+    # Recién con el turno persistido, actualizar la memoria de la sesión
+    turno = Turno(mensaje, response_text)
+    if not actualizada:
+        session_memory.descartar(session_id)
+    elif session_id in session_memory:
+        session_memory.agregar_turno(session_id, turno)
+        session_memory.set_resumen(session_id, resumen)
+        session_memory.set_contacto(session_id, contact_info)
+        session_memory.set_version(session_id, version + 1)
+    else:
+        session_memory.cargar(session_id, turnos + [turno], resumen, contact_info, version + 1)
+    
+    return lead_score, contact_info
+
+
+# ============================================================================
+# 🔧 FUNCIÓN: EXTRAER INFORMACIÓN DE CONTACTO
+# ============================================================================
+
+CAMPOS_CONTACTO = ("nombre", "email", "telefono", "tipo_cliente", "problema", "servicio")
+
+
+def actualizar_contacto(contacto: dict, message: str) -> dict:
+    """
+    Completa el contacto de una sesión con un mensaje nuevo.
+    
+    Solo se buscan los campos que todavía faltan, y solo en este mensaje:
+    el costo es O(largo del mensaje), no O(conversación). Un campo ya
+    detectado no se pisa, salvo que llegue el formulario del chat (es
+    lo que el usuario cargó a propósito, manda sobre lo inferido).
+    
+    Retorna solo los campos nuevos o corregidos (puede ser {}).
+    """
+    
+    # 1️⃣ FORMATO DEL FORMULARIO (trae todo junto)
+    formulario = parsear_formulario(message)
+    if formulario:
+        logger.info(f"✅ Parseado formato nuevo: {formulario['nombre']}")
+        return {
+            campo: valor
+            for campo, valor in formulario.items()
+            if valor and valor != contacto.get(campo)
+        }
+    
+    # 2️⃣ MENSAJE LIBRE: una pasada del extractor, solo por lo que falta
+    faltantes = [campo for campo in CAMPOS_CONTACTO if not contacto.get(campo)]
+    if not faltantes:
+        return {}
+    return extractor.extraer(message, faltantes)
+
+
+def extract_contact_info(message: str) -> dict:
+    """
+    Extrae nombre, email, teléfono, tipo de cliente y problema del mensaje.
+    Formato esperado: nombre | email | tipoCliente | problema | telefono | Interesado en: servicio
+    """
+    contact = dict.fromkeys(CAMPOS_CONTACTO, "")
+    contact.update(actualizar_contacto({}, message))
     return contact
 
 
@@ -352,6 +509,19 @@ async def get_session_history(
         }
 
 
+@router.get("/chat/metrics")
+async def chat_metrics():
+    """Métricas internas del motor de chat (proveedores, cache, single-flight, memoria, prompts)."""
+    return {
+        "status": "success",
+        "llm": llm_stats(),
+        "cache": completion_cache.stats(),
+        "single_flight": single_flight.stats(),
+        "memoria_sesiones": session_memory.stats(),
+        "prompts": prompt_store.stats()
+    }
+
+
 @router.get("/health")
 async def health_check():
     """Health check para monitoreo."""
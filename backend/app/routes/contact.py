@@ -6,31 +6,36 @@ POST /api/contact - Recibe formularios del landing page
 Flujo:
 1. Usuario completa formulario en la landing
 2. Frontend envía datos a /api/contact
-3. Se valida y guarda en BD
-4. Se envía email de confirmación (usuario + admin)
-5. Se notifica por Telegram (al admin)
-6. Se dispara webhook a n8n (para agendar cita)
-7. Respuesta al frontend
+3. Se valida y guarda en BD, junto con los eventos del outbox
+4. Respuesta al frontend
+5. El outbox (app/workers/outbox.py) procesa en segundo plano, con reintentos:
+   - Email de confirmación (usuario) y de notificación (admin)
+   - Notificación por Telegram (al admin)
+   - Lead en Airtable
+   - Webhook a n8n (para agendar cita)
 """
 
+import asyncio
 import os
 import json
-import httpx
 import logging
 from datetime import datetime
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 
-from app.database import get_db
+from app.database import SessionLocal, get_db
 from app.schemas import ContactForm
 from app.models.lead import Lead
 from app.ai.lead_scorer import score_lead
 from app.config import settings
 from app.integrations.telegram import send_telegram_message
-from app.integrations.sendgrid import send_email_sendgrid
+from app.integrations.plantillas_telegram import NUEVO_LEAD_FORMULARIO, RESUMEN_LEAD
+from app.integrations.sendgrid import send_email_confirmacion_usuario, send_email_nuevo_lead_admin
 from app.integrations.airtable import save_lead_to_airtable
+from app.integrations.http_clients import cliente_http
+from app.workers.outbox import encolar, manejador, outbox
 
 # Configurar logging
 logger = logging.getLogger(__name__)
@@ -45,7 +50,6 @@ router = APIRouter()
 @router.post("/contact")
 async def contact_submit(
     form: ContactForm,
-    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
 ):
     """
@@ -94,63 +98,42 @@ async def contact_submit(
         )
         logger.info(f"⭐ Lead Score: {lead_score}/100")
         
-        # Paso 3: Guardar en base de datos
+        # Paso 3: Guardar lead + eventos del outbox (una sola transacción)
         # ====================================================================
         nuevo_lead = Lead(
             nombre=form.name,
             email=form.email,
-            phone=form.phone,
+            telefono=form.phone,
             mensaje=form.message,
             lead_score=lead_score,
             origen="formulario_landing"
         )
         db.add(nuevo_lead)
+        db.flush()  # Asigna el ID sin confirmar todavía
+        
+        datos = {
+            "nombre": form.name,
+            "email": form.email,
+            "telefono": form.phone,
+            "mensaje": form.message
+        }
+        fecha = datetime.utcnow().isoformat()
+        
+        # Un evento por efecto: si falla Airtable no se reenvían los emails
+        encolar(db, "email_confirmacion_usuario", **datos)
+        encolar(db, "email_nuevo_lead_admin", **datos, fecha=fecha, lead_score=lead_score)
+        encolar(db, "telegram_nuevo_lead", **datos, lead_score=lead_score)
+        encolar(db, "airtable_nuevo_lead", **datos, lead_score=lead_score, fecha=fecha, lead_id=nuevo_lead.id)
+        encolar(db, "n8n_nuevo_lead", **datos, lead_score=lead_score, fecha=fecha)
+        
         db.commit()
         db.refresh(nuevo_lead)  # Obtener el ID asignado
         
         logger.info(f"✅ Lead guardado en BD con ID: {nuevo_lead.id}")
         
-        # Paso 4: Procesar en background (no bloquear respuesta)
+        # Paso 4: Avisar al outbox (procesa en segundo plano, con reintentos)
         # ====================================================================
-        # Enviar emails
-        background_tasks.add_task(
-            enviar_emails,
-            nombre=form.name,
-            email=form.email,
-            telefono=form.phone,
-            mensaje=form.message
-        )
-        
-        # Notificar Telegram
-        background_tasks.add_task(
-            notificar_telegram,
-            nombre=form.name,
-            email=form.email,
-            telefono=form.phone,
-            mensaje=form.message,
-            lead_score=lead_score
-        )
-        
-        # Guardar en Airtable
-        background_tasks.add_task(
-            guardar_airtable,
-            nombre=form.name,
-            email=form.email,
-            telefono=form.phone,
-            mensaje=form.message,
-            lead_score=lead_score,
-            fecha=datetime.utcnow().isoformat()
-        )
-        
-        # Disparar webhook n8n
-        background_tasks.add_task(
-            dispara_webhook_n8n,
-            nombre=form.name,
-            email=form.email,
-            telefono=form.phone,
-            mensaje=form.message,
-            lead_score=lead_score
-        )
+        outbox.despertar()
         
         # Paso 5: Respuesta inmediata al usuario
         # ====================================================================
@@ -174,127 +157,61 @@ async def contact_submit(
 
 
 # ============================================================================
-# 📧 FUNCIÓN AUXILIAR: ENVIAR EMAILS
+# 📧 MANEJADORES DEL OUTBOX: EMAILS
 # ============================================================================
+# Los manejadores lanzan excepción si el envío falla: el outbox reintenta.
+# Si la integración no está configurada, no hay nada que reintentar.
 
-async def enviar_emails(
+@manejador("email_confirmacion_usuario")
+async def enviar_email_usuario(
     nombre: str,
     email: str,
     telefono: str,
     mensaje: str
 ):
-    """
-    Envía 2 emails:
-    1. Al usuario (confirmación)
-    2. Al admin (notificación)
-    """
+    """Email de confirmación al usuario (plantilla "confirmacion_usuario")."""
     
-    try:
-        # Email 1: Confirmación para el usuario
-        # ====================================================================
-        html_usuario = f"""
-        <div style="font-family: Arial, sans-serif; color: #333; line-height: 1.6;">
-            <h2 style="color: #0f172a;">¡Hola {nombre}!</h2>
-            
-            <p>Gracias por contactarme. He recibido tu mensaje correctamente:</p>
-            
-            <blockquote style="background: #f9f9f9; padding: 15px; border-left: 5px solid #22c55e;">
-                "{mensaje}"
-            </blockquote>
-            
-            <p><strong>Tus datos:</strong></p>
-            <ul>
-                <li>📧 Email: {email}</li>
-                <li>📱 WhatsApp: {telefono}</li>
-            </ul>
-            
-            <p>Me pondré en contacto contigo a la brevedad para analizar cómo podemos automatizar tus procesos.</p>
-            
-            <hr style="border: none; border-top: 1px solid #eee; margin: 20px 0;">
-            
-            <p><strong>Opciones rápidas:</strong></p>
-            <ul>
-                <li>📞 Llamarme: {telefono}</li>
-                <li>💬 WhatsApp: <a href="https://wa.me/{telefono.replace('+', '').replace(' ', '')}">Abrir chat</a></li>
-            </ul>
-            
-            <hr style="border: none; border-top: 1px solid #eee; margin: 20px 0;">
-            
-            <p>Saludos,<br>
-            <strong>Luciano Valinoti</strong><br>
-            <em>Especialista en Automatización IT</em></p>
-        </div>
-        """
-        
-        await send_email_sendgrid(
-            to_email=email,
-            subject="Recibí tu consulta - Luciano Valinoti",
-            html_content=html_usuario
-        )
-        logger.info(f"✅ Email de confirmación enviado a {email}")
-        
-        # Email 2: Notificación para el admin (Luciano)
-        # ====================================================================
-        html_admin = f"""
-        <div style="font-family: Arial, sans-serif; max-width: 600px; border: 1px solid #eee; border-radius: 10px; overflow: hidden;">
-            
-            <div style="background: linear-gradient(135deg, #0f172a 0%, #1e293b 100%); color: #22c55e; padding: 20px; text-align: center;">
-                <h2 style="margin: 0;">🚀 NUEVO LEAD DETECTADO</h2>
-            </div>
-            
-            <div style="padding: 20px;">
-                <table style="width: 100%; border-collapse: collapse;">
-                    <tr>
-                        <td style="padding: 10px; background: #f9f9f9; font-weight: bold; width: 120px;">👤 Nombre:</td>
-                        <td style="padding: 10px;">{nombre}</td>
-                    </tr>
-                    <tr>
-                        <td style="padding: 10px; background: #f9f9f9; font-weight: bold;">📧 Email:</td>
-                        <td style="padding: 10px;"><a href="mailto:{email}">{email}</a></td>
-                    </tr>
-                    <tr>
-                        <td style="padding: 10px; background: #f9f9f9; font-weight: bold;">📱 Teléfono:</td>
-                        <td style="padding: 10px;"><a href="https://wa.me/{telefono.replace('+', '').replace(' ', '')}">{telefono}</a></td>
-                    </tr>
-                    <tr>
-                        <td style="padding: 10px; background: #f9f9f9; font-weight: bold;">💬 Mensaje:</td>
-                        <td style="padding: 10px;">{mensaje}</td>
-                    </tr>
-                </table>
-                
-                <div style="margin-top: 20px; padding: 15px; background: #f0f9ff; border-left: 4px solid #22c55e;">
-                    <p style="margin: 0;"><strong>⏰ Timestamp:</strong> {datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')} UTC</p>
-                </div>
-                
-                <div style="text-align: center; margin-top: 20px;">
-                    <a href="https://wa.me/{telefono.replace('+', '').replace(' ', '')}?text=Hola%20{nombre},%20vi%20tu%20consulta..." 
-                       style="display: inline-block; background: #25D366; color: white; padding: 12px 24px; text-decoration: none; border-radius: 8px; font-weight: bold; margin-right: 10px;">
-                        📲 RESPONDER POR WHATSAPP
-                    </a>
-                    <a href="mailto:{email}" 
-                       style="display: inline-block; background: #0066cc; color: white; padding: 12px 24px; text-decoration: none; border-radius: 8px; font-weight: bold;">
-                        📧 RESPONDER POR EMAIL
-                    </a>
-                </div>
-            </div>
-        </div>
-        """
-        
-        await send_email_sendgrid(
-            to_email=settings.SENDGRID_FROM_EMAIL,  # A ti mismo (admin)
-            subject=f"🚀 NUEVO LEAD: {nombre}",
-            html_content=html_admin
-        )
-        logger.info(f"✅ Email de notificación enviado al admin")
+    if not settings.SENDGRID_API_KEY:
+        logger.warning("⚠️ SendGrid no configurado: se omite el email al usuario")
+        return
     
-    except Exception as e:
-        logger.error(f"❌ Error enviando emails: {str(e)}")
+    if not await send_email_confirmacion_usuario(nombre=nombre, email=email, telefono=telefono, mensaje=mensaje):
+        raise RuntimeError(f"SendGrid no aceptó el email a {email}")
+    logger.info(f"✅ Email de confirmación enviado a {email}")
+
+
+@manejador("email_nuevo_lead_admin")
+async def enviar_email_admin(
+    nombre: str,
+    email: str,
+    telefono: str,
+    mensaje: str,
+    fecha: str,
+    lead_score: Optional[int] = None
+):
+    """Email de notificación al admin (Luciano), plantilla "nuevo_lead_admin"."""
+    
+    if not settings.SENDGRID_API_KEY:
+        logger.warning("⚠️ SendGrid no configurado: se omite el email al admin")
+        return
+    
+    if not await send_email_nuevo_lead_admin(
+        nombre=nombre,
+        email=email,
+        telefono=telefono,
+        mensaje=mensaje,
+        lead_score=lead_score,
+        fecha=fecha
+    ):
+        raise RuntimeError("SendGrid no aceptó el email al admin")
+    logger.info(f"✅ Email de notificación enviado al admin")
 
 
 # ============================================================================
-# 🤖 FUNCIÓN AUXILIAR: NOTIFICAR TELEGRAM
+# 🤖 MANEJADOR DEL OUTBOX: NOTIFICAR TELEGRAM
 # ============================================================================
 
+@manejador("telegram_nuevo_lead")
 async def notificar_telegram(
     nombre: str,
     email: str,
@@ -306,68 +223,88 @@ async def notificar_telegram(
     Envía notificación instantánea por Telegram al admin.
     """
     
-    try:
-        telegram_text = f"""
-🚀 <b>NUEVO LEAD - FORMULARIO</b>
-
-👤 <b>Nombre:</b> {nombre}
-📧 <b>Email:</b> {email}
-📱 <b>WhatsApp:</b> {telefono}
-💬 <b>Mensaje:</b> {mensaje}
-⭐ <b>Lead Score:</b> {lead_score}/100
-
-<a href="https://wa.me/{telefono.replace('+', '').replace(' ', '')}">📲 WHATSAPP</a> | <a href="mailto:{email}">📧 EMAIL</a>
-"""
-        
-        await send_telegram_message(telegram_text)
-        logger.info(f"✅ Notificación Telegram enviada")
+    datos = {
+        "nombre": nombre,
+        "email": email,
+        "telefono": telefono,
+        "mensaje": mensaje,
+        "lead_score": lead_score,
+        "tiene_score": lead_score is not None,
+        "emoji_score": "⚡",
+        "origen": "formulario"
+    }
     
-    except Exception as e:
-        logger.error(f"❌ Error en Telegram: {str(e)}")
+    # Leads fríos: en una ráfaga salen agrupados en un resumen
+    enviado = await send_telegram_message(
+        NUEVO_LEAD_FORMULARIO.render(datos),
+        agrupable=lead_score < settings.TELEGRAM_DIGEST_SCORE,
+        resumen=RESUMEN_LEAD.render(datos)
+    )
+    if not enviado:
+        raise RuntimeError("Telegram no aceptó la notificación")
+    logger.info(f"✅ Notificación Telegram enviada")
 
 
 # ============================================================================
-# 📊 FUNCIÓN AUXILIAR: GUARDAR EN AIRTABLE
+# 📊 MANEJADOR DEL OUTBOX: GUARDAR EN AIRTABLE
 # ============================================================================
 
+def _tiene_record_airtable(lead_id: int) -> bool:
+    with SessionLocal() as db:
+        return db.query(Lead.airtable_record_id).filter(Lead.id == lead_id).scalar() is not None
+
+
+@manejador("airtable_nuevo_lead")
 async def guardar_airtable(
     nombre: str,
     email: str,
     telefono: str,
     mensaje: str,
     lead_score: int,
-    fecha: str
+    fecha: str,
+    lead_id: Optional[int] = None
 ):
     """
     Guarda el lead en Airtable para tener CRM visual.
+    El record ID que devuelve Airtable queda en Lead.airtable_record_id.
     """
     
-    try:
-        await save_lead_to_airtable(
-            nombre=nombre,
-            email=email,
-            telefono=telefono,
-            mensaje=mensaje,
-            lead_score=lead_score,
-            origen="formulario_landing",
-            fecha=fecha
-        )
-        logger.info(f"✅ Lead guardado en Airtable")
+    if not settings.AIRTABLE_TOKEN or not settings.AIRTABLE_BASE_ID:
+        logger.warning("⚠️ Airtable no configurado: se omite el lead")
+        return
     
-    except Exception as e:
-        logger.error(f"❌ Error guardando en Airtable: {str(e)}")
+    # Si la sincronización ya lo creó (ej: el evento estuvo muerto), no duplicarlo
+    if lead_id is not None and await asyncio.to_thread(_tiene_record_airtable, lead_id):
+        logger.info(f"⏭️ Lead {lead_id} ya está en Airtable")
+        return
+    
+    resultado = await save_lead_to_airtable(
+        nombre=nombre,
+        email=email,
+        telefono=telefono,
+        mensaje=mensaje,
+        lead_score=lead_score,
+        origen="formulario_landing",
+        fecha=fecha,
+        lead_id=lead_id
+    )
+    if not resultado["exito"]:
+        raise RuntimeError(f"Airtable: {resultado['mensaje']}")
+    logger.info(f"✅ Lead guardado en Airtable")
 
 
 # ============================================================================
-# 🔄 FUNCIÓN AUXILIAR: DISPARAR WEBHOOK A n8n
+# 🔄 MANEJADOR DEL OUTBOX: DISPARAR WEBHOOK A n8n
 # ============================================================================
 
+@manejador("n8n_nuevo_lead")
 async def dispara_webhook_n8n(
     nombre: str,
     email: str,
     telefono: str,
     mensaje: str,
-    lead_score: int
+    lead_score: int,
+    fecha: str
 ):
     """
     Dispara webhook a n8n para:
@@ -383,22 +320,16 @@ async def dispara_webhook_n8n(
         "telefono": telefono,
         "mensaje": mensaje,
         "lead_score": lead_score,
-        "timestamp": datetime.utcnow().isoformat()
+        "timestamp": fecha
     }
     
-    try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                settings.N8N_WEBHOOK_URL,
-                json=payload,
-                timeout=settings.N8N_TIMEOUT
-            )
-            logger.info(f"✅ Webhook n8n disparado. Status: {response.status_code}")
+    # Timeout o error de red: la excepción sube y el outbox reintenta
+    client = cliente_http("n8n")
+    response = await client.post(settings.N8N_WEBHOOK_URL, json=payload)
     
-    except httpx.TimeoutException:
-        logger.warning(f"⏱️  n8n timeout. Continuando sin esperar respuesta.")
-    except Exception as e:
-        logger.error(f"❌ Error disparando n8n: {str(e)}")
+    if response.status_code >= 500:
+        raise RuntimeError(f"n8n respondió {response.status_code}")
+    logger.info(f"✅ Webhook n8n disparado. Status: {response.status_code}")
 
 
 # ============================================================================
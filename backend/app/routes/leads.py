@@ -4,6 +4,7 @@ ENDPOINT DE ADMINISTRACIÓN DE LEADS
 GET/POST endpoints para que el admin (Luciano) gestione los leads
 """
 
+import asyncio
 import logging
 from datetime import datetime, timedelta
 from typing import Optional
@@ -16,6 +17,11 @@ from sqlalchemy import func
 from app.database import get_db
 from app.models.lead import Lead, ChatSession, ChatHistory
 from app.config import settings
+from app.schemas import ScoreExplicarQuery
+from app.ai.lead_scorer import explicar_score
+from app.workers.outbox import outbox
+from app.integrations.airtable_sync import airtable_sync
+from app.integrations.sendgrid_bulk import sendgrid_bulk
 
 logger = logging.getLogger(__name__)
 
@@ -175,6 +181,89 @@ async def list_leads(
         raise HTTPException(status_code=500, detail="Error listando leads")
 
 
+# ============================================================================
+# 📤 OUTBOX - Cola de emails/Telegram/Airtable/n8n pendientes
+# ============================================================================
+# (antes de /leads/{lead_id} para que "outbox" no se tome como un ID)
+
+@router.get("/leads/outbox")
+async def get_outbox_stats():
+    """Profundidad de la cola, eventos muertos y contadores del worker."""
+    
+    return await asyncio.to_thread(outbox.stats)
+
+
+@router.post("/leads/outbox/{evento_id}/reintentar")
+async def reintentar_evento_outbox(evento_id: int):
+    """Vuelve a encolar un evento muerto (dead letter)."""
+    
+    if not await asyncio.to_thread(outbox.reintentar, evento_id):
+        raise HTTPException(status_code=404, detail="Evento muerto no encontrado")
+    
+    outbox.despertar()
+    logger.info(f"🔁 Evento del outbox {evento_id} reencolado")
+    return {"status": "success", "evento_id": evento_id}
+
+
+# ============================================================================
+# 🔄 SINCRONIZACIÓN CON AIRTABLE
+# ============================================================================
+
+@router.get("/leads/sync/airtable")
+async def get_airtable_sync_stats():
+    """Watermarks y resultado de la última sincronización con Airtable."""
+    
+    return await asyncio.to_thread(airtable_sync.stats)
+
+
+@router.post("/leads/sync/airtable")
+async def sincronizar_airtable():
+    """Sincroniza ahora (solo lo cambiado desde la última corrida)."""
+    
+    if not settings.AIRTABLE_TOKEN or not settings.AIRTABLE_BASE_ID:
+        raise HTTPException(status_code=400, detail="Airtable no configurado")
+    
+    return await airtable_sync.sincronizar()
+
+
+# ============================================================================
+# 📨 POST /api/leads/campanas/seguimiento - EMAIL DE SEGUIMIENTO MASIVO
+# ============================================================================
+
+@router.post("/leads/campanas/seguimiento")
+async def campana_seguimiento(
+    db: Session = Depends(get_db),
+    estado: EstadoLead = EstadoLead.CONTACTADO,
+    dias_sin_actividad: int = Query(7, ge=0, le=365),
+    score_min: int = Query(0, ge=0, le=100),
+    limit: int = Query(500, ge=1, le=5000)
+):
+    """
+    Email de seguimiento a los leads que se enfriaron.
+    Salen todos juntos: cientos de leads = un puñado de requests a SendGrid.
+    
+    Ejemplo:
+    POST /api/leads/campanas/seguimiento?estado=contactado&dias_sin_actividad=10
+    """
+    
+    if not settings.SENDGRID_API_KEY:
+        raise HTTPException(status_code=400, detail="SendGrid no configurado")
+    
+    limite_actividad = datetime.utcnow() - timedelta(days=dias_sin_actividad)
+    leads = db.query(Lead.nombre, Lead.email, Lead.mensaje).filter(
+        Lead.estado == estado.value,
+        Lead.lead_score >= score_min,
+        Lead.fecha_ultima_actividad <= limite_actividad
+    ).order_by(Lead.fecha_ultima_actividad).limit(limit).all()
+    
+    destinatarios = [
+        (lead.email, {"nombre": lead.nombre, "mensaje": lead.mensaje})
+        for lead in leads
+        if lead.email
+    ]
+    return await sendgrid_bulk.campana("seguimiento", destinatarios)
+
+
 # ============================================================================
 # 📄 GET /api/leads/{lead_id} - VER DETALLES DE UN LEAD
 # ============================================================================
@@ -238,6 +327,56 @@ async def get_lead_detail(
         raise HTTPException(status_code=500, detail="Error obteniendo detalles")
 
 
+# ============================================================================
+# 🔎 SCORE EXPLICADO - Qué factores y palabras arman el score
+# ============================================================================
+
+@router.post("/leads/score/explicar")
+async def explicar_score_mensaje(query: ScoreExplicarQuery):
+    """
+    Explica el score que tendría un mensaje.
+    
+    Ejemplo:
+    POST /api/leads/score/explicar
+    {"mensaje": "Necesito automatizar 50 facturas", "tiene_contacto": true}
+    """
+    
+    return explicar_score(
+        query.mensaje,
+        query.tiene_contacto,
+        query.tiene_intencion,
+        query.historial_length
+    ).to_dict()
+
+
+@router.get("/leads/{lead_id}/score")
+async def explicar_score_lead(
+    lead_id: int,
+    db: Session = Depends(get_db)
+):
+    """
+    Recalcula y explica el score de un lead guardado.
+    Los leads del formulario siempre tienen contacto e intención.
+    """
+    
+    lead = db.query(Lead).filter(Lead.id == lead_id).first()
+    
+    if not lead:
+        raise HTTPException(status_code=404, detail="Lead no encontrado")
+    
+    explicacion = explicar_score(
+        lead.mensaje or "",
+        tiene_contacto=bool(lead.email or lead.telefono),
+        tiene_intencion=True
+    )
+    
+    return {
+        "lead_id": lead.id,
+        "score_guardado": lead.lead_score,
+        **explicacion.to_dict()
+    }
+
+
 # ============================================================================
 # ✏️ PUT /api/leads/{lead_id} - ACTUALIZAR ESTADO DE UN LEAD
 # ============================================================================
@@ -267,6 +406,7 @@ async def update_lead(
             lead.notas = notas
         
         db.commit()
+        airtable_sync.despertar()  # Que el cambio llegue a Airtable sin esperar el intervalo
         
         logger.info(f"✏️  Lead {lead_id}: {estado_anterior} → {estado.value}")
         
@@ -121,6 +121,23 @@ class LeadListResponse(BaseModel):
     total: int
     leads: List[LeadResponse]
 
+class ScoreExplicarQuery(BaseModel):
+    """Schema para explicar el score de un mensaje (admin)."""
+    mensaje: str = Field(..., min_length=1, max_length=2000, description="Mensaje a puntuar")
+    tiene_contacto: bool = False
+    tiene_intencion: bool = False
+    historial_length: int = Field(0, ge=0)
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "mensaje": "Necesito automatizar el envío de 50 facturas diarias",
+                "tiene_contacto": True,
+                "tiene_intencion": True,
+                "historial_length": 0
+            }
+        }
+
 # ============================================================================
 # 📅 CITAS / AGENDAR
 # ============================================================================
@@ -0,0 +1,132 @@
+# app/utils/batching.py
+"""
+MICRO-BATCHER - Juntar llamadas concurrentes en un solo request
+
+¿Para qué?
+- APIs como Airtable aceptan varios registros por request (10): si llegan
+  5 leads a la vez, mandarlos juntos es 1 llamada en vez de 5
+- Quien llama sigue viendo una función de a un elemento: espera su
+  resultado como si hubiera hecho la llamada sola
+
+Cómo funciona:
+- enviar(item) agrega el item al lote abierto y espera su resultado
+- El lote se despacha cuando llega a `max_lote` o cuando pasan
+  `max_espera` segundos desde el primer item (lo que ocurra primero)
+- `procesar(items)` recibe la lista y devuelve un resultado por item, en
+  el mismo orden. Si lanza excepción, la reciben todos los del lote; si
+  un resultado ES una excepción, solo ese item la recibe
+- Si quien espera se cancela antes del despacho, su item se saca del lote
+
+Los lotes pueden salir en paralelo: el ritmo contra el proveedor lo pone
+`procesar` (por ejemplo, con un TokenBucket).
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class MicroBatcher:
+    """
+    Ejemplo:
+    async def crear_registros(filas): ...   # 1 request, retorna un id por fila
+    lote = MicroBatcher("airtable_leads", crear_registros, max_lote=10, max_espera=0.25)
+    record_id = await lote.enviar(fila)
+    """
+
+    def __init__(
+        self,
+        nombre: str,
+        procesar: Callable[[List[Any]], Awaitable[List[Any]]],
+        max_lote: int,
+        max_espera: float
+    ):
+        self.nombre = nombre
+        self.procesar = procesar
+        self.max_lote = max_lote
+        self.max_espera = max_espera
+
+        self._pendientes: List[Tuple[Any, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._en_curso: Set[asyncio.Task] = set()
+
+        self.lotes = 0
+        self.items = 0
+        self.mayor_lote = 0
+        self.errores = 0
+
+    async def enviar(self, item: Any) -> Any:
+        """Agrega `item` al lote abierto y espera su resultado."""
+
+        loop = asyncio.get_running_loop()
+        entrada = (item, loop.create_future())
+        self._pendientes.append(entrada)
+
+        if len(self._pendientes) >= self.max_lote:
+            self._despachar()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_espera, self._despachar)
+
+        try:
+            return await entrada[1]
+        except asyncio.CancelledError:
+            if entrada in self._pendientes:
+                self._pendientes.remove(entrada)
+            raise
+
+    def _despachar(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        pendientes = [e for e in self._pendientes if not e[1].done()]
+        self._pendientes = []
+
+        for inicio in range(0, len(pendientes), self.max_lote):
+            tarea = asyncio.create_task(self._procesar_lote(pendientes[inicio:inicio + self.max_lote]))
+            self._en_curso.add(tarea)
+            tarea.add_done_callback(self._en_curso.discard)
+
+    async def _procesar_lote(self, lote: List[Tuple[Any, asyncio.Future]]) -> None:
+        self.lotes += 1
+        self.items += len(lote)
+        self.mayor_lote = max(self.mayor_lote, len(lote))
+
+        try:
+            resultados = await self.procesar([item for item, _ in lote])
+            if len(resultados) != len(lote):
+                raise RuntimeError(f"{self.nombre}: {len(resultados)} resultados para {len(lote)} items")
+        except Exception as e:
+            self.errores += 1
+            for _, futuro in lote:
+                if not futuro.done():
+                    futuro.set_exception(e)
+            return
+
+        for (_, futuro), resultado in zip(lote, resultados):
+            if futuro.done():
+                continue
+            if isinstance(resultado, Exception):
+                futuro.set_exception(resultado)
+            else:
+                futuro.set_result(resultado)
+
+    async def cerrar(self) -> None:
+        """Despacha lo pendiente y espera los lotes en curso. Llamar en el shutdown."""
+
+        if self._pendientes:
+            self._despachar()
+        if self._en_curso:
+            await asyncio.gather(*self._en_curso, return_exceptions=True)
+
+    def stats(self) -> dict:
+        return {
+            "lotes": self.lotes,
+            "items": self.items,
+            "promedio_por_lote": round(self.items / self.lotes, 2) if self.lotes else None,
+            "mayor_lote": self.mayor_lote,
+            "errores": self.errores,
+            "pendientes": len(self._pendientes)
+        }
@@ -0,0 +1,301 @@
+# app/utils/plantillas.py
+"""
+MOTOR DE PLANTILLAS - Compiladas una vez a funciones, con escape automático
+
+¿Para qué?
+- Los emails y avisos de Telegram se armaban con f-strings sueltos, cada uno
+  con su propio .replace("<", "&lt;") (y a veces sin ninguno) y su propio
+  armado del link de wa.me
+- Que escapar no dependa de acordarse: todo valor sale escapado para HTML
+- Que la versión en texto plano del email salga sola de la misma plantilla
+
+Sintaxis:
+    {campo}                 valor, escapado para HTML
+    {campo|wa}              con filtros (se aplican antes de escapar):
+                              wa     -> solo dígitos (para https://wa.me/...)
+                              url    -> codificado para una URL (?text=...)
+                              titulo -> "formulario_landing" -> "Formulario Landing"
+                              150    -> recortado a 150 caracteres (con "...")
+    {?campo}...{/campo}     el bloque solo si campo tiene valor
+    {!campo}...{/campo}     el bloque solo si campo NO tiene valor
+    {{ y }}                 llaves literales
+
+Cómo funciona:
+- Al crear la Plantilla (al importar el módulo que la define, o sea en el
+  startup) se parsea y se genera el código de una función:
+      def render(d): return "".join(("<p>Hola ", _e(_t(d.get("nombre"))), "</p>"))
+  Renderizar es llamar esa función: sin parseo ni formato en cada envío,
+  un solo join y solo se escapan los valores que tienen caracteres especiales
+- texto=True: también se compila la versión en texto plano (etiquetas
+  quitadas, links como "texto (url)", listas con viñetas), sin escapar
+- con_etiquetas(): para SendGrid masivo, el cuerpo con etiquetas -campo- y
+  una función que arma el dict de sustituciones de cada destinatario
+
+Uso:
+    saludo = Plantilla("<b>Hola {nombre}</b> <a href='https://wa.me/{telefono|wa}'>WhatsApp</a>")
+    saludo.render({"nombre": "Juan & Cía", "telefono": "+54 9 351"})
+    # "<b>Hola Juan &amp; Cía</b> <a href='https://wa.me/549351'>WhatsApp</a>"
+"""
+
+import html
+import re
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import quote
+
+_TOKEN = re.compile(r"\{\{|\}\}|\{([?!/]?)([A-Za-z_]\w*)((?:\|[^|{}]+)*)\}")
+_ESPECIALES = re.compile(r"[&<>\"']")
+_NO_DIGITOS = re.compile(r"\D")
+
+
+# ============================================================================
+# 🔧 FUNCIONES QUE USA EL CÓDIGO GENERADO
+# ============================================================================
+
+def _texto(valor) -> str:
+    if valor is None:
+        return ""
+    return valor if type(valor) is str else str(valor)
+
+
+def _escapar(valor: str, _buscar=_ESPECIALES.search) -> str:
+    # La mayoría de los valores no tienen nada que escapar: no copiarlos
+    return html.escape(valor) if _buscar(valor) else valor
+
+
+def _valor_escapado(valor, _buscar=_ESPECIALES.search) -> str:
+    # _escapar(_texto(valor)) en una sola llamada: el caso de casi todos los {campo}
+    if valor is None:
+        return ""
+    if type(valor) is not str:
+        valor = str(valor)
+    return html.escape(valor) if _buscar(valor) else valor
+
+
+def _recortar(largo: int) -> Callable[[str], str]:
+    return lambda valor: valor if len(valor) <= largo else valor[:largo] + "..."
+
+
+FILTROS: Dict[str, Callable[[str], str]] = {
+    "wa": lambda valor: _NO_DIGITOS.sub("", valor),
+    "url": lambda valor: quote(valor, safe=""),
+    "titulo": lambda valor: valor.replace("_", " ").title()
+}
+
+
+# ============================================================================
+# 🧩 PARSEO Y GENERACIÓN DE CÓDIGO
+# ============================================================================
+
+def _parsear(fuente: str) -> list:
+    """Fuente -> árbol de nodos: ("lit", texto) | ("var", campo, filtros) | ("si"/"no", campo, hijos)."""
+
+    raiz: list = []
+    pila: List[Tuple[str, list]] = [("", raiz)]
+    posicion = 0
+
+    def literal(texto: str) -> None:
+        nodos = pila[-1][1]
+        if nodos and nodos[-1][0] == "lit":
+            nodos[-1] = ("lit", nodos[-1][1] + texto)
+        elif texto:
+            nodos.append(("lit", texto))
+
+    for token in _TOKEN.finditer(fuente):
+        literal(fuente[posicion:token.start()])
+        posicion = token.end()
+
+        if token.group(0) in ("{{", "}}"):
+            literal(token.group(0)[0])
+            continue
+
+        marca, campo, filtros = token.group(1), token.group(2), token.group(3)
+        if marca == "/":
+            if pila[-1][0] != campo:
+                raise ValueError(f"Plantilla: {{/{campo}}} no cierra ningún bloque abierto")
+            pila.pop()
+        elif marca in ("?", "!"):
+            hijos: list = []
+            pila[-1][1].append(("si" if marca == "?" else "no", campo, hijos))
+            pila.append((campo, hijos))
+        else:
+            nombres = tuple(filtro.strip() for filtro in filtros.split("|")[1:])
+            for nombre in nombres:
+                if nombre not in FILTROS and not nombre.isdigit():
+                    raise ValueError(f"Plantilla: filtro desconocido '{nombre}'")
+            pila[-1][1].append(("var", campo, nombres))
+
+    literal(fuente[posicion:])
+    if len(pila) > 1:
+        raise ValueError(f"Plantilla: falta cerrar {{/{pila[-1][0]}}}")
+    return raiz
+
+
+class _Generador:
+    """Arma el código Python de las funciones de render."""
+
+    def __init__(self):
+        self.globales = {"_t": _texto, "_e": _escapar, "_v": _valor_escapado}
+        self.filtrados: set = set()
+
+    def _filtro(self, nombre: str) -> str:
+        clave = f"_f_{nombre}"
+        if clave not in self.globales:
+            self.globales[clave] = _recortar(int(nombre)) if nombre.isdigit() else FILTROS[nombre]
+        return clave
+
+    def valor(self, nodo: tuple, escapar: bool) -> str:
+        _, campo, filtros = nodo
+        if escapar and not filtros:
+            return f"_v(d.get({campo!r}))"
+        codigo = f"_t(d.get({campo!r}))"
+        for filtro in filtros:
+            codigo = f"{self._filtro(filtro)}({codigo})"
+        codigo = f"_e({codigo})" if escapar else codigo
+        self.filtrados.add(codigo)
+        return codigo
+
+    def expresion(self, nodos: list, escapar: bool) -> str:
+        partes = []
+        for nodo in nodos:
+            if nodo[0] == "lit":
+                partes.append(repr(nodo[1]))
+            elif nodo[0] == "var":
+                partes.append(self.valor(nodo, escapar))
+            else:
+                condicion = "" if nodo[0] == "si" else "not "
+                partes.append(f"({self.expresion(nodo[2], escapar)} if {condicion}d.get({nodo[1]!r}) else '')")
+
+        if not partes:
+            return "''"
+        if len(partes) == 1:
+            return partes[0]
+        return "''.join((" + ", ".join(partes) + ",))"
+
+    def compilar(self, nombre: str, cuerpo: str) -> Callable:
+        # Un valor con filtros que aparece varias veces (ej: {telefono|wa} en
+        # dos links) se calcula una sola vez, antes del join
+        lineas = []
+        for codigo in sorted(self.filtrados, key=len, reverse=True):
+            if cuerpo.count(codigo) > 1:
+                local = f"_c{len(lineas)}"
+                lineas.append(f"    {local} = {codigo}\n")
+                cuerpo = cuerpo.replace(codigo, local)
+
+        espacio = dict(self.globales)
+        nombre = re.sub(r"\W", "_", nombre)
+        fuente = f"def {nombre}(d):\n{''.join(lineas)}    return {cuerpo}\n"
+        exec(compile(fuente, f"<plantilla {nombre}>", "exec"), espacio)
+        return espacio[nombre]
+
+
+def html_a_texto(fuente: str) -> str:
+    """Versión en texto plano de una plantilla HTML (los {campos} se conservan)."""
+
+    # Como en HTML, los saltos de línea del código fuente son espacios
+    texto = " ".join(re.sub(r"<!--.*?-->", "", fuente, flags=re.S).split())
+
+    def link(match: re.Match) -> str:
+        etiqueta = re.sub(r"<[^>]+>", "", match.group(2)).strip()
+        return f"{etiqueta} ({match.group(1)})" if etiqueta else match.group(1)
+
+    texto = re.sub(r"<a\b[^>]*?href=[\"']([^\"']*)[\"'][^>]*>(.*?)</a>", link, texto, flags=re.I)
+    texto = re.sub(r"<br\s*/?>", "\n", texto, flags=re.I)
+    texto = re.sub(r"<li\b[^>]*>", "\n• ", texto, flags=re.I)
+    texto = re.sub(r"<hr\b[^>]*>", "\n────────\n", texto, flags=re.I)
+    texto = re.sub(r"</(p|h[1-6]|ul|ol|table|blockquote)>", "\n\n", texto, flags=re.I)
+    texto = re.sub(r"</(div|tr)>", "\n", texto, flags=re.I)
+    texto = html.unescape(re.sub(r"<[^>]+>", "", texto))
+    texto = re.sub(r"[ \t]+", " ", texto)
+    # Un bloque que empieza la línea no debe dejarla con un espacio adelante
+    texto = re.sub(r"(^|\n) ?(\{[?!/][A-Za-z_]\w*\}) ?", r"\1\2", texto)
+
+    lineas, vacia = [], True
+    for linea in texto.splitlines():
+        linea = linea.strip()
+        if linea or not vacia:
+            lineas.append(linea)
+        vacia = not linea
+    return "\n".join(lineas).strip() + "\n"
+
+
+# ============================================================================
+# 📄 PLANTILLA
+# ============================================================================
+
+class Plantilla:
+    """
+    Ejemplo:
+    aviso = Plantilla("<b>{nombre}</b>{?problema} - {problema|150}{/problema}", texto=True)
+    aviso.render({"nombre": "Ana"})          # "<b>Ana</b>"
+    aviso.render_texto({"nombre": "Ana"})    # "Ana\\n"
+    """
+
+    def __init__(self, fuente: str, html: bool = True, texto: bool = False, nombre: str = "render"):
+        self.fuente = fuente
+        self.nombre = nombre
+        self.escapar = html
+
+        self._nodos = _parsear(fuente)
+        self._nodos_texto = _parsear(html_a_texto(fuente)) if texto else None
+        self._generador = _Generador()
+
+        # render(datos) -> str: la función generada, sin intermediarios
+        self.render: Callable[[dict], str] = self._generador.compilar(
+            nombre, self._generador.expresion(self._nodos, escapar=html)
+        )
+        self.render_texto: Optional[Callable[[dict], str]] = None
+        if self._nodos_texto is not None:
+            self.render_texto = self._generador.compilar(
+                f"{nombre}_texto", self._generador.expresion(self._nodos_texto, escapar=False)
+            )
+
+    def campos(self) -> List[str]:
+        """Campos que usa la plantilla (para validar o documentar)."""
+
+        encontrados = set()
+
+        def recorrer(nodos):
+            for nodo in nodos:
+                if nodo[0] == "var":
+                    encontrados.add(nodo[1])
+                elif nodo[0] in ("si", "no"):
+                    encontrados.add(nodo[1])
+                    recorrer(nodo[2])
+
+        recorrer(self._nodos)
+        return sorted(encontrados)
+
+    def con_etiquetas(self, compartir_valores: bool = False) -> Tuple[str, Optional[str], Callable[[dict], Dict[str, str]]]:
+        """
+        Para envíos con sustituciones (SendGrid): (html, texto, sustituciones).
+        html/texto llevan etiquetas -campo- en lugar de cada valor o bloque;
+        sustituciones(datos) retorna {etiqueta: valor} de un destinatario.
+        
+        compartir_valores=True: cada {campo} del texto usa la etiqueta del
+        HTML (valor escapado) en vez de una propia. Sirve para destinatarios
+        cuyos valores no cambian al escapar: así no viajan dos veces.
+        """
+
+        entradas: Dict[str, str] = {}
+
+        def esqueleto(nodos: list, escapar: bool, prefijo: str) -> str:
+            partes = []
+            for i, nodo in enumerate(nodos):
+                if nodo[0] == "lit":
+                    partes.append(nodo[1])
+                    continue
+                if nodo[0] == "var":
+                    etiqueta = f"-{'' if compartir_valores else prefijo}{nodo[1]}{''.join('|' + f for f in nodo[2])}-"
+                    codigo = self._generador.valor(nodo, escapar)
+                else:
+                    etiqueta = f"-{prefijo}{'?' if nodo[0] == 'si' else '!'}{nodo[1]}#{i}-"
+                    codigo = self._generador.expresion([nodo], escapar)
+                entradas.setdefault(etiqueta, codigo)
+                partes.append(etiqueta)
+            return "".join(partes)
+
+        cuerpo_html = esqueleto(self._nodos, self.escapar, "")
+        cuerpo_texto = esqueleto(self._nodos_texto, False, "t:") if self._nodos_texto is not None else None
+
+        dict_codigo = "{" + ", ".join(f"{etiqueta!r}: {codigo}" for etiqueta, codigo in entradas.items()) + "}"
+        return cuerpo_html, cuerpo_texto, self._generador.compilar(f"{self.nombre}_sustituciones", dict_codigo)
@@ -0,0 +1,98 @@
+# app/utils/rate_limit.py
+"""
+TOKEN BUCKET - Limitar el ritmo de llamadas salientes a una API
+
+¿Para qué?
+- Respetar el límite de un tercero (ej: Airtable, 5 requests/seg por base)
+  ANTES de que conteste 429, en vez de enterarse por el error
+- Permitir ráfagas cortas (capacidad) sin pasarse del promedio (tasa)
+
+Cómo funciona:
+- El balde se llena a `tasa` tokens por segundo, hasta `capacidad`
+- Cada llamada consume un token; si no hay, espera lo justo para que haya
+- penalizar(segundos): si igual llegó un 429, vacía el balde y bloquea
+  hasta que pase el Retry-After
+
+Es por proceso: con varios workers de uvicorn, dividir la tasa entre ellos.
+"""
+
+import asyncio
+import time
+
+
+class TokenBucket:
+    """
+    Ejemplo:
+    bucket = TokenBucket(tasa=5, capacidad=5)
+    await bucket.adquirir()   # espera si ya se hicieron 5 llamadas en el último segundo
+    """
+
+    def __init__(self, tasa: float, capacidad: float):
+        self.tasa = tasa
+        self.capacidad = capacidad
+        self._tokens = capacidad
+        self._ultimo = time.monotonic()
+        self._bloqueado_hasta = 0.0
+        self._lock = asyncio.Lock()
+
+        self.adquiridos = 0
+        self.esperas = 0
+        self.espera_total = 0.0
+        self.penalizaciones = 0
+
+    def _recargar(self, ahora: float) -> None:
+        self._tokens = min(self.capacidad, self._tokens + (ahora - self._ultimo) * self.tasa)
+        self._ultimo = ahora
+
+    def intentar(self, n: float = 1) -> bool:
+        """Consume `n` tokens si los hay, sin esperar."""
+
+        ahora = time.monotonic()
+        if ahora < self._bloqueado_hasta:
+            return False
+        self._recargar(ahora)
+        if self._tokens >= n:
+            self._tokens -= n
+            self.adquiridos += 1
+            return True
+        return False
+
+    async def adquirir(self, n: float = 1) -> float:
+        """Espera hasta poder consumir `n` tokens. Retorna los segundos esperados."""
+
+        inicio = time.monotonic()
+        # El lock hace la cola FIFO: nadie se adelanta a quien ya está esperando
+        async with self._lock:
+            while True:
+                ahora = time.monotonic()
+                if ahora < self._bloqueado_hasta:
+                    await asyncio.sleep(self._bloqueado_hasta - ahora)
+                    continue
+                self._recargar(ahora)
+                if self._tokens >= n:
+                    self._tokens -= n
+                    break
+                await asyncio.sleep((n - self._tokens) / self.tasa)
+
+        esperado = time.monotonic() - inicio
+        self.adquiridos += 1
+        if esperado > 0.001:
+            self.esperas += 1
+            self.espera_total += esperado
+        return esperado
+
+    def penalizar(self, segundos: float) -> None:
+        """El proveedor respondió 429: no llamar durante `segundos`."""
+
+        self._tokens = 0
+        self._bloqueado_hasta = max(self._bloqueado_hasta, time.monotonic() + segundos)
+        self.penalizaciones += 1
+
+    def stats(self) -> dict:
+        return {
+            "tasa_por_seg": self.tasa,
+            "adquiridos": self.adquiridos,
+            "esperas": self.esperas,
+            "espera_total_seg": round(self.espera_total, 2),
+            "penalizaciones_429": self.penalizaciones
+        }
@@ -0,0 +1,393 @@
+# app/workers/outbox.py
+"""
+OUTBOX - Cola persistente para los efectos secundarios del formulario
+
+¿Para qué?
+- Que un email, una notificación de Telegram, Airtable o n8n no se pierdan
+  si el proceso se reinicia o se cae (BackgroundTasks vive en memoria)
+- Que la respuesta al usuario no dependa de lo que tarden los terceros
+- Que un pico de formularios se procese a ritmo constante (N workers)
+  en vez de lanzar una tarea sin límite por cada uno
+
+Cómo funciona:
+- El endpoint llama a encolar() ANTES del commit: el evento se guarda en
+  la misma transacción que el Lead (o se guardan los dos, o ninguno)
+- Un despachador busca eventos vencidos cada OUTBOX_POLL_SECONDS (o al
+  instante si el endpoint llama a despertar()) y los reclama con un
+  UPDATE condicional: con varios procesos, cada evento lo toma uno solo
+- Reclamar un evento corre su proximo_intento OUTBOX_LEASE_SECONDS hacia
+  adelante (lease): si el proceso muere a mitad, vuelve a estar vencido
+  y otro lo reintenta
+- OUTBOX_WORKERS consumidores ejecutan el manejador registrado para el tipo
+- Si falla: backoff exponencial con jitter; después de OUTBOX_MAX_ATTEMPTS
+  intentos queda "muerto" (dead letter) hasta que alguien lo reintente
+
+Entrega "al menos una vez": un manejador puede correr dos veces si el
+proceso muere justo después de ejecutarlo y antes de marcarlo enviado.
+
+Uso:
+    @manejador("telegram_lead")
+    async def notificar(nombre: str, ...): ...   # lanzar excepción = reintentar
+
+    encolar(db, "telegram_lead", nombre="Juan", ...)
+    db.commit()
+    outbox.despertar()
+"""
+
+import asyncio
+import json
+import logging
+import random
+import time
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import func, update
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models.lead import OutboxEvent
+
+logger = logging.getLogger(__name__)
+
+PENDIENTE = "pendiente"
+ENVIADO = "enviado"
+MUERTO = "muerto"
+
+# tipo -> corrutina que recibe el payload como kwargs
+MANEJADORES: Dict[str, Callable[..., Awaitable[None]]] = {}
+
+
+# ============================================================================
+# 📝 REGISTRO Y ENCOLADO
+# ============================================================================
+
+def manejador(tipo: str):
+    """Decorador: registra la corrutina que procesa los eventos de `tipo`."""
+
+    def registrar(funcion):
+        if tipo in MANEJADORES:
+            raise ValueError(f"Ya hay un manejador para '{tipo}'")
+        MANEJADORES[tipo] = funcion
+        return funcion
+
+    return registrar
+
+
+def encolar(db: Session, tipo: str, **payload) -> OutboxEvent:
+    """
+    Agrega un evento a la sesión SIN hacer commit: se confirma junto con
+    el resto de la transacción del llamador.
+    """
+
+    if tipo not in MANEJADORES:
+        raise ValueError(f"Tipo de evento sin manejador: '{tipo}'")
+
+    evento = OutboxEvent(
+        tipo=tipo,
+        payload=json.dumps(payload, ensure_ascii=False, default=str),
+        estado=PENDIENTE,
+        intentos=0,
+        proximo_intento=datetime.utcnow()
+    )
+    db.add(evento)
+    return evento
+
+
+# ============================================================================
+# ⚙️ WORKER POOL
+# ============================================================================
+
+class OutboxWorker:
+    """
+    Despachador + pool de consumidores sobre la tabla outbox_events.
+
+    Ejemplo:
+    await outbox.iniciar()    # startup
+    outbox.despertar()        # después de encolar y hacer commit
+    await outbox.detener()    # shutdown
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        intervalo: float,
+        lote: int,
+        lease: float,
+        max_intentos: int,
+        backoff_base: float,
+        backoff_max: float
+    ):
+        self.workers = workers
+        self.intervalo = intervalo
+        self.lote = lote
+        self.lease = lease
+        self.max_intentos = max_intentos
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+        self._cola: Optional[asyncio.Queue] = None
+        self._despierto: Optional[asyncio.Event] = None
+        self._tareas: List[asyncio.Task] = []
+
+        self.en_vuelo = 0
+        self.enviados = 0
+        self.reintentos = 0
+        self.muertos = 0
+        self._latencia_total = 0.0
+
+    # ------------------------------------------------------------------------
+    # Ciclo de vida
+    # ------------------------------------------------------------------------
+
+    async def iniciar(self) -> None:
+        """Arranca el despachador y los consumidores. Llamar en el startup."""
+
+        if self._tareas or self.workers <= 0:
+            return
+
+        # Cola acotada: si los workers no dan abasto, el despachador espera
+        # en vez de reclamar más eventos de los que se pueden procesar
+        self._cola = asyncio.Queue(maxsize=self.workers * 2)
+        self._despierto = asyncio.Event()
+        self._tareas = [asyncio.create_task(self._despachador())]
+        self._tareas += [asyncio.create_task(self._consumidor()) for _ in range(self.workers)]
+        logger.info(f"📤 Outbox iniciado: {self.workers} workers, revisión cada {self.intervalo}s")
+
+    async def detener(self) -> None:
+        """Frena el pool y devuelve a la cola de BD lo reclamado sin procesar."""
+
+        for tarea in self._tareas:
+            tarea.cancel()
+        await asyncio.gather(*self._tareas, return_exceptions=True)
+        self._tareas = []
+
+        sin_procesar = []
+        while self._cola is not None and not self._cola.empty():
+            sin_procesar.append(self._cola.get_nowait()[0])
+        if sin_procesar:
+            await asyncio.to_thread(self._liberar, sin_procesar)
+            logger.info(f"📤 Outbox: {len(sin_procesar)} eventos devueltos a la cola")
+
+    def despertar(self) -> None:
+        """Hay eventos nuevos: que el despachador no espere al próximo intervalo."""
+
+        if self._despierto is not None:
+            self._despierto.set()
+
+    # ------------------------------------------------------------------------
+    # Despachador y consumidores
+    # ------------------------------------------------------------------------
+
+    async def _despachador(self) -> None:
+        while True:
+            reclamado = time.monotonic()  # El lease corre desde acá
+            try:
+                eventos = await asyncio.to_thread(self._reclamar, self.lote)
+            except Exception as e:
+                logger.error(f"❌ Outbox: error reclamando eventos: {e}")
+                eventos = []
+
+            for evento in eventos:
+                await self._cola.put((*evento, reclamado))
+
+            # Lote completo: probablemente hay más, seguir sin esperar
+            if len(eventos) == self.lote:
+                continue
+
+            try:
+                await asyncio.wait_for(self._despierto.wait(), timeout=self.intervalo)
+            except asyncio.TimeoutError:
+                pass
+            self._despierto.clear()
+
+    async def _consumidor(self) -> None:
+        while True:
+            evento_id, tipo, payload, intentos, reclamado = await self._cola.get()
+
+            # Un error de BD (liberar/registrar) no debe matar al consumidor:
+            # el evento queda reclamado y vuelve solo cuando vence el lease
+            try:
+                await self._consumir(evento_id, tipo, payload, intentos, reclamado)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"❌ Outbox: error procesando evento {evento_id}: {e}")
+
+    async def _consumir(self, evento_id: int, tipo: str, payload: str, intentos: int, reclamado: float) -> None:
+        # Hay que terminar antes de que venza el lease (si no, otro proceso
+        # lo reclamaría y correría dos veces). Si esperó demasiado en la
+        # cola local, se devuelve sin ejecutar.
+        restante = self.lease * 0.9 - (time.monotonic() - reclamado)
+        if restante <= 0:
+            await asyncio.to_thread(self._liberar, [evento_id])
+            return
+
+        self.en_vuelo += 1
+        inicio = time.monotonic()
+        try:
+            await self._procesar(evento_id, tipo, payload, intentos, restante)
+        finally:
+            self.en_vuelo -= 1
+            self._latencia_total += time.monotonic() - inicio
+
+    async def _procesar(self, evento_id: int, tipo: str, payload: str, intentos: int, limite: float) -> None:
+        funcion = MANEJADORES.get(tipo)
+        try:
+            if funcion is None:
+                raise LookupError(f"sin manejador para '{tipo}'")
+            await asyncio.wait_for(funcion(**json.loads(payload)), timeout=limite)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            definitivo = funcion is None or intentos >= self.max_intentos
+            await asyncio.to_thread(self._registrar_fallo, evento_id, intentos, error, definitivo)
+            return
+
+        await asyncio.to_thread(self._registrar_exito, evento_id)
+
+    # ------------------------------------------------------------------------
+    # Acceso a BD (bloqueante: se llama con asyncio.to_thread)
+    # ------------------------------------------------------------------------
+
+    def _reclamar(self, limite: int) -> List[Tuple[int, str, str, int]]:
+        """Toma hasta `limite` eventos vencidos. Retorna (id, tipo, payload, intentos)."""
+
+        ahora = datetime.utcnow()
+        vence = ahora + timedelta(seconds=self.lease)
+
+        with SessionLocal() as db:
+            candidatos = db.query(OutboxEvent.id).filter(
+                OutboxEvent.estado == PENDIENTE,
+                OutboxEvent.proximo_intento <= ahora
+            ).order_by(OutboxEvent.proximo_intento).limit(limite).all()
+
+            reclamados = []
+            for (evento_id,) in candidatos:
+                # Condicional: si otro proceso lo reclamó primero, no toca ninguna fila
+                resultado = db.execute(
+                    update(OutboxEvent)
+                    .where(
+                        OutboxEvent.id == evento_id,
+                        OutboxEvent.estado == PENDIENTE,
+                        OutboxEvent.proximo_intento <= ahora
+                    )
+                    .values(proximo_intento=vence, intentos=OutboxEvent.intentos + 1)
+                )
+                if resultado.rowcount == 1:
+                    reclamados.append(evento_id)
+            db.commit()
+
+            if not reclamados:
+                return []
+            filas = db.query(
+                OutboxEvent.id, OutboxEvent.tipo, OutboxEvent.payload, OutboxEvent.intentos
+            ).filter(OutboxEvent.id.in_(reclamados)).order_by(OutboxEvent.id).all()
+            return [tuple(fila) for fila in filas]
+
+    def _registrar_exito(self, evento_id: int) -> None:
+        with SessionLocal() as db:
+            db.execute(
+                update(OutboxEvent)
+                .where(OutboxEvent.id == evento_id)
+                .values(estado=ENVIADO, ultimo_error=None, fecha_procesado=datetime.utcnow())
+            )
+            db.commit()
+        self.enviados += 1
+
+    def _registrar_fallo(self, evento_id: int, intentos: int, error: str, definitivo: bool) -> None:
+        ahora = datetime.utcnow()
+        with SessionLocal() as db:
+            if definitivo:
+                valores = {"estado": MUERTO, "ultimo_error": error, "fecha_procesado": ahora}
+            else:
+                valores = {"ultimo_error": error, "proximo_intento": ahora + timedelta(seconds=self._backoff(intentos))}
+            db.execute(update(OutboxEvent).where(OutboxEvent.id == evento_id).values(**valores))
+            db.commit()
+
+        if definitivo:
+            self.muertos += 1
+            logger.error(f"💀 Outbox: evento {evento_id} muerto tras {intentos} intentos: {error}")
+        else:
+            self.reintentos += 1
+            logger.warning(f"🔁 Outbox: evento {evento_id} falló (intento {intentos}/{self.max_intentos}): {error}")
+
+    def _liberar(self, ids: List[int]) -> None:
+        """Devuelve eventos reclamados y no procesados (no cuenta el intento)."""
+
+        with SessionLocal() as db:
+            db.execute(
+                update(OutboxEvent)
+                .where(OutboxEvent.id.in_(ids), OutboxEvent.estado == PENDIENTE)
+                .values(proximo_intento=datetime.utcnow(), intentos=OutboxEvent.intentos - 1)
+            )
+            db.commit()
+
+    def _backoff(self, intentos: int) -> float:
+        """base * 2^(intentos-1), con tope y jitter (50-100%) para no reintentar todos juntos."""
+
+        espera = min(self.backoff_max, self.backoff_base * (2 ** (intentos - 1)))
+        return espera * random.uniform(0.5, 1.0)
+
+    # ------------------------------------------------------------------------
+    # Administración y métricas
+    # ------------------------------------------------------------------------
+
+    def reintentar(self, evento_id: int) -> bool:
+        """Vuelve a poner un evento muerto en la cola, con los intentos en cero."""
+
+        with SessionLocal() as db:
+            resultado = db.execute(
+                update(OutboxEvent)
+                .where(OutboxEvent.id == evento_id, OutboxEvent.estado == MUERTO)
+                .values(estado=PENDIENTE, intentos=0, proximo_intento=datetime.utcnow(), fecha_procesado=None)
+            )
+            db.commit()
+        return resultado.rowcount == 1
+
+    def stats(self) -> dict:
+        """Profundidad de la cola (de BD) + contadores de este proceso. Bloqueante."""
+
+        ahora = datetime.utcnow()
+        with SessionLocal() as db:
+            por_estado = dict(
+                db.query(OutboxEvent.estado, func.count(OutboxEvent.id)).group_by(OutboxEvent.estado).all()
+            )
+            vencidos = db.query(func.count(OutboxEvent.id)).filter(
+                OutboxEvent.estado == PENDIENTE,
+                OutboxEvent.proximo_intento <= ahora
+            ).scalar()
+            mas_viejo = db.query(func.min(OutboxEvent.fecha_creacion)).filter(
+                OutboxEvent.estado == PENDIENTE
+            ).scalar()
+
+        procesados = self.enviados + self.reintentos + self.muertos
+        return {
+            "pendientes": por_estado.get(PENDIENTE, 0),
+            "vencidos": vencidos,
+            "muertos": por_estado.get(MUERTO, 0),
+            "enviados": por_estado.get(ENVIADO, 0),
+            "pendiente_mas_viejo_seg": round((ahora - mas_viejo).total_seconds(), 1) if mas_viejo else None,
+            "proceso": {
+                "activo": bool(self._tareas),
+                "en_cola_local": self._cola.qsize() if self._cola is not None else 0,
+                "en_vuelo": self.en_vuelo,
+                "enviados": self.enviados,
+                "reintentos": self.reintentos,
+                "muertos": self.muertos,
+                "latencia_promedio_ms": round(self._latencia_total / procesados * 1000, 1) if procesados else None
+            }
+        }
+
+
+outbox = OutboxWorker(
+    workers=settings.OUTBOX_WORKERS,
+    intervalo=settings.OUTBOX_POLL_SECONDS,
+    lote=settings.OUTBOX_BATCH_SIZE,
+    lease=settings.OUTBOX_LEASE_SECONDS,
+    max_intentos=settings.OUTBOX_MAX_ATTEMPTS,
+    backoff_base=settings.OUTBOX_BACKOFF_BASE_SECONDS,
+    backoff_max=settings.OUTBOX_BACKOFF_MAX_SECONDS
+)
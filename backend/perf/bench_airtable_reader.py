@@ -0,0 +1,144 @@
+# perf/bench_airtable_reader.py
+"""
+BENCHMARK - Lectura paginada de Airtable (con prefetch) vs. página por página
+
+Simula una base de Airtable con httpx.MockTransport (latencia por página
+configurable, un 429 de vez en cuando) y compara, recorriendo TODO:
+- secuencial: pedir página, procesarla, recién ahí pedir la siguiente
+- prefetch:   iterar_registros (la próxima página se pide mientras se procesa)
+
+También verifica que lleguen todos los registros, que fields[] se respete
+y mide el pico de memoria (tracemalloc) de cada forma.
+
+Uso (desde backend/):
+    python -m perf.bench_airtable_reader
+    python -m perf.bench_airtable_reader --registros 20000 --latencia 0.15
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+import tracemalloc
+
+os.environ.setdefault("AIRTABLE_TOKEN", "bench")
+os.environ.setdefault("AIRTABLE_BASE_ID", "appBench")
+os.environ.setdefault("AIRTABLE_RATE_LIMIT_PER_SECOND", "1000")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx  # noqa: E402
+
+from app.integrations import airtable_writer as writer  # noqa: E402
+from app.integrations import http_clients  # noqa: E402
+from app.integrations.airtable_reader import TAMANO_PAGINA, iterar_registros  # noqa: E402
+
+COLUMNAS = ["Nombre", "Email", "Teléfono", "Mensaje", "Lead Score", "Estado", "Origen", "Fecha", "Notas"]
+
+
+def _transporte(total: int, latencia: float, cada_429: int) -> httpx.MockTransport:
+    pedidos = {"n": 0}
+
+    async def responder(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(latencia)
+        pedidos["n"] += 1
+        if cada_429 and pedidos["n"] % cada_429 == 0:
+            return httpx.Response(429, json={"errors": [{"error": "RATE_LIMIT_REACHED"}]})
+
+        params = request.url.params
+        desde = int(params.get("offset", "0"))
+        hasta = min(desde + int(params.get("pageSize", TAMANO_PAGINA)), total)
+        campos = params.get_list("fields[]") or COLUMNAS
+        registros = [
+            {
+                "id": f"rec{i:014d}",
+                "createdTime": "2024-01-01T00:00:00.000Z",
+                "fields": {c: f"{c} del lead {i} " * 3 for c in campos}
+            }
+            for i in range(desde, hasta)
+        ]
+        cuerpo = {"records": registros}
+        if hasta < total:
+            cuerpo["offset"] = str(hasta)
+        return httpx.Response(200, json=cuerpo)
+
+    return httpx.MockTransport(responder)
+
+
+async def _secuencial(procesar_pagina: float) -> int:
+    """Lo que hacía falta antes: un GET a la vez, todo a una lista."""
+
+    url = f"https://api.airtable.com/v0/appBench/Leads"
+    client = http_clients.cliente_http("airtable")
+    registros, offset = [], None
+    while True:
+        params = {"pageSize": TAMANO_PAGINA, **({"offset": offset} if offset else {})}
+        while True:
+            response = await client.get(url, params=params)
+            if response.status_code != 429:
+                break
+        pagina = response.json()
+        registros.extend(pagina["records"])
+        await asyncio.sleep(procesar_pagina)
+        offset = pagina.get("offset")
+        if not offset:
+            return len(registros)
+
+
+async def _prefetch(procesar_pagina: float, campos=None) -> int:
+    total = 0
+    async for _ in iterar_registros("leads", campos=campos):
+        total += 1
+        if total % TAMANO_PAGINA == 0:
+            await asyncio.sleep(procesar_pagina)
+    return total
+
+
+async def _medir(nombre: str, corrutina) -> None:
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    total = await corrutina
+    duracion = time.perf_counter() - inicio
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"  {nombre:<22} {total:>7} registros  {duracion:6.2f} s  pico {pico / 1e6:6.1f} MB")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Benchmark del lector paginado de Airtable")
+    parser.add_argument("--registros", type=int, default=5000)
+    parser.add_argument("--latencia", type=float, default=0.08, help="Segundos por GET")
+    parser.add_argument("--procesar", type=float, default=0.06, help="Segundos de trabajo por página")
+    parser.add_argument("--cada-429", type=int, default=17, help="Un 429 cada N pedidos (0 = nunca)")
+    args = parser.parse_args()
+
+    # Un 429 real castiga 30s; acá alcanza con un instante
+    writer.ESPERA_429 = 0.05
+    import app.integrations.airtable_reader as reader
+    reader.ESPERA_429 = 0.05
+
+    http_clients.cliente_http("airtable")
+    http_clients._clientes["airtable"].client = httpx.AsyncClient(
+        transport=_transporte(args.registros, args.latencia, args.cada_429)
+    )
+
+    paginas = -(-args.registros // TAMANO_PAGINA)
+    print(f"📏 {args.registros} registros ({paginas} páginas), {args.latencia * 1000:.0f} ms por GET, "
+          f"{args.procesar * 1000:.0f} ms de trabajo por página\n")
+
+    await _medir("secuencial + lista", _secuencial(args.procesar))
+    await _medir("iterar_registros", _prefetch(args.procesar))
+    await _medir("iterar_registros 2 col", _prefetch(args.procesar, campos=["Email", "Estado"]))
+
+    recibidos = [r async for r in iterar_registros("leads", campos=["Email"])]
+    completos = len(recibidos) == args.registros and len({r["id"] for r in recibidos}) == args.registros
+    proyectados = all(set(r["fields"]) == {"Email"} for r in recibidos)
+    print(f"\n{'✅' if completos else '❌'} Todos los registros, sin repetidos: {completos}")
+    print(f"{'✅' if proyectados else '❌'} fields[] respetado: {proyectados}")
+
+    await http_clients.close_http_clients()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,241 @@
+# perf/bench_extractor.py
+"""
+MICROBENCHMARK - Extractor de contacto unificado vs. implementaciones anteriores
+
+Compara, sobre los mismos mensajes:
+- extract_contact_info (versión anterior de routes/chat.py, con regex sin precompilar)
+- LeadDetector.analizar (versiones anteriores de app/utils y app/ai)
+- ContactExtractor.extraer / .analizar (app/ai/contact_extractor.py)
+
+Las versiones anteriores están copiadas acá tal cual, para poder medirlas
+aunque ya no existan en la app.
+
+Uso (desde backend/):
+    python -m perf.bench_extractor
+    python -m perf.bench_extractor --repeticiones 20000
+"""
+
+import argparse
+import os
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.ai.contact_extractor import extractor  # noqa: E402
+
+MENSAJES = [
+    "Hola, buenas tardes",
+    "¿Qué servicios ofrecen?",
+    "Tengo una oficina de 12 personas y cargamos facturas a mano todos los días, "
+    "necesito automatizar eso porque perdemos horas cada semana",
+    "Me llamo Carla Gómez, mi email es carla.gomez@estudio-contable.com",
+    "Mi teléfono es +54 9 351 555 0001, llamame después de las 18 hs",
+    "Nos entró un ransomware el mes pasado y perdimos datos. Somos un comercio con 3 sucursales "
+    "y queremos mejorar la seguridad de la red y los backups. ¿Cuánto cuesta una auditoría?",
+    "Juan Pérez | juan@empresa.com | Empresa | servidores caídos | 3515551234 | Interesado en: Soporte IT",
+    "dale, el lunes a las 10 hs me viene bien",
+]
+
+# ============================================================================
+# 🕰️ IMPLEMENTACIONES ANTERIORES (copia literal)
+# ============================================================================
+
+def legacy_extract_contact_info(message: str) -> dict:
+    contact = {"nombre": "", "email": "", "telefono": "", "tipo_cliente": "", "problema": "", "servicio": ""}
+    try:
+        if " | " in message:
+            partes = message.split(" | ")
+            if len(partes) >= 6:
+                contact["nombre"] = partes[0].strip()[:100]
+                contact["email"] = partes[1].strip()[:255]
+                contact["tipo_cliente"] = partes[2].strip()[:50]
+                contact["problema"] = partes[3].strip()[:500]
+                contact["telefono"] = partes[4].strip()[:20]
+                servicio_parte = partes[5].strip()
+                if "Interesado en:" in servicio_parte:
+                    contact["servicio"] = servicio_parte.replace("Interesado en:", "").strip()[:100]
+                return contact
+    except Exception:
+        pass
+    email_pattern = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
+    email_match = re.search(email_pattern, message)
+    if email_match:
+        contact["email"] = email_match.group()[:255]
+    phone_patterns = [
+        r'\+\d{1,3}\s?\d{1,4}\s?\d{1,4}\s?\d{1,4}',
+        r'\+\d{1,3}\s?\d{7,14}',
+        r'(?:^|\s)(\d{2,4}\s?\d{3,4}\s?\d{4})',
+        r'3\d{9}',
+    ]
+    for pattern in phone_patterns:
+        phone_match = re.search(pattern, message)
+        if phone_match:
+            telefono = phone_match.group().strip()
+            digitos = re.sub(r'\D', '', telefono)
+            if len(digitos) >= 8:
+                contact["telefono"] = telefono[:20]
+                break
+    words = message.split()
+    palabras_excluir = [
+        "interesado", "en:", "automatización", "seguridad", "soporte",
+        "consulta", "hola", "perfecto", "gracias", "particular", "comercio"
+    ]
+    for word in words:
+        clean_word = word.replace(",", "").replace(".", "").replace("!", "").replace("?", "")
+        if (clean_word and clean_word[0].isupper() and len(clean_word) > 2 and
+                clean_word.lower() not in palabras_excluir and
+                not any(char.isdigit() for char in clean_word) and '@' not in clean_word):
+            contact["nombre"] = clean_word[:100]
+            break
+    tipo_patterns = {
+        "Particular": ["particular", "autónomo"],
+        "Comercio": ["comercio"],
+        "Oficina": ["oficina"],
+        "Empresa": ["empresa"]
+    }
+    message_lower = message.lower()
+    for tipo, palabras in tipo_patterns.items():
+        if any(p in message_lower for p in palabras):
+            contact["tipo_cliente"] = tipo
+            break
+    servicio_patterns = {
+        "Automatización": ["automatización", "automatizar"],
+        "Seguridad IT": ["seguridad"],
+        "Soporte IT": ["soporte"],
+        "Consulta General": ["consulta"]
+    }
+    for servicio, palabras in servicio_patterns.items():
+        if any(p in message_lower for p in palabras):
+            contact["servicio"] = servicio
+            break
+    return contact
+
+
+class LegacyUtilsLeadDetector:
+    PHONE_PATTERNS = [
+        r'\+?54\s?9?\s?11\s?\d{4}\s?\d{4}',
+        r'\+?54\s?9?\s?3\d{2}\s?\d{3}\s?\d{4}',
+        r'\d{2,4}\s?\d{3,4}\s?\d{4}',
+    ]
+    PALABRAS_INTENCION = [
+        'reunion', 'reunión', 'llamame', 'llámame',
+        'contactame', 'contáctame', 'agenda', 'agendar',
+        'whatsapp', 'wp', 'wa', 'presupuesto', 'cotización',
+        'enviame', 'envíame', 'necesito', 'me interesa'
+    ]
+
+    def __init__(self):
+        self.phone_regex = re.compile('|'.join(self.PHONE_PATTERNS))
+        self.email_regex = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+
+    def analizar(self, mensaje: str) -> dict:
+        match = self.phone_regex.search(mensaje)
+        telefono = match.group().replace(' ', '').replace('-', '') if match else None
+        match = self.email_regex.search(mensaje)
+        email = match.group() if match else None
+        mensaje_lower = mensaje.lower()
+        tiene_intencion = any(palabra in mensaje_lower for palabra in self.PALABRAS_INTENCION)
+        razon_partes = []
+        if telefono:
+            razon_partes.append(f"Teléfono: {telefono}")
+        if email:
+            razon_partes.append(f"Email: {email}")
+        if tiene_intencion and not (telefono or email):
+            razon_partes.append("Palabras de intención de contacto")
+        return {
+            'es_lead': bool(telefono or email or tiene_intencion),
+            'telefono': telefono,
+            'email': email,
+            'tiene_intencion': tiene_intencion,
+            'razon': " | ".join(razon_partes) if razon_partes else "Sin señales"
+        }
+
+
+class LegacyAiLeadDetector:
+    def analizar(self, texto: str):
+        t = texto.lower()
+        email = re.search(r'[\w\.-]+@[\w\.-]+\.\w+', t)
+        telefono = re.search(r'\+?\d{7,15}', t)
+        confirmacion = any(x in t for x in ["lunes", "martes", "miércoles", "jueves", "viernes", "mañana", "hs", "hora", "agendemos", "dale", "ok"])
+        return {
+            "es_lead": bool(email or telefono),
+            "email": email.group(0) if email else None,
+            "telefono": telefono.group(0) if telefono else None,
+            "quiere_agendar": confirmacion,
+            "texto_puro": texto
+        }
+
+
+# Varios tipos/servicios en un mismo mensaje: el resultado no puede depender
+# de PYTHONHASHSEED y debe coincidir con el orden de la versión anterior
+MENSAJES_PRIORIDAD = [
+    "Tengo un comercio y también una oficina",
+    "Necesito soporte y seguridad para la empresa",
+    "quiero automatizar y tengo una consulta",
+    "Soy particular pero trabajo para una empresa, necesito una consulta de seguridad",
+]
+
+
+def _verificar_prioridad() -> bool:
+    ok = True
+    for mensaje in MENSAJES_PRIORIDAD:
+        esperado = legacy_extract_contact_info(mensaje)
+        obtenido = extractor.extraer(mensaje, ("tipo_cliente", "servicio"))
+        for campo in ("tipo_cliente", "servicio"):
+            if (esperado[campo] or None) != obtenido.get(campo):
+                ok = False
+                print(f"  ❌ {mensaje!r}: {campo} = {obtenido.get(campo)!r}, antes {esperado[campo]!r}")
+    return ok
+
+
+# ============================================================================
+# ⏱️ MEDICIÓN
+# ============================================================================
+
+def _medir(nombre: str, funcion, repeticiones: int) -> float:
+    def _todos():
+        for mensaje in MENSAJES:
+            funcion(mensaje)
+
+    mejor = min(timeit.repeat(_todos, number=repeticiones, repeat=5))
+    por_mensaje = mejor / (repeticiones * len(MENSAJES)) * 1e6
+    print(f"  {nombre:<48} {por_mensaje:8.2f} µs/mensaje")
+    return por_mensaje
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del extractor de contacto")
+    parser.add_argument("--repeticiones", type=int, default=5000)
+    args = parser.parse_args()
+
+    legacy_utils = LegacyUtilsLeadDetector()
+    legacy_ai = LegacyAiLeadDetector()
+    n = args.repeticiones
+
+    prioridad_ok = _verificar_prioridad()
+    print(f"{'✅' if prioridad_ok else '❌'} Tipo de cliente / servicio con varias coincidencias: "
+          f"{'igual que antes' if prioridad_ok else 'distinto de antes'}\n")
+
+    print(f"📏 {len(MENSAJES)} mensajes x {n} repeticiones (mejor de 5)\n")
+
+    print("Contacto completo (nombre, email, teléfono, tipo, servicio):")
+    antes = _medir("anterior: extract_contact_info", legacy_extract_contact_info, n)
+    ahora = _medir("nuevo:    extractor.extraer", extractor.extraer, n)
+    print(f"  → {antes / ahora:.1f}x\n")
+
+    print("Contacto incremental (solo faltan email y teléfono):")
+    ahora = _medir("nuevo:    extractor.extraer(campos=...)",
+                   lambda m: extractor.extraer(m, ("email", "telefono")), n)
+    print(f"  → {antes / ahora:.1f}x vs. extract_contact_info\n")
+
+    print("Señales de lead (email, teléfono, intención):")
+    antes_utils = _medir("anterior: utils.LeadDetector.analizar", legacy_utils.analizar, n)
+    antes_ai = _medir("anterior: ai.LeadDetector.analizar", legacy_ai.analizar, n)
+    ahora = _medir("nuevo:    extractor.analizar", extractor.analizar, n)
+    print(f"  → {(antes_utils + antes_ai) / ahora:.1f}x vs. correr ambos detectores")
+
+
+if __name__ == "__main__":
+    main()
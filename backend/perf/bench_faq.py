@@ -0,0 +1,89 @@
+# perf/bench_faq.py
+"""
+MICROBENCHMARK - Índice de FAQ vs. búsqueda lineal anterior
+
+Compara get_respuesta_predefinida tal como era (normalizar cada pregunta
+en cada llamada + substring en ambos sentidos) contra FaqIndex, con las
+preguntas reales y con N preguntas sintéticas más.
+
+Uso (desde backend/):
+    python -m perf.bench_faq
+    python -m perf.bench_faq --preguntas 5000
+"""
+
+import argparse
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.ai.faq_index import FaqIndex  # noqa: E402
+from app.ai.prompts import EJEMPLOS_RESPUESTAS  # noqa: E402
+
+from perf.bench_extractor import MENSAJES  # noqa: E402
+
+CONSULTAS = MENSAJES + [
+    "¿Cuánto cuesta?", "cuesta", "que servicios tienen?", "dónde están ubicados",
+    "te contacto por whatsapp?", "me cuesta entender la factura",
+]
+
+TEMAS = ["backup", "servidor", "factura", "email", "red", "firewall", "excel", "nube", "antivirus", "impresora"]
+VERBOS = ["configuran", "migran", "automatizan", "revisan", "instalan", "monitorean", "cotizan", "reparan"]
+
+
+def legacy_respuesta_predefinida(preguntas: dict, mensaje: str):
+    mensaje_clean = mensaje.lower().strip().rstrip("?!")
+    for pregunta, respuesta in preguntas.items():
+        pregunta_clean = pregunta.lower().strip().rstrip("?!")
+        if mensaje_clean in pregunta_clean or pregunta_clean in mensaje_clean:
+            return respuesta
+    return None
+
+
+def _preguntas(extra: int, semilla: int) -> dict:
+    rng = random.Random(semilla)
+    preguntas = dict(EJEMPLOS_RESPUESTAS)
+    for i in range(extra):
+        pregunta = f"¿{rng.choice(VERBOS).capitalize()} {rng.choice(TEMAS)} {rng.choice(TEMAS)} modelo {i}?"
+        preguntas[pregunta] = f"Respuesta {i}"
+    return preguntas
+
+
+def _medir(funcion, repeticiones: int) -> float:
+    def _todas():
+        for consulta in CONSULTAS:
+            funcion(consulta)
+
+    mejor = min(timeit.repeat(_todas, number=repeticiones, repeat=5))
+    return mejor / (repeticiones * len(CONSULTAS)) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del índice de FAQ")
+    parser.add_argument("--preguntas", type=int, default=1000, help="Preguntas sintéticas extra")
+    parser.add_argument("--repeticiones", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"📏 {len(CONSULTAS)} consultas x {args.repeticiones} repeticiones (mejor de 5)\n")
+    print(f"  {'preguntas':>9} {'lineal':>12} {'índice':>12}")
+
+    for extra in (0, args.preguntas):
+        preguntas = _preguntas(extra, 7)
+        indice = FaqIndex(preguntas)
+        antes = _medir(lambda m: legacy_respuesta_predefinida(preguntas, m), args.repeticiones)
+        ahora = _medir(indice.buscar, args.repeticiones)
+        print(f"  {len(preguntas):>9} {antes:>9.1f} µs {ahora:>9.1f} µs")
+
+    indice = FaqIndex(EJEMPLOS_RESPUESTAS)
+    print("\nCoincidencias con las preguntas reales (anterior → ahora):")
+    for consulta in CONSULTAS:
+        antes = legacy_respuesta_predefinida(EJEMPLOS_RESPUESTAS, consulta)
+        ahora = indice.mejor(consulta)
+        pregunta_antes = next((p for p, r in EJEMPLOS_RESPUESTAS.items() if r == antes), None)
+        print(f"  {consulta[:50]!r:54} {pregunta_antes} → {ahora[0] if ahora else None}")
+
+
+if __name__ == "__main__":
+    main()
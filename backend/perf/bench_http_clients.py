@@ -0,0 +1,103 @@
+# perf/bench_http_clients.py
+"""
+BENCHMARK - Cliente HTTP compartido vs. un httpx.AsyncClient por llamada
+
+Levanta un servidor HTTP/1.1 local con keep-alive (o usa --url) y compara:
+- anterior: `async with httpx.AsyncClient()` en cada notificación
+- nuevo:    cliente_http("n8n") de app/integrations/http_clients.py
+
+En local el handshake es casi gratis; contra un host real con TLS
+(--url https://...) la diferencia es la de DNS + TCP + TLS por llamada.
+
+Uso (desde backend/):
+    python -m perf.bench_http_clients
+    python -m perf.bench_http_clients --url https://api.telegram.org --llamadas 20
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx  # noqa: E402
+
+from app.integrations.http_clients import (  # noqa: E402
+    close_http_clients,
+    cliente_http,
+    http_clients_stats,
+)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        cuerpo = b'{"ok": true}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(cuerpo)))
+        self.end_headers()
+        self.wfile.write(cuerpo)
+
+    def log_message(self, *args):
+        pass
+
+
+def _servidor_local() -> str:
+    servidor = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{servidor.server_address[1]}/"
+
+
+async def _anterior(url: str, llamadas: int) -> list:
+    tiempos = []
+    for _ in range(llamadas):
+        inicio = time.perf_counter()
+        async with httpx.AsyncClient(timeout=10.0) as client:
+            await client.get(url)
+        tiempos.append(time.perf_counter() - inicio)
+    return tiempos
+
+
+async def _compartido(url: str, llamadas: int) -> list:
+    client = cliente_http("n8n")
+    tiempos = []
+    for _ in range(llamadas):
+        inicio = time.perf_counter()
+        await client.get(url)
+        tiempos.append(time.perf_counter() - inicio)
+    return tiempos
+
+
+def _resumen(nombre: str, tiempos: list) -> None:
+    print(
+        f"  {nombre:<28} p50 {statistics.median(tiempos) * 1000:7.2f} ms   "
+        f"max {max(tiempos) * 1000:7.2f} ms"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Benchmark de clientes HTTP compartidos")
+    parser.add_argument("--url", default=None, help="URL a llamar (default: servidor local)")
+    parser.add_argument("--llamadas", type=int, default=200)
+    args = parser.parse_args()
+
+    url = args.url or _servidor_local()
+    print(f"📏 {args.llamadas} GET a {url}\n")
+
+    _resumen("anterior (cliente por call)", await _anterior(url, args.llamadas))
+    _resumen("nuevo (cliente compartido)", await _compartido(url, args.llamadas))
+
+    print(f"\n🔌 {http_clients_stats()['n8n']}")
+    await close_http_clients()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,83 @@
+# perf/bench_keywords.py
+"""
+MICROBENCHMARK - Autómata de palabras clave vs. un `in` por palabra
+
+Mide, sobre los mismos mensajes, cuánto cuesta encontrar las palabras
+clave del scoring a medida que crece el diccionario:
+- anterior: `palabra in mensaje_lower` por cada entrada
+- nuevo:    KeywordMatcher.buscar (app/ai/keyword_matcher.py)
+
+Uso (desde backend/):
+    python -m perf.bench_keywords
+    python -m perf.bench_keywords --repeticiones 5000
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.ai.keyword_matcher import KeywordMatcher  # noqa: E402
+from app.ai.lead_scorer import (  # noqa: E402
+    DETALLES_TECNICOS,
+    DETALLES_TIMELINE,
+    PALABRAS_NEGATIVAS,
+    PALABRAS_POSITIVAS,
+)
+
+from perf.bench_extractor import MENSAJES  # noqa: E402
+
+
+def _diccionario(extra: int) -> dict:
+    """Los diccionarios reales + `extra` claves de dominio inventadas."""
+
+    positivas = list(PALABRAS_POSITIVAS) + [f"termino{i} dominio" if i % 5 == 0 else f"termino{i}" for i in range(extra)]
+    return {
+        "positivas": positivas,
+        "negativas": list(PALABRAS_NEGATIVAS),
+        "tecnicos": DETALLES_TECNICOS,
+        "timeline": DETALLES_TIMELINE
+    }
+
+
+def _anterior(grupos: dict):
+    def buscar(mensaje: str):
+        mensaje_lower = mensaje.lower()
+        return [
+            (grupo, palabra)
+            for grupo, palabras in grupos.items()
+            for palabra in palabras
+            if palabra in mensaje_lower
+        ]
+    return buscar
+
+
+def _medir(funcion, repeticiones: int) -> float:
+    def _todos():
+        for mensaje in MENSAJES:
+            funcion(mensaje)
+
+    mejor = min(timeit.repeat(_todos, number=repeticiones, repeat=5))
+    return mejor / (repeticiones * len(MENSAJES)) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del buscador de palabras clave")
+    parser.add_argument("--repeticiones", type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"📏 {len(MENSAJES)} mensajes x {args.repeticiones} repeticiones (mejor de 5)\n")
+    print(f"  {'claves':>7} {'anterior (in)':>15} {'autómata':>12}")
+
+    for extra in (0, 200, 1000):
+        grupos = _diccionario(extra)
+        buscador = KeywordMatcher(grupos)
+        antes = _medir(_anterior(grupos), args.repeticiones)
+        ahora = _medir(buscador.buscar, args.repeticiones)
+        print(f"  {buscador.total_claves:>7} {antes:>12.2f} µs {ahora:>9.2f} µs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+# perf/bench_plantillas.py
+"""
+BENCHMARK - Armado de emails y avisos: f-strings sueltos vs. plantillas compiladas
+
+Compara, por render:
+- antes:        f-string + .replace("<", "&lt;") a mano (el código que había)
+- sin compilar: parsear la plantilla en cada envío (lo que haría un motor
+                "interpretado"; muestra cuánto ahorra compilar una sola vez)
+- compilado:    Plantilla.render (la función generada en el startup)
+- texto plano:  html_a_texto sobre el HTML ya armado vs. render_texto
+
+Se mide: µs por render, memoria pico (tracemalloc) armando N mensajes, y si
+un nombre malicioso sale escapado.
+
+Uso (desde backend/):
+    python -m perf.bench_plantillas
+    python -m perf.bench_plantillas --renders 20000
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+os.environ.setdefault("TELEGRAM_TOKEN", "bench")
+os.environ.setdefault("TELEGRAM_CHAT_ID", "1")
+os.environ.setdefault("GROQ_API_KEY", "bench")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.integrations.plantillas_email import CONFIRMACION_USUARIO  # noqa: E402
+from app.integrations.plantillas_telegram import NUEVO_LEAD_CHAT  # noqa: E402
+from app.utils.plantillas import Plantilla, html_a_texto  # noqa: E402
+
+MALICIOSO = '"><script>alert(1)</script>'
+
+
+# ============================================================================
+# ⏮️ LO DE ANTES (copiado de telegram.py / sendgrid.py)
+# ============================================================================
+
+def _telegram_antes(d: dict) -> str:
+    nombre = d["nombre"].replace("<", "&lt;").replace(">", "&gt;").strip()
+    email = d["email"].replace("<", "&lt;").replace(">", "&gt;").strip()
+    tipo_cliente = d["tipo_cliente"].replace("<", "&lt;").replace(">", "&gt;").strip()
+    problema = d["problema"].replace("<", "&lt;").replace(">", "&gt;")[:150]
+    mensaje = d["mensaje"].replace("<", "&lt;").replace(">", "&gt;")[:100]
+    telefono, lead_score, origen = d["telefono"], d["lead_score"], d["origen"]
+    emoji_tipo, emoji_score = d["emoji_tipo"], d["emoji_score"]
+
+    return f"""
+<b>🚀 NUEVO LEAD - CHATBOT</b>
+
+<b>👤 Nombre:</b> <code>{nombre}</code>
+<b>📧 Email:</b> <code>{email}</code>
+<b>📱 WhatsApp:</b> <a href="https://wa.me/{telefono.replace('+', '').replace(' ', '')}">{telefono}</a>
+
+<b>{emoji_tipo} Tipo:</b> {tipo_cliente if tipo_cliente else 'No especificado'}
+<b>🎯 Servicio:</b> {mensaje}
+
+<b>📝 Problema/Necesidad:</b>
+<code>{problema if problema else 'No especificado'}</code>
+
+<b>{emoji_score} Score:</b> <code>{lead_score}/100</code>
+<b>📍 Origen:</b> {origen}
+
+━━━━━━━━━━━━━━━━━━━━━━
+<a href="https://wa.me/{telefono.replace('+', '').replace(' ', '')}?text=Hola%20{nombre.replace(' ', '%20')}%2C%20soy%20Luciano.%20Recib%C3%AD%20tu%20consulta.">📲 RESPONDER WHATSAPP</a> | <a href="mailto:{email}">📧 EMAIL</a>
+"""
+
+
+def _email_antes(d: dict) -> str:
+    nombre = d["nombre"].replace("<", "&lt;").replace(">", "&gt;")
+    email = d["email"].replace("<", "&lt;").replace(">", "&gt;")
+    mensaje = d["mensaje"].replace("<", "&lt;").replace(">", "&gt;")
+    telefono = d["telefono"]
+
+    return f"""
+    <div style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto; color: #333;">
+        <div style="background: linear-gradient(135deg, #0f172a 0%, #1e293b 100%); color: #22c55e; padding: 30px; text-align: center; border-radius: 10px 10px 0 0;">
+            <h1 style="margin: 0; font-size: 24px;">¡Hola {nombre}!</h1>
+        </div>
+        <div style="background: #f9f9f9; padding: 30px; border-radius: 0 0 10px 10px;">
+            <p style="font-size: 16px; line-height: 1.6;">
+                Gracias por contactarme. He recibido tu mensaje correctamente.
+            </p>
+            <div style="background: white; padding: 20px; border-left: 5px solid #22c55e; margin: 20px 0; border-radius: 5px;">
+                <p style="margin: 0; color: #666;"><strong>Tu mensaje:</strong></p>
+                <p style="margin: 10px 0 0 0; color: #333; font-style: italic;">"{mensaje}"</p>
+            </div>
+            <p style="font-size: 14px; color: #666;"><strong>Tus datos de contacto:</strong></p>
+            <ul style="margin: 10px 0 20px 0; padding-left: 20px;">
+                <li style="margin: 5px 0;">📧 Email: <strong>{email}</strong></li>
+                <li style="margin: 5px 0;">📱 WhatsApp: <strong>{telefono}</strong></li>
+            </ul>
+            <p style="font-size: 14px; color: #666; line-height: 1.6;">
+                Me pondré en contacto contigo a la brevedad para analizar cómo podemos automatizar tus procesos
+                y mejorar la eficiencia de tu empresa.
+            </p>
+            <div style="text-align: center; margin: 20px 0;">
+                <a href="https://wa.me/{telefono.replace('+', '').replace(' ', '')}"
+                   style="display: inline-block; background: #25D366; color: white; padding: 12px 30px; text-decoration: none; border-radius: 5px; font-weight: bold; margin-right: 10px; margin-bottom: 10px;">
+                    📱 Contactar por WhatsApp
+                </a>
+            </div>
+            <p style="font-size: 12px; color: #999; margin: 20px 0 0 0;">
+                Saludos,<br>
+                <strong>Luciano Valinoti</strong><br>
+                <em>Especialista en Automatización IT</em><br>
+                📍 Córdoba, Argentina
+            </p>
+        </div>
+    </div>
+    """
+
+
+# ============================================================================
+# 📏 MEDICIÓN
+# ============================================================================
+
+def _datos(i: int) -> dict:
+    return {
+        "nombre": f"Lead Número {i}",
+        "email": f"lead{i}@example.com",
+        "telefono": f"+54 9 351 {i:07d}",
+        "mensaje": "Necesito automatizar la facturación y el seguimiento de clientes del local",
+        "problema": "Pierdo pedidos por WhatsApp y no tengo un registro ordenado de las consultas",
+        "tipo_cliente": "Comercio",
+        "emoji_tipo": "🏪",
+        "emoji_score": "⭐",
+        "lead_score": 65,
+        "origen": "chat"
+    }
+
+
+def _medir(funcion, datos: list) -> tuple:
+    """(µs por render, memoria pico en KB) armando todos los mensajes."""
+
+    inicio = time.perf_counter()
+    for d in datos:
+        funcion(d)
+    micros = (time.perf_counter() - inicio) / len(datos) * 1e6
+
+    tracemalloc.start()
+    mensajes = [funcion(d) for d in datos[:1000]]
+    pico = tracemalloc.get_traced_memory()[1] / 1024
+    tracemalloc.stop()
+    del mensajes
+    return micros, pico
+
+
+def _reporte(titulo: str, variantes: dict, datos: list) -> None:
+    print(f"\n📄 {titulo}")
+    base = None
+    for nombre, funcion in variantes.items():
+        micros, pico = _medir(funcion, datos)
+        base = base or micros
+        print(f"   {nombre:<24} {micros:8.2f} µs/render  x{base / micros:5.2f}   pico {pico:8.0f} KB (1000 msgs)")
+
+
+def _seguro(funcion, d: dict) -> str:
+    salida = funcion({**d, "nombre": MALICIOSO, "telefono": '+54 351" onclick="x'})
+    return "✅ escapado" if "<script>" not in salida and '" onclick' not in salida else "❌ inyectable"
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--renders", type=int, default=10000)
+    args = parser.parse_args()
+
+    datos = [_datos(i) for i in range(args.renders)]
+    print(f"📏 {args.renders} renders por variante")
+
+    chat = NUEVO_LEAD_CHAT.fuente
+    _reporte("Telegram: nuevo lead del chatbot", {
+        "antes (f-string)": _telegram_antes,
+        "sin compilar": lambda d: Plantilla(chat).render(d),
+        "compilado": NUEVO_LEAD_CHAT.render
+    }, datos)
+
+    confirmacion = CONFIRMACION_USUARIO.cuerpo
+    _reporte("Email: confirmación al usuario (HTML)", {
+        "antes (f-string)": _email_antes,
+        "sin compilar": lambda d: Plantilla(confirmacion.fuente).render(d),
+        "compilado": confirmacion.render
+    }, datos)
+
+    _reporte("Email: parte en texto plano", {
+        "html_a_texto(html)": lambda d: html_a_texto(confirmacion.render(d)),
+        "render_texto": confirmacion.render_texto
+    }, datos)
+
+    print("\n🛡️ Nombre/teléfono maliciosos:")
+    print(f"   Telegram antes:   {_seguro(_telegram_antes, datos[0])}")
+    print(f"   Telegram ahora:   {_seguro(NUEVO_LEAD_CHAT.render, datos[0])}")
+    print(f"   Email antes:      {_seguro(_email_antes, datos[0])}")
+    print(f"   Email ahora:      {_seguro(confirmacion.render, datos[0])}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+# perf/bench_scoring.py
+"""
+BENCHMARK - Scoring en lote (score_leads_batch) vs. score_lead en un loop
+
+Arma un histórico sintético de leads (mensajes reales del chat combinados,
+con contacto/intención/historial al azar) y compara:
+- anterior: score_lead lead por lead + seis pasadas para la distribución
+- nuevo:    analizar_calidad_leads sobre score_leads_batch
+
+También verifica que score_leads_batch dé exactamente lo mismo que
+score_lead para cada lead.
+
+Uso (desde backend/):
+    python -m perf.bench_scoring
+    python -m perf.bench_scoring --leads 50000 --distintos 5000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.ai.lead_scorer import (  # noqa: E402
+    analizar_calidad_leads,
+    get_score_category,
+    score_lead,
+    score_leads_batch,
+)
+
+from perf.bench_extractor import MENSAJES  # noqa: E402
+
+EXTRAS = [
+    "", "es urgente", "somos 5 personas", "solo curioso", "usamos Excel y Zapier",
+    "necesitamos backup de la base de datos", "esta semana si se puede", "es una prueba",
+]
+
+
+def _historico(cantidad: int, distintos: int, semilla: int) -> list:
+    rng = random.Random(semilla)
+    mensajes = [
+        f"{rng.choice(MENSAJES)} {rng.choice(EXTRAS)} {rng.choice(MENSAJES)}".strip() + f" #{i}"
+        for i in range(distintos)
+    ]
+    return [
+        {
+            "mensaje": rng.choice(mensajes),
+            "tiene_contacto": rng.random() < 0.3,
+            "tiene_intencion": rng.random() < 0.4,
+            "historial_length": rng.randint(0, 8)
+        }
+        for _ in range(cantidad)
+    ]
+
+
+def _analizar_anterior(leads: list) -> dict:
+    """analizar_calidad_leads tal como era antes de score_leads_batch."""
+
+    scores = [
+        score_lead(
+            lead.get("mensaje", ""),
+            lead.get("tiene_contacto", False),
+            lead.get("tiene_intencion", False),
+            lead.get("historial_length", 0)
+        )
+        for lead in leads
+    ]
+    distribucion = {
+        "muy_calidos_90+": len([s for s in scores if s >= 90]),
+        "muy_calidos_80-89": len([s for s in scores if 80 <= s < 90]),
+        "calidos_70-79": len([s for s in scores if 70 <= s < 80]),
+        "tibios_50-69": len([s for s in scores if 50 <= s < 70]),
+        "frios_30-49": len([s for s in scores if 30 <= s < 50]),
+        "spam_0-29": len([s for s in scores if s < 30]),
+    }
+    return {
+        "total_leads": len(leads),
+        "score_promedio": round(sum(scores) / len(scores), 1),
+        "score_min": min(scores),
+        "score_max": max(scores),
+        "distribucion": distribucion,
+        "tasa_conversion_estimada": round(sum([get_score_category(s)["probabilidad_conversion"] for s in scores]) / len(scores), 2)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del scoring en lote")
+    parser.add_argument("--leads", type=int, default=20000)
+    parser.add_argument("--distintos", type=int, default=2000, help="Mensajes distintos en el histórico")
+    parser.add_argument("--semilla", type=int, default=7)
+    args = parser.parse_args()
+
+    leads = _historico(args.leads, args.distintos, args.semilla)
+    print(f"📏 {len(leads)} leads ({args.distintos} mensajes distintos)\n")
+
+    inicio = time.perf_counter()
+    antes = _analizar_anterior(leads)
+    t_antes = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    ahora = analizar_calidad_leads(leads)
+    t_ahora = time.perf_counter() - inicio
+
+    print(f"  anterior: score_lead en loop      {t_antes * 1000:9.1f} ms")
+    print(f"  nuevo:    score_leads_batch       {t_ahora * 1000:9.1f} ms")
+    print(f"  → {t_antes / t_ahora:.1f}x\n")
+
+    esperados = [
+        score_lead(l["mensaje"], l["tiene_contacto"], l["tiene_intencion"], l["historial_length"])
+        for l in leads
+    ]
+    lote = score_leads_batch(
+        [l["mensaje"] for l in leads],
+        [l["tiene_contacto"] for l in leads],
+        [l["tiene_intencion"] for l in leads],
+        [l["historial_length"] for l in leads]
+    )
+    iguales = esperados == lote.tolist()
+    print(f"{'✅' if iguales else '❌'} Scores idénticos a score_lead: {iguales}")
+    print(f"{'✅' if antes == ahora else '❌'} Mismo resumen que antes: {antes == ahora}")
+    if antes != ahora:
+        print(f"  antes: {antes}\n  ahora: {ahora}")
+
+
+if __name__ == "__main__":
+    main()
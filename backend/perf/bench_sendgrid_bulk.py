@@ -0,0 +1,173 @@
+# perf/bench_sendgrid_bulk.py
+"""
+BENCHMARK - Campaña de emails: un request por destinatario vs. envío masivo
+
+Simula /v3/mail/send con httpx.MockTransport (latencia por request, y 400
+si algún destinatario tiene un email inválido, como SendGrid) y compara
+una campaña de seguimiento a N leads:
+- uno por uno: HTML armado por destinatario + send_email_sendgrid (lo de antes)
+- masivo:      sendgrid_bulk.campana (plantilla compilada, personalizations)
+
+Se mide: requests, tiempo total, bytes enviados, y que el email inválido
+falle solo (sin arrastrar al resto del lote). También se verifica que un
+mensaje de 2000 caracteres (comillas y emojis: pasa los 10.000 bytes de
+sustituciones) salga igual, por el envío individual.
+
+Uso (desde backend/):
+    python -m perf.bench_sendgrid_bulk
+    python -m perf.bench_sendgrid_bulk --leads 1000 --latencia 0.12
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+os.environ.setdefault("SENDGRID_API_KEY", "SG.bench")
+os.environ.setdefault("SENDGRID_FROM_EMAIL", "bench@example.com")
+os.environ.setdefault("TELEGRAM_TOKEN", "bench")
+os.environ.setdefault("TELEGRAM_CHAT_ID", "1")
+os.environ.setdefault("GROQ_API_KEY", "bench")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx  # noqa: E402
+
+from app.config import settings  # noqa: E402
+from app.integrations import http_clients  # noqa: E402
+from app.integrations.plantillas_email import SEGUIMIENTO  # noqa: E402
+from app.integrations.sendgrid import send_email_sendgrid  # noqa: E402
+from app.integrations.sendgrid_bulk import SendGridBulk  # noqa: E402
+
+INVALIDO = "no-es-un-email"
+
+
+class SendGridSimulado:
+    def __init__(self, latencia: float, concurrencia: int):
+        self.latencia = latencia
+        self._cupo = asyncio.Semaphore(concurrencia)
+        self.reiniciar()
+
+    def reiniciar(self):
+        self.requests = 0
+        self.bytes = 0
+        self.entregados = set()
+
+    async def responder(self, request: httpx.Request) -> httpx.Response:
+        cuerpo = request.read()
+        async with self._cupo:
+            await asyncio.sleep(self.latencia)
+        self.requests += 1
+        self.bytes += len(cuerpo)
+
+        payload = json.loads(cuerpo)
+        if payload["from"]["email"] == INVALIDO:
+            return httpx.Response(400, json={"errors": [{"message": "Invalid from", "field": "from.email"}]})
+        destinatarios = [p["to"][0]["email"] for p in payload["personalizations"]]
+        if INVALIDO in destinatarios:
+            indice = destinatarios.index(INVALIDO)
+            return httpx.Response(400, json={"errors": [{"message": "Invalid email", "field": f"personalizations.{indice}.to"}]})
+        self.entregados.update(destinatarios)
+        return httpx.Response(202)
+
+
+def _leads(cantidad: int):
+    leads = [
+        (f"lead{i}@empresa.com", {"nombre": f"Lead <{i}>", "mensaje": f"Necesito automatizar facturas #{i} " * 8})
+        for i in range(cantidad)
+    ]
+    leads[cantidad // 3] = (INVALIDO, {"nombre": "Roto", "mensaje": "x"})
+    return leads
+
+
+def _render_individual(datos: dict):
+    """(asunto, html) completos por destinatario (lo que hacía el f-string de antes)."""
+
+    asunto, html, _ = SEGUIMIENTO.render(datos)
+    return asunto, html
+
+
+async def _uno_por_uno(leads, concurrencia: int):
+    cupo = asyncio.Semaphore(concurrencia)
+
+    async def uno(email, datos):
+        asunto, html = _render_individual(datos)
+        async with cupo:
+            return await send_email_sendgrid(
+                to_email=email,
+                subject=asunto,
+                html_content=html
+            )
+
+    return await asyncio.gather(*[uno(email, datos) for email, datos in leads])
+
+
+def _reporte(nombre: str, api: SendGridSimulado, total: int, duracion: float, ok: int):
+    print(f"  {nombre:<12} requests {api.requests:>5}   {duracion:6.2f} s   {api.bytes / 1e6:6.2f} MB enviados   "
+          f"entregados {len(api.entregados)}/{total} (ok={ok})")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Benchmark del envío masivo por SendGrid")
+    parser.add_argument("--leads", type=int, default=300)
+    parser.add_argument("--latencia", type=float, default=0.08, help="Segundos por request")
+    parser.add_argument("--concurrencia", type=int, default=10, help="Requests en paralelo")
+    args = parser.parse_args()
+
+    import logging
+    logging.disable(logging.ERROR)
+
+    api = SendGridSimulado(args.latencia, args.concurrencia)
+    http_clients.cliente_http("sendgrid")
+    http_clients._clientes["sendgrid"].client = httpx.AsyncClient(transport=httpx.MockTransport(api.responder))
+
+    leads = _leads(args.leads)
+    print(f"📏 Campaña de seguimiento a {args.leads} leads (1 email inválido), "
+          f"{args.latencia * 1000:.0f} ms por request, {args.concurrencia} en paralelo\n")
+
+    inicio = time.perf_counter()
+    resultados = await _uno_por_uno(leads, args.concurrencia)
+    _reporte("uno por uno", api, args.leads, time.perf_counter() - inicio, sum(resultados))
+
+    api.reiniciar()
+    validos = [(email, datos) for email, datos in leads if email != INVALIDO]
+    inicio = time.perf_counter()
+    resultado = await SendGridBulk(max_lote=500, max_espera=0.05).campana("seguimiento", validos)
+    _reporte("masivo", api, len(validos), time.perf_counter() - inicio, resultado["enviados"])
+
+    api.reiniciar()
+    masivo = SendGridBulk(max_lote=500, max_espera=0.05)
+    inicio = time.perf_counter()
+    resultado = await masivo.campana("seguimiento", leads)
+    _reporte("masivo + 400", api, args.leads, time.perf_counter() - inicio, resultado["enviados"])
+
+    solo_invalido = resultado["fallidos"] == 1 and INVALIDO not in api.entregados
+    print(f"\n{'✅' if solo_invalido else '❌'} Solo falló el email inválido "
+          f"({masivo.requests} requests contando las mitades reintentadas tras el 400)")
+
+    # 400 del request entero (remitente inválido): partir no sirve de nada
+    api.reiniciar()
+    remitente, settings.SENDGRID_FROM_EMAIL = settings.SENDGRID_FROM_EMAIL, INVALIDO
+    roto = SendGridBulk(max_lote=500, max_espera=0.05)
+    resultado = await roto.campana("seguimiento", validos)
+    settings.SENDGRID_FROM_EMAIL = remitente
+    sin_particion = roto.requests <= -(-len(validos) // 500)
+    print(f"{'✅' if sin_particion else '❌'} Remitente inválido: {resultado['fallidos']}/{len(validos)} fallidos "
+          f"en {roto.requests} requests (sin partir el lote)")
+
+    # Sustituciones de más de 10.000 bytes: SendGrid las rechazaría
+    api.reiniciar()
+    grande = SendGridBulk(max_lote=500, max_espera=0.05)
+    mensaje = ('"🚀' * 1000)[:2000]
+    ok = await grande.enviar("confirmacion_usuario", "largo@empresa.com", {"nombre": "Lead", "mensaje": mensaje})
+    individual = ok and grande.individuales == 1 and "largo@empresa.com" in api.entregados
+    print(f"{'✅' if individual else '❌'} Mensaje de {len(mensaje)} caracteres ({len(mensaje.encode())} bytes): "
+          f"enviado solo, en {grande.requests} request")
+
+    await http_clients.close_http_clients()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
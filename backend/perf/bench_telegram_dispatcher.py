@@ -0,0 +1,178 @@
+# perf/bench_telegram_dispatcher.py
+"""
+BENCHMARK - Ráfaga de leads a Telegram: envío directo vs. despachador
+
+Simula el Bot API con httpx.MockTransport: acepta como mucho LIMITE
+mensajes por VENTANA segundos y contesta 429 con retry_after si uno se
+pasa (como Telegram con un grupo). Llega una ráfaga de leads, algunos
+calientes y la mayoría fríos, y se compara:
+- directo:      un POST por lead en el momento (lo de antes: 429 = perdido)
+- despachador:  TelegramDispatcher con la misma tasa (escalada a la ventana)
+
+Se mide: 429 recibidos, leads que nunca llegaron al chat, mensajes que
+vio el admin y cuánto tardó en avisar cada lead caliente.
+
+Uso (desde backend/):
+    python -m perf.bench_telegram_dispatcher
+    python -m perf.bench_telegram_dispatcher --leads 60 --calientes 5 --ventana 4
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import re
+import statistics
+import sys
+import time
+from collections import deque
+
+os.environ.setdefault("TELEGRAM_TOKEN", "bench")
+os.environ.setdefault("TELEGRAM_CHAT_ID", "1")
+os.environ.setdefault("GROQ_API_KEY", "bench")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx  # noqa: E402
+
+from app.integrations import http_clients  # noqa: E402
+from app.integrations.telegram_dispatcher import TelegramDispatcher  # noqa: E402
+
+
+class BotApiSimulado:
+    """Ventana deslizante de LIMITE mensajes cada VENTANA segundos por chat."""
+
+    def __init__(self, limite: int, ventana: float, latencia: float):
+        self.limite = limite
+        self.ventana = ventana
+        self.latencia = latencia
+        self.reiniciar()
+
+    def reiniciar(self):
+        self.aceptados = deque()
+        self.mensajes = []
+        self.respuestas_429 = 0
+
+    async def responder(self, request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(self.latencia)
+        ahora = time.monotonic()
+        while self.aceptados and ahora - self.aceptados[0] >= self.ventana:
+            self.aceptados.popleft()
+        if len(self.aceptados) >= self.limite:
+            self.respuestas_429 += 1
+            espera = self.ventana - (ahora - self.aceptados[0])
+            return httpx.Response(429, json={
+                "ok": False, "error_code": 429,
+                "description": "Too Many Requests",
+                "parameters": {"retry_after": round(espera, 2)}
+            })
+        self.aceptados.append(ahora)
+        self.mensajes.append((ahora, request.read().decode()))
+        return httpx.Response(200, json={"ok": True, "result": {}})
+
+
+def _leads(cantidad: int, calientes: int):
+    indices = set(random.sample(range(cantidad), calientes))
+    return [(f"lead{i:03d}", 90 if i in indices else 35) for i in range(cantidad)]
+
+
+def _texto(nombre: str, score: int) -> str:
+    return f"🚀 <b>NUEVO LEAD</b>\n\n👤 <b>Nombre:</b> {nombre}\n⭐ <b>Score:</b> {score}/100"
+
+
+def _entregados(api: BotApiSimulado) -> set:
+    return {nombre for _, cuerpo in api.mensajes for nombre in re.findall(r"lead\d{3}", cuerpo)}
+
+
+def _latencia_calientes(api: BotApiSimulado, leads, inicio: float) -> list:
+    calientes = {nombre for nombre, score in leads if score >= 60}
+    return [t - inicio for t, cuerpo in api.mensajes for nombre in re.findall(r"lead\d{3}", cuerpo) if nombre in calientes]
+
+
+async def _directo(api: BotApiSimulado, leads, espaciado: float):
+    client = http_clients.cliente_http("telegram")
+    url = "https://api.telegram.org/botbench/sendMessage"
+
+    async def uno(nombre, score):
+        response = await client.post(url, json={"chat_id": "1", "text": _texto(nombre, score)})
+        return response.status_code == 200  # 429: se logueaba y listo
+
+    tareas = []
+    for nombre, score in leads:
+        tareas.append(asyncio.create_task(uno(nombre, score)))
+        await asyncio.sleep(espaciado)
+    await asyncio.gather(*tareas)
+
+
+async def _despachador(despachador: TelegramDispatcher, leads, espaciado: float):
+    tareas = []
+    for nombre, score in leads:
+        tareas.append(asyncio.create_task(despachador.enviar(
+            _texto(nombre, score),
+            agrupable=score < 60,
+            resumen=f"⚡ <b>{nombre}</b> · {score}/100"
+        )))
+        await asyncio.sleep(espaciado)
+    return await asyncio.gather(*tareas)
+
+
+def _reporte(nombre: str, api: BotApiSimulado, leads, inicio: float, duracion: float):
+    entregados = _entregados(api)
+    calientes = _latencia_calientes(api, leads, inicio)
+    calientes_perdidos = sum(1 for nombre, score in leads if score >= 60 and nombre not in entregados)
+    p50 = statistics.median(calientes) if calientes else float("nan")
+    peor = max(calientes) if calientes else float("nan")
+    print(f"  {nombre:<12} 429s {api.respuestas_429:>3}   perdidos {len(leads) - len(entregados):>3}   "
+          f"mensajes {len(api.mensajes):>3}   calientes perdidos {calientes_perdidos}  p50 {p50:5.2f}s  peor {peor:5.2f}s   total {duracion:5.1f}s")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Benchmark del despachador de Telegram")
+    parser.add_argument("--leads", type=int, default=40)
+    parser.add_argument("--calientes", type=int, default=6)
+    parser.add_argument("--limite", type=int, default=20, help="Mensajes por ventana (Telegram: 20)")
+    parser.add_argument("--ventana", type=float, default=3.0, help="Segundos (Telegram: 60; escalado para el bench)")
+    parser.add_argument("--rafaga", type=int, default=3)
+    parser.add_argument("--duracion-rafaga", type=float, default=1.0, help="Segundos en que llegan todos los leads")
+    parser.add_argument("--latencia", type=float, default=0.03)
+    args = parser.parse_args()
+
+    random.seed(7)
+    leads = _leads(args.leads, args.calientes)
+    espaciado = args.duracion_rafaga / args.leads
+    api = BotApiSimulado(args.limite, args.ventana, args.latencia)
+
+    http_clients.cliente_http("telegram")
+    http_clients._clientes["telegram"].client = httpx.AsyncClient(transport=httpx.MockTransport(api.responder))
+
+    print(f"📏 {args.leads} leads ({args.calientes} calientes) en {args.duracion_rafaga:.0f}s; "
+          f"límite {args.limite} mensajes cada {args.ventana:.0f}s\n")
+
+    inicio = time.monotonic()
+    await _directo(api, leads, espaciado)
+    _reporte("directo", api, leads, inicio, time.monotonic() - inicio)
+
+    # Dejar vaciar la ventana del simulador entre corridas
+    await asyncio.sleep(args.ventana)
+    api.reiniciar()
+
+    despachador = TelegramDispatcher(
+        tasa=(args.limite - args.rafaga) / args.ventana,
+        capacidad=args.rafaga,
+        max_resumen=20,
+        max_reintentos=3
+    )
+    inicio = time.monotonic()
+    resultados = await _despachador(despachador, leads, espaciado)
+    _reporte("despachador", api, leads, inicio, time.monotonic() - inicio)
+    await despachador.detener()
+
+    stats = despachador.stats()
+    print(f"\n  Despachador: {stats['resumenes']} resúmenes con {stats['leads_en_resumenes']} leads, "
+          f"{stats['respuestas_429']} respuestas 429, todos confirmados: {all(resultados)}")
+
+    await http_clients.close_http_clients()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
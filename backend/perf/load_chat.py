@@ -0,0 +1,260 @@
+# perf/load_chat.py
+"""
+PRUEBA DE CARGA - Sesiones de chat realistas contra /api/chat
+
+¿Para qué?
+- Tener una línea base repetible antes/después de tocar el pipeline del chat
+- Medir throughput, p50/p95/p99 y consultas a la BD por turno
+
+Cada sesión virtual sigue un guion de varios turnos (saludo, pregunta,
+problema, datos de contacto...) con el mismo session_id, como un
+visitante real. Se corren --concurrencia sesiones a la vez hasta
+completar --sesiones.
+
+Modos:
+- En proceso (default): carga la app con httpx.ASGITransport, sin red ni
+  uvicorn. Cuenta las consultas SQL de cada turno.
+- --url http://host:puerto: pega contra un servidor ya levantado
+  (sin conteo de consultas).
+
+Uso (desde backend/, con el stub corriendo: python -m perf.stub_llm):
+    python -m perf.load_chat --sesiones 200 --concurrencia 50
+    python -m perf.load_chat --stream          # usa /api/chat/stream
+
+La BD por defecto es sqlite:///./perf_load.db para no ensuciar la real.
+"""
+
+import argparse
+import asyncio
+import contextvars
+import os
+import random
+import statistics
+import sys
+import time
+
+import httpx
+
+# ============================================================================
+# 💬 GUIONES DE CONVERSACIÓN
+# ============================================================================
+
+GUIONES = [
+    [
+        "Hola, buenas tardes",
+        "¿Qué servicios ofrecen?",
+        "Tengo una oficina de 12 personas y cargamos facturas a mano todos los días",
+        "Me llamo Carla Gómez, mi email es carla{n}@estudio-contable.com",
+        "Mi teléfono es +54 9 351 555 {n:04d}",
+        "¿Cuándo podrían empezar?",
+    ],
+    [
+        "Buenas, necesito ayuda con la seguridad de mi empresa",
+        "Nos entró un ransomware el mes pasado y perdimos datos",
+        "Somos un comercio con 3 sucursales",
+        "¿Cuánto cuesta una auditoría?",
+        "Soy Martín Ruiz, martin.ruiz{n}@ferreteria.com.ar",
+    ],
+    [
+        "Hola",
+        "Quiero automatizar el envío de presupuestos por email desde una planilla",
+        "Usamos Google Sheets y Gmail",
+        "¿En qué horarios atienden?",
+        "Perfecto, gracias",
+    ],
+    [
+        "¿Hacen soporte de PCs?",
+        "Ok, ¿y mantenimiento de servidores?",
+        "Tenemos un servidor Windows que se cuelga seguido",
+        "Mi nombre es Laura Pérez y mi WhatsApp es 351 444 {n:04d}",
+    ],
+]
+
+# ============================================================================
+# 🔢 CONTEO DE CONSULTAS SQL POR TURNO
+# ============================================================================
+
+_consultas_turno = contextvars.ContextVar("consultas_turno", default=None)
+
+
+def _contar_consulta(conn, cursor, statement, parameters, context, executemany):
+    contador = _consultas_turno.get()
+    if contador is not None:
+        contador[0] += 1
+
+
+# ============================================================================
+# 🏃 SESIONES VIRTUALES
+# ============================================================================
+
+class Resultados:
+    def __init__(self):
+        self.latencias = []
+        self.consultas = []
+        self.errores = 0
+        self.codigos = {}
+
+
+async def _turno(client, ruta: str, payload: dict, resultados: Resultados, stream: bool) -> None:
+    contador = [0]
+    token = _consultas_turno.set(contador)
+    inicio = time.perf_counter()
+    try:
+        if stream:
+            async with client.stream("POST", ruta, json=payload) as respuesta:
+                async for _ in respuesta.aiter_lines():
+                    pass
+                codigo = respuesta.status_code
+        else:
+            respuesta = await client.post(ruta, json=payload)
+            codigo = respuesta.status_code
+            if codigo == 200 and respuesta.json().get("status") != "success":
+                codigo = "error_app"
+    except Exception as e:
+        codigo = type(e).__name__
+    finally:
+        _consultas_turno.reset(token)
+
+    resultados.latencias.append(time.perf_counter() - inicio)
+    resultados.consultas.append(contador[0])
+    resultados.codigos[codigo] = resultados.codigos.get(codigo, 0) + 1
+    if codigo != 200:
+        resultados.errores += 1
+
+
+async def _sesion(client, n: int, args, resultados: Resultados) -> None:
+    guion = GUIONES[n % len(GUIONES)]
+    session_id = f"perf-{args.semilla}-{n}"
+    ruta = "/api/chat/stream" if args.stream else "/api/chat"
+
+    for mensaje in guion:
+        payload = {"message": mensaje.format(n=n), "session_id": session_id}
+        await _turno(client, ruta, payload, resultados, args.stream)
+        if args.pausa:
+            await asyncio.sleep(random.uniform(0, args.pausa))
+
+
+# ============================================================================
+# 📊 REPORTE
+# ============================================================================
+
+def _percentil(valores: list, p: float) -> float:
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(p * len(ordenados)))]
+
+
+def _reporte(resultados: Resultados, duracion: float, metricas: dict = None) -> None:
+    turnos = len(resultados.latencias)
+    ms = lambda segundos: f"{segundos * 1000:.1f} ms"
+
+    print("\n" + "=" * 60)
+    print("📊 RESULTADOS")
+    print("=" * 60)
+    print(f"Turnos:        {turnos} en {duracion:.2f}s")
+    print(f"Throughput:    {turnos / duracion:.1f} turnos/s")
+    print(f"Errores:       {resultados.errores} {resultados.codigos}")
+    print(f"Latencia p50:  {ms(_percentil(resultados.latencias, 0.50))}")
+    print(f"Latencia p95:  {ms(_percentil(resultados.latencias, 0.95))}")
+    print(f"Latencia p99:  {ms(_percentil(resultados.latencias, 0.99))}")
+    print(f"Latencia máx:  {ms(max(resultados.latencias))}")
+
+    if any(resultados.consultas):
+        print(
+            f"SQL por turno: media {statistics.mean(resultados.consultas):.2f} | "
+            f"p95 {_percentil(resultados.consultas, 0.95)} | máx {max(resultados.consultas)}"
+        )
+
+    if metricas:
+        print("\n🔎 /api/chat/metrics")
+        for clave, valor in metricas.items():
+            if clave != "status":
+                print(f"  {clave}: {valor}")
+
+
+# ============================================================================
+# 🚀 MAIN
+# ============================================================================
+
+async def _correr(args) -> None:
+    random.seed(args.semilla)
+
+    if args.url:
+        client = httpx.AsyncClient(base_url=args.url, timeout=60.0)
+    else:
+        from sqlalchemy import event
+
+        from app.ai.llm_client import close_llm_client, init_llm_client
+        from app.database import engine
+        from app.main import app as aplicacion
+
+        if not args.notificar:
+            # Sin Telegram real durante la carga: las notificaciones se descartan
+            import app.routes.chat as rutas_chat
+
+            async def _notificacion_nula(**kwargs):
+                return None
+
+            rutas_chat.notificar_nuevo_lead = _notificacion_nula
+
+        event.listen(engine, "before_cursor_execute", _contar_consulta)
+        await init_llm_client()
+        client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=aplicacion, client=("10.0.0.1", 5000)),
+            base_url="http://perf",
+            timeout=60.0
+        )
+
+    resultados = Resultados()
+    semaforo = asyncio.Semaphore(args.concurrencia)
+
+    async def _con_limite(n: int):
+        async with semaforo:
+            await _sesion(client, n, args, resultados)
+
+    print(f"🚀 {args.sesiones} sesiones, {args.concurrencia} concurrentes, {'stream' if args.stream else 'json'}")
+    inicio = time.perf_counter()
+    await asyncio.gather(*[_con_limite(n) for n in range(args.sesiones)])
+    duracion = time.perf_counter() - inicio
+
+    metricas = None
+    try:
+        respuesta = await client.get("/api/chat/metrics")
+        metricas = respuesta.json()
+    except Exception:
+        pass
+
+    await client.aclose()
+    if not args.url:
+        await close_llm_client()
+
+    _reporte(resultados, duracion, metricas)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prueba de carga de /api/chat")
+    parser.add_argument("--sesiones", type=int, default=100, help="Sesiones virtuales en total")
+    parser.add_argument("--concurrencia", type=int, default=20, help="Sesiones corriendo a la vez")
+    parser.add_argument("--pausa", type=float, default=0.0, help="Pausa máxima entre turnos (s)")
+    parser.add_argument("--stream", action="store_true", help="Usar /api/chat/stream")
+    parser.add_argument("--url", default=None, help="Servidor ya levantado (si no, en proceso)")
+    parser.add_argument("--stub", default="http://127.0.0.1:8081", help="URL de perf/stub_llm.py")
+    parser.add_argument("--db", default="sqlite:///./perf_load.db", help="BD para el modo en proceso")
+    parser.add_argument("--notificar", action="store_true", help="Enviar notificaciones reales de Telegram")
+    parser.add_argument("--semilla", type=int, default=int(time.time()))
+    args = parser.parse_args()
+
+    if not args.url:
+        # Antes de importar app.config: la app apunta al stub y a una BD aparte
+        os.environ["GROQ_BASE_URL"] = args.stub
+        os.environ["DATABASE_URL"] = args.db
+        os.environ.setdefault("GROQ_API_KEY", "stub")
+        os.environ.setdefault("TELEGRAM_TOKEN", "stub")
+        os.environ.setdefault("TELEGRAM_CHAT_ID", "0")
+        os.environ.setdefault("LOG_LEVEL", "WARNING")
+        sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+    asyncio.run(_correr(args))
+
+
+if __name__ == "__main__":
+    main()
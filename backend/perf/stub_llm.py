@@ -0,0 +1,193 @@
+# perf/stub_llm.py
+"""
+STUB LLM - Servidor local compatible con Groq / OpenAI para pruebas de carga
+
+¿Para qué?
+- Cargar /api/chat sin gastar cuota de Groq
+- Latencias reproducibles: misma semilla = misma distribución
+- Simular incidentes (lentitud, errores 5xx) para probar breaker y hedging
+
+Rutas:
+- POST /openai/v1/chat/completions   (lo que llama el SDK de Groq)
+- POST /v1/chat/completions          (lo que llama el SDK de OpenAI)
+- GET  /stats                        (pedidos atendidos, errores, en vuelo)
+
+Latencia de cada respuesta:
+- Tiempo al primer token: lognormal con mediana --ttft y dispersión --sigma
+- Después, --tokens-por-segundo hasta completar la respuesta
+  (con stream=true cada token se envía como un delta SSE)
+
+Uso (desde backend/):
+    python -m perf.stub_llm --port 8081 --ttft 0.35 --sigma 0.6 --tokens-por-segundo 250
+
+    # En otra terminal, apuntar la app al stub:
+    GROQ_BASE_URL=http://127.0.0.1:8081 uvicorn app.main:app
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import time
+import uuid
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+# ============================================================================
+# ⚙️ CONFIGURACIÓN (se completa desde la línea de comandos)
+# ============================================================================
+
+config = {
+    "ttft": 0.35,               # Mediana del tiempo al primer token (s)
+    "sigma": 0.6,               # Dispersión de la lognormal (0 = latencia fija)
+    "tokens_por_segundo": 250,  # Velocidad de generación
+    "tokens_respuesta": 60,     # Largo de cada respuesta (tope: max_tokens del pedido)
+    "tasa_error": 0.0,          # Proporción de pedidos que responden 503
+    "semilla": None
+}
+
+stats = {"pedidos": 0, "streams": 0, "errores": 0, "en_vuelo": 0, "max_en_vuelo": 0}
+
+PALABRAS = (
+    "perfecto automatizamos ese proceso con Python y n8n para que tu equipo "
+    "ahorre horas cada semana completa el formulario de asesoría y te contacto "
+    "en 24hs con una propuesta concreta según el tamaño de tu empresa"
+).split()
+
+_rng = random.Random()
+app = FastAPI(title="Stub LLM")
+
+
+def _muestrear_ttft() -> float:
+    if config["sigma"] <= 0:
+        return config["ttft"]
+    return _rng.lognormvariate(math.log(config["ttft"]), config["sigma"])
+
+
+def _generar_tokens(cantidad: int) -> list:
+    return [PALABRAS[i % len(PALABRAS)] + " " for i in range(cantidad)]
+
+
+# ============================================================================
+# 🤖 CHAT COMPLETIONS
+# ============================================================================
+
+@app.post("/openai/v1/chat/completions")
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request):
+    pedido = await request.json()
+    stats["pedidos"] += 1
+
+    if _rng.random() < config["tasa_error"]:
+        stats["errores"] += 1
+        return JSONResponse(status_code=503, content={"error": {"message": "stub: servicio no disponible"}})
+
+    cantidad = min(config["tokens_respuesta"], pedido.get("max_tokens") or config["tokens_respuesta"])
+    tokens = _generar_tokens(cantidad)
+    ttft = _muestrear_ttft()
+    por_token = 1.0 / config["tokens_por_segundo"]
+    modelo = pedido.get("model", "stub")
+    id_completion = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+    creado = int(time.time())
+    tokens_prompt = sum(len(m.get("content", "")) for m in pedido.get("messages", [])) // 4
+
+    if pedido.get("stream"):
+        stats["streams"] += 1
+
+        async def eventos():
+            stats["en_vuelo"] += 1
+            stats["max_en_vuelo"] = max(stats["max_en_vuelo"], stats["en_vuelo"])
+            try:
+                await asyncio.sleep(ttft)
+                for i, token in enumerate(tokens):
+                    if i:
+                        await asyncio.sleep(por_token)
+                    chunk = {
+                        "id": id_completion,
+                        "object": "chat.completion.chunk",
+                        "created": creado,
+                        "model": modelo,
+                        "choices": [{"index": 0, "delta": {"content": token}, "finish_reason": None}]
+                    }
+                    yield f"data: {json.dumps(chunk)}\n\n"
+
+                final = {
+                    "id": id_completion,
+                    "object": "chat.completion.chunk",
+                    "created": creado,
+                    "model": modelo,
+                    "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]
+                }
+                yield f"data: {json.dumps(final)}\n\n"
+                yield "data: [DONE]\n\n"
+            finally:
+                stats["en_vuelo"] -= 1
+
+        return StreamingResponse(eventos(), media_type="text/event-stream")
+
+    stats["en_vuelo"] += 1
+    stats["max_en_vuelo"] = max(stats["max_en_vuelo"], stats["en_vuelo"])
+    try:
+        await asyncio.sleep(ttft + por_token * cantidad)
+    finally:
+        stats["en_vuelo"] -= 1
+
+    return {
+        "id": id_completion,
+        "object": "chat.completion",
+        "created": creado,
+        "model": modelo,
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": "".join(tokens).strip()},
+            "finish_reason": "stop"
+        }],
+        "usage": {
+            "prompt_tokens": tokens_prompt,
+            "completion_tokens": cantidad,
+            "total_tokens": tokens_prompt + cantidad
+        }
+    }
+
+
+@app.get("/stats")
+async def get_stats():
+    return {"config": config, **stats}
+
+
+# ============================================================================
+# 🏃 RUN
+# ============================================================================
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Servidor LLM falso para pruebas de carga")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--ttft", type=float, default=config["ttft"], help="Mediana del tiempo al primer token (s)")
+    parser.add_argument("--sigma", type=float, default=config["sigma"], help="Dispersión lognormal (0 = fija)")
+    parser.add_argument("--tokens-por-segundo", type=float, default=config["tokens_por_segundo"])
+    parser.add_argument("--tokens-respuesta", type=int, default=config["tokens_respuesta"])
+    parser.add_argument("--tasa-error", type=float, default=config["tasa_error"], help="Proporción de 503 (0-1)")
+    parser.add_argument("--semilla", type=int, default=None)
+    args = parser.parse_args()
+
+    config.update(
+        ttft=args.ttft,
+        sigma=args.sigma,
+        tokens_por_segundo=args.tokens_por_segundo,
+        tokens_respuesta=args.tokens_respuesta,
+        tasa_error=args.tasa_error,
+        semilla=args.semilla
+    )
+    _rng.seed(args.semilla)
+
+    print(f"🧪 Stub LLM en http://{args.host}:{args.port} {config}")
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()